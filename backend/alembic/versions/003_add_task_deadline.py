@@ -0,0 +1,41 @@
+"""Add deadline and slo_class fields to tasks table
+
+Revision ID: 003_add_task_deadline
+Revises: 002_add_worker_api_key
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_task_deadline'
+down_revision: Union[str, None] = '002_add_worker_api_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add deadline column to tasks table
+    op.add_column(
+        'tasks',
+        sa.Column('deadline', sa.TIMESTAMP(timezone=True), nullable=True)
+    )
+
+    # Add slo_class column to tasks table
+    op.add_column(
+        'tasks',
+        sa.Column('slo_class', sa.String(20), nullable=True)
+    )
+
+    # Create index on deadline for EDF ordering
+    op.create_index('ix_tasks_deadline', 'tasks', ['deadline'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_deadline', table_name='tasks')
+    op.drop_column('tasks', 'slo_class')
+    op.drop_column('tasks', 'deadline')
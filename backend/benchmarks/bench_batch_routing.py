@@ -0,0 +1,204 @@
+"""
+Benchmark: batch routing vs one routing decision per task.
+
+Generates a synthetic fleet (tools, success rates, load, latency) and a
+backlog of tasks with tool requirements and priorities, then drains the
+backlog with:
+
+- sequential: the IntelligentRouter.route_task pattern; for each task in
+  turn, await a per-worker score over every capable worker with a free
+  slot and take the best
+- greedy: build_score_matrix() + assign_greedy()
+- optimal: build_score_matrix() + assign_optimal() (small batches only)
+
+Reports CPU time, tasks placed, total score and how many of the
+highest-priority tasks were left unplaced.
+
+Usage:
+    python benchmarks/bench_batch_routing.py [--tasks 1000] [--workers 200] [--seed 7]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.batch_router import (
+    assign_greedy,
+    assign_optimal,
+    build_score_matrix,
+)
+
+TOOLS = ["claude_code", "gemini_cli", "ollama", "codex_cli"]
+COST_SCORE = {"claude_code": 0.87, "gemini_cli": 0.99, "ollama": 1.0, "codex_cli": 0.9}
+
+# Same defaults as RoutingFactors
+WEIGHTS = {
+    "capability_match": 0.30,
+    "historical_success": 0.25,
+    "current_load": 0.20,
+    "cost_efficiency": 0.15,
+    "latency_estimate": 0.10,
+}
+
+
+def make_fleet(num_tasks: int, num_workers: int, seed: int):
+    """Random workers and tasks; total capacity is ~90% of the backlog."""
+    rng = random.Random(seed)
+    workers = []
+    for _ in range(num_workers):
+        workers.append({
+            "tools": rng.sample(TOOLS, rng.randint(1, 3)),
+            "success": rng.uniform(0.5, 1.0),
+            "load": rng.choice([1.0, 0.7]),
+            "latency": rng.uniform(0.3, 1.0),
+        })
+    slots = int(num_tasks * 0.9)
+    capacity = [1] * num_workers
+    for _ in range(max(0, slots - num_workers)):
+        capacity[rng.randrange(num_workers)] += 1
+
+    tasks = [
+        {"tool": rng.choice(TOOLS), "priority": rng.randint(1, 10)}
+        for _ in range(num_tasks)
+    ]
+    return workers, tasks, capacity
+
+
+class SequentialRouter:
+    """
+    Per-task routing with the same call structure as IntelligentRouter.
+
+    route_task() awaits one _calculate_score() per capable worker, which in
+    turn awaits the capability check and the (cached) performance lookup.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._performance_cache = {}
+        self._cache_ttl = timedelta(minutes=5)
+        self._last_cache_update = None
+
+    async def _score_capability(self, worker, task):
+        return 1.0 if task["tool"] in worker["tools"] else 0.0
+
+    async def _get_worker_performance(self, worker_id):
+        if worker_id in self._performance_cache:
+            if self._last_cache_update and datetime.utcnow() - self._last_cache_update < self._cache_ttl:
+                return self._performance_cache[worker_id]
+        self._performance_cache[worker_id] = self.workers[worker_id]["success"]
+        self._last_cache_update = datetime.utcnow()
+        return self._performance_cache[worker_id]
+
+    async def _calculate_score(self, worker_id, task):
+        worker = self.workers[worker_id]
+        factors = {}
+        factors["capability_match"] = await self._score_capability(worker, task)
+        factors["historical_success"] = await self._get_worker_performance(worker_id)
+        factors["current_load"] = worker["load"]
+        factors["cost_efficiency"] = COST_SCORE[task["tool"]]
+        factors["latency_estimate"] = worker["latency"]
+        total = sum(WEIGHTS[name] * value for name, value in factors.items())
+        return total, factors
+
+    async def route_task(self, task, remaining):
+        candidates = [
+            w for w, worker in enumerate(self.workers)
+            if remaining[w] > 0 and task["tool"] in worker["tools"]
+        ]
+        scored = []
+        for w in candidates:
+            score, factors = await self._calculate_score(w, task)
+            scored.append((w, score, factors))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[0][0] if scored else -1
+
+
+def route_sequential(workers, tasks, capacity):
+    """One routing decision per task, in arrival order."""
+    router = SequentialRouter(workers)
+    remaining = list(capacity)
+
+    async def drain():
+        assignment = []
+        for task in tasks:
+            w = await router.route_task(task, remaining)
+            if w >= 0:
+                remaining[w] -= 1
+            assignment.append(w)
+        return assignment
+
+    return np.array(asyncio.run(drain()))
+
+
+def route_batch(workers, tasks, capacity, solver):
+    """Score matrix plus one assignment solve."""
+    scores, _ = build_score_matrix(
+        task_tools=[t["tool"] for t in tasks],
+        worker_tools=[w["tools"] for w in workers],
+        weights=WEIGHTS,
+        success=np.array([w["success"] for w in workers]),
+        load=np.array([w["load"] for w in workers]),
+        latency=np.array([w["latency"] for w in workers]),
+        cost=np.array([COST_SCORE[t["tool"]] for t in tasks]),
+    )
+    return solver(scores, capacity, [t["priority"] for t in tasks]), scores
+
+
+def summarize(name, assignment, scores, tasks, elapsed):
+    placed = assignment >= 0
+    rows = np.flatnonzero(placed)
+    total = scores[rows, assignment[rows]].sum()
+    urgent = np.array([t["priority"] >= 9 for t in tasks])
+    print(
+        f"{name:<11}{elapsed * 1000:>10.1f}{placed.sum():>9}{total:>12.1f}"
+        f"{int((urgent & ~placed).sum()):>16}"
+    )
+
+
+def run(num_tasks, num_workers, seed, include_optimal):
+    workers, tasks, capacity = make_fleet(num_tasks, num_workers, seed)
+    print(f"\n{num_tasks} tasks x {num_workers} workers, {sum(capacity)} slots")
+    print(f"{'method':<11}{'cpu ms':>10}{'placed':>9}{'total score':>12}{'urgent unplaced':>16}")
+
+    start = time.process_time()
+    sequential = route_sequential(workers, tasks, capacity)
+    elapsed = time.process_time() - start
+    _, scores = route_batch(workers, tasks, capacity, assign_greedy)
+    summarize("sequential", sequential, scores, tasks, elapsed)
+
+    # Warm up NumPy code paths before timing
+    route_batch(workers[:5], tasks[:5], capacity[:5], assign_greedy)
+
+    solvers = [("greedy", assign_greedy)]
+    if include_optimal:
+        solvers.append(("optimal", assign_optimal))
+    for name, solver in solvers:
+        start = time.process_time()
+        assignment, scores = route_batch(workers, tasks, capacity, solver)
+        summarize(name, assignment, scores, tasks, time.process_time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch routing benchmark")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    run(args.tasks, args.workers, args.seed, include_optimal=False)
+    run(100, 20, args.seed, include_optimal=True)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    main()
@@ -0,0 +1,125 @@
+"""
+Micro-benchmark: per-node state overhead in NodeExecutor.
+
+Runs a linear workflow of N task nodes through NodeExecutor.execute_task
+with a stub MCP bus that returns immediately, so the measured time is the
+executor's own state handling. Each node reads the previous node's output
+through its input mapping, produces an LLM-sized output (a few KB of text
+plus token metadata) and the state is cloned once per node, as a branch or
+checkpoint would.
+
+Cases:
+- legacy: the previous behaviour; inputs resolved from state.to_dict()
+  rebuilt per node, clone() deep-copies every output
+- cow: copy-on-write state; per-key input lookups, O(1) clone()
+
+The "last 10%" column shows the cost of the final nodes, which is where
+overhead that grows with executed history shows up.
+
+Usage:
+    python benchmarks/bench_workflow_state.py [--sizes 10 100 1000] [--output-kb 4]
+"""
+
+import argparse
+import asyncio
+import copy
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp import ToolResult, ToolResultStatus
+from src.workflows.executor import NodeExecutor
+from src.workflows.nodes import TaskNode
+from src.workflows.state import WorkflowState
+
+
+class LegacyWorkflowState(WorkflowState):
+    """WorkflowState with the previous copy-everything behaviour"""
+
+    def view(self, **extra):
+        data = self.to_dict()
+        data.update(self.input)
+        data.update(self.outputs)
+        data.update(extra)
+        return data
+
+    def clone(self):
+        return LegacyWorkflowState(
+            input=copy.deepcopy(self.input.to_dict()),
+            outputs=copy.deepcopy(self.outputs.to_dict()),
+            current_node=self.current_node,
+            completed_nodes=self.completed_nodes.copy(),
+            failed_nodes=self.failed_nodes.copy(),
+            parallel_branches={k: v.copy() for k, v in self.parallel_branches.items()},
+            parallel_results=copy.deepcopy({k: v.to_dict() for k, v in self.parallel_results.items()}),
+            loop_iterations=self.loop_iterations.copy(),
+            pending_reviews=self.pending_reviews.copy(),
+            errors=copy.deepcopy(self.errors),
+            started_at=self.started_at,
+            last_updated=self.last_updated
+        )
+
+
+class StubBus:
+    """MCP bus stand-in returning a fixed LLM-sized result"""
+
+    def __init__(self, output_kb: int):
+        self.text = "x" * (output_kb * 1024)
+
+    async def invoke_tool(self, tool_path, arguments, timeout=None):
+        return ToolResult(
+            tool_path=tool_path,
+            status=ToolResultStatus.SUCCESS,
+            result={"text": self.text, "tokens": list(range(64)), "model": "llama2"}
+        )
+
+
+async def run_case(state_cls, nodes: int, output_kb: int):
+    executor = NodeExecutor.__new__(NodeExecutor)
+    executor._bus = StubBus(output_kb)
+    executor._llm_router = None
+
+    state = state_cls(input={"topic": "benchmark"})
+    timings = []
+    previous = "topic"
+    for i in range(nodes):
+        node = TaskNode(
+            id=f"n{i}",
+            name=f"node {i}",
+            tool_path="ollama.generate",
+            input_mapping={previous: "prompt"},
+            output_key=f"out_{i}",
+            max_retries=0
+        )
+        start = time.perf_counter()
+        await executor.execute_task(node, state)
+        state = state.clone()
+        timings.append(time.perf_counter() - start)
+        previous = f"out_{i}"
+
+    tail = timings[-max(1, nodes // 10):]
+    return statistics.mean(timings) * 1e6, statistics.mean(tail) * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Workflow state per-node overhead")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--output-kb", type=int, default=4, help="Text size of each node output")
+    args = parser.parse_args()
+
+    print(f"output={args.output_kb}KB per node, one clone() per node")
+    print(f"{'nodes':>6}  {'case':<8}{'mean us/node':>14}{'last 10% us':>14}")
+    for nodes in args.sizes:
+        for name, state_cls in (("legacy", LegacyWorkflowState), ("cow", WorkflowState)):
+            mean_us, tail_us = await run_case(state_cls, nodes, args.output_kb)
+            print(f"{nodes:>6}  {name:<8}{mean_us:>14.1f}{tail_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main())
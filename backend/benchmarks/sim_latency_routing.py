@@ -0,0 +1,162 @@
+"""
+Simulation: status-based latency scoring vs the online latency model.
+
+Replays one synthetic trace (Poisson arrivals, per-tool lognormal service
+times) on a heterogeneous fleet where each worker runs each of its tools at
+its own speed. Tasks are dispatched on arrival to one worker's FIFO queue:
+
+- static: the router's previous behaviour; latency and load come from the
+  worker status only (idle beats busy, ties broken at random)
+- model: the load and latency factors IntelligentRouter now computes, with a
+  LatencyModel fed from the simulated completions (queue wait + p50
+  service time); falls back to the static score until a pair has samples
+
+Reports turnaround (arrival to completion) percentiles per policy and the
+model's p50 error against each pair's true median.
+
+Usage:
+    python benchmarks/sim_latency_routing.py [--tasks 5000] [--workers 24] [--load 0.8] [--seed 7]
+"""
+
+import argparse
+import heapq
+import logging
+import math
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.latency_model import LatencyModel
+
+# Median service time per tool (ms) on a worker of speed 1.0
+TOOL_MEDIAN_MS = {"claude_code": 40_000, "gemini_cli": 25_000, "ollama": 60_000, "codex_cli": 35_000}
+SERVICE_SIGMA = 0.5
+
+
+def make_fleet(num_workers: int, seed: int):
+    """Workers with 1-3 tools and a speed multiplier per tool (0.5x-4x)."""
+    rng = random.Random(seed)
+    tools = list(TOOL_MEDIAN_MS)
+    fleet = []
+    for _ in range(num_workers):
+        supported = rng.sample(tools, rng.randint(1, 3))
+        fleet.append({tool: math.exp(rng.uniform(math.log(0.5), math.log(4.0))) for tool in supported})
+    return fleet
+
+
+def make_trace(fleet, num_tasks: int, load: float, seed: int):
+    """(arrival_ms, tool, base_ms) tuples; arrival rate targets the given utilization."""
+    rng = random.Random(seed + 1)
+    tools = sorted({tool for worker in fleet for tool in worker})
+    mean_work = np.mean([
+        TOOL_MEDIAN_MS[tool] * math.exp(SERVICE_SIGMA ** 2 / 2) * np.mean(
+            [w[tool] for w in fleet if tool in w]
+        )
+        for tool in tools
+    ])
+    rate = load * len(fleet) / mean_work
+    trace, now = [], 0.0
+    for _ in range(num_tasks):
+        now += rng.expovariate(rate)
+        tool = rng.choice(tools)
+        trace.append((now, tool, rng.lognormvariate(math.log(TOOL_MEDIAN_MS[tool]), SERVICE_SIGMA)))
+    return trace
+
+
+def static_score(busy: bool) -> float:
+    """Load and latency factors from status alone (RoutingFactors weights)."""
+    load, latency = (0.3, 0.5) if busy else (1.0, 1.0)
+    return 0.20 * load + 0.10 * latency
+
+
+def simulate(fleet, trace, policy: str, seed: int):
+    """
+    Replay the trace under a dispatch policy.
+
+    Returns:
+        Tuple of (turnaround ms per task, LatencyModel or None)
+    """
+    rng = random.Random(seed + 2)
+    model = LatencyModel() if policy == "model" else None
+    free_at = [0.0] * len(fleet)  # time each worker's queue drains
+    queued = [0] * len(fleet)
+    completions = []  # heap of (finish_ms, worker, tool, service_ms)
+    turnaround = []
+
+    for arrival, tool, base_ms in trace:
+        # Deliver completions that happened before this arrival
+        while completions and completions[0][0] <= arrival:
+            _, w, done_tool, service_ms = heapq.heappop(completions)
+            queued[w] -= 1
+            if model is not None:
+                model.record_completion(w, done_tool, service_ms)
+
+        candidates = [w for w, worker in enumerate(fleet) if tool in worker]
+        best, best_score = [], -math.inf
+        for w in candidates:
+            score = None
+            if model is not None:
+                latency = model.latency_score(w, tool)
+                if latency is not None:
+                    score = 0.20 * (0.3 if queued[w] else 1.0) + 0.10 * latency
+            if score is None:
+                score = static_score(queued[w] > 0)
+            if score > best_score + 1e-12:
+                best, best_score = [w], score
+            elif abs(score - best_score) <= 1e-12:
+                best.append(w)
+        w = rng.choice(best)
+
+        service_ms = base_ms * fleet[w][tool]
+        start = max(arrival, free_at[w])
+        free_at[w] = start + service_ms
+        queued[w] += 1
+        if model is not None:
+            model.task_assigned(w, tool)
+        heapq.heappush(completions, (free_at[w], w, tool, service_ms))
+        turnaround.append(free_at[w] - arrival)
+
+    return np.array(turnaround), model
+
+
+def p50_error(fleet, model):
+    """Mean relative error of each sampled pair's p50 against its true median."""
+    errors = []
+    for w, worker in enumerate(fleet):
+        for tool, speed in worker.items():
+            stats = model._pairs.get((w, tool))
+            if stats is not None and stats.count >= model.min_samples:
+                truth = TOOL_MEDIAN_MS[tool] * speed
+                errors.append(abs(stats.p50() - truth) / truth)
+    return float(np.mean(errors)) if errors else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency model routing simulation")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=24)
+    parser.add_argument("--load", type=float, default=0.8, help="Target fleet utilization")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fleet = make_fleet(args.workers, args.seed)
+    trace = make_trace(fleet, args.tasks, args.load, args.seed)
+    print(f"\n{args.tasks} tasks, {args.workers} workers, target load {args.load:.0%}")
+    print(f"{'policy':<8}{'mean s':>10}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}")
+
+    for policy in ("static", "model"):
+        turnaround, model = simulate(fleet, trace, policy, args.seed)
+        p50, p95, p99 = np.percentile(turnaround, [50, 95, 99]) / 1000
+        print(f"{policy:<8}{turnaround.mean() / 1000:>10.1f}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+        if model is not None:
+            print(f"\nmodel p50 error vs true pair median: {p50_error(fleet, model):.1%}")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    main()
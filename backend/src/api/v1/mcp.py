@@ -286,7 +286,8 @@ async def register_tool(server_name: str, tool: Dict[str, Any]):
             name=tool.get("name", ""),
             description=tool.get("description", ""),
             input_schema=tool.get("input_schema", {}),
-            server_name=server_name
+            server_name=server_name,
+            metadata=tool.get("metadata", {})
         )
         await bus.register_tool_manually(server_name, tool_def)
         return {"status": "registered", "tool": tool_def.name}
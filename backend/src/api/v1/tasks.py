@@ -4,11 +4,11 @@ Task Endpoints
 Task CRUD operations and management.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -17,6 +17,8 @@ from src.models.task import Task
 from src.models.user import User
 from src.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
 from src.auth.dependencies import get_current_active_user
+from src.services.deadline_scheduler import resolve_deadline
+from src.tracing import inject_context, start_span
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -65,25 +67,38 @@ async def list_tasks(
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     data: TaskCreate,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Create a new task.
+
+    The task starts a trace (or joins the caller's traceparent header); its
+    context is stored in metadata["trace"] for the worker that runs it.
     """
-    task = Task(
-        user_id=current_user.user_id,
-        description=data.description,
-        tool_preference=data.tool_preference,
-        priority=data.priority,
-        workflow_id=data.workflow_id,
-        task_metadata=data.metadata,
-        status="pending",
-    )
+    with start_span("task.create", carrier=request.headers) as span:
+        metadata = data.metadata
+        trace = inject_context()
+        if trace:
+            metadata = {**(metadata or {}), "trace": trace}
+
+        task = Task(
+            user_id=current_user.user_id,
+            description=data.description,
+            tool_preference=data.tool_preference,
+            priority=data.priority,
+            deadline=resolve_deadline(datetime.now(timezone.utc), data.deadline, data.slo_class),
+            slo_class=data.slo_class,
+            workflow_id=data.workflow_id,
+            task_metadata=metadata,
+            status="pending",
+        )
 
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
+        db.add(task)
+        await db.commit()
+        await db.refresh(task)
+        span.set_attribute("task.id", str(task.task_id))
 
     logger.info(
         "Task created",
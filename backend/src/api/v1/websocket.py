@@ -6,18 +6,23 @@ Handles real-time communication between backend and workers.
 
 import asyncio
 import json
+import time
 from datetime import datetime
 from typing import Dict, Optional, Any
 from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 
 from src.database import get_db, AsyncSessionLocal
 from src.models.worker import Worker
 from src.models.task import Task
 from src.logging_config import get_logger
+from src.services.latency_model import get_latency_model, service_time_ms
+from src.services.outbox_sequences import get_outbox_tracker
+from src.metrics import WEBSOCKET_CONNECTIONS, WEBSOCKET_SEND_DURATION, WEBSOCKET_SENDS_IN_FLIGHT
+from src.tracing import inject_context, start_span
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -59,6 +64,7 @@ class ConnectionManager:
                     pass
 
             self.active_connections[worker_id] = websocket
+            WEBSOCKET_CONNECTIONS.set(len(self.active_connections))
 
         logger.info(
             "WebSocket connected",
@@ -77,6 +83,8 @@ class ConnectionManager:
         async with self._lock:
             if worker_id in self.active_connections:
                 del self.active_connections[worker_id]
+            WEBSOCKET_CONNECTIONS.set(len(self.active_connections))
+        get_outbox_tracker().forget(worker_id)
 
         logger.info(
             "WebSocket disconnected",
@@ -100,14 +108,33 @@ class ConnectionManager:
             logger.warning("Worker not connected", worker_id=worker_id)
             return False
 
+        with start_span(
+            "websocket.send",
+            {"worker.id": worker_id, "message.type": message.get("type")},
+        ) as span:
+            trace = inject_context()
+            if trace:
+                message = {**message, "trace": trace}
+
+            try:
+                await self._send(websocket, message, "unicast")
+                logger.debug("Message sent to worker", worker_id=worker_id, message_type=message.get("type"))
+                return True
+            except Exception as e:
+                logger.error("Failed to send message", worker_id=worker_id, error=str(e))
+                span.record_exception(e)
+                await self.disconnect(worker_id)
+                return False
+
+    async def _send(self, websocket: WebSocket, message: dict, kind: str) -> None:
+        """Write a message, tracking sends in flight and write latency."""
+        WEBSOCKET_SENDS_IN_FLIGHT.inc()
+        start = time.perf_counter()
         try:
             await websocket.send_json(message)
-            logger.debug("Message sent to worker", worker_id=worker_id, message_type=message.get("type"))
-            return True
-        except Exception as e:
-            logger.error("Failed to send message", worker_id=worker_id, error=str(e))
-            await self.disconnect(worker_id)
-            return False
+        finally:
+            WEBSOCKET_SENDS_IN_FLIGHT.dec()
+            WEBSOCKET_SEND_DURATION.labels(kind).observe(time.perf_counter() - start)
 
     async def broadcast(self, message: dict, exclude: Optional[list] = None) -> int:
         """
@@ -129,7 +156,7 @@ class ConnectionManager:
                 continue
 
             try:
-                await websocket.send_json(message)
+                await self._send(websocket, message, "broadcast")
                 sent_count += 1
             except Exception as e:
                 logger.error("Broadcast failed for worker", worker_id=worker_id, error=str(e))
@@ -286,6 +313,95 @@ async def handle_message(worker_id: str, message: dict, websocket: WebSocket) ->
     """
     Handle incoming messages from workers.
 
+    Messages carrying an outbox sequence (``seq`` + ``stream``) are
+    deduplicated and acknowledged; ``batch`` frames replay many of them
+    at once and are acknowledged with a single cumulative ack. The ack
+    never passes a gap, so the worker keeps replaying what is missing.
+
+    Args:
+        worker_id: The worker's UUID as string
+        message: The received message dictionary
+        websocket: The WebSocket connection
+    """
+    if message.get("type") == "batch":
+        await handle_batch(worker_id, message, websocket)
+        return
+
+    seq = message.get("seq")
+    stream = message.get("stream")
+    if seq is None or stream is None:
+        await dispatch_message(worker_id, message, websocket)
+        return
+
+    tracker = get_outbox_tracker()
+    if not await tracker.is_duplicate(worker_id, stream, seq):
+        await dispatch_message(worker_id, message, websocket)
+        tracker.mark_processed(worker_id, stream, seq)
+        await tracker.persist(worker_id, stream)
+    await send_ack(websocket, stream, tracker.acked(worker_id, stream))
+
+
+async def handle_batch(worker_id: str, message: dict, websocket: WebSocket) -> None:
+    """Handle a batch of replayed outbox messages from a worker."""
+    stream = message.get("stream")
+    messages = message.get("messages", [])
+
+    if not stream:
+        logger.warning("Batch without stream id", worker_id=worker_id)
+        return
+
+    tracker = get_outbox_tracker()
+    skipped = 0
+    processed = 0
+    for item in messages:
+        seq = item.get("seq")
+        if seq is None:
+            continue
+        if await tracker.is_duplicate(worker_id, stream, seq):
+            skipped += 1
+            continue
+        try:
+            await dispatch_message(worker_id, item, websocket)
+        except Exception as e:
+            # Stop at the first failure so the worker replays from here
+            logger.error(
+                "Failed to process replayed message",
+                worker_id=worker_id,
+                seq=seq,
+                error=str(e),
+            )
+            break
+        tracker.mark_processed(worker_id, stream, seq)
+        processed += 1
+
+    if processed:
+        await tracker.persist(worker_id, stream)
+
+    logger.info(
+        "Outbox batch processed",
+        worker_id=worker_id,
+        count=len(messages),
+        duplicates=skipped,
+    )
+
+    last_seq = tracker.acked(worker_id, stream)
+    if last_seq is not None:
+        await send_ack(websocket, stream, last_seq)
+
+
+async def send_ack(websocket: WebSocket, stream: str, seq: int) -> None:
+    """Send a cumulative outbox acknowledgement to a worker."""
+    await websocket.send_json({
+        "type": "ack",
+        "data": {"stream": stream, "seq": seq},
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+
+
+async def dispatch_message(worker_id: str, message: dict, websocket: WebSocket) -> None:
+    """
+    Route a single worker message to its handler.
+
     Args:
         worker_id: The worker's UUID as string
         message: The received message dictionary
@@ -375,8 +491,9 @@ async def handle_task_progress(worker_id: str, data: dict) -> None:
 
     try:
         task_uuid = UUID(task_id)
+        worker_uuid = UUID(worker_id)
     except ValueError:
-        logger.warning("Invalid task_id format", worker_id=worker_id, task_id=task_id)
+        logger.warning("Invalid UUID format", worker_id=worker_id, task_id=task_id)
         return
 
     async with AsyncSessionLocal() as db:
@@ -386,10 +503,42 @@ async def handle_task_progress(worker_id: str, data: dict) -> None:
         task = result.scalar_one_or_none()
 
         if task:
-            task.progress = min(100, max(0, progress))
+            if task.worker_id != worker_uuid:
+                # Task was moved to another worker (work stealing)
+                logger.info(
+                    "Progress from worker no longer assigned to task",
+                    task_id=task_id,
+                    worker_id=worker_id,
+                )
+                await send_task_cancel(worker_id, task_id, reason="Task was reassigned")
+                return
+
+            progress = min(100, max(0, progress))
             if task.status == "assigned":
-                task.status = "running"
-            await db.commit()
+                # Start claim: compare-and-swap so a concurrent steal and the
+                # start cannot both win
+                claimed = await db.execute(
+                    update(Task)
+                    .where(
+                        Task.task_id == task_uuid,
+                        Task.worker_id == worker_uuid,
+                        Task.status == "assigned",
+                        Task.version == task.version,
+                    )
+                    .values(
+                        status="running",
+                        progress=progress,
+                        started_at=func.now(),
+                        version=Task.version + 1,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount != 1:
+                    await send_task_cancel(worker_id, task_id, reason="Task was reassigned")
+                    return
+            else:
+                task.progress = progress
+                await db.commit()
 
             logger.debug(
                 "Task progress updated",
@@ -440,6 +589,13 @@ async def handle_task_result(worker_id: str, data: dict) -> None:
 
             await db.commit()
 
+            get_latency_model().record_completion(
+                worker_uuid,
+                task.tool_preference,
+                service_time_ms(data.get("execution_time_ms"), task.started_at, task.completed_at),
+                task_id=task_uuid,
+            )
+
             logger.info(
                 "Task completed via WebSocket",
                 task_id=task_id,
@@ -488,6 +644,10 @@ async def handle_task_failed(worker_id: str, data: dict) -> None:
 
             await db.commit()
 
+            get_latency_model().record_completion(
+                worker_uuid, task.tool_preference, None, success=False, task_id=task_uuid
+            )
+
             logger.info(
                 "Task failed via WebSocket",
                 task_id=task_id,
@@ -539,22 +699,75 @@ async def handle_register(worker_id: str, data: dict, websocket: WebSocket) -> N
 
 # Helper functions for external use
 
-async def send_task_to_worker(worker_id: str, task: dict) -> bool:
+async def send_task_to_worker(worker_id: str, task: dict, track_latency: bool = True) -> bool:
     """
     Send a task assignment to a worker via WebSocket.
 
+    A delivered assignment counts as outstanding work for the worker in
+    the latency model, like a task handed out by pull_task.
+
     Args:
         worker_id: The worker's UUID as string
         task: Task data dictionary
+        track_latency: Record the assignment in the latency model (off
+            when the caller already accounts for it)
 
     Returns:
         True if task was sent successfully
     """
-    return await manager.send_to_worker(worker_id, {
+    sent = await manager.send_to_worker(worker_id, {
         "type": "task_assignment",
         "data": task,
         "timestamp": datetime.utcnow().isoformat(),
     })
+    if sent and track_latency:
+        get_latency_model().task_assigned(
+            UUID(worker_id), task.get("tool_preference"), task_id=task.get("task_id")
+        )
+    return sent
+
+
+async def send_model_prewarm(worker_id: str, models: list, tool: str = "ollama") -> bool:
+    """
+    Hint a worker to load models needed by tasks queued for it.
+
+    Workers load the models in the background; workers without the tool,
+    or not connected over WebSocket, simply miss the hint.
+
+    Args:
+        worker_id: The worker's UUID as string
+        models: Model names, most urgent first
+        tool: Tool the models belong to
+
+    Returns:
+        True if the hint was sent
+    """
+    if not manager.is_connected(worker_id):
+        return False
+    return await manager.send_to_worker(worker_id, {
+        "type": "model_prewarm",
+        "data": {"tool": tool, "models": models},
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+
+
+async def send_task_cancel(worker_id: str, task_id: str, reason: str) -> bool:
+    """
+    Ask a worker to stop executing a task.
+
+    Args:
+        worker_id: The worker's UUID as string
+        task_id: The task's UUID as string
+        reason: Cancellation reason
+
+    Returns:
+        True if the request was sent successfully
+    """
+    return await manager.send_to_worker(worker_id, {
+        "type": "task_cancel",
+        "data": {"subtask_id": task_id, "reason": reason},
+        "timestamp": datetime.utcnow().isoformat(),
+    })
 
 
 async def broadcast_notification(notification: dict, exclude: Optional[list] = None) -> int:
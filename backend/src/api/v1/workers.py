@@ -4,13 +4,13 @@ Worker Endpoints
 Worker registration, heartbeat, and management.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 
 from src.database import get_db
 from src.models.worker import Worker
@@ -25,15 +25,27 @@ from src.schemas.worker import (
     WorkerTaskAssignment,
     TaskCompleteRequest,
     TaskFailedRequest,
+    TaskProgressReport,
     TaskResultReport,
     TaskResultResponse,
 )
+from src.api.v1.websocket import send_model_prewarm
 from src.auth.dependencies import get_current_active_user, get_optional_user
+from src.metrics import PULL_TASK_DURATION, time_async
+from src.services.deadline_scheduler import order_edf
+from src.services.latency_model import get_latency_model, service_time_ms
+from src.tracing import PHASE_ATTRIBUTE, record_span
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Pending tasks considered per pull when ordering by deadline and slack
+PULL_CANDIDATES = 20
+
+# Models of queued Ollama tasks hinted to the puller per pull
+PREWARM_MODELS = 2
+
 
 @router.get("", response_model=WorkerListResponse)
 async def list_workers(
@@ -197,7 +209,8 @@ async def worker_heartbeat(
     worker.disk_percent = data.disk_percent
     worker.last_heartbeat = datetime.utcnow()
 
-    if data.tools:
+    # An empty list is meaningful: every tool is currently unhealthy
+    if data.tools is not None:
         worker.tools = data.tools
 
     await db.commit()
@@ -206,7 +219,38 @@ async def worker_heartbeat(
     return worker
 
 
+def _record_queue_wait(task: Task, worker_id: UUID) -> None:
+    """Record the time a traced task spent pending as a queue span."""
+    trace = (task.task_metadata or {}).get("trace")
+    if not trace or task.created_at is None:
+        return
+    record_span(
+        "task.queued",
+        task.created_at,
+        datetime.now(timezone.utc),
+        carrier=trace,
+        attributes={
+            "task.id": str(task.task_id),
+            "worker.id": str(worker_id),
+            PHASE_ATTRIBUTE: "queue",
+        },
+    )
+
+
+def _queued_models(tasks: list, limit: int = PREWARM_MODELS) -> list:
+    """Ollama models named by queued tasks, in queue order, without duplicates."""
+    models = []
+    for task in tasks:
+        model = (task.task_metadata or {}).get("model")
+        if task.tool_preference == "ollama" and model and model not in models:
+            models.append(model)
+            if len(models) == limit:
+                break
+    return models
+
+
 @router.get("/{worker_id}/pull-task", response_model=Optional[WorkerTaskAssignment])
+@time_async(PULL_TASK_DURATION)
 async def pull_task(
     worker_id: UUID,
     db: AsyncSession = Depends(get_db),
@@ -225,6 +269,24 @@ async def pull_task(
             detail="Worker not found",
         )
 
+    # Tasks already bound to this worker (e.g. stolen for it) come first
+    result = await db.execute(
+        select(Task)
+        .where(Task.worker_id == worker_id, Task.status == "assigned")
+        .order_by(Task.priority.desc(), Task.updated_at.asc())
+        .limit(1)
+    )
+    task = result.scalar_one_or_none()
+    if task:
+        return WorkerTaskAssignment(
+            task_id=task.task_id,
+            description=task.description,
+            tool_preference=task.tool_preference,
+            priority=task.priority,
+            workflow_id=task.workflow_id,
+            metadata=task.task_metadata,
+        )
+
     if not worker.is_available():
         return None
 
@@ -234,20 +296,28 @@ async def pull_task(
         Task.worker_id.is_(None),
     )
 
-    # Filter by tool preference if worker has tools
-    if worker.tools:
+    # Filter by tool preference if worker advertises tools (an empty list
+    # means none is healthy right now: only tool-agnostic tasks match)
+    if worker.tools is not None:
         query = query.where(
             (Task.tool_preference.is_(None)) |
             (Task.tool_preference.in_(worker.tools))
         )
 
-    query = query.order_by(Task.priority.desc(), Task.created_at.asc()).limit(1)
+    # Earliest deadline first within priority; tasks that can no longer meet
+    # their deadline go behind feasible ones of the same priority
+    query = query.order_by(
+        Task.priority.desc(),
+        Task.deadline.asc().nulls_last(),
+        Task.created_at.asc(),
+    ).limit(PULL_CANDIDATES)
 
     result = await db.execute(query)
-    task = result.scalar_one_or_none()
+    candidates = order_edf(result.scalars().all())
 
-    if not task:
+    if not candidates:
         return None
+    task = candidates[0]
 
     # Assign task to worker
     task.worker_id = worker_id
@@ -257,6 +327,14 @@ async def pull_task(
     await db.commit()
     await db.refresh(task)
 
+    get_latency_model().task_assigned(worker_id, task.tool_preference, task_id=task.task_id)
+    _record_queue_wait(task, worker_id)
+
+    # Let the worker load the models its next pulls will likely need
+    models = _queued_models(candidates[1:])
+    if models:
+        await send_model_prewarm(str(worker_id), models)
+
     logger.info(
         "Task pulled",
         task_id=str(task.task_id),
@@ -273,6 +351,71 @@ async def pull_task(
     )
 
 
+@router.post("/{worker_id}/tasks/{task_id}/progress")
+async def report_task_progress(
+    worker_id: UUID,
+    task_id: UUID,
+    data: TaskProgressReport,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Report task progress from worker.
+
+    The first report starts the task (assigned -> running) with a
+    compare-and-swap on Task.version, so a task that was meanwhile moved to
+    another worker is rejected with 409 and the worker should abandon it.
+    """
+    result_task = await db.execute(
+        select(Task).where(Task.task_id == task_id)
+    )
+    task = result_task.scalar_one_or_none()
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    if task.worker_id != worker_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task was reassigned to another worker",
+        )
+
+    if task.status == "assigned":
+        claimed = await db.execute(
+            update(Task)
+            .where(
+                Task.task_id == task_id,
+                Task.worker_id == worker_id,
+                Task.status == "assigned",
+                Task.version == task.version,
+            )
+            .values(
+                status="running",
+                progress=data.progress,
+                started_at=func.now(),
+                version=Task.version + 1,
+            )
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Task was reassigned to another worker",
+            )
+    elif task.status == "running":
+        task.progress = data.progress
+        await db.commit()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Task is not in progress: {task.status}",
+        )
+
+    return {"status": "success"}
+
+
 @router.post("/{worker_id}/task-complete")
 async def complete_task(
     worker_id: UUID,
@@ -319,6 +462,13 @@ async def complete_task(
 
     await db.commit()
 
+    get_latency_model().record_completion(
+        worker_id,
+        task.tool_preference,
+        service_time_ms(data.execution_time_ms, task.started_at, task.completed_at),
+        task_id=task.task_id,
+    )
+
     logger.info(
         "Task completed",
         task_id=str(data.task_id),
@@ -373,6 +523,10 @@ async def fail_task(
 
     await db.commit()
 
+    get_latency_model().record_completion(
+        worker_id, task.tool_preference, None, success=False, task_id=task.task_id
+    )
+
     logger.info(
         "Task failed",
         task_id=str(data.task_id),
@@ -464,6 +618,14 @@ async def report_task_result(
 
     await db.commit()
 
+    get_latency_model().record_completion(
+        worker_id,
+        task.tool_preference,
+        data.execution_time_ms,
+        success=data.status == "completed",
+        task_id=task.task_id,
+    )
+
     logger.info(
         "Task result reported",
         task_id=str(data.task_id),
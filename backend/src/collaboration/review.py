@@ -6,24 +6,33 @@ that require human intervention (HumanReviewNode).
 
 Features:
 - Review request creation and management
-- Review queue with filtering
+- Review queue with indexed filtering and pagination
 - Decision processing with modification support
-- Notification hooks for various channels
+- Expiry index with a background sweeper
+- Bounded requests; the full state snapshot is stored compressed and
+  loaded only when a reviewer opens the request
+- Notification hooks for various channels (pooled, concurrent, retried)
 """
 
+import asyncio
+import base64
 import json
 import logging
+import zlib
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
 
 from src.config import settings
+from src.metrics import instrument_redis
 
 logger = logging.getLogger(__name__)
 
@@ -98,8 +107,11 @@ class ReviewRequest(BaseModel):
     instructions: str = ""
     required_fields: List[str] = Field(default_factory=list)
 
-    # State snapshot (data to review)
+    # State snapshot (data to review). Stored requests keep only the summary
+    # and a reference; the full snapshot is loaded on demand.
     state_snapshot: Dict[str, Any] = Field(default_factory=dict)
+    snapshot_key: Optional[str] = None
+    snapshot_size: int = 0  # Bytes of uncompressed snapshot JSON
     context_summary: str = ""
 
     # Assignment
@@ -200,6 +212,10 @@ class NotificationHandler(ABC):
         """
         pass
 
+    async def close(self) -> None:
+        """Release pooled resources (connections, pending batches)."""
+        pass
+
 
 class EmailNotificationHandler(NotificationHandler):
     """Email notification handler (placeholder implementation)."""
@@ -222,10 +238,58 @@ class EmailNotificationHandler(NotificationHandler):
 
 
 class WebhookNotificationHandler(NotificationHandler):
-    """Webhook notification handler."""
+    """
+    Webhook notification handler.
 
-    def __init__(self, default_url: Optional[str] = None):
+    All webhooks go through one pooled HTTP session, so repeated deliveries
+    to an endpoint reuse its keep-alive connection. With a batch window,
+    notifications for the same URL that arrive within the window are
+    coalesced into one POST of ``{"notifications": [...]}``.
+    """
+
+    def __init__(
+        self,
+        default_url: Optional[str] = None,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        batch_window: float = 0.0,
+        max_batch_size: int = 50
+    ):
+        """
+        Initialize handler.
+
+        Args:
+            default_url: URL used when the recipient is empty
+            timeout: Request timeout in seconds
+            max_connections: Pool size across all endpoints
+            max_connections_per_host: Pool size per endpoint
+            batch_window: Seconds to coalesce notifications per URL (0 = no batching)
+            max_batch_size: Notifications per POST before a batch is flushed early
+        """
         self.default_url = default_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._session = None
+        self._batches: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    def _get_session(self):
+        """Shared session, created on first use."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
 
     async def send(
         self,
@@ -236,8 +300,6 @@ class WebhookNotificationHandler(NotificationHandler):
         metadata: Dict[str, Any]
     ) -> bool:
         """Send webhook notification."""
-        import aiohttp
-
         url = recipient or self.default_url
         if not url:
             logger.warning("No webhook URL configured")
@@ -251,19 +313,66 @@ class WebhookNotificationHandler(NotificationHandler):
             **metadata
         }
 
+        if self.batch_window <= 0:
+            return await self._post(url, payload)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._batches.setdefault(url, [])
+        batch.append((payload, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(url)
+        elif len(batch) == 1:
+            loop.call_later(self.batch_window, self._flush, url)
+        return await future
+
+    def _flush(self, url: str) -> None:
+        """Send the pending batch for a URL in the background."""
+        batch = self._batches.pop(url, None)
+        if not batch:
+            return
+        task = asyncio.create_task(self._post_batch(url, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _post_batch(
+        self,
+        url: str,
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        """POST a batch and resolve each caller with the shared outcome."""
+        if len(batch) == 1:
+            sent = await self._post(url, batch[0][0])
+        else:
+            sent = await self._post(url, {"notifications": [payload for payload, _ in batch]})
+        for _, future in batch:
+            if not future.done():
+                future.set_result(sent)
+
+    async def _post(self, url: str, payload: Dict[str, Any]) -> bool:
+        """POST one payload over the pooled session."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=10) as response:
-                    if response.status < 300:
-                        logger.info(f"Webhook sent to {url}")
-                        return True
-                    else:
-                        logger.warning(f"Webhook failed: {response.status}")
-                        return False
+            async with self._get_session().post(url, json=payload) as response:
+                if response.status < 300:
+                    logger.info(f"Webhook sent to {url}")
+                    return True
+                else:
+                    logger.warning(f"Webhook failed: {response.status}")
+                    return False
         except Exception as e:
             logger.error(f"Webhook error: {e}")
             return False
 
+    async def close(self) -> None:
+        """Flush pending batches and close the pooled session."""
+        for url in list(self._batches):
+            self._flush(url)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
 
 class WebSocketNotificationHandler(NotificationHandler):
     """WebSocket notification handler for real-time updates."""
@@ -302,19 +411,59 @@ class WebSocketNotificationHandler(NotificationHandler):
             return False
 
 
+@dataclass
+class NotificationDelivery:
+    """A queued notification for one recipient."""
+    recipient: str
+    subject: str
+    body: str
+    urgency: Urgency
+    metadata: Dict[str, Any]
+    attempt: int = 0
+
+
 class NotificationService:
     """
     Service for sending notifications through various channels.
 
     Supports multiple notification handlers (email, webhook, websocket, etc.)
     with configurable routing based on urgency and user preferences.
+
+    Recipients are notified concurrently (bounded by max_concurrency).
+    Failed deliveries are retried with exponential backoff from an async
+    delivery queue; callers that pass ``wait=False`` hand the whole fan-out
+    to that queue and return immediately.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        queue_size: int = 10000
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            max_concurrency: Deliveries in flight at once
+            max_attempts: Attempts per recipient before giving up
+            retry_delay: Delay before the first retry (doubles per attempt)
+            queue_size: Queued deliveries before new ones are dropped
+        """
         self._handlers: Dict[NotificationType, NotificationHandler] = {}
         self._user_preferences: Dict[str, List[NotificationType]] = {}
         self._default_channels: List[NotificationType] = [NotificationType.WEBSOCKET]
 
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._workers: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+        self._in_flight = 0
+
     def register_handler(
         self,
         notification_type: NotificationType,
@@ -339,7 +488,8 @@ class NotificationService:
     async def notify_review_created(
         self,
         request: ReviewRequest,
-        recipients: Optional[List[str]] = None
+        recipients: Optional[List[str]] = None,
+        wait: bool = True
     ) -> Dict[str, bool]:
         """
         Send notification when a review request is created.
@@ -347,9 +497,10 @@ class NotificationService:
         Args:
             request: The review request
             recipients: List of recipient identifiers (user IDs or addresses)
+            wait: Deliver now; False queues delivery and returns immediately
 
         Returns:
-            Dict mapping recipient to success status
+            Dict mapping recipient to success status (empty when queued)
         """
         subject = f"[{request.urgency.value.upper()}] Review Required: {request.node_name or request.node_id}"
         body = self._format_review_notification(request)
@@ -363,15 +514,17 @@ class NotificationService:
                 "request_id": request.request_id,
                 "workflow_id": str(request.workflow_id),
                 "review_type": request.review_type.value
-            }
+            },
+            wait=wait
         )
 
     async def notify_review_assigned(
         self,
         request: ReviewRequest,
-        assignee_id: str
+        assignee_id: str,
+        wait: bool = True
     ) -> bool:
-        """Notify a user that a review has been assigned to them."""
+        """Notify a user that a review has been assigned to them (False when queued)."""
         subject = f"Review Assigned: {request.node_name or request.node_id}"
         body = f"You have been assigned to review:\n\n{request.instructions}"
 
@@ -380,7 +533,8 @@ class NotificationService:
             subject,
             body,
             request.urgency,
-            {"request_id": request.request_id}
+            {"request_id": request.request_id},
+            wait=wait
         )
         return results.get(assignee_id, False)
 
@@ -388,7 +542,8 @@ class NotificationService:
         self,
         request: ReviewRequest,
         decision: ReviewDecision,
-        recipients: Optional[List[str]] = None
+        recipients: Optional[List[str]] = None,
+        wait: bool = True
     ) -> Dict[str, bool]:
         """Notify that a review has been completed."""
         subject = f"Review {decision.decision_type.value.title()}: {request.node_name or request.node_id}"
@@ -402,13 +557,15 @@ class NotificationService:
             {
                 "request_id": request.request_id,
                 "decision_type": decision.decision_type.value
-            }
+            },
+            wait=wait
         )
 
     async def notify_review_expired(
         self,
         request: ReviewRequest,
-        recipients: Optional[List[str]] = None
+        recipients: Optional[List[str]] = None,
+        wait: bool = True
     ) -> Dict[str, bool]:
         """Notify that a review has expired."""
         subject = f"Review Expired: {request.node_name or request.node_id}"
@@ -419,7 +576,8 @@ class NotificationService:
             subject,
             body,
             Urgency.HIGH,
-            {"request_id": request.request_id}
+            {"request_id": request.request_id},
+            wait=wait
         )
 
     def _format_review_notification(self, request: ReviewRequest) -> str:
@@ -449,30 +607,144 @@ class NotificationService:
         subject: str,
         body: str,
         urgency: Urgency,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        wait: bool = True
     ) -> Dict[str, bool]:
-        """Send notifications to multiple recipients."""
-        results = {}
-
-        for recipient in recipients:
-            # Get user's preferred channels or use defaults
-            channels = self._user_preferences.get(recipient, self._default_channels)
-
-            # Try each channel until one succeeds
-            sent = False
-            for channel in channels:
-                handler = self._handlers.get(channel)
-                if handler:
-                    try:
-                        sent = await handler.send(recipient, subject, body, urgency, metadata)
-                        if sent:
-                            break
-                    except Exception as e:
-                        logger.error(f"Notification error ({channel}): {e}")
-
-            results[recipient] = sent
+        """
+        Send notifications to multiple recipients concurrently.
 
-        return results
+        Recipients whose first attempt fails are queued for retry.
+
+        Returns:
+            Dict mapping recipient to first-attempt success (empty when queued)
+        """
+        deliveries = [
+            NotificationDelivery(recipient, subject, body, urgency, metadata)
+            for recipient in dict.fromkeys(recipients)
+        ]
+
+        if not wait:
+            for delivery in deliveries:
+                self._enqueue(delivery)
+            return {}
+
+        sent = await asyncio.gather(*(self._attempt(delivery) for delivery in deliveries))
+        return {delivery.recipient: ok for delivery, ok in zip(deliveries, sent)}
+
+    async def _deliver(self, delivery: NotificationDelivery) -> bool:
+        """Try the recipient's channels in order until one succeeds."""
+        # Get user's preferred channels or use defaults
+        channels = self._user_preferences.get(delivery.recipient, self._default_channels)
+
+        for channel in channels:
+            handler = self._handlers.get(channel)
+            if handler:
+                try:
+                    if await handler.send(
+                        delivery.recipient,
+                        delivery.subject,
+                        delivery.body,
+                        delivery.urgency,
+                        delivery.metadata
+                    ):
+                        return True
+                except Exception as e:
+                    logger.error(f"Notification error ({channel}): {e}")
+
+        return False
+
+    async def _attempt(self, delivery: NotificationDelivery) -> bool:
+        """One bounded delivery attempt; schedules a retry on failure."""
+        async with self._semaphore:
+            sent = await self._deliver(delivery)
+
+        delivery.attempt += 1
+        if not sent:
+            if delivery.attempt < self.max_attempts:
+                delay = self.retry_delay * 2 ** (delivery.attempt - 1)
+                retry = asyncio.create_task(self._retry_later(delivery, delay))
+                self._retries.add(retry)
+                retry.add_done_callback(self._retries.discard)
+            else:
+                logger.warning(
+                    f"Giving up on notification to {delivery.recipient} "
+                    f"after {delivery.attempt} attempts"
+                )
+        return sent
+
+    async def _retry_later(self, delivery: NotificationDelivery, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._enqueue(delivery)
+
+    def _enqueue(self, delivery: NotificationDelivery) -> None:
+        """Queue a delivery for the background workers."""
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(delivery)
+        except asyncio.QueueFull:
+            logger.error(f"Notification queue full; dropping notification to {delivery.recipient}")
+
+    def _ensure_workers(self) -> None:
+        """Start the delivery workers on first use."""
+        self._workers = [w for w in self._workers if not w.done()]
+        for _ in range(self.max_concurrency - len(self._workers)):
+            self._workers.append(asyncio.create_task(self._run_worker()))
+
+    async def _run_worker(self) -> None:
+        while True:
+            delivery = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._attempt(delivery)
+            except Exception as e:
+                logger.error(f"Notification delivery failed: {e}")
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _drain(self) -> None:
+        """Wait until the queue is empty and no retry is pending."""
+        while True:
+            await self._queue.join()
+            if not self._retries:
+                return
+            await asyncio.wait(list(self._retries))
+
+    async def close(self, drain_timeout: float = 5.0) -> None:
+        """
+        Stop the delivery workers and release handler resources.
+
+        Queued deliveries and pending retries get up to drain_timeout
+        seconds to go out first; whatever is left is dropped and logged.
+        """
+        if self._workers or self._retries:
+            try:
+                await asyncio.wait_for(self._drain(), drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        dropped = self._in_flight + len(self._retries)
+        tasks = [*self._retries, *self._workers]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._retries.clear()
+        self._workers = []
+
+        recipients = []
+        while not self._queue.empty():
+            recipients.append(self._queue.get_nowait().recipient)
+            self._queue.task_done()
+        dropped += len(recipients)
+        if dropped:
+            logger.warning(
+                f"Dropped {dropped} undelivered notifications on shutdown "
+                f"(queued for: {', '.join(recipients) or 'none'})"
+            )
+
+        for handler in self._handlers.values():
+            await handler.close()
 
 
 # ==================== Human Review Manager ====================
@@ -486,6 +758,7 @@ class HumanReviewManager:
     - Managing the review queue
     - Processing review decisions
     - Coordinating notifications
+    - Expiring overdue requests (a background sweeper started by connect())
     """
 
     # Redis key prefixes
@@ -495,15 +768,32 @@ class HumanReviewManager:
     KEY_WORKFLOW_REVIEWS = "review:workflow:{workflow_id}"
     KEY_EVENTS = "review:events:{request_id}"
     KEY_DECISION = "review:decision:{request_id}"
+    KEY_SNAPSHOT = "review:snapshot:{request_id}"
+
+    # Filter indexes over pending requests (sorted sets scored by created_at)
+    KEY_INDEX_STATUS = "review:index:status:{status}"
+    KEY_INDEX_TYPE = "review:index:type:{review_type}"
+    KEY_INDEX_URGENCY = "review:index:urgency:{urgency}"
+    KEY_INDEX_TAG = "review:index:tag:{tag}"
+    KEY_QUERY = "review:query:{token}"
+
+    # Pending requests scored by expires_at
+    KEY_EXPIRY = "review:expiry"
+
+    # Statuses that keep a request in the queues and indexes
+    ACTIVE_STATUSES = (ReviewStatus.PENDING, ReviewStatus.IN_PROGRESS)
 
     # Defaults
     DEFAULT_TTL = 3600 * 24 * 7  # 7 days
+    EXPIRY_MAX_INTERVAL = 30.0  # Longest sweeper sleep between checks (seconds)
+    PAGE_OVERFETCH = 10  # Extra queue entries read per page to skip unswept ones
 
     def __init__(
         self,
         redis_client: Optional[Redis] = None,
         redis_url: str = "redis://localhost:6379",
-        notification_service: Optional[NotificationService] = None
+        notification_service: Optional[NotificationService] = None,
+        expiry_sweeper: bool = True
     ):
         """
         Initialize the review manager.
@@ -512,33 +802,53 @@ class HumanReviewManager:
             redis_client: Existing Redis client or None to create new
             redis_url: Redis connection URL
             notification_service: Optional notification service
+            expiry_sweeper: Start the expiry sweeper on connect(). Disable
+                when another process sweeps, or to call
+                check_expired_reviews() on your own schedule.
         """
         self._redis: Optional[Redis] = redis_client
         self._redis_url = redis_url
         self._connected = False
         self._notification_service = notification_service or NotificationService()
+        self._owns_notification_service = notification_service is None
 
         # Callbacks for workflow integration
         self._on_decision_callbacks: List[Callable] = []
 
+        # Expiry sweeper (woken early when a request is created)
+        self._run_sweeper = expiry_sweeper
+        self._expiry_task: Optional[asyncio.Task] = None
+        self._expiry_wakeup = asyncio.Event()
+
     @property
     def notification_service(self) -> NotificationService:
         """Get the notification service."""
         return self._notification_service
 
     async def connect(self) -> None:
-        """Connect to Redis."""
+        """
+        Connect to Redis.
+
+        Also starts the expiry sweeper unless it was disabled with
+        expiry_sweeper=False; disconnect() stops it.
+        """
         if self._redis is None:
-            self._redis = await redis.from_url(
+            self._redis = instrument_redis(await redis.from_url(
                 self._redis_url,
                 encoding="utf-8",
                 decode_responses=True
-            )
+            ), "review")
         self._connected = True
         logger.info("HumanReviewManager connected to Redis")
 
+        if self._run_sweeper:
+            await self.start_expiry_sweeper()
+
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
+        await self.stop_expiry_sweeper()
+        if self._owns_notification_service:
+            await self._notification_service.close()
         if self._redis:
             await self._redis.close()
             self._redis = None
@@ -555,6 +865,7 @@ class HumanReviewManager:
         Register a callback to be called when a decision is made.
 
         Callback signature: async def callback(request: ReviewRequest, decision: ReviewDecision)
+        The request carries its full state_snapshot.
         """
         self._on_decision_callbacks.append(callback)
 
@@ -625,22 +936,25 @@ class HumanReviewManager:
         # Generate context summary
         request.context_summary = self._generate_context_summary(state)
 
-        # Store in Redis
-        await self._store_request(request)
-
-        # Add to queues
-        await self._add_to_queues(request)
-
-        # Log creation event
-        await self._log_event(
+        # Store, enqueue and log creation in one transaction
+        pipe = self._transaction()
+        self._store_snapshot(pipe, request)
+        self._store_request(pipe, request)
+        self._add_to_queues(pipe, request)
+        self._log_event(
+            pipe,
             request.request_id,
             "created",
             {"workflow_id": str(workflow_id), "node_id": node_id}
         )
+        await pipe.execute()
+        self._expiry_wakeup.set()
 
         # Send notifications
         if notify_recipients:
-            await self._notification_service.notify_review_created(request, notify_recipients)
+            await self._notification_service.notify_review_created(
+                request, notify_recipients, wait=False
+            )
 
         logger.info(
             f"Review request created: {request.request_id} "
@@ -649,12 +963,18 @@ class HumanReviewManager:
 
         return request
 
-    async def get_review_request(self, request_id: str) -> Optional[ReviewRequest]:
+    async def get_review_request(
+        self,
+        request_id: str,
+        include_snapshot: bool = False
+    ) -> Optional[ReviewRequest]:
         """
         Get a review request by ID.
 
         Args:
             request_id: The request ID
+            include_snapshot: Load the full state snapshot (when a reviewer
+                opens the request)
 
         Returns:
             ReviewRequest or None if not found
@@ -664,9 +984,26 @@ class HumanReviewManager:
         key = self.KEY_REQUEST.format(request_id=request_id)
         data = await self._redis.get(key)
 
-        if data:
-            return ReviewRequest.model_validate_json(data)
-        return None
+        if not data:
+            return None
+
+        request = ReviewRequest.model_validate_json(data)
+        if include_snapshot and request.snapshot_key:
+            request.state_snapshot = await self._load_snapshot(request.snapshot_key)
+        return request
+
+    async def get_review_snapshot(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the full workflow state captured for a review.
+
+        Args:
+            request_id: The request ID
+
+        Returns:
+            State snapshot, or None if the request was not found
+        """
+        request = await self.get_review_request(request_id, include_snapshot=True)
+        return request.state_snapshot if request else None
 
     async def get_pending_reviews(
         self,
@@ -676,10 +1013,16 @@ class HumanReviewManager:
         urgency: Optional[Urgency] = None,
         tags: Optional[List[str]] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        status: Optional[ReviewStatus] = None
     ) -> List[ReviewRequest]:
         """
-        Get pending review requests with optional filtering.
+        Get pending review requests with optional filtering, newest first.
+
+        Without filters the queue is paged directly, so the cost follows the
+        page size. Filters are resolved in Redis by intersecting the queue
+        and index sorted sets. Either way, requests that are past expires_at
+        but not swept yet are skipped, so every page is full.
 
         Args:
             user_id: Filter by assigned user
@@ -689,83 +1032,174 @@ class HumanReviewManager:
             tags: Filter by tags (any match)
             limit: Maximum results
             offset: Skip first N results
+            status: Filter by status (default: pending and in progress)
 
         Returns:
             List of pending ReviewRequests
         """
         self._ensure_connected()
 
-        # Get request IDs from appropriate queue
+        if limit <= 0:
+            return []
+
+        # Most specific queue first; every other filter is an index set
         if user_id:
-            queue_key = self.KEY_USER_QUEUE.format(user_id=str(user_id))
+            required = [self.KEY_USER_QUEUE.format(user_id=str(user_id))]
         elif workflow_id:
-            queue_key = self.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(workflow_id))
+            required = [self.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(workflow_id))]
         else:
-            queue_key = self.KEY_QUEUE
+            required = [self.KEY_QUEUE]
+
+        if user_id and workflow_id:
+            required.append(self.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(workflow_id)))
+        if review_type:
+            required.append(self.KEY_INDEX_TYPE.format(review_type=ReviewType(review_type).value))
+        if urgency:
+            required.append(self.KEY_INDEX_URGENCY.format(urgency=Urgency(urgency).value))
+
+        # Queues only hold active requests: page one directly
+        if len(required) == 1 and not status and not tags:
+            return await self._page_queue(required[0], offset, limit)
+
+        # Each group is a union a request must be in at least one set of
+        if status:
+            statuses = [ReviewStatus(status)]
+        else:
+            statuses = list(self.ACTIVE_STATUSES)
+        any_of = [[self.KEY_INDEX_STATUS.format(status=s.value) for s in statuses]]
+        if tags:
+            any_of.append([self.KEY_INDEX_TAG.format(tag=tag) for tag in dict.fromkeys(tags)])
 
-        # Get all request IDs (we'll filter after fetching)
-        request_ids = await self._redis.zrevrange(queue_key, 0, -1)
+        request_ids = await self._query_index(required, any_of, offset, offset + limit - 1)
+        return await self._fetch_active(request_ids)
 
-        # Fetch and filter requests
-        results = []
-        skipped = 0
+    async def _fetch_active(self, request_ids: List[str]) -> List[ReviewRequest]:
+        """Fetch requests in one round trip, keeping those still active."""
+        if not request_ids:
+            return []
 
-        for request_id in request_ids:
-            request = await self.get_review_request(request_id)
+        payloads = await self._redis.mget(
+            [self.KEY_REQUEST.format(request_id=request_id) for request_id in request_ids]
+        )
 
-            if not request:
+        results = []
+        for payload in payloads:
+            if not payload:
                 continue
 
-            # Check if expired
-            if request.expires_at and datetime.utcnow() > request.expires_at:
-                if request.status == ReviewStatus.PENDING:
-                    await self._handle_expiration(request)
-                continue
+            request = ReviewRequest.model_validate_json(payload)
 
-            # Apply filters
-            if request.status not in (ReviewStatus.PENDING, ReviewStatus.IN_PROGRESS):
-                continue
+            # Decided between the index query and the fetch
+            if request.status in self.ACTIVE_STATUSES:
+                results.append(request)
 
-            if user_id and request.assigned_to != user_id:
-                continue
+        return results
 
-            if workflow_id and request.workflow_id != workflow_id:
-                continue
+    async def _page_queue(self, queue_key: str, offset: int, limit: int) -> List[ReviewRequest]:
+        """
+        Page a queue newest first with ZREVRANGE.
 
-            if review_type and request.review_type != review_type:
-                continue
+        Fetches a few extra entries per round trip to make up for requests
+        that are due but not swept yet (or finished since the read), and
+        keeps reading until the page is full. Such entries still count
+        towards offset until the sweeper removes them, so a later page can
+        shift by that many requests in the meantime.
 
-            if urgency and request.urgency != urgency:
-                continue
+        Args:
+            queue_key: Sorted set scored by created_at
+            offset: Skip first N entries
+            limit: Maximum results
 
-            if tags and not any(t in request.tags for t in tags):
-                continue
+        Returns:
+            Live requests, newest first
+        """
+        now = datetime.utcnow()
+        chunk = limit + self.PAGE_OVERFETCH
+        start = offset
+        results: List[ReviewRequest] = []
+
+        while len(results) < limit:
+            request_ids = await self._redis.zrevrange(queue_key, start, start + chunk - 1)
+            start += len(request_ids)
+            for request in await self._fetch_active(request_ids):
+                if request.expires_at is None or request.expires_at > now:
+                    results.append(request)
+            if len(request_ids) < chunk:
+                break
 
-            # Apply pagination
-            if skipped < offset:
-                skipped += 1
-                continue
+        return results[:limit]
 
-            results.append(request)
+    async def _query_index(
+        self,
+        required: List[str],
+        any_of: List[List[str]],
+        start: int,
+        stop: int
+    ) -> List[str]:
+        """
+        Intersect index sets server-side and return one page of live request IDs.
 
-            if len(results) >= limit:
-                break
+        The intersection is re-scored by expires_at to trim requests that
+        are already due (ZREMRANGEBYSCORE), then by created_at again for
+        newest-first paging. The unions and intersections are materialized
+        in temporary keys, so the cost grows with the sets involved (the
+        status union alone covers the whole queue); unfiltered listings use
+        _page_queue() instead.
 
-        return results
+        Args:
+            required: Sorted sets a request must be in
+            any_of: Groups of sorted sets; a request must be in at least one
+                set of every group (statuses, tags)
+            start: First rank (newest first)
+            stop: Last rank, inclusive
 
-    async def get_review_status(self, request_id: str) -> Optional[Dict[str, Any]]:
+        Returns:
+            Request IDs, newest first
+        """
+        result_key = self.KEY_QUERY.format(token=uuid4().hex)
+        live_key = f"{result_key}:live"
+        keys = list(required)
+        temporary = [result_key, live_key]
+
+        pipe = self._redis.pipeline(transaction=True)
+        for n, group in enumerate(any_of):
+            union_key = f"{result_key}:any{n}"
+            pipe.zunionstore(union_key, group, aggregate="MAX")
+            keys.append(union_key)
+            temporary.append(union_key)
+
+        # Score the matches by expires_at and drop the ones that are due
+        weights = {key: 0 for key in keys}
+        weights[self.KEY_EXPIRY] = 1
+        pipe.zinterstore(live_key, weights)
+        pipe.zremrangebyscore(live_key, "-inf", datetime.utcnow().timestamp())
+
+        # Back to created_at (the queue score) for newest-first paging
+        pipe.zinterstore(result_key, {live_key: 0, self.KEY_QUEUE: 1})
+        pipe.zrevrange(result_key, start, stop)
+        pipe.delete(*temporary)
+        results = await pipe.execute()
+
+        return results[-2]
+
+    async def get_review_status(
+        self,
+        request_id: str,
+        include_snapshot: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Get the current status of a review request.
 
         Args:
             request_id: The request ID
+            include_snapshot: Include the full state snapshot
 
         Returns:
             Status dict with request and decision info, or None
         """
         self._ensure_connected()
 
-        request = await self.get_review_request(request_id)
+        request = await self.get_review_request(request_id, include_snapshot)
         if not request:
             return None
 
@@ -865,20 +1299,22 @@ class HumanReviewManager:
         }
         request.status = status_map[decision_type]
 
+        pipe = self._transaction()
+
         # Store decision
         decision_key = self.KEY_DECISION.format(request_id=request_id)
-        await self._redis.set(decision_key, decision.model_dump_json())
-        await self._redis.expire(decision_key, self.DEFAULT_TTL)
+        pipe.set(decision_key, decision.model_dump_json(), ex=self.DEFAULT_TTL)
 
         # Update request
-        await self._store_request(request)
+        self._store_request(pipe, request)
 
         # Remove from pending queues (unless deferred)
         if decision_type != DecisionType.DEFER:
-            await self._remove_from_queues(request)
+            self._remove_from_queues(pipe, request)
 
         # Log event
-        await self._log_event(
+        self._log_event(
+            pipe,
             request_id,
             "decided",
             {
@@ -887,8 +1323,12 @@ class HumanReviewManager:
             },
             reviewer_id
         )
+        await pipe.execute()
+
+        # Callbacks resume the workflow, so they get the full state snapshot
+        if self._on_decision_callbacks and request.snapshot_key:
+            request.state_snapshot = await self._load_snapshot(request.snapshot_key)
 
-        # Call callbacks
         for callback in self._on_decision_callbacks:
             try:
                 await callback(request, decision)
@@ -898,7 +1338,7 @@ class HumanReviewManager:
         # Send notifications
         if notify_recipients:
             await self._notification_service.notify_review_completed(
-                request, decision, notify_recipients
+                request, decision, notify_recipients, wait=False
             )
 
         logger.info(
@@ -936,29 +1376,34 @@ class HumanReviewManager:
         request.assigned_to = user_id
         request.assigned_at = datetime.utcnow()
 
-        await self._store_request(request)
+        pipe = self._transaction()
+        self._store_request(pipe, request)
 
         # Update user queues
         if old_assignee:
             old_queue_key = self.KEY_USER_QUEUE.format(user_id=str(old_assignee))
-            await self._redis.zrem(old_queue_key, request_id)
+            pipe.zrem(old_queue_key, request_id)
 
         new_queue_key = self.KEY_USER_QUEUE.format(user_id=str(user_id))
-        await self._redis.zadd(
+        pipe.zadd(
             new_queue_key,
             {request_id: request.created_at.timestamp()}
         )
 
         # Log event
-        await self._log_event(
+        self._log_event(
+            pipe,
             request_id,
             "assigned",
             {"assigned_to": str(user_id), "previous": str(old_assignee) if old_assignee else None}
         )
+        await pipe.execute()
 
         # Notify
         if notify:
-            await self._notification_service.notify_review_assigned(request, str(user_id))
+            await self._notification_service.notify_review_assigned(
+                request, str(user_id), wait=False
+            )
 
         return request
 
@@ -986,18 +1431,22 @@ class HumanReviewManager:
             raise ValueError(f"Review request not found: {request_id}")
 
         request.status = ReviewStatus.CANCELLED
-        await self._store_request(request)
+
+        pipe = self._transaction()
+        self._store_request(pipe, request)
 
         # Remove from queues
-        await self._remove_from_queues(request)
+        self._remove_from_queues(pipe, request)
 
         # Log event
-        await self._log_event(
+        self._log_event(
+            pipe,
             request_id,
             "cancelled",
             {"reason": reason},
             actor_id
         )
+        await pipe.execute()
 
         logger.info(f"Review cancelled: {request_id}, reason: {reason}")
 
@@ -1005,56 +1454,154 @@ class HumanReviewManager:
 
     # ==================== Internal Methods ====================
 
-    async def _store_request(self, request: ReviewRequest) -> None:
-        """Store a review request in Redis."""
-        key = self.KEY_REQUEST.format(request_id=request.request_id)
-        await self._redis.set(key, request.model_dump_json())
+    def _transaction(self):
+        """
+        MULTI/EXEC pipeline for one lifecycle transition.
 
-        # Set TTL based on expiration
+        The _store_request, _add_to_queues, _remove_from_queues and
+        _log_event helpers only queue commands on it; a single execute()
+        applies them in one round trip, all or nothing.
+        """
+        return self._redis.pipeline(transaction=True)
+
+    def _request_ttl(self, request: ReviewRequest) -> int:
+        """Seconds to keep a request's keys, based on its expiration."""
         if request.expires_at:
-            ttl = int((request.expires_at - datetime.utcnow()).total_seconds())
-            if ttl > 0:
-                await self._redis.expire(key, ttl + 3600)  # Extra hour buffer
-            else:
-                await self._redis.expire(key, self.DEFAULT_TTL)
-        else:
-            await self._redis.expire(key, self.DEFAULT_TTL)
+            remaining = int((request.expires_at - datetime.utcnow()).total_seconds())
+            if remaining > 0:
+                return remaining + 3600  # Extra hour buffer
+        return self.DEFAULT_TTL
+
+    def _store_request(self, pipe, request: ReviewRequest) -> None:
+        """Queue storing a review request (without an externally stored snapshot)."""
+        key = self.KEY_REQUEST.format(request_id=request.request_id)
+        exclude = {"state_snapshot"} if request.snapshot_key else None
+        pipe.set(key, request.model_dump_json(exclude=exclude), ex=self._request_ttl(request))
+
+    def _store_snapshot(self, pipe, request: ReviewRequest) -> None:
+        """
+        Queue storing the request's state snapshot under its own key.
+
+        The snapshot is zlib-compressed (base64 for the text client) and
+        replaced in the request by snapshot_key and snapshot_size.
+        """
+        raw = to_json(request.state_snapshot, fallback=str)
+        key = self.KEY_SNAPSHOT.format(request_id=request.request_id)
+        pipe.set(
+            key,
+            base64.b64encode(zlib.compress(raw)).decode("ascii"),
+            ex=self._request_ttl(request)
+        )
+        request.snapshot_key = key
+        request.snapshot_size = len(raw)
+
+    async def _load_snapshot(self, snapshot_key: str) -> Dict[str, Any]:
+        """Load and decompress a stored state snapshot (empty if evicted)."""
+        data = await self._redis.get(snapshot_key)
+        if not data:
+            return {}
+        return json.loads(zlib.decompress(base64.b64decode(data)))
+
+    def _index_keys(self, request: ReviewRequest) -> List[str]:
+        """Filter index sets a pending request belongs to (status excluded)."""
+        keys = [
+            self.KEY_INDEX_TYPE.format(review_type=ReviewType(request.review_type).value),
+            self.KEY_INDEX_URGENCY.format(urgency=Urgency(request.urgency).value),
+        ]
+        keys.extend(self.KEY_INDEX_TAG.format(tag=tag) for tag in dict.fromkeys(request.tags))
+        return keys
 
-    async def _add_to_queues(self, request: ReviewRequest) -> None:
-        """Add request to appropriate queues."""
+    def _add_to_queues(self, pipe, request: ReviewRequest) -> None:
+        """Queue adding a request to the queues and filter indexes."""
         score = request.created_at.timestamp()
 
         # Add to main queue
-        await self._redis.zadd(self.KEY_QUEUE, {request.request_id: score})
+        pipe.zadd(self.KEY_QUEUE, {request.request_id: score})
 
         # Add to workflow queue
         workflow_key = self.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(request.workflow_id))
-        await self._redis.zadd(workflow_key, {request.request_id: score})
+        pipe.zadd(workflow_key, {request.request_id: score})
 
         # Add to user queue if assigned
         if request.assigned_to:
             user_key = self.KEY_USER_QUEUE.format(user_id=str(request.assigned_to))
-            await self._redis.zadd(user_key, {request.request_id: score})
+            pipe.zadd(user_key, {request.request_id: score})
+
+        # Add to expiry index
+        if request.expires_at:
+            pipe.zadd(self.KEY_EXPIRY, {request.request_id: request.expires_at.timestamp()})
+
+        # Add to filter indexes
+        status_key = self.KEY_INDEX_STATUS.format(status=ReviewStatus(request.status).value)
+        for index_key in [status_key, *self._index_keys(request)]:
+            pipe.zadd(index_key, {request.request_id: score})
 
-    async def _remove_from_queues(self, request: ReviewRequest) -> None:
-        """Remove request from queues."""
-        await self._redis.zrem(self.KEY_QUEUE, request.request_id)
+    def _remove_from_queues(self, pipe, request: ReviewRequest) -> None:
+        """Queue removing a request from the queues and filter indexes."""
+        pipe.zrem(self.KEY_QUEUE, request.request_id)
 
         workflow_key = self.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(request.workflow_id))
-        await self._redis.zrem(workflow_key, request.request_id)
+        pipe.zrem(workflow_key, request.request_id)
 
         if request.assigned_to:
             user_key = self.KEY_USER_QUEUE.format(user_id=str(request.assigned_to))
-            await self._redis.zrem(user_key, request.request_id)
+            pipe.zrem(user_key, request.request_id)
+
+        pipe.zrem(self.KEY_EXPIRY, request.request_id)
+
+        # The status has usually changed already, so clear every active one
+        status_keys = [
+            self.KEY_INDEX_STATUS.format(status=status.value) for status in self.ACTIVE_STATUSES
+        ]
+        for index_key in [*status_keys, *self._index_keys(request)]:
+            pipe.zrem(index_key, request.request_id)
+
+    async def rebuild_indexes(self, batch_size: int = 500) -> int:
+        """
+        Re-add every queued request to the queues and filter indexes.
+
+        Used to backfill the indexes for requests created before they
+        existed.
+
+        Args:
+            batch_size: Requests fetched per round trip
+
+        Returns:
+            Number of requests indexed
+        """
+        self._ensure_connected()
 
-    async def _log_event(
+        indexed = 0
+        total = await self._redis.zcard(self.KEY_QUEUE)
+        for start in range(0, total, batch_size):
+            request_ids = await self._redis.zrange(self.KEY_QUEUE, start, start + batch_size - 1)
+            if not request_ids:
+                break
+            payloads = await self._redis.mget(
+                [self.KEY_REQUEST.format(request_id=request_id) for request_id in request_ids]
+            )
+            pipe = self._redis.pipeline(transaction=False)
+            for payload in payloads:
+                if not payload:
+                    continue
+                request = ReviewRequest.model_validate_json(payload)
+                if request.status in self.ACTIVE_STATUSES:
+                    self._add_to_queues(pipe, request)
+                    indexed += 1
+            await pipe.execute()
+
+        logger.info(f"Rebuilt review indexes for {indexed} requests")
+        return indexed
+
+    def _log_event(
         self,
+        pipe,
         request_id: str,
         event_type: str,
         data: Dict[str, Any],
         actor_id: Optional[UUID] = None
     ) -> None:
-        """Log a review event."""
+        """Queue logging a review event."""
         event = ReviewEvent(
             request_id=request_id,
             event_type=event_type,
@@ -1063,8 +1610,8 @@ class HumanReviewManager:
         )
 
         events_key = self.KEY_EVENTS.format(request_id=request_id)
-        await self._redis.lpush(events_key, event.model_dump_json())
-        await self._redis.expire(events_key, self.DEFAULT_TTL)
+        pipe.lpush(events_key, event.model_dump_json())
+        pipe.expire(events_key, self.DEFAULT_TTL)
 
     async def _get_events(self, request_id: str) -> List[ReviewEvent]:
         """Get all events for a request."""
@@ -1076,17 +1623,20 @@ class HumanReviewManager:
     async def _handle_expiration(self, request: ReviewRequest) -> None:
         """Handle an expired review request."""
         request.status = ReviewStatus.EXPIRED
-        await self._store_request(request)
-        await self._remove_from_queues(request)
 
-        await self._log_event(
+        pipe = self._transaction()
+        self._store_request(pipe, request)
+        self._remove_from_queues(pipe, request)
+        self._log_event(
+            pipe,
             request.request_id,
             "expired",
             {"expired_at": datetime.utcnow().isoformat()}
         )
+        await pipe.execute()
 
         # Notify about expiration
-        await self._notification_service.notify_review_expired(request)
+        await self._notification_service.notify_review_expired(request, wait=False)
 
         logger.info(f"Review expired: {request.request_id}")
 
@@ -1114,11 +1664,17 @@ class HumanReviewManager:
 
         return summary
 
-    async def check_expired_reviews(self) -> List[str]:
+    async def check_expired_reviews(self, batch_size: int = 100) -> List[str]:
         """
-        Check for and handle expired reviews.
+        Expire pending reviews that are due.
+
+        Only requests whose expires_at has passed are read, via the expiry
+        index. Each due request is claimed by removing it from the index,
+        so concurrent sweepers never expire (and notify) the same request
+        twice.
 
-        This can be called periodically by a background task.
+        Args:
+            batch_size: Due requests fetched per round trip
 
         Returns:
             List of expired request IDs
@@ -1126,17 +1682,81 @@ class HumanReviewManager:
         self._ensure_connected()
 
         expired_ids = []
-        request_ids = await self._redis.zrange(self.KEY_QUEUE, 0, -1)
+        while True:
+            now = datetime.utcnow()
+            due_ids = await self._redis.zrangebyscore(
+                self.KEY_EXPIRY, "-inf", now.timestamp(), start=0, num=batch_size
+            )
+            if not due_ids:
+                break
+
+            payloads = await self._redis.mget(
+                [self.KEY_REQUEST.format(request_id=request_id) for request_id in due_ids]
+            )
+            for request_id, payload in zip(due_ids, payloads):
+                if not await self._redis.zrem(self.KEY_EXPIRY, request_id):
+                    continue  # Claimed by another sweeper
 
-        for request_id in request_ids:
-            request = await self.get_review_request(request_id)
-            if request and request.expires_at and datetime.utcnow() > request.expires_at:
+                if not payload:
+                    # Request data already evicted; drop the dangling queue entry
+                    await self._redis.zrem(self.KEY_QUEUE, request_id)
+                    continue
+
+                request = ReviewRequest.model_validate_json(payload)
                 if request.status == ReviewStatus.PENDING:
                     await self._handle_expiration(request)
                     expired_ids.append(request_id)
 
+            if len(due_ids) < batch_size:
+                break
+
         return expired_ids
 
+    async def _seconds_until_next_expiry(self) -> float:
+        """Seconds until the earliest expiry, capped at EXPIRY_MAX_INTERVAL."""
+        head = await self._redis.zrange(self.KEY_EXPIRY, 0, 0, withscores=True)
+        if not head:
+            return self.EXPIRY_MAX_INTERVAL
+        _, expires_at = head[0]
+        delay = expires_at - datetime.utcnow().timestamp()
+        return min(max(delay, 0.0), self.EXPIRY_MAX_INTERVAL)
+
+    async def start_expiry_sweeper(self) -> None:
+        """Start the background task that expires reviews when they are due."""
+        self._ensure_connected()
+        if self._expiry_task is None or self._expiry_task.done():
+            self._expiry_task = asyncio.create_task(self._run_expiry_sweeper())
+            logger.info("Review expiry sweeper started")
+
+    async def stop_expiry_sweeper(self) -> None:
+        """Stop the expiry sweeper."""
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            try:
+                await self._expiry_task
+            except asyncio.CancelledError:
+                pass
+            self._expiry_task = None
+            logger.info("Review expiry sweeper stopped")
+
+    async def _run_expiry_sweeper(self) -> None:
+        while True:
+            # Cleared first so a request created during the sweep wakes the next sleep
+            self._expiry_wakeup.clear()
+            try:
+                await self.check_expired_reviews()
+                delay = await self._seconds_until_next_expiry()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Review expiry sweep failed: {e}")
+                delay = self.EXPIRY_MAX_INTERVAL
+
+            try:
+                await asyncio.wait_for(self._expiry_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
 
 # ==================== Singleton Factory ====================
 
@@ -83,6 +83,21 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_WORKFLOWS: int = 50
     WORKFLOW_NODE_TIMEOUT: int = 300
 
+    # Work Stealing (move assigned-but-not-started tasks to idle workers)
+    WORK_STEALING_ENABLED: bool = True
+    WORK_STEALING_AFTER_SECONDS: int = 30
+    WORK_STEALING_INTERVAL_SECONDS: int = 5
+
+    # Workflow Result Cache (for task nodes with cache enabled)
+    RESULT_CACHE_REDIS_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 1024
+    RESULT_CACHE_MAX_MB: int = 64
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+
+    # Worker outbox deduplication state (processed sequence numbers)
+    OUTBOX_STATE_REDIS_ENABLED: bool = True
+    OUTBOX_STATE_TTL_SECONDS: int = 604800
+
     # Task Allocator Weights
     ALLOCATOR_WEIGHT_TOOL_MATCH: float = 0.40
     ALLOCATOR_WEIGHT_RESOURCES: float = 0.30
@@ -97,6 +112,12 @@ class Settings(BaseSettings):
     LOG_FORMAT: str = "json"
     LOG_TTL_SECONDS: int = 3600
 
+    # Distributed Tracing (OpenTelemetry)
+    TRACING_EXPORTER: str = "none"  # "otlp", "file" or "none"
+    TRACING_SAMPLE_RATE: float = 0.05  # Fraction of new traces recorded
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: Optional[str] = None  # Default: OTEL_EXPORTER_OTLP_* env
+
     # API Keys
     ANTHROPIC_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
@@ -4,13 +4,17 @@ Database Connection Management
 SQLAlchemy async session and connection management.
 """
 
+import time
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
 
 from src.config import settings
 from src.logging_config import get_logger
+from src.metrics import DB_POOL_CHECKED_OUT, DB_POOL_WAIT
 from src.models.base import Base
 
 logger = get_logger(__name__)
@@ -34,10 +38,33 @@ else:
 
 engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
 
+
+class PoolTimedSession(Session):
+    """Sync session behind AsyncSession that reports pool wait (see below)."""
+
+
+# A session checks out a connection lazily, on its first statement after
+# (auto)begin. The pool has no event before checkout, so the wait is timed
+# from the transaction's creation to the session's after_begin, which fires
+# once the connection has been checked out (or newly connected).
+@event.listens_for(PoolTimedSession, "after_transaction_create")
+def _mark_connection_requested(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info["connection_requested_at"] = time.perf_counter()
+
+
+@event.listens_for(PoolTimedSession, "after_begin")
+def _observe_pool_wait(session, transaction, connection) -> None:
+    start = session.info.pop("connection_requested_at", None)
+    if start is not None:
+        DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PoolTimedSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -45,6 +72,10 @@ AsyncSessionLocal = async_sessionmaker(
 
 async_session_factory = AsyncSessionLocal
 
+# NullPool (debug) keeps no connections to count
+if hasattr(engine.pool, "checkedout"):
+    DB_POOL_CHECKED_OUT.set_function(engine.pool.checkedout)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for database sessions."""
@@ -8,13 +8,18 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.config import settings
 from src.database import init_db, close_db
 from src.logging_config import setup_logging, get_logger
 from src.api.v1 import router as api_v1_router
 from src.mcp import get_mcp_bus
+from src.metrics import render_metrics
+from src.services.outbox_sequences import create_outbox_tracker, get_outbox_tracker
+from src.services.work_stealing import get_work_stealer
+from src.tracing import configure_tracing, shutdown_tracing
+from src.workflows.result_cache import create_result_cache, get_result_cache
 
 # Setup logging
 setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
@@ -34,11 +39,47 @@ async def lifespan(app: FastAPI):
 
     await init_db()
 
+    configure_tracing(
+        exporter=settings.TRACING_EXPORTER,
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        service_name=f"{settings.APP_NAME.lower()}-backend",
+        file_path=settings.TRACING_FILE_PATH,
+        otlp_endpoint=settings.TRACING_OTLP_ENDPOINT,
+    )
+
     # Initialize MCP Bus
     mcp_bus = get_mcp_bus()
     await mcp_bus.start()
     logger.info("MCP Bus started")
 
+    # Shared result cache for cacheable workflow task nodes
+    if settings.RESULT_CACHE_REDIS_ENABLED:
+        try:
+            await create_result_cache(
+                redis_url=settings.REDIS_URL,
+                max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+                max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 * 1024,
+                default_ttl=settings.RESULT_CACHE_TTL_SECONDS,
+            )
+            logger.info("Result cache connected to Redis")
+        except Exception as e:
+            logger.warning("Result cache Redis tier unavailable, using memory only", error=str(e))
+
+    # Processed worker outbox sequences survive restarts in Redis
+    if settings.OUTBOX_STATE_REDIS_ENABLED:
+        try:
+            await create_outbox_tracker(
+                redis_url=settings.REDIS_URL,
+                ttl=settings.OUTBOX_STATE_TTL_SECONDS,
+            )
+            logger.info("Outbox sequence tracker connected to Redis")
+        except Exception as e:
+            logger.warning("Outbox state Redis unavailable, using memory only", error=str(e))
+
+    # Rebalance queued tasks from stalled/slow workers to idle ones
+    if settings.WORK_STEALING_ENABLED:
+        await get_work_stealer().start()
+
     logger.info("Application started successfully")
 
     yield
@@ -50,7 +91,15 @@ async def lifespan(app: FastAPI):
     await mcp_bus.stop()
     logger.info("MCP Bus stopped")
 
+    await get_work_stealer().stop()
+
+    await get_result_cache().disconnect()
+
+    await get_outbox_tracker().disconnect()
+
     await close_db()
+
+    shutdown_tracing()
     logger.info("Application shutdown complete")
 
 
@@ -104,6 +153,13 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
 
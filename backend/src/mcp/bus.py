@@ -5,12 +5,16 @@ Core infrastructure for managing MCP server connections and tool invocations.
 """
 
 import asyncio
+import json
 import logging
 import time
 import uuid
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
+from src.metrics import MCP_COALESCED_CALLS, MCP_INVOCATION_DURATION
+from src.tracing import start_span, with_trace_meta
+
 from .registry import ToolNotFoundError, ToolRegistry
 from .types import (
     MCPError,
@@ -56,14 +60,26 @@ class MCPBus:
 
     Manages MCP server connections, tool registry, and tool invocations.
     Provides a unified interface for interacting with multiple MCP servers.
+
+    Calls to tools declared idempotent (ToolDefinition.metadata) are
+    coalesced: concurrent calls with the same tool path, arguments and
+    timeout share one in-flight execution and its result (single-flight).
     """
 
-    def __init__(self):
-        """Initialize the MCP Bus."""
+    def __init__(self, coalesce: bool = True):
+        """
+        Initialize the MCP Bus.
+
+        Args:
+            coalesce: Share in-flight executions of identical idempotent calls
+        """
         self._servers: Dict[str, ServerInfo] = {}
         self._registry = ToolRegistry()
         self._connections: Dict[str, Any] = {}  # Server connections (transport-specific)
         self._invocations: Dict[str, ToolInvocation] = {}
+        self._coalesce = coalesce
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._coalesced_calls = 0
         self._lock = asyncio.Lock()
         self._event_handlers: Dict[str, List[Callable]] = {}
         self._running = False
@@ -106,7 +122,8 @@ class MCPBus:
         self,
         name: str,
         config: MCPServerConfig,
-        connect: bool = True
+        connect: bool = True,
+        connection: Optional[Any] = None
     ) -> ServerInfo:
         """
         Register an MCP server.
@@ -115,6 +132,9 @@ class MCPBus:
             name: Unique name for the server
             config: Server configuration
             connect: Whether to connect immediately
+            connection: In-process server that executes this server's calls
+                (call_tool(name, arguments, invocation_id=...) and optionally
+                cancel_execution(invocation_id))
 
         Returns:
             Server info object
@@ -141,6 +161,8 @@ class MCPBus:
             )
 
             self._servers[name] = server_info
+            if connection is not None:
+                self._connections[name] = connection
             logger.info(f"Registered server: {name}")
 
         if connect:
@@ -327,7 +349,9 @@ class MCPBus:
         self,
         tool_path: str,
         arguments: Optional[Dict[str, Any]] = None,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        invocation_id: Optional[str] = None,
+        coalesce: bool = True
     ) -> ToolResult:
         """
         Invoke an MCP tool.
@@ -336,6 +360,11 @@ class MCPBus:
             tool_path: Full tool path (server.tool_name)
             arguments: Tool arguments
             timeout: Optional timeout in seconds
+            invocation_id: ID for this call, e.g. to cancel it later with
+                cancel_tool_execution() (generated when omitted)
+            coalesce: Allow joining an identical in-flight call of an
+                idempotent tool; False always runs a separate execution
+                (e.g. a hedged duplicate that must not join its primary)
 
         Returns:
             Tool execution result
@@ -369,8 +398,93 @@ class MCPBus:
         # Get tool definition
         tool = await self._registry.get_tool(tool_path)
 
+        with start_span("mcp.invoke_tool", {"mcp.server": server_name, "mcp.tool": tool_name}) as span:
+            if coalesce and self._coalesce and tool.idempotent:
+                result = await self._invoke_coalesced(
+                    tool_path, server_name, tool_name, tool, arguments, timeout, start_time,
+                    invocation_id
+                )
+            else:
+                result = await self._invoke(
+                    tool_path, server_name, tool_name, tool, arguments, timeout, start_time,
+                    invocation_id
+                )
+            span.set_attribute("mcp.status", result.status.value)
+            span.set_attribute("mcp.coalesced", bool(result.metadata.get("coalesced", False)))
+            return result
+
+    @staticmethod
+    def _coalesce_key(
+        tool_path: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> str:
+        """Key identifying identical calls (tool path + canonical arguments)."""
+        canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{tool_path}|{timeout}|{canonical}"
+
+    async def _invoke_coalesced(
+        self,
+        tool_path: str,
+        server_name: str,
+        tool_name: str,
+        tool: ToolDefinition,
+        arguments: Dict[str, Any],
+        timeout: Optional[float],
+        start_time: float,
+        invocation_id: Optional[str] = None
+    ) -> ToolResult:
+        """
+        Join an identical in-flight call or start one others can join.
+
+        The execution runs as its own task, so a caller that is cancelled
+        does not cancel it for the others. It runs under the starting
+        caller's invocation ID; a joiner's ID cannot cancel it.
+
+        Returns:
+            Tool execution result (metadata["coalesced"] is set for joiners)
+        """
+        key = self._coalesce_key(tool_path, arguments, timeout)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._coalesced_calls += 1
+            MCP_COALESCED_CALLS.labels(server_name).inc()
+            logger.debug(f"Coalescing call to {tool_path} with in-flight execution")
+            result = await asyncio.shield(inflight)
+            return result.model_copy(
+                update={"metadata": {**result.metadata, "coalesced": True}},
+                deep=True
+            )
+
+        inflight = asyncio.ensure_future(self._invoke(
+            tool_path, server_name, tool_name, tool, arguments, timeout, start_time,
+            invocation_id
+        ))
+        self._inflight[key] = inflight
+
+        def _done(future: asyncio.Future) -> None:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.cancelled():
+                future.exception()  # Mark retrieved if every caller went away
+
+        inflight.add_done_callback(_done)
+        return await asyncio.shield(inflight)
+
+    async def _invoke(
+        self,
+        tool_path: str,
+        server_name: str,
+        tool_name: str,
+        tool: ToolDefinition,
+        arguments: Dict[str, Any],
+        timeout: Optional[float],
+        start_time: float,
+        invocation_id: Optional[str] = None
+    ) -> ToolResult:
+        """Execute one tool call and record the invocation."""
         # Create invocation record
-        invocation_id = str(uuid.uuid4())
+        invocation_id = invocation_id or str(uuid.uuid4())
         invocation = ToolInvocation(
             id=invocation_id,
             tool_path=tool_path,
@@ -386,10 +500,10 @@ class MCPBus:
             message = MCPMessage(
                 id=invocation_id,
                 method=MCPMessageType.CALL_TOOL,
-                params={
+                params=with_trace_meta({
                     "name": tool_name,
                     "arguments": arguments
-                }
+                })
             )
 
             # TODO: Send message via transport and get response
@@ -398,20 +512,27 @@ class MCPBus:
                 server_name,
                 tool,
                 arguments,
-                timeout
+                timeout,
+                invocation_id
             )
 
             execution_time = time.time() - start_time
 
-            result = ToolResult(
-                tool_path=tool_path,
-                status=ToolResultStatus.SUCCESS,
-                result=result_data,
-                execution_time=execution_time
-            )
+            if isinstance(result_data, ToolResult):
+                result = result_data.model_copy(
+                    update={"tool_path": tool_path, "execution_time": execution_time}
+                )
+            else:
+                result = ToolResult(
+                    tool_path=tool_path,
+                    status=ToolResultStatus.SUCCESS,
+                    result=result_data,
+                    execution_time=execution_time
+                )
 
             invocation.completed_at = datetime.utcnow()
             invocation.result = result
+            MCP_INVOCATION_DURATION.labels(server_name, result.status.value).observe(execution_time)
 
             logger.info(
                 f"Tool invocation completed: {tool_path} "
@@ -421,7 +542,7 @@ class MCPBus:
             await self._emit_event("tool_invoked", {
                 "tool_path": tool_path,
                 "invocation_id": invocation_id,
-                "status": "success"
+                "status": result.status.value
             })
 
             return result
@@ -436,6 +557,7 @@ class MCPBus:
             )
             invocation.completed_at = datetime.utcnow()
             invocation.result = result
+            MCP_INVOCATION_DURATION.labels(server_name, result.status.value).observe(execution_time)
 
             logger.warning(f"Tool invocation timed out: {tool_path}")
             return result
@@ -450,6 +572,7 @@ class MCPBus:
             )
             invocation.completed_at = datetime.utcnow()
             invocation.result = result
+            MCP_INVOCATION_DURATION.labels(server_name, result.status.value).observe(execution_time)
 
             logger.error(f"Tool invocation failed: {tool_path} - {e}")
             raise ToolInvocationError(f"Tool invocation failed: {e}")
@@ -459,7 +582,8 @@ class MCPBus:
         server_name: str,
         tool: ToolDefinition,
         arguments: Dict[str, Any],
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        invocation_id: Optional[str] = None
     ) -> Any:
         """
         Execute a tool call on the server.
@@ -469,10 +593,17 @@ class MCPBus:
             tool: Tool definition
             arguments: Tool arguments
             timeout: Optional timeout
+            invocation_id: Invocation the call belongs to
 
         Returns:
-            Tool execution result
+            Tool execution result (a ToolResult from in-process servers)
         """
+        connection = self._connections.get(server_name)
+        if connection is not None:
+            return await connection.call_tool(
+                tool.name, arguments, invocation_id=invocation_id
+            )
+
         # TODO: Implement actual transport-based tool execution
         # This is a placeholder that should be replaced with real transport logic
 
@@ -551,6 +682,35 @@ class MCPBus:
 
         return self._servers[name].status == MCPServerStatus.CONNECTED
 
+    async def cancel_tool_execution(self, tool_path: str, invocation_id: str) -> bool:
+        """
+        Ask a tool's server to stop one execution.
+
+        Only the execution started by the given invocation is stopped (via
+        the connection's cancel_execution(invocation_id) hook); other calls
+        running on the same server are left alone.
+
+        Args:
+            tool_path: Full tool path (server.tool_name)
+            invocation_id: ID the call was invoked with
+
+        Returns:
+            True if a cancellation was initiated
+        """
+        invocation = self._invocations.get(invocation_id)
+        if invocation is None or invocation.tool_path != tool_path or invocation.result is not None:
+            return False
+
+        server_name = tool_path.split(".", 1)[0]
+        cancel = getattr(self._connections.get(server_name), "cancel_execution", None)
+        if cancel is None:
+            return False
+
+        cancelled = await cancel(invocation_id)
+        if cancelled:
+            logger.info(f"Cancelled invocation {invocation_id} on server: {server_name}")
+        return bool(cancelled)
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform health check on all servers.
@@ -563,6 +723,8 @@ class MCPBus:
             "total_servers": len(self._servers),
             "connected_servers": 0,
             "total_tools": len(self._registry),
+            "inflight_coalesced_calls": len(self._inflight),
+            "coalesced_calls": self._coalesced_calls,
             "servers": {}
         }
 
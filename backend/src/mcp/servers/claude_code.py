@@ -11,9 +11,10 @@ import logging
 import os
 import shutil
 import time
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 from pydantic import BaseModel, Field
 
@@ -23,10 +24,20 @@ from ..types import (
     ToolResultStatus,
     MCPServerStatus,
 )
+from .streaming import (
+    DEFAULT_MAX_MEMORY_BYTES,
+    JSONStreamScanner,
+    OutputCollector,
+    pump_stream,
+)
+from .session_pool import CLISession, CLISessionPool
 
 
 logger = logging.getLogger(__name__)
 
+# Bus invocation the running call_tool() belongs to (scopes cancellation)
+_invocation_id: ContextVar[Optional[str]] = ContextVar("claude_code_invocation_id", default=None)
+
 
 class ClaudeCodeError(Exception):
     """Base exception for Claude Code MCP server errors."""
@@ -134,6 +145,30 @@ class ClaudeCodeServerConfig(BaseModel):
         default=False,
         description="Skip permission prompts (use with caution)"
     )
+    max_output_bytes: int = Field(
+        default=DEFAULT_MAX_MEMORY_BYTES,
+        ge=1024,
+        description="Output kept in memory per stream before spilling to a temp file"
+    )
+    spill_directory: Optional[str] = Field(
+        default=None,
+        description="Directory for spilled output (default: system temp dir)"
+    )
+    session_pool_enabled: bool = Field(
+        default=False,
+        description="Send print-mode prompts to pre-spawned CLI processes"
+    )
+    session_pool_max_idle: int = Field(
+        default=1,
+        ge=0,
+        le=16,
+        description="Warm CLI processes kept per working directory and command"
+    )
+    session_pool_idle_timeout: float = Field(
+        default=300.0,
+        ge=1.0,
+        description="Seconds before an idle pre-spawned process is recycled"
+    )
 
     model_config = {"extra": "forbid"}
 
@@ -202,6 +237,24 @@ class ClaudeCodeMCPServer:
         self._current_process: Optional[asyncio.subprocess.Process] = None
         self._cancelled = False
         self._initialized = False
+        self._output_callback: Optional[Callable[[str, str], Any]] = None
+        self._current_session: Optional[CLISession] = None
+        # Running processes/sessions by invocation ID, for cancel_execution()
+        self._executions: Dict[str, Union[asyncio.subprocess.Process, CLISession]] = {}
+        self._cancelled_invocations: Set[str] = set()
+        self._session_pool: Optional[CLISessionPool] = None
+        # Environment is built once rather than copied per call
+        self._env = os.environ.copy()
+        self._env.update(self.config.env_vars)
+        if self.config.session_pool_enabled:
+            self._session_pool = CLISessionPool(
+                env=self._env,
+                mode="oneshot",
+                max_idle=self.config.session_pool_max_idle,
+                idle_timeout=self.config.session_pool_idle_timeout,
+                max_output_bytes=self.config.max_output_bytes,
+                spill_dir=self.config.spill_directory
+            )
 
         logger.info(
             "ClaudeCodeMCPServer created",
@@ -217,6 +270,16 @@ class ClaudeCodeMCPServer:
         """Get current server status."""
         return self._status
 
+    def set_output_callback(self, callback: Optional[Callable[[str, str], Any]]) -> None:
+        """
+        Set a callback that receives CLI output lines as they are produced.
+
+        Args:
+            callback: Sync or async function taking (line, stream_name),
+                or None to stop forwarding.
+        """
+        self._output_callback = callback
+
     @property
     def is_initialized(self) -> bool:
         """Check if server is initialized and ready."""
@@ -250,6 +313,15 @@ class ClaudeCodeMCPServer:
             # Register available tools
             self._register_tools()
 
+            # Pre-spawn a process for plain print-mode prompts
+            if self._session_pool is not None:
+                try:
+                    await self._session_pool.prewarm(
+                        self._build_command(), self.config.working_directory
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to prewarm Claude Code session pool: {e}")
+
             self._status = MCPServerStatus.CONNECTED
             self._initialized = True
 
@@ -302,7 +374,8 @@ class ClaudeCodeMCPServer:
     async def call_tool(
         self,
         name: str,
-        arguments: Dict[str, Any]
+        arguments: Dict[str, Any],
+        invocation_id: Optional[str] = None
     ) -> ToolResult:
         """
         Execute a tool by name with the given arguments.
@@ -310,6 +383,8 @@ class ClaudeCodeMCPServer:
         Args:
             name: Tool name (e.g., "claude_code.execute" or "execute")
             arguments: Tool arguments as a dictionary
+            invocation_id: Caller's ID for this call; cancel_execution()
+                with the same ID stops only this call
 
         Returns:
             ToolResult containing execution result or error.
@@ -358,7 +433,12 @@ class ClaudeCodeMCPServer:
             handler_name = name.split(".")[-1] if "." in name else name
             handler = self._get_tool_handler(handler_name)
 
-            result = await handler(arguments)
+            token = _invocation_id.set(invocation_id)
+            try:
+                result = await handler(arguments)
+            finally:
+                _invocation_id.reset(token)
+                self._cancelled_invocations.discard(invocation_id)
             execution_time = time.time() - start_time
 
             return ToolResult(
@@ -430,6 +510,14 @@ class ClaudeCodeMCPServer:
             self._cancelled = True
             await self._terminate_process(self._current_process)
 
+        if self._current_session is not None:
+            self._cancelled = True
+            self._current_session.broken = True
+            await self._current_session.close()
+
+        if self._session_pool is not None:
+            await self._session_pool.close()
+
         self._status = MCPServerStatus.DISCONNECTED
         self._initialized = False
         self._tools.clear()
@@ -750,7 +838,8 @@ class ClaudeCodeMCPServer:
                         "metadata": {"type": "object"}
                     }
                 },
-                metadata={"category": "analysis"}
+                # Read-only: concurrent identical analyses share one run
+                metadata={"category": "analysis", "idempotent": True}
             ),
         ]
 
@@ -827,35 +916,25 @@ class ClaudeCodeMCPServer:
             logger.warning(f"Failed to get CLI version: {e}")
             return None
 
-    async def _execute_claude_code(
+    def _build_command(
         self,
-        prompt: str,
-        working_dir: Optional[str],
-        timeout: int,
-        files: List[str],
-        output_format: str,
+        files: Optional[List[str]] = None,
+        output_format: str = "text",
         mode: str = "print",
         additional_args: Optional[List[str]] = None
-    ) -> Dict[str, Any]:
+    ) -> List[str]:
         """
-        Execute Claude Code CLI with the given parameters.
+        Build the Claude Code command line (the prompt is sent via stdin).
 
         Args:
-            prompt: The prompt to send to Claude Code
-            working_dir: Working directory for execution
-            timeout: Timeout in seconds
             files: List of file paths to include
             output_format: Output format (text, json)
             mode: Execution mode (print, interactive)
             additional_args: Additional CLI arguments
 
         Returns:
-            Dictionary with execution result.
+            Command list.
         """
-        start_time = time.time()
-        self._cancelled = False
-
-        # Build command
         cmd = [self.config.cli_path]
 
         # Add print mode for non-interactive execution
@@ -875,15 +954,168 @@ class ClaudeCodeMCPServer:
             cmd.extend(additional_args)
 
         # Add file paths if provided
-        for file_path in files:
+        for file_path in files or []:
             if os.path.exists(file_path):
                 cmd.extend(["--file", file_path])
             else:
                 logger.warning(f"File not found: {file_path}")
 
-        # Prepare environment
-        env = os.environ.copy()
-        env.update(self.config.env_vars)
+        return cmd
+
+    async def _run_process(
+        self,
+        cmd: List[str],
+        working_dir: Optional[str],
+        prompt: str,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """
+        Spawn Claude Code, send the prompt via stdin and stream its output.
+
+        Args:
+            cmd: Command list
+            working_dir: Working directory for execution
+            prompt: The prompt to send
+            timeout: Timeout in seconds
+
+        Returns:
+            Dictionary with stdout, stderr, exit_code, stdout_truncated,
+            stdout_bytes, stdout_path and json_value.
+
+        Raises:
+            asyncio.TimeoutError: If the process does not finish in time.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=working_dir,
+            env=self._env
+        )
+
+        self._current_process = process
+        invocation_id = _invocation_id.get()
+        if invocation_id is not None:
+            self._executions[invocation_id] = process
+
+        scanner = (
+            JSONStreamScanner(max_value_chars=self.config.max_output_bytes)
+            if self.config.enable_json_parsing else None
+        )
+        stdout_collector = OutputCollector(
+            "stdout",
+            max_memory_bytes=self.config.max_output_bytes,
+            on_line=self._output_callback,
+            scanner=scanner,
+            spill_dir=self.config.spill_directory
+        )
+        stderr_collector = OutputCollector(
+            "stderr",
+            max_memory_bytes=self.config.max_output_bytes,
+            on_line=self._output_callback,
+            spill_dir=self.config.spill_directory
+        )
+
+        async def send_prompt() -> None:
+            process.stdin.write(prompt.encode("utf-8"))
+            await process.stdin.drain()
+            process.stdin.close()
+
+        # Send prompt via stdin while streaming output
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    send_prompt(),
+                    pump_stream(process.stdout, stdout_collector),
+                    pump_stream(process.stderr, stderr_collector),
+                    process.wait()
+                ),
+                timeout=timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Do not leave the CLI running when the caller gives up
+            await self._terminate_process(process)
+            raise
+        finally:
+            self._current_process = None
+            self._executions.pop(invocation_id, None)
+
+        return {
+            "stdout": stdout_collector.get_text(),
+            "stderr": stderr_collector.get_text(),
+            "exit_code": process.returncode,
+            "stdout_truncated": stdout_collector.truncated,
+            "stdout_bytes": stdout_collector.total_bytes,
+            "stdout_path": stdout_collector.spill_path,
+            "json_value": scanner.last_value if scanner else None,
+        }
+
+    async def _run_pooled(
+        self,
+        cmd: List[str],
+        working_dir: Optional[str],
+        prompt: str,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """
+        Send the prompt to a pre-spawned Claude Code process.
+
+        Args:
+            cmd: Command list (pool key together with working_dir)
+            working_dir: Working directory for execution
+            prompt: The prompt to send
+            timeout: Timeout in seconds
+
+        Returns:
+            Dictionary shaped like ``_run_process`` output.
+        """
+        session = await self._session_pool.acquire(cmd, working_dir)
+        self._current_session = session
+        invocation_id = _invocation_id.get()
+        if invocation_id is not None:
+            self._executions[invocation_id] = session
+        try:
+            return await session.run(
+                prompt,
+                timeout=timeout,
+                on_line=self._output_callback,
+                parse_json=self.config.enable_json_parsing
+            )
+        finally:
+            self._current_session = None
+            self._executions.pop(invocation_id, None)
+            await self._session_pool.release(session)
+
+    async def _execute_claude_code(
+        self,
+        prompt: str,
+        working_dir: Optional[str],
+        timeout: int,
+        files: List[str],
+        output_format: str,
+        mode: str = "print",
+        additional_args: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute Claude Code CLI with the given parameters.
+
+        Args:
+            prompt: The prompt to send to Claude Code
+            working_dir: Working directory for execution
+            timeout: Timeout in seconds
+            files: List of file paths to include
+            output_format: Output format (text, json)
+            mode: Execution mode (print, interactive)
+            additional_args: Additional CLI arguments
+
+        Returns:
+            Dictionary with execution result.
+        """
+        start_time = time.time()
+        self._cancelled = False
+
+        cmd = self._build_command(files, output_format, mode, additional_args)
 
         logger.debug(
             f"Executing Claude Code",
@@ -895,35 +1127,19 @@ class ClaudeCodeMCPServer:
         )
 
         try:
-            # Create subprocess with stdin for prompt
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir,
-                env=env
-            )
-
-            self._current_process = process
-
-            # Send prompt via stdin
             try:
-                stdout_data, stderr_data = await asyncio.wait_for(
-                    process.communicate(input=prompt.encode("utf-8")),
-                    timeout=timeout
-                )
+                if self._session_pool is not None and mode == "print":
+                    run = await self._run_pooled(cmd, working_dir, prompt, timeout)
+                else:
+                    run = await self._run_process(cmd, working_dir, prompt, timeout)
             except asyncio.TimeoutError:
-                await self._terminate_process(process)
                 raise ClaudeCodeTimeoutError(
                     timeout=timeout,
                     details={"duration": time.time() - start_time}
                 )
-            finally:
-                self._current_process = None
 
             # Check if cancelled
-            if self._cancelled:
+            if self._cancelled or _invocation_id.get() in self._cancelled_invocations:
                 raise ClaudeCodeError(
                     "Execution was cancelled",
                     retryable=False,
@@ -931,33 +1147,38 @@ class ClaudeCodeMCPServer:
                 )
 
             duration = time.time() - start_time
-            stdout = stdout_data.decode("utf-8", errors="replace")
-            stderr = stderr_data.decode("utf-8", errors="replace")
+            stdout = run["stdout"]
+            stderr = run["stderr"]
+            exit_code = run["exit_code"]
 
             # Check for errors
-            if process.returncode != 0:
-                retryable = self._is_retryable_error(process.returncode, stderr)
-                error_msg = f"Claude Code failed with exit code {process.returncode}"
+            if exit_code != 0:
+                retryable = self._is_retryable_error(exit_code, stderr)
+                error_msg = f"Claude Code failed with exit code {exit_code}"
                 if stderr:
                     error_msg += f": {stderr[:500]}"
 
                 raise ClaudeCodeExecutionError(
                     error_msg,
-                    exit_code=process.returncode,
+                    exit_code=exit_code,
                     stderr=stderr,
                     retryable=retryable
                 )
 
-            # Parse JSON from output if enabled
+            # Parse JSON from output if enabled; spilled output was scanned
+            # incrementally, so use the last complete value seen
             parsed_json = None
             if self.config.enable_json_parsing and stdout:
-                parsed_json = self._parse_json_output(stdout)
+                if run["stdout_truncated"]:
+                    parsed_json = run["json_value"]
+                else:
+                    parsed_json = self._parse_json_output(stdout)
 
             logger.info(
                 f"Claude Code execution completed",
                 extra={
                     "duration": duration,
-                    "exit_code": process.returncode,
+                    "exit_code": exit_code,
                     "has_json": parsed_json is not None,
                 }
             )
@@ -969,9 +1190,12 @@ class ClaudeCodeMCPServer:
                 "error": None,
                 "metadata": {
                     "duration": duration,
-                    "exit_code": process.returncode,
+                    "exit_code": exit_code,
                     "working_directory": working_dir,
                     "files_included": len(files),
+                    "output_bytes": run["stdout_bytes"],
+                    "output_file": run["stdout_path"],
+                    "pooled_session": self._session_pool is not None and mode == "print",
                 }
             }
 
@@ -1069,18 +1293,41 @@ class ClaudeCodeMCPServer:
 
         return None
 
-    async def cancel_execution(self) -> bool:
+    async def cancel_execution(self, invocation_id: Optional[str] = None) -> bool:
         """
-        Cancel any ongoing execution.
+        Cancel an ongoing execution.
+
+        Args:
+            invocation_id: Stop only the call_tool() started with this ID
+                (default: whatever is currently running)
 
         Returns:
             True if cancellation was initiated, False if no execution was running.
         """
+        if invocation_id is not None:
+            execution = self._executions.get(invocation_id)
+            if execution is None:
+                return False
+            logger.info(f"Cancelling Claude Code invocation {invocation_id}")
+            self._cancelled_invocations.add(invocation_id)
+            if isinstance(execution, CLISession):
+                execution.broken = True
+                await execution.close()
+            elif execution.returncode is None:
+                await self._terminate_process(execution)
+            return True
+
         if self._current_process and self._current_process.returncode is None:
             logger.info("Cancelling Claude Code execution")
             self._cancelled = True
             await self._terminate_process(self._current_process)
             return True
+        if self._current_session is not None and self._current_session.alive:
+            logger.info("Cancelling pooled Claude Code session")
+            self._cancelled = True
+            self._current_session.broken = True
+            await self._current_session.close()
+            return True
         return False
 
     def get_server_info(self) -> Dict[str, Any]:
@@ -1109,5 +1356,6 @@ class ClaudeCodeMCPServer:
                 "refactoring",
                 "testing",
                 "documentation"
-            ]
+            ],
+            "session_pool": self._session_pool.get_stats() if self._session_pool else None,
         }
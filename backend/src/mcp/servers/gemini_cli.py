@@ -470,7 +470,8 @@ class GeminiCLIMCPServer(BaseMCPServer):
             },
             metadata={
                 "category": "analysis",
-                "capabilities": ["code_review", "summarization", "explanation", "security_analysis"]
+                "capabilities": ["code_review", "summarization", "explanation", "security_analysis"],
+                "idempotent": True
             }
         )
 
@@ -15,6 +15,8 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+from .ollama_scheduler import OllamaRequestScheduler
+
 
 class MCPToolType(str, Enum):
     """MCP tool types supported by the server"""
@@ -34,6 +36,9 @@ class OllamaServerConfig:
         connect_timeout: Connection timeout in seconds (default: 10)
         max_retries: Maximum retry attempts for failed requests (default: 3)
         retry_delay: Delay between retries in seconds (default: 1.0)
+        num_parallel: Concurrent requests sent to Ollama
+            (default: OLLAMA_NUM_PARALLEL or 4)
+        max_batch: Consecutive requests for one model while others wait (default: 16)
     """
     host: str = "http://localhost:11434"
     default_model: str = "llama3.2:1b"
@@ -41,6 +46,8 @@ class OllamaServerConfig:
     connect_timeout: float = 10.0
     max_retries: int = 3
     retry_delay: float = 1.0
+    num_parallel: Optional[int] = None
+    max_batch: int = 16
 
 
 @dataclass
@@ -51,10 +58,13 @@ class MCPTool:
         name: Tool name (e.g., "ollama.generate")
         description: Human-readable description of the tool
         input_schema: JSON Schema defining the tool's input parameters
+        metadata: Bus-side hints (same keys as ToolDefinition.metadata,
+            e.g. idempotent)
     """
     name: str
     description: str
     input_schema: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to MCP tool format"""
@@ -139,6 +149,12 @@ class OllamaMCPServer:
         self._initialized: bool = False
         self._server_info: Dict[str, Any] = {}
 
+        # Requests are grouped by model and capped at the server's parallelism
+        self._scheduler = OllamaRequestScheduler(
+            max_parallel=self.config.num_parallel,
+            max_batch=self.config.max_batch
+        )
+
         # Define available tools
         self._tools: Dict[str, MCPTool] = {
             MCPToolType.GENERATE: MCPTool(
@@ -169,6 +185,12 @@ class OllamaMCPServer:
                         "system": {
                             "type": "string",
                             "description": "System prompt to prepend"
+                        },
+                        "priority": {
+                            "type": "integer",
+                            "description": "Scheduling priority (1-10, higher first, default: 5)",
+                            "minimum": 1,
+                            "maximum": 10
                         }
                     },
                     "required": ["prompt"]
@@ -213,6 +235,12 @@ class OllamaMCPServer:
                             "type": "integer",
                             "description": "Maximum tokens to generate",
                             "minimum": 1
+                        },
+                        "priority": {
+                            "type": "integer",
+                            "description": "Scheduling priority (1-10, higher first, default: 5)",
+                            "minimum": 1,
+                            "maximum": 10
                         }
                     },
                     "required": ["messages"]
@@ -225,7 +253,8 @@ class OllamaMCPServer:
                     "type": "object",
                     "properties": {},
                     "required": []
-                }
+                },
+                metadata={"idempotent": True}
             )
         }
 
@@ -274,7 +303,8 @@ class OllamaMCPServer:
             "ollama": {
                 "host": self.config.host,
                 "default_model": self.config.default_model,
-                "available_models": health.get("models", [])
+                "available_models": health.get("models", []),
+                "num_parallel": self._scheduler.max_parallel
             }
         }
 
@@ -333,12 +363,17 @@ class OllamaMCPServer:
 
     async def shutdown(self) -> None:
         """Cleanup and close connections"""
+        self._scheduler.close()
         if self._session and not self._session.closed:
             await self._session.close()
         self._session = None
         self._initialized = False
         self._server_info = {}
 
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get request scheduler statistics (queue depth, model switches, waits)"""
+        return self._scheduler.get_stats()
+
     # ==================== Tool Implementations ====================
 
     async def _tool_generate(self, arguments: Dict[str, Any]) -> MCPToolResult:
@@ -378,7 +413,11 @@ class OllamaMCPServer:
         if system:
             payload["system"] = system
 
-        result = await self._make_request_with_retry(url, payload)
+        result = await self._scheduler.submit(
+            model,
+            lambda: self._make_request_with_retry(url, payload),
+            priority=arguments.get("priority", 5)
+        )
 
         if result.get("error"):
             return MCPToolResult.error(
@@ -440,7 +479,11 @@ class OllamaMCPServer:
         if max_tokens:
             payload["options"]["num_predict"] = max_tokens
 
-        result = await self._make_request_with_retry(url, payload)
+        result = await self._scheduler.submit(
+            model,
+            lambda: self._make_request_with_retry(url, payload),
+            priority=arguments.get("priority", 5)
+        )
 
         if result.get("error"):
             return MCPToolResult.error(
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
+from src.tracing import start_span, with_trace_meta
+
 
 class TransportType(str, Enum):
     """Supported transport types."""
@@ -254,13 +256,22 @@ class Transport(ABC):
         Raises:
             TransportError: If the request fails
         """
-        request = JsonRpcRequest(
-            id=self._next_message_id(),
-            method=method,
-            params=params,
-        )
-        await self.send(request)
-        return await self.receive(timeout=timeout)
+        with start_span("mcp.transport.request", self._span_attributes(method)):
+            request = JsonRpcRequest(
+                id=self._next_message_id(),
+                method=method,
+                params=with_trace_meta(params),
+            )
+            await self.send(request)
+            return await self.receive(timeout=timeout)
+
+    def _span_attributes(self, method: str) -> Dict[str, Any]:
+        """Attributes for the span of one JSON-RPC request."""
+        return {
+            "rpc.system": "jsonrpc",
+            "rpc.method": method,
+            "mcp.transport": self._config.transport_type.value,
+        }
 
     async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -14,6 +14,8 @@ import signal
 import sys
 from typing import Any, Dict, List, Optional, Union
 
+from src.tracing import start_span, with_trace_meta
+
 from .base import (
     JsonRpcNotification,
     JsonRpcRequest,
@@ -389,18 +391,19 @@ class STDIOTransport(Transport):
         if not self._connected:
             raise TransportConnectionError("Transport not connected")
 
-        request_id = self._next_message_id()
-        request = JsonRpcRequest(
-            id=request_id,
-            method=method,
-            params=params,
-        )
+        with start_span("mcp.transport.request", self._span_attributes(method)):
+            request_id = self._next_message_id()
+            request = JsonRpcRequest(
+                id=request_id,
+                method=method,
+                params=with_trace_meta(params),
+            )
 
-        # Send the request
-        await self.send(request)
+            # Send the request
+            await self.send(request)
 
-        # Wait for the response
-        return await self._wait_for_response(request_id, timeout)
+            # Wait for the response
+            return await self._wait_for_response(request_id, timeout)
 
     async def close(self) -> None:
         """
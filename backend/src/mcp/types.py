@@ -106,6 +106,14 @@ class ToolDefinition(BaseModel):
     description: str
     input_schema: Dict[str, Any] = Field(default_factory=dict)
     server_name: Optional[str] = None
+    # Bus-side hints, e.g. {"idempotent": True} lets concurrent identical
+    # calls share one execution
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def idempotent(self) -> bool:
+        """Whether identical calls may share one execution and result."""
+        return bool(self.metadata.get("idempotent", False))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to MCP tool format."""
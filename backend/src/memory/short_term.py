@@ -14,6 +14,8 @@ from uuid import UUID
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
+from src.metrics import instrument_redis
+
 from .types import (
     MemoryEvent,
     MemoryEventType,
@@ -64,11 +66,11 @@ class ShortTermMemory:
     async def connect(self) -> None:
         """Connect to Redis."""
         if self._redis is None:
-            self._redis = await redis.from_url(
+            self._redis = instrument_redis(await redis.from_url(
                 self._redis_url,
                 encoding="utf-8",
                 decode_responses=True
-            )
+            ), "short_term_memory")
         self._connected = True
         logger.info("Short-term memory connected to Redis")
 
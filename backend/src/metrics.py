@@ -0,0 +1,193 @@
+"""
+Prometheus Metrics
+
+Process-wide counters, gauges and histograms for backend hot paths,
+exposed in the Prometheus text format on /metrics.
+
+Histograms are in-process (a bucket increment per observation), so they
+are cheap enough for per-request and per-command use. Label values must
+come from small, fixed sets (node types, statuses, command names); never
+use IDs as labels.
+"""
+
+import functools
+import time
+from typing import Any, Callable, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+NAMESPACE = "garageswarm"
+
+# Sub-millisecond to one second: routing, Redis, pool checkout, pull-task
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Tool calls and workflow nodes: tens of milliseconds to tens of minutes
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+DAG_NODE_DURATION = Histogram(
+    "dag_node_duration_seconds",
+    "Workflow node execution time in the DAG executor",
+    ["node_type", "status"],
+    namespace=NAMESPACE,
+    buckets=SLOW_BUCKETS,
+)
+
+ROUTER_DECISION_DURATION = Histogram(
+    "router_decision_duration_seconds",
+    "Time for the intelligent router to pick workers",
+    ["mode"],
+    namespace=NAMESPACE,
+    buckets=FAST_BUCKETS,
+)
+
+PULL_TASK_DURATION = Histogram(
+    "pull_task_duration_seconds",
+    "Latency of the worker pull-task endpoint",
+    namespace=NAMESPACE,
+    buckets=FAST_BUCKETS,
+)
+
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Workers connected over WebSocket",
+    namespace=NAMESPACE,
+)
+
+WEBSOCKET_SENDS_IN_FLIGHT = Gauge(
+    "websocket_sends_in_flight",
+    "Messages handed to WebSocket connections and not yet written",
+    namespace=NAMESPACE,
+)
+
+WEBSOCKET_SEND_DURATION = Histogram(
+    "websocket_send_duration_seconds",
+    "Time to write one message to a worker WebSocket",
+    ["kind"],
+    namespace=NAMESPACE,
+    buckets=FAST_BUCKETS,
+)
+
+MCP_INVOCATION_DURATION = Histogram(
+    "mcp_invocation_duration_seconds",
+    "MCP tool execution time (one observation per actual execution)",
+    ["server", "status"],
+    namespace=NAMESPACE,
+    buckets=SLOW_BUCKETS,
+)
+
+MCP_COALESCED_CALLS = Counter(
+    "mcp_coalesced_calls",
+    "MCP calls served by joining an identical in-flight execution",
+    ["server"],
+    namespace=NAMESPACE,
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round trip time per command or pipeline",
+    ["component", "command"],
+    namespace=NAMESPACE,
+    buckets=FAST_BUCKETS,
+)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time for a database session to obtain a pooled connection",
+    namespace=NAMESPACE,
+    buckets=FAST_BUCKETS,
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    namespace=NAMESPACE,
+)
+
+
+def time_async(histogram: Histogram, **labels: str) -> Callable:
+    """
+    Decorator observing the duration of an async function.
+
+    Histogram.time() only measures coroutine creation when used on an
+    async function, so coroutines need their own wrapper.
+
+    Args:
+        histogram: Histogram to observe into
+        **labels: Fixed label values
+
+    Returns:
+        Decorator
+    """
+    child = histogram.labels(**labels) if labels else histogram
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+def instrument_redis(client: Any, component: str) -> Any:
+    """
+    Time every command and pipeline of a redis.asyncio client.
+
+    Args:
+        client: Redis client
+        component: Label naming the owner (e.g. "review", "checkpoints")
+
+    Returns:
+        The same client
+    """
+    execute_command = client.execute_command
+    pipeline = client.pipeline
+
+    async def timed_execute_command(*args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await execute_command(*args, **options)
+        finally:
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            REDIS_COMMAND_DURATION.labels(component, command).observe(time.perf_counter() - start)
+
+    def timed_pipeline(*args: Any, **kwargs: Any) -> Any:
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+        command = "MULTI" if pipe.is_transaction else "PIPELINE"
+
+        async def timed_execute(*exec_args: Any, **exec_kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await execute(*exec_args, **exec_kwargs)
+            finally:
+                REDIS_COMMAND_DURATION.labels(component, command).observe(time.perf_counter() - start)
+
+        pipe.execute = timed_execute
+        return pipe
+
+    client.execute_command = timed_execute_command
+    client.pipeline = timed_pipeline
+    return client
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text exposition format.
+
+    Returns:
+        (payload, content type)
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
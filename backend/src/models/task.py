@@ -91,6 +91,20 @@ class Task(Base):
         comment="Task priority (1-10, higher = more urgent)",
     )
 
+    # Deadline-aware scheduling (EDF within priority)
+    deadline = Column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        index=True,
+        comment="Completion deadline (explicit or from the SLO class)",
+    )
+
+    slo_class = Column(
+        String(20),
+        nullable=True,
+        comment="SLO class (interactive, standard, batch)",
+    )
+
     task_metadata = Column(
         JSONB,
         nullable=True,
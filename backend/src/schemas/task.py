@@ -5,7 +5,7 @@ Request and response models for task endpoints.
 """
 
 from datetime import datetime
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -17,6 +17,8 @@ class TaskCreate(BaseModel):
     description: str = Field(..., min_length=1, max_length=10000)
     tool_preference: Optional[str] = Field(None, max_length=50)
     priority: int = Field(default=5, ge=1, le=10)
+    deadline: Optional[datetime] = Field(None, description="Completion deadline (overrides slo_class)")
+    slo_class: Optional[Literal["interactive", "standard", "batch"]] = None
     workflow_id: Optional[UUID] = None
     metadata: Optional[Dict[str, Any]] = None
 
@@ -43,6 +45,8 @@ class TaskResponse(BaseModel):
     status: str
     progress: int
     priority: int
+    deadline: Optional[datetime] = None
+    slo_class: Optional[str] = None
     tool_preference: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
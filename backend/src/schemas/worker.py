@@ -74,6 +74,7 @@ class TaskCompleteRequest(BaseModel):
 
     task_id: UUID
     result: Dict[str, Any] = Field(default_factory=dict)
+    execution_time_ms: Optional[int] = Field(None, ge=0, description="Execution time in milliseconds")
 
 
 class TaskFailedRequest(BaseModel):
@@ -83,6 +84,13 @@ class TaskFailedRequest(BaseModel):
     error: str
 
 
+class TaskProgressReport(BaseModel):
+    """Task progress update from worker."""
+
+    progress: int = Field(..., ge=0, le=100, description="Progress percentage (0-100)")
+    message: Optional[str] = None
+
+
 class TaskResultReport(BaseModel):
     """Task result report from worker - unified completion/failure reporting."""
 
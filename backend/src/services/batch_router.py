@@ -0,0 +1,349 @@
+"""
+Batch Task Assignment
+
+Assigns a batch of pending tasks to workers in one solve instead of one
+greedy decision per task:
+
+- build_score_matrix(): task x worker scores from per-task and per-worker
+  factor vectors (same factors and weights as IntelligentRouter)
+- assign_greedy(): vectorized proposal rounds; every open task proposes to
+  its best worker with free capacity and each worker keeps the best
+  proposals (priority first, then score) up to its capacity
+- assign_optimal(): maximum total utility assignment (Hungarian algorithm
+  over worker capacity slots) for small batches
+"""
+
+import logging
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tools that can stand in for one another (with a reduced capability score)
+SIMILAR_TOOLS: Dict[str, Sequence[str]] = {
+    "claude_code": ["codex_cli", "gemini_cli"],
+    "gemini_cli": ["claude_code", "codex_cli"],
+    "ollama": ["gemini_cli"],
+}
+SIMILAR_TOOL_SCORE = 0.7
+
+# Batches up to this many task x slot cells use the exact solver in "auto" mode
+OPTIMAL_MAX_CELLS = 10_000
+
+# Cost used for infeasible pairs inside the Hungarian solver
+_INFEASIBLE_COST = 1e9
+
+
+def capability_matrix(
+    task_tools: Sequence[Optional[str]],
+    worker_tools: Sequence[Sequence[str]]
+) -> np.ndarray:
+    """
+    Capability scores for every task/worker pair.
+
+    Args:
+        task_tools: Required tool per task (None = any worker)
+        worker_tools: Tools supported by each worker
+
+    Returns:
+        T x W matrix: 1.0 exact match (or no requirement), 0.7 similar tool, else 0.0
+    """
+    vocabulary: Dict[str, int] = {}
+    for tools in worker_tools:
+        for tool in tools or []:
+            vocabulary.setdefault(tool, len(vocabulary))
+    for tool in task_tools:
+        if tool:
+            vocabulary.setdefault(tool, len(vocabulary))
+
+    supports = np.zeros((len(worker_tools), len(vocabulary)), dtype=bool)
+    for w, tools in enumerate(worker_tools):
+        for tool in tools or []:
+            supports[w, vocabulary[tool]] = True
+
+    # Per-task rows: exact tool and acceptable substitutes
+    exact = np.zeros((len(task_tools), len(vocabulary)), dtype=bool)
+    similar = np.zeros_like(exact)
+    generic = np.zeros(len(task_tools), dtype=bool)
+    for t, tool in enumerate(task_tools):
+        if not tool:
+            generic[t] = True
+            continue
+        exact[t, vocabulary[tool]] = True
+        for alt in SIMILAR_TOOLS.get(tool, ()):
+            if alt in vocabulary:
+                similar[t, vocabulary[alt]] = True
+
+    supports_f = supports.T.astype(np.float32)
+    scores = np.where(similar.astype(np.float32) @ supports_f > 0, SIMILAR_TOOL_SCORE, 0.0)
+    scores = np.where(exact.astype(np.float32) @ supports_f > 0, 1.0, scores)
+    scores[generic] = 1.0
+    return scores
+
+
+def build_score_matrix(
+    task_tools: Sequence[Optional[str]],
+    worker_tools: Sequence[Sequence[str]],
+    weights: Mapping[str, float],
+    success: np.ndarray,
+    load: np.ndarray,
+    latency: np.ndarray,
+    cost: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the weighted task x worker score matrix.
+
+    Only exact tool matches are feasible, as in IntelligentRouter's
+    candidate filter; infeasible pairs score -inf.
+
+    Args:
+        task_tools: Required tool per task
+        worker_tools: Tools supported by each worker
+        weights: Factor weights (RoutingFactors fields)
+        success: Historical success score per worker (W)
+        load: Current load score per worker (W)
+        latency: Latency score per worker (W) or per task/worker pair (T x W)
+        cost: Cost efficiency score per task (T)
+
+    Returns:
+        Tuple of (scores, capability), both T x W
+    """
+    capability = capability_matrix(task_tools, worker_tools)
+
+    worker_part = (
+        weights["historical_success"] * np.asarray(success, dtype=np.float64)
+        + weights["current_load"] * np.asarray(load, dtype=np.float64)
+    )
+    latency_part = weights["latency_estimate"] * np.atleast_2d(np.asarray(latency, dtype=np.float64))
+    task_part = weights["cost_efficiency"] * np.asarray(cost, dtype=np.float64)
+
+    scores = (
+        weights["capability_match"] * capability
+        + worker_part[np.newaxis, :]
+        + latency_part
+        + task_part[:, np.newaxis]
+    )
+    scores[capability < 1.0] = -np.inf
+    return scores, capability
+
+
+def _normalize_inputs(
+    scores: np.ndarray,
+    capacity: Sequence[int],
+    priorities: Optional[Sequence[int]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Coerce solver inputs to arrays."""
+    scores = np.asarray(scores, dtype=np.float64)
+    capacity = np.maximum(np.asarray(capacity, dtype=np.int64), 0)
+    if priorities is None:
+        priorities = np.zeros(scores.shape[0], dtype=np.int64)
+    else:
+        priorities = np.asarray(priorities, dtype=np.int64)
+    return scores, capacity, priorities
+
+
+def assign_greedy(
+    scores: np.ndarray,
+    capacity: Sequence[int],
+    priorities: Optional[Sequence[int]] = None
+) -> np.ndarray:
+    """
+    Greedy batch assignment in vectorized proposal rounds.
+
+    Args:
+        scores: T x W score matrix (-inf = infeasible)
+        capacity: Free slots per worker (W)
+        priorities: Task priorities (T, higher = more urgent)
+
+    Returns:
+        Worker index per task, -1 if unassigned
+    """
+    scores, remaining, priorities = _normalize_inputs(scores, capacity, priorities)
+    num_tasks = scores.shape[0]
+    assignment = np.full(num_tasks, -1, dtype=np.int64)
+    if num_tasks == 0 or scores.shape[1] == 0:
+        return assignment
+
+    # Working copy (float32 halves the memory scanned per round); columns of
+    # full workers are masked out as they fill
+    available = scores.astype(np.float32)
+    available[:, remaining <= 0] = -np.inf
+    best = available.argmax(axis=1)
+    stuck = np.zeros(num_tasks, dtype=bool)
+
+    open_tasks = np.arange(num_tasks)
+    while open_tasks.size:
+        choice = best[open_tasks]
+        value = available[open_tasks, choice]
+        proposing = np.isfinite(value)
+        # Tasks with no feasible worker left can never be placed
+        stuck[open_tasks[~proposing]] = True
+        if not proposing.any():
+            break
+
+        tasks = open_tasks[proposing]
+        workers = choice[proposing]
+        values = value[proposing]
+
+        # Workers with enough room take every proposal; the rest keep the
+        # best ones by priority, then score
+        proposals = np.bincount(workers, minlength=remaining.size)
+        contested = (proposals > remaining)[workers]
+        accepted = ~contested
+        if contested.any():
+            idx = np.flatnonzero(contested)
+            order = idx[np.lexsort((-values[idx], -priorities[tasks[idx]], workers[idx]))]
+            grouped = workers[order]
+            starts = np.flatnonzero(np.concatenate(([True], grouped[1:] != grouped[:-1])))
+            rank = np.arange(order.size) - np.repeat(starts, np.diff(np.append(starts, order.size)))
+            accepted[order[rank < remaining[grouped]]] = True
+
+        assignment[tasks[accepted]] = workers[accepted]
+        remaining -= np.bincount(workers[accepted], minlength=remaining.size)
+
+        # Mask newly full workers and re-pick only for tasks that wanted them
+        full = remaining <= 0
+        newly_full = np.flatnonzero(full & (proposals > 0))
+        if newly_full.size:
+            available[:, newly_full] = -np.inf
+        open_tasks = np.flatnonzero((assignment < 0) & ~stuck)
+        redo = open_tasks[full[best[open_tasks]]]
+        if redo.size:
+            best[redo] = available[redo].argmax(axis=1)
+
+    return assignment
+
+
+def _linear_sum_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Minimum-cost assignment of rows to distinct columns (rows <= columns).
+
+    Shortest augmenting path Hungarian algorithm, O(n^2 m) with the inner
+    loop vectorized over columns.
+
+    Returns:
+        Column index per row
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # row (1-based) assigned to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free[1:] & (reduced < min_reduced[1:])
+            min_reduced[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+
+            candidates = np.where(free, min_reduced, np.inf)
+            j1 = int(candidates.argmin())
+            delta = candidates[j1]
+
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_reduced[free] -= delta
+
+            j0 = j1
+            if owner[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    result = np.full(n, -1, dtype=np.int64)
+    assigned = np.flatnonzero(owner[1:])
+    result[owner[1:][assigned] - 1] = assigned
+    return result
+
+
+def assign_optimal(
+    scores: np.ndarray,
+    capacity: Sequence[int],
+    priorities: Optional[Sequence[int]] = None
+) -> np.ndarray:
+    """
+    Assignment maximizing total utility (Hungarian over capacity slots).
+
+    Utility is score plus priority, so when slots are short higher-priority
+    tasks are placed first and score decides among equal priorities.
+
+    Args:
+        scores: T x W score matrix (-inf = infeasible)
+        capacity: Free slots per worker (W)
+        priorities: Task priorities (T, higher = more urgent)
+
+    Returns:
+        Worker index per task, -1 if unassigned
+    """
+    scores, capacity, priorities = _normalize_inputs(scores, capacity, priorities)
+    num_tasks = scores.shape[0]
+    assignment = np.full(num_tasks, -1, dtype=np.int64)
+
+    # One column per free slot; a worker never needs more slots than tasks
+    slot_worker = np.repeat(np.arange(scores.shape[1]), np.minimum(capacity, num_tasks))
+    if num_tasks == 0 or slot_worker.size == 0:
+        return assignment
+
+    utility = scores[:, slot_worker] + priorities[:, np.newaxis]
+    feasible = np.isfinite(utility)
+    if not feasible.any():
+        return assignment
+    # Shift so every feasible utility is positive, then minimize its negation
+    utility = utility - utility[feasible].min() + 1.0
+    cost = np.where(feasible, -utility, _INFEASIBLE_COST)
+
+    if num_tasks <= slot_worker.size:
+        slots = _linear_sum_assignment(cost)
+        tasks = np.arange(num_tasks)
+    else:
+        tasks = _linear_sum_assignment(cost.T)
+        slots = np.arange(slot_worker.size)
+
+    valid = (tasks >= 0) & (slots >= 0)
+    tasks, slots = tasks[valid], slots[valid]
+    ok = feasible[tasks, slots]
+    assignment[tasks[ok]] = slot_worker[slots[ok]]
+    return assignment
+
+
+def assign(
+    scores: np.ndarray,
+    capacity: Sequence[int],
+    priorities: Optional[Sequence[int]] = None,
+    method: str = "auto"
+) -> np.ndarray:
+    """
+    Assign a batch of tasks to workers.
+
+    Args:
+        scores: T x W score matrix (-inf = infeasible)
+        capacity: Free slots per worker (W)
+        priorities: Task priorities (T, higher = more urgent)
+        method: "greedy", "optimal" or "auto" (optimal for small batches)
+
+    Returns:
+        Worker index per task, -1 if unassigned
+    """
+    if method == "auto":
+        slots = int(np.minimum(np.maximum(capacity, 0), len(scores)).sum()) if len(scores) else 0
+        method = "optimal" if len(scores) * slots <= OPTIMAL_MAX_CELLS else "greedy"
+
+    if method == "optimal":
+        return assign_optimal(scores, capacity, priorities)
+    if method == "greedy":
+        return assign_greedy(scores, capacity, priorities)
+    raise ValueError(f"Unknown assignment method: {method}")
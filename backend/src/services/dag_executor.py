@@ -13,13 +13,23 @@ Integrates with the MCP Bus for tool execution and provides:
 """
 
 import asyncio
+import time
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
+from opentelemetry.trace import Status, StatusCode
+
 from src.logging_config import get_logger
 from src.mcp import get_mcp_bus, ToolResult, ToolResultStatus
+from src.metrics import DAG_NODE_DURATION
+from src.tracing import start_span
+from src.services.deadline_scheduler import (
+    remaining_critical_path_seconds,
+    resolve_deadline,
+    slack_seconds,
+)
 from src.workflows.graph import WorkflowGraph
 from src.workflows.nodes import (
     BaseNode,
@@ -34,6 +44,9 @@ from src.workflows.nodes import (
     SubflowNode,
     TaskNode,
 )
+from src.workflows.hedging import HedgeBudget
+from src.workflows.prompt_template import render_prompt
+from src.workflows.result_cache import ResultCache, get_result_cache, make_cache_key
 from src.workflows.state import WorkflowContext, WorkflowState
 from src.workflows.executor import (
     NodeExecutor,
@@ -68,6 +81,11 @@ class WorkflowCancelledError(DAGExecutionError):
     pass
 
 
+class DeadlineExceededError(DAGExecutionError):
+    """Raised when a workflow that sheds hopeless work cannot meet its deadline."""
+    pass
+
+
 class CycleDetectedError(DAGExecutionError):
     """Raised when a cycle is detected in the workflow graph."""
     pass
@@ -118,6 +136,7 @@ class DAGExecutor:
     - MCP Bus integration for tool execution
     - State management and persistence
     - Integration with NodeExecutor for robust node execution
+    - Deadline tracking (slack along the remaining critical path)
 
     Usage:
         executor = DAGExecutor()
@@ -132,6 +151,7 @@ class DAGExecutor:
         retry_delay: float = 1.0,
         node_executor: Optional[NodeExecutor] = None,
         llm_router: Optional[Callable] = None,
+        result_cache: Optional[ResultCache] = None,
     ):
         """
         Initialize the DAG executor.
@@ -143,20 +163,32 @@ class DAGExecutor:
             retry_delay: Default delay between retries in seconds
             node_executor: Optional NodeExecutor instance for node execution
             llm_router: Optional LLM router callback for RouterNode decisions
+            result_cache: Cache for task nodes with ``cache`` enabled
+                (defaults to the shared instance)
         """
         self._max_parallel_branches = max_parallel_branches
         self._default_timeout = default_timeout
         self._max_retries = max_retries
         self._retry_delay = retry_delay
 
+        # Result cache consulted before invoking tools for cacheable nodes
+        # (None resolves to the shared instance at use time)
+        self._result_cache = result_cache
+
         # Node executor for individual node execution
-        self._node_executor = node_executor or NodeExecutor(llm_router=llm_router)
+        self._node_executor = node_executor or NodeExecutor(
+            llm_router=llm_router,
+            result_cache=result_cache,
+        )
         self._llm_router = llm_router
 
         # Execution tracking
         self._running_workflows: Dict[str, asyncio.Task] = {}
         self._cancel_flags: Dict[str, bool] = {}
         self._pause_flags: Dict[str, bool] = {}
+        self._hedge_budgets: Dict[str, HedgeBudget] = {}
+        self._deadlines: Dict[str, datetime] = {}
+        self._deadline_at_risk: Set[str] = set()
 
         # Event handlers
         self._event_handlers: Dict[str, List[Callable]] = defaultdict(list)
@@ -219,6 +251,10 @@ class DAGExecutor:
         # Initialize tracking
         self._cancel_flags[workflow_id] = False
         self._pause_flags[workflow_id] = False
+        self._hedge_budgets[workflow_id] = HedgeBudget(max_hedges=context.hedge_budget)
+        deadline = resolve_deadline(context.created_at, context.deadline, context.slo_class)
+        if deadline is not None:
+            self._deadlines[workflow_id] = deadline
 
         result = ExecutionResult(
             workflow_id=workflow_id,
@@ -227,82 +263,94 @@ class DAGExecutor:
         )
         result.started_at = datetime.utcnow()
 
-        try:
-            # Get topological order
-            execution_order = graph.topological_sort()
-            logger.debug(
-                "Computed execution order",
-                workflow_id=workflow_id,
-                order=execution_order,
-            )
+        with start_span(
+            "workflow.execute",
+            {"workflow.id": workflow_id, "workflow.name": context.workflow_name},
+            carrier=context.trace,
+        ) as span:
+            try:
+                # Get topological order
+                execution_order = graph.topological_sort()
+                logger.debug(
+                    "Computed execution order",
+                    workflow_id=workflow_id,
+                    order=execution_order,
+                )
 
-            # Execute the graph
-            await self._execute_graph(
-                graph=graph,
-                state=state,
-                context=context,
-                execution_order=execution_order,
-            )
+                # Execute the graph
+                await self._execute_graph(
+                    graph=graph,
+                    state=state,
+                    context=context,
+                    execution_order=execution_order,
+                )
 
-            # Check final status
-            if self._cancel_flags.get(workflow_id):
-                result.status = "cancelled"
-                logger.info("Workflow cancelled", workflow_id=workflow_id)
-            elif self._pause_flags.get(workflow_id):
-                result.status = "paused"
-                result.paused_at = state.current_node
-                logger.info(
-                    "Workflow paused",
-                    workflow_id=workflow_id,
-                    paused_at=result.paused_at,
+                # Check final status
+                if self._cancel_flags.get(workflow_id):
+                    result.status = "cancelled"
+                    logger.info("Workflow cancelled", workflow_id=workflow_id)
+                elif self._pause_flags.get(workflow_id):
+                    result.status = "paused"
+                    result.paused_at = state.current_node
+                    logger.info(
+                        "Workflow paused",
+                        workflow_id=workflow_id,
+                        paused_at=result.paused_at,
+                    )
+                else:
+                    result.status = "completed"
+                    logger.info(
+                        "Workflow completed successfully",
+                        workflow_id=workflow_id,
+                        completed_nodes=len(state.completed_nodes),
+                    )
+
+                result.completed_at = datetime.utcnow()
+                await self._emit_event(
+                    "workflow_completed",
+                    {"workflow_id": workflow_id, "status": result.status},
                 )
-            else:
-                result.status = "completed"
+
+            except WorkflowPausedError as e:
+                result.status = "paused"
+                result.paused_at = e.node_id
                 logger.info(
-                    "Workflow completed successfully",
+                    "Workflow paused for review",
                     workflow_id=workflow_id,
-                    completed_nodes=len(state.completed_nodes),
+                    paused_at=e.node_id,
                 )
 
-            result.completed_at = datetime.utcnow()
-            await self._emit_event(
-                "workflow_completed",
-                {"workflow_id": workflow_id, "status": result.status},
-            )
-
-        except WorkflowPausedError as e:
-            result.status = "paused"
-            result.paused_at = e.node_id
-            logger.info(
-                "Workflow paused for review",
-                workflow_id=workflow_id,
-                paused_at=e.node_id,
-            )
+            except WorkflowCancelledError:
+                result.status = "cancelled"
+                result.completed_at = datetime.utcnow()
+                logger.info("Workflow execution cancelled", workflow_id=workflow_id)
 
-        except WorkflowCancelledError:
-            result.status = "cancelled"
-            result.completed_at = datetime.utcnow()
-            logger.info("Workflow execution cancelled", workflow_id=workflow_id)
+            except Exception as e:
+                result.status = "failed"
+                result.error = str(e)
+                result.completed_at = datetime.utcnow()
+                logger.error(
+                    "Workflow execution failed",
+                    workflow_id=workflow_id,
+                    error=str(e),
+                    exc_info=True,
+                )
+                await self._emit_event(
+                    "workflow_failed",
+                    {"workflow_id": workflow_id, "error": str(e)},
+                )
 
-        except Exception as e:
-            result.status = "failed"
-            result.error = str(e)
-            result.completed_at = datetime.utcnow()
-            logger.error(
-                "Workflow execution failed",
-                workflow_id=workflow_id,
-                error=str(e),
-                exc_info=True,
-            )
-            await self._emit_event(
-                "workflow_failed",
-                {"workflow_id": workflow_id, "error": str(e)},
-            )
+            finally:
+                # Cleanup
+                self._cancel_flags.pop(workflow_id, None)
+                self._pause_flags.pop(workflow_id, None)
+                self._hedge_budgets.pop(workflow_id, None)
+                self._deadlines.pop(workflow_id, None)
+                self._deadline_at_risk.discard(workflow_id)
 
-        finally:
-            # Cleanup
-            self._cancel_flags.pop(workflow_id, None)
-            self._pause_flags.pop(workflow_id, None)
+            span.set_attribute("workflow.status", result.status)
+            if result.status == "failed":
+                span.set_status(Status(StatusCode.ERROR, result.error))
 
         return result
 
@@ -364,6 +412,9 @@ class DAGExecutor:
 
             state.current_node = current_id
 
+            if node.node_type == NodeType.TASK:
+                await self._check_deadline(graph, state, context)
+
             logger.info(
                 "Executing node",
                 workflow_id=workflow_id,
@@ -372,65 +423,151 @@ class DAGExecutor:
                 node_name=node.name,
             )
 
-            try:
-                # Execute based on node type
-                if node.node_type == NodeType.PARALLEL:
-                    await self._handle_parallel_node(
-                        node, graph, state, context, ready_queue,
-                        active_parallel, parallel_results, in_degree
+            with start_span(
+                "workflow.node",
+                {"node.id": current_id, "node.type": node.node_type.value, "node.name": node.name},
+                record_exception=False,
+            ) as node_span:
+                node_started = time.perf_counter()
+                node_status = "failed"
+                try:
+                    # Execute based on node type
+                    if node.node_type == NodeType.PARALLEL:
+                        await self._handle_parallel_node(
+                            node, graph, state, context, ready_queue,
+                            active_parallel, parallel_results, in_degree
+                        )
+                    elif node.node_type == NodeType.JOIN:
+                        await self._handle_join_node(
+                            node, state, active_parallel, parallel_results
+                        )
+                        self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
+                    elif node.node_type == NodeType.CONDITION:
+                        next_node = await self._handle_condition_node(node, state)
+                        if next_node:
+                            # Skip normal flow, go to specific branch
+                            self._add_to_ready_queue(next_node, ready_queue, state)
+                        state.mark_completed(current_id)
+                    elif node.node_type == NodeType.HUMAN_REVIEW:
+                        await self._handle_human_review_node(node, state, workflow_id)
+                    elif node.node_type == NodeType.LOOP:
+                        next_node = await self._handle_loop_node(node, state)
+                        if next_node:
+                            self._add_to_ready_queue(next_node, ready_queue, state)
+                        # Don't mark completed until loop exits
+                    elif node.node_type == NodeType.ROUTER:
+                        next_node = await self._handle_router_node(node, state, context)
+                        if next_node:
+                            self._add_to_ready_queue(next_node, ready_queue, state)
+                        state.mark_completed(current_id)
+                    elif node.node_type == NodeType.SUBFLOW:
+                        await self._handle_subflow_node(node, state, context)
+                        state.mark_completed(current_id)
+                        self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
+                    elif node.node_type == NodeType.TASK:
+                        output = await self._execute_task_node(node, state, context)
+                        state.mark_completed(current_id, output)
+                        self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
+                    else:
+                        # Default handling for unknown types
+                        output = await node.execute(state.outputs)
+                        state.mark_completed(current_id, output)
+                        self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
+
+                    node_status = "completed"
+                    await self._emit_event(
+                        "node_completed",
+                        {
+                            "workflow_id": workflow_id,
+                            "node_id": current_id,
+                            "node_type": node.node_type.value,
+                        },
                     )
-                elif node.node_type == NodeType.JOIN:
-                    await self._handle_join_node(
-                        node, state, active_parallel, parallel_results
+
+                except WorkflowPausedError:
+                    node_status = "paused"
+                    raise
+                except WorkflowCancelledError:
+                    node_status = "cancelled"
+                    raise
+                except Exception as e:
+                    await self._handle_node_error(node, state, e, ready_queue, graph, in_degree)
+                finally:
+                    DAG_NODE_DURATION.labels(node.node_type.value, node_status).observe(
+                        time.perf_counter() - node_started
                     )
-                    self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
-                elif node.node_type == NodeType.CONDITION:
-                    next_node = await self._handle_condition_node(node, state)
-                    if next_node:
-                        # Skip normal flow, go to specific branch
-                        self._add_to_ready_queue(next_node, ready_queue, state)
-                    state.mark_completed(current_id)
-                elif node.node_type == NodeType.HUMAN_REVIEW:
-                    await self._handle_human_review_node(node, state, workflow_id)
-                elif node.node_type == NodeType.LOOP:
-                    next_node = await self._handle_loop_node(node, state)
-                    if next_node:
-                        self._add_to_ready_queue(next_node, ready_queue, state)
-                    # Don't mark completed until loop exits
-                elif node.node_type == NodeType.ROUTER:
-                    next_node = await self._handle_router_node(node, state, context)
-                    if next_node:
-                        self._add_to_ready_queue(next_node, ready_queue, state)
-                    state.mark_completed(current_id)
-                elif node.node_type == NodeType.SUBFLOW:
-                    await self._handle_subflow_node(node, state, context)
-                    state.mark_completed(current_id)
-                    self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
-                elif node.node_type == NodeType.TASK:
-                    output = await self._execute_task_node(node, state, context)
-                    state.mark_completed(current_id, output)
-                    self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
-                else:
-                    # Default handling for unknown types
-                    output = await node.execute(state.outputs)
-                    state.mark_completed(current_id, output)
-                    self._update_ready_queue(graph, current_id, in_degree, ready_queue, state)
+                    node_span.set_attribute("node.status", node_status)
+                    if node_status == "failed":
+                        node_span.set_status(Status(StatusCode.ERROR))
 
-                await self._emit_event(
-                    "node_completed",
-                    {
-                        "workflow_id": workflow_id,
-                        "node_id": current_id,
-                        "node_type": node.node_type.value,
-                    },
-                )
+    def _estimate_node_seconds(self, node: BaseNode) -> float:
+        """
+        Historical p50 duration of a task node's tool.
 
-            except WorkflowPausedError:
-                raise
-            except WorkflowCancelledError:
-                raise
-            except Exception as e:
-                await self._handle_node_error(node, state, e, ready_queue, graph, in_degree)
+        Nodes without history count as 0s: their timeout is an upper bound,
+        not an expected duration, and would make healthy workflows look
+        hopeless. The remaining critical path is then a lower bound.
+        """
+        if not isinstance(node, TaskNode):
+            return 0.0
+        p50 = self._node_executor.duration_history.quantile(node.tool_path, 0.5)
+        return p50 if p50 is not None else 0.0
+
+    async def _check_deadline(
+        self,
+        graph: WorkflowGraph,
+        state: WorkflowState,
+        context: WorkflowContext,
+    ) -> None:
+        """
+        Check the workflow's slack before starting a task node.
+
+        Slack is the time to the deadline minus the remaining critical path,
+        estimated from historical node durations (tools without history do
+        not count, so only observed durations shed work). The first time it
+        turns negative a "workflow_deadline_at_risk" event is emitted;
+        workflows with ``shed_hopeless`` are aborted instead of occupying
+        workers.
+
+        Raises:
+            DeadlineExceededError: If the deadline cannot be met and the
+                workflow sheds hopeless work
+        """
+        workflow_id = str(context.workflow_id)
+        deadline = self._deadlines.get(workflow_id)
+        if deadline is None:
+            return
+
+        remaining = remaining_critical_path_seconds(
+            graph, state.completed_nodes, self._estimate_node_seconds
+        )
+        slack = slack_seconds(deadline, remaining, datetime.now(timezone.utc))
+        if slack >= 0:
+            return
+
+        if context.shed_hopeless:
+            raise DeadlineExceededError(
+                f"Deadline {deadline.isoformat()} cannot be met "
+                f"({remaining:.0f}s of work remaining, slack {slack:.0f}s)",
+                state.current_node,
+            )
+
+        if workflow_id not in self._deadline_at_risk:
+            self._deadline_at_risk.add(workflow_id)
+            logger.warning(
+                "Workflow deadline at risk",
+                workflow_id=workflow_id,
+                deadline=deadline.isoformat(),
+                slack_seconds=round(slack, 1),
+            )
+            await self._emit_event(
+                "workflow_deadline_at_risk",
+                {
+                    "workflow_id": workflow_id,
+                    "deadline": deadline.isoformat(),
+                    "slack_seconds": slack,
+                },
+            )
 
     def _update_ready_queue(
         self,
@@ -483,6 +620,7 @@ class DAGExecutor:
             max_retries=node.max_retries,
             debug=context.debug,
             llm_router=self._llm_router,
+            hedge_budget=self._hedge_budgets.get(str(context.workflow_id)),
             metadata=context.metadata,
         )
 
@@ -508,12 +646,31 @@ class DAGExecutor:
             resolved_inputs = node.resolve_inputs(state.outputs)
             arguments = {**node.arguments, **resolved_inputs}
 
+            cache_key: Optional[str] = None
+            if node.cache:
+                dependencies = {key: state.outputs.get(key) for key in node.cache_dependencies}
+                cache_key = make_cache_key(
+                    f"agent:{node.agent_config.get('tool', 'claude_code')}",
+                    {"config": node.agent_config, "inputs": arguments},
+                    dependencies,
+                )
+                hit, cached = await (self._result_cache or get_result_cache()).get(cache_key)
+                if hit:
+                    logger.info("Task served from result cache", node_id=node.id)
+                    node.status = NodeStatus.COMPLETED
+                    node.completed_at = datetime.utcnow()
+                    return cached
+
             output = await self._execute_legacy_agent(
                 config=node.agent_config,
                 inputs=arguments,
                 context=context,
             )
 
+            failed = isinstance(output, dict) and "error" in output
+            if cache_key is not None and not failed:
+                await (self._result_cache or get_result_cache()).set(cache_key, output, ttl=node.cache_ttl)
+
             node.status = NodeStatus.COMPLETED
             node.completed_at = datetime.utcnow()
             return output
@@ -651,17 +808,8 @@ class DAGExecutor:
             return {"error": str(e), "status": "failed"}
 
     def _build_prompt(self, template: str, context: Dict[str, Any]) -> str:
-        """Build prompt from template and context variables."""
-        if not template:
-            return str(context)
-
-        result = template
-        for key, value in context.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
-
-        return result
+        """Build prompt from template and context variables (compiled once per template)."""
+        return render_prompt(template, context)
 
     async def _handle_parallel_node(
         self,
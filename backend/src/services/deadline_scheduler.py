@@ -0,0 +1,190 @@
+"""
+Deadline-Aware Scheduling
+
+Orders work earliest-deadline-first (EDF) within a priority level:
+
+- Deadlines are explicit or derived from an SLO class (creation + target)
+- Slack = deadline - now - estimated remaining time, where the estimate
+  comes from historical durations (latency model p50 per tool for tasks,
+  critical path of p50 node durations for workflows)
+- Work with negative slack cannot meet its deadline anyway; it is moved
+  behind feasible work of the same priority instead of delaying it too
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.services.latency_model import LatencyModel, get_latency_model
+
+logger = logging.getLogger(__name__)
+
+# Completion target per SLO class, measured from creation
+SLO_CLASSES: Dict[str, timedelta] = {
+    "interactive": timedelta(minutes=5),
+    "standard": timedelta(hours=1),
+    "batch": timedelta(hours=24),
+}
+
+# Service time assumed for tools without history
+DEFAULT_SERVICE_SECONDS = 60.0
+
+DEFAULT_PRIORITY = 5
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive timestamps (datetime.utcnow()) as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def resolve_deadline(
+    created_at: datetime,
+    deadline: Optional[datetime] = None,
+    slo_class: Optional[str] = None
+) -> Optional[datetime]:
+    """
+    Effective deadline of a task or workflow.
+
+    Args:
+        created_at: Creation time
+        deadline: Explicit deadline (wins over the SLO class)
+        slo_class: SLO class name (see SLO_CLASSES)
+
+    Returns:
+        Deadline, or None for best-effort work
+
+    Raises:
+        ValueError: If the SLO class is unknown
+    """
+    if deadline is not None:
+        return _as_utc(deadline)
+    if slo_class is None:
+        return None
+    if slo_class not in SLO_CLASSES:
+        raise ValueError(f"Unknown SLO class: {slo_class}")
+    return _as_utc(created_at) + SLO_CLASSES[slo_class]
+
+
+def estimate_service_seconds(
+    tool: Optional[str],
+    latency_model: Optional[LatencyModel] = None
+) -> float:
+    """Fleet-wide p50 service time for a tool, or the default without history."""
+    p50_ms = (latency_model or get_latency_model()).fleet_p50_ms(tool)
+    return p50_ms / 1000 if p50_ms is not None else DEFAULT_SERVICE_SECONDS
+
+
+def slack_seconds(
+    deadline: Optional[datetime],
+    remaining_seconds: float,
+    now: Optional[datetime] = None
+) -> Optional[float]:
+    """
+    Time to spare if the remaining work started now.
+
+    Returns:
+        Seconds (negative = deadline cannot be met), or None without deadline
+    """
+    if deadline is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return (_as_utc(deadline) - now).total_seconds() - remaining_seconds
+
+
+def edf_key(
+    priority: Optional[int],
+    deadline: Optional[datetime],
+    created_at: Optional[datetime],
+    slack: Optional[float]
+) -> Tuple[int, bool, float, float]:
+    """
+    Sort key: priority (high first), feasible before hopeless, earliest
+    deadline (none last), then oldest.
+    """
+    deadline = _as_utc(deadline)
+    created_at = _as_utc(created_at)
+    return (
+        -(priority or DEFAULT_PRIORITY),
+        slack is not None and slack < 0,
+        deadline.timestamp() if deadline else math.inf,
+        created_at.timestamp() if created_at else 0.0,
+    )
+
+
+def order_edf(
+    tasks: Iterable[Any],
+    now: Optional[datetime] = None,
+    latency_model: Optional[LatencyModel] = None
+) -> List[Any]:
+    """
+    Order tasks EDF within priority.
+
+    Args:
+        tasks: Task-like objects (priority, deadline, created_at, tool_preference)
+        now: Current time
+        latency_model: Source of service time estimates
+
+    Returns:
+        Tasks in scheduling order
+    """
+    now = now or datetime.now(timezone.utc)
+    model = latency_model or get_latency_model()
+    estimates: Dict[Optional[str], float] = {}
+
+    def key(task):
+        tool = getattr(task, "tool_preference", None)
+        if tool not in estimates:
+            estimates[tool] = estimate_service_seconds(tool, model)
+        deadline = getattr(task, "deadline", None)
+        return edf_key(
+            getattr(task, "priority", None),
+            deadline,
+            getattr(task, "created_at", None),
+            slack_seconds(deadline, estimates[tool], now),
+        )
+
+    return sorted(tasks, key=key)
+
+
+def edf_ranks(
+    tasks: Sequence[Any],
+    now: Optional[datetime] = None,
+    latency_model: Optional[LatencyModel] = None
+) -> List[int]:
+    """
+    Integer urgency per task for solvers that take priorities (higher first).
+
+    Returns:
+        len(tasks) for the first task in EDF order down to 1 for the last
+    """
+    ranked = order_edf(list(tasks), now, latency_model)
+    position = {id(task): i for i, task in enumerate(ranked)}
+    return [len(tasks) - position[id(task)] for task in tasks]
+
+
+def remaining_critical_path_seconds(
+    graph: Any,
+    completed: Set[str],
+    duration_of: Callable[[Any], float]
+) -> float:
+    """
+    Longest chain of not yet completed nodes (upper bound on time left).
+
+    Args:
+        graph: WorkflowGraph
+        completed: Completed node IDs
+        duration_of: Estimated seconds for a node
+
+    Returns:
+        Seconds along the critical path of the remaining graph
+    """
+    longest: Dict[str, float] = {}
+    for node_id in reversed(graph.topological_sort()):
+        own = 0.0 if node_id in completed else duration_of(graph.nodes[node_id])
+        tail = max((longest[n] for n in graph.get_next_nodes(node_id)), default=0.0)
+        longest[node_id] = own + tail
+    roots = [n for n in graph.nodes if n not in completed] or list(graph.nodes)
+    return max((longest[n] for n in roots), default=0.0)
@@ -0,0 +1,393 @@
+"""
+Online Latency Model
+
+Streaming per (worker, tool) service time estimates, fed from task
+completion reports, used by the router to score workers on expected
+completion time:
+
+    expected completion = queue wait + p50 service time
+
+- EWMA of service time (tracks drift; used to size a worker's backlog)
+- t-digest of service times (robust percentiles, bounded memory)
+- Outstanding work per worker (expected ms of assigned, unfinished tasks)
+
+Estimates fall back from (worker, tool) to the worker across tools, then to
+the fleet-wide estimate for the tool.
+"""
+
+import logging
+import math
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tool key used when a task has no tool preference
+ANY_TOOL = "any"
+
+# Expected completion that scores 0.5 (matches the router's 60s baseline)
+LATENCY_BASELINE_MS = 60_000.0
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantile estimates.
+
+    Keeps at most ~compression centroids; accuracy is best at the tails.
+    """
+
+    __slots__ = ("compression", "_means", "_weights", "_buffer", "count", "min", "max")
+
+    def __init__(self, compression: float = 100.0):
+        """
+        Initialize digest.
+
+        Args:
+            compression: Size/accuracy trade-off (delta)
+        """
+        self.compression = compression
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _k(self, q: float) -> float:
+        """Scale function k1."""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add a sample."""
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Merge buffered samples into the centroids."""
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+
+        total = self.count
+        means: List[float] = []
+        weights: List[float] = []
+        cur_mean, cur_weight = points[0]
+        weight_so_far = 0.0
+        k_lower = self._k(0.0)
+        for mean, weight in points[1:]:
+            q = (weight_so_far + cur_weight + weight) / total
+            if self._k(q) - k_lower <= 1.0:
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                weight_so_far += cur_weight
+                k_lower = self._k(weight_so_far / total)
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean)
+        weights.append(cur_weight)
+
+        self._means = means
+        self._weights = weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None without samples
+        """
+        self._compress()
+        if not self._means:
+            return None
+        if len(self._means) == 1:
+            return self._means[0]
+
+        target = min(max(q, 0.0), 1.0) * self.count
+        # Centroid i is centred at cumulative weight before it + half its weight
+        centers = []
+        cumulative = 0.0
+        for weight in self._weights:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+
+        if target <= centers[0]:
+            span = centers[0]
+            return self.min + (self._means[0] - self.min) * (target / span if span else 1.0)
+        if target >= centers[-1]:
+            span = self.count - centers[-1]
+            frac = (target - centers[-1]) / span if span else 0.0
+            return self._means[-1] + (self.max - self._means[-1]) * frac
+
+        i = bisect_left(centers, target)
+        lo, hi = centers[i - 1], centers[i]
+        frac = (target - lo) / (hi - lo) if hi > lo else 0.0
+        return self._means[i - 1] + (self._means[i] - self._means[i - 1]) * frac
+
+    @property
+    def centroids(self) -> int:
+        """Number of centroids after compression."""
+        self._compress()
+        return len(self._means)
+
+
+@dataclass
+class LatencyStats:
+    """Streaming service time statistics for one key."""
+    alpha: float = 0.2
+    count: int = 0
+    ewma_ms: float = 0.0
+    digest: TDigest = field(default_factory=TDigest)
+
+    def observe(self, execution_time_ms: float) -> None:
+        """Add a service time sample."""
+        if self.count == 0:
+            self.ewma_ms = execution_time_ms
+        else:
+            self.ewma_ms += self.alpha * (execution_time_ms - self.ewma_ms)
+        self.count += 1
+        self.digest.add(execution_time_ms)
+
+    def p50(self) -> Optional[float]:
+        """Median service time."""
+        return self.digest.quantile(0.5)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for stats endpoints."""
+        return {
+            "count": self.count,
+            "ewma_ms": round(self.ewma_ms, 1),
+            "p50_ms": self.digest.quantile(0.5),
+            "p95_ms": self.digest.quantile(0.95),
+        }
+
+
+class LatencyModel:
+    """
+    Per (worker, tool) latency estimates with outstanding-work tracking.
+
+    Thread-safe; updates are O(1) amortized.
+    """
+
+    def __init__(self, alpha: float = 0.2, min_samples: int = 3):
+        """
+        Initialize model.
+
+        Args:
+            alpha: EWMA smoothing factor
+            min_samples: Samples needed before a key's estimate is used
+        """
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._pairs: Dict[Tuple[Hashable, str], LatencyStats] = {}
+        self._workers: Dict[Hashable, LatencyStats] = {}
+        self._tools: Dict[str, LatencyStats] = {}
+        # worker -> {task key: expected ms} of assigned, unfinished tasks
+        self._outstanding: Dict[Hashable, Dict[Hashable, float]] = {}
+
+    def _new_stats(self) -> LatencyStats:
+        return LatencyStats(alpha=self.alpha)
+
+    def task_assigned(
+        self,
+        worker_id: Hashable,
+        tool: Optional[str] = None,
+        task_id: Optional[Hashable] = None
+    ) -> None:
+        """
+        Record that a task was assigned to a worker (adds to its queue).
+
+        Args:
+            worker_id: Worker the task was assigned to
+            tool: Tool the task uses
+            task_id: Task identifier, so the task's own estimate is removed
+                when it finishes (anonymous entries are released oldest first)
+        """
+        expected = self.mean_service_ms(worker_id, tool) or 0.0
+        key = str(task_id) if task_id is not None else object()
+        with self._lock:
+            self._outstanding.setdefault(worker_id, {})[key] = expected
+
+    def task_released(self, worker_id: Hashable, task_id: Optional[Hashable] = None) -> None:
+        """
+        Remove a task from a worker's queue (finished or moved elsewhere).
+
+        Args:
+            worker_id: Worker the task was assigned to
+            task_id: Task identifier given to task_assigned()
+        """
+        with self._lock:
+            self._release(worker_id, task_id)
+
+    def _release(self, worker_id: Hashable, task_id: Optional[Hashable]) -> None:
+        queue = self._outstanding.get(worker_id)
+        if not queue:
+            return
+        if task_id is None:
+            del queue[next(iter(queue))]
+        else:
+            # Unknown IDs (e.g. assigned before a restart) release nothing
+            queue.pop(str(task_id), None)
+        if not queue:
+            del self._outstanding[worker_id]
+
+    def record_completion(
+        self,
+        worker_id: Hashable,
+        tool: Optional[str],
+        execution_time_ms: Optional[float],
+        success: bool = True,
+        task_id: Optional[Hashable] = None
+    ) -> None:
+        """
+        Record a finished task.
+
+        Releases the task from the worker's queue and, for successful tasks
+        with a measured time, adds a service time sample.
+
+        Args:
+            worker_id: Worker that ran the task
+            tool: Tool the task used
+            execution_time_ms: Measured service time (None if unknown)
+            success: Whether the task completed successfully
+            task_id: Task identifier given to task_assigned()
+        """
+        tool = tool or ANY_TOOL
+        with self._lock:
+            self._release(worker_id, task_id)
+
+            if not success or execution_time_ms is None or execution_time_ms < 0:
+                return
+
+            for stats_map, key in (
+                (self._pairs, (worker_id, tool)),
+                (self._workers, worker_id),
+                (self._tools, tool),
+            ):
+                stats = stats_map.get(key)
+                if stats is None:
+                    stats = stats_map[key] = self._new_stats()
+                stats.observe(float(execution_time_ms))
+
+    def _lookup(self, worker_id: Hashable, tool: Optional[str]) -> Optional[LatencyStats]:
+        """Most specific stats with enough samples."""
+        tool = tool or ANY_TOOL
+        for stats in (
+            self._pairs.get((worker_id, tool)),
+            self._workers.get(worker_id) if tool == ANY_TOOL else None,
+            self._tools.get(tool),
+        ):
+            if stats is not None and stats.count >= self.min_samples:
+                return stats
+        return None
+
+    def has_estimate(self, worker_id: Hashable, tool: Optional[str] = None) -> bool:
+        """Whether an estimate is available for the worker and tool."""
+        return self._lookup(worker_id, tool) is not None
+
+    def mean_service_ms(self, worker_id: Hashable, tool: Optional[str] = None) -> Optional[float]:
+        """EWMA service time, or None without data."""
+        stats = self._lookup(worker_id, tool)
+        return stats.ewma_ms if stats else None
+
+    def p50_service_ms(self, worker_id: Hashable, tool: Optional[str] = None) -> Optional[float]:
+        """Median service time, or None without data."""
+        stats = self._lookup(worker_id, tool)
+        return stats.p50() if stats else None
+
+    def fleet_p50_ms(self, tool: Optional[str] = None) -> Optional[float]:
+        """Median service time of a tool across all workers, or None without data."""
+        stats = self._tools.get(tool or ANY_TOOL)
+        if stats is None or stats.count < self.min_samples:
+            return None
+        return stats.p50()
+
+    def queue_wait_ms(self, worker_id: Hashable) -> float:
+        """Expected wait for work already assigned to the worker."""
+        return sum(self._outstanding.get(worker_id, {}).values())
+
+    def expected_completion_ms(self, worker_id: Hashable, tool: Optional[str] = None) -> Optional[float]:
+        """
+        Expected time until a new task would finish on the worker.
+
+        Returns:
+            Queue wait plus p50 service time, or None without data
+        """
+        p50 = self.p50_service_ms(worker_id, tool)
+        if p50 is None:
+            return None
+        return self.queue_wait_ms(worker_id) + p50
+
+    def latency_score(self, worker_id: Hashable, tool: Optional[str] = None) -> Optional[float]:
+        """
+        Latency factor for routing in (0, 1]; higher is faster.
+
+        Returns:
+            baseline / (baseline + expected completion), or None without data
+        """
+        expected = self.expected_completion_ms(worker_id, tool)
+        if expected is None:
+            return None
+        return LATENCY_BASELINE_MS / (LATENCY_BASELINE_MS + expected)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get model statistics.
+
+        Returns:
+            Per-tool and per-worker summaries and queue depths
+        """
+        return {
+            "tools": {tool: s.to_dict() for tool, s in self._tools.items()},
+            "workers": {str(w): s.to_dict() for w, s in self._workers.items()},
+            "pairs": len(self._pairs),
+            "outstanding": {str(w): len(q) for w, q in self._outstanding.items() if q},
+        }
+
+
+def service_time_ms(
+    reported_ms: Optional[float],
+    started_at: Optional[datetime],
+    completed_at: Optional[datetime]
+) -> Optional[float]:
+    """
+    Service time of a finished task.
+
+    Prefers the worker's own measurement; otherwise uses the task's
+    start/completion timestamps (None if the task never reported start).
+    """
+    if reported_ms is not None:
+        return float(reported_ms)
+    if started_at is None or completed_at is None:
+        return None
+    # started_at comes from the database (aware), completed_at may be naive UTC
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    if completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    return (completed_at - started_at).total_seconds() * 1000
+
+
+# Singleton instance
+_latency_model: Optional[LatencyModel] = None
+
+
+def get_latency_model() -> LatencyModel:
+    """Get the singleton latency model."""
+    global _latency_model
+    if _latency_model is None:
+        _latency_model = LatencyModel()
+    return _latency_model
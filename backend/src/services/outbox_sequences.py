@@ -0,0 +1,236 @@
+"""
+Outbox Sequence Tracking
+
+Workers send results and progress through a durable outbox: every message
+carries a per-stream sequence number, is replayed after a reconnect until
+acknowledged, and the backend acknowledges cumulatively (``ack(seq)`` lets
+the worker drop everything up to ``seq``). This module remembers which
+sequence numbers were processed so replays are not applied twice.
+
+Per (worker, stream) it keeps:
+- ``acked``: every sequence up to here was processed (the cumulative ack)
+- ``above``: sequences processed beyond a gap, e.g. seq 5 arriving live
+  while seq 4 is still waiting in the worker's outbox. The ack stays at 3,
+  so the worker keeps 4 and 5 and replays both; 4 is applied, 5 skipped.
+
+State is mirrored to Redis (when configured) so a backend restart does not
+re-apply messages that were processed but not yet acknowledged. In-memory
+state is dropped when a worker disconnects (Redis has it) or, without
+Redis, after ``ttl`` seconds of inactivity.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+
+import redis.asyncio as redis
+from redis.asyncio import Redis
+
+from src.metrics import instrument_redis
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamState:
+    """Processed sequence numbers of one outbox stream."""
+    acked: int
+    above: Set[int] = field(default_factory=set)
+    touched: float = field(default_factory=time.monotonic)
+
+    def contains(self, seq: int) -> bool:
+        return seq <= self.acked or seq in self.above
+
+    def add(self, seq: int) -> None:
+        if self.contains(seq):
+            return
+        if seq == self.acked + 1:
+            self.acked = seq
+            # Close the gap with anything already processed past it
+            while self.acked + 1 in self.above:
+                self.acked += 1
+                self.above.discard(self.acked)
+        else:
+            self.above.add(seq)
+
+
+class OutboxSequenceTracker:
+    """
+    Deduplicates worker outbox messages by (worker_id, stream, seq).
+
+    Usage per message: ``is_duplicate()``, process it, ``mark_processed()``,
+    ``persist()``, then acknowledge ``acked()``.
+    """
+
+    KEY_STREAM = "ws:outbox:{worker_id}:{stream}"
+
+    DEFAULT_TTL = 7 * 86400  # Longest a worker is expected to stay away
+    PRUNE_INTERVAL = 60.0  # Seconds between idle-state sweeps
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL,
+        redis_client: Optional[Redis] = None,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            ttl: Seconds a stream's state is kept without new messages
+            redis_client: Existing Redis client for persisted state
+            redis_url: Redis URL for persisted state (connected in connect())
+        """
+        self._ttl = ttl
+        self._redis: Optional[Redis] = redis_client
+        self._redis_url = redis_url
+
+        self._streams: Dict[Tuple[str, str], StreamState] = {}
+        self._last_prune = time.monotonic()
+
+    @property
+    def redis_enabled(self) -> bool:
+        """Whether state is persisted to Redis."""
+        return self._redis is not None
+
+    async def connect(self) -> None:
+        """Connect to Redis if a URL was given."""
+        if self._redis is None and self._redis_url:
+            self._redis = instrument_redis(await redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            ), "outbox")
+            await self._redis.ping()
+            logger.info("Outbox sequence tracker connected to Redis")
+
+    async def disconnect(self) -> None:
+        """Disconnect from Redis."""
+        if self._redis is not None and self._redis_url:
+            await self._redis.close()
+        self._redis = None
+
+    async def is_duplicate(self, worker_id: str, stream: str, seq: int) -> bool:
+        """
+        Check whether a message was already processed.
+
+        The first message seen for a stream without stored state sets the
+        baseline: workers replay from their oldest unacknowledged message,
+        so everything before it was acknowledged earlier.
+
+        Args:
+            worker_id: The worker's UUID as string
+            stream: Outbox stream ID
+            seq: Message sequence number
+
+        Returns:
+            True if the message must be skipped
+        """
+        state = await self._load(worker_id, stream, baseline=seq - 1)
+        return state.contains(seq)
+
+    def mark_processed(self, worker_id: str, stream: str, seq: int) -> None:
+        """Record a processed message (after is_duplicate() loaded the stream)."""
+        state = self._streams[(worker_id, stream)]
+        state.add(seq)
+        state.touched = time.monotonic()
+
+    def acked(self, worker_id: str, stream: str) -> Optional[int]:
+        """Highest sequence up to which every message was processed."""
+        state = self._streams.get((worker_id, stream))
+        return state.acked if state else None
+
+    async def persist(self, worker_id: str, stream: str) -> None:
+        """Write a stream's state to Redis (no-op without Redis)."""
+        state = self._streams.get((worker_id, stream))
+        if self._redis is None or state is None:
+            return
+        try:
+            await self._redis.set(
+                self.KEY_STREAM.format(worker_id=worker_id, stream=stream),
+                json.dumps({"acked": state.acked, "above": sorted(state.above)}),
+                ex=self._ttl
+            )
+        except Exception as e:
+            logger.warning(f"Outbox state write failed for worker {worker_id}: {e}")
+
+    def forget(self, worker_id: str) -> None:
+        """
+        Drop a disconnected worker's in-memory state.
+
+        Kept without Redis, where memory is the only copy; idle streams are
+        pruned after ttl instead.
+        """
+        if self._redis is None:
+            return
+        for key in [key for key in self._streams if key[0] == worker_id]:
+            del self._streams[key]
+
+    async def _load(self, worker_id: str, stream: str, baseline: int) -> StreamState:
+        """Get a stream's state from memory, Redis, or the baseline."""
+        self._prune()
+
+        key = (worker_id, stream)
+        state = self._streams.get(key)
+        if state is not None:
+            state.touched = time.monotonic()
+            return state
+
+        state = StreamState(acked=baseline)
+        if self._redis is not None:
+            try:
+                payload = await self._redis.get(self.KEY_STREAM.format(worker_id=worker_id, stream=stream))
+                if payload:
+                    stored = json.loads(payload)
+                    state = StreamState(acked=stored["acked"], above=set(stored["above"]))
+            except Exception as e:
+                logger.warning(f"Outbox state read failed for worker {worker_id}: {e}")
+
+        self._streams[key] = state
+        return state
+
+    def _prune(self) -> None:
+        """Drop streams idle for longer than ttl (at most once per interval)."""
+        now = time.monotonic()
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        cutoff = now - self._ttl
+        for key in [key for key, state in self._streams.items() if state.touched < cutoff]:
+            del self._streams[key]
+
+
+# Singleton instance
+_outbox_tracker: Optional[OutboxSequenceTracker] = None
+
+
+def get_outbox_tracker() -> OutboxSequenceTracker:
+    """Get the singleton tracker (memory only until configured)."""
+    global _outbox_tracker
+    if _outbox_tracker is None:
+        _outbox_tracker = OutboxSequenceTracker()
+    return _outbox_tracker
+
+
+async def create_outbox_tracker(
+    redis_url: str = "redis://localhost:6379",
+    ttl: int = OutboxSequenceTracker.DEFAULT_TTL
+) -> OutboxSequenceTracker:
+    """
+    Create a Redis-backed tracker and install it as the singleton.
+
+    Args:
+        redis_url: Redis connection URL
+        ttl: Seconds a stream's state is kept without new messages
+
+    Returns:
+        Connected OutboxSequenceTracker instance
+    """
+    global _outbox_tracker
+    tracker = OutboxSequenceTracker(ttl=ttl, redis_url=redis_url)
+    await tracker.connect()
+    _outbox_tracker = tracker
+    return tracker
@@ -6,22 +6,27 @@ Routes tasks to the most suitable worker based on multiple factors:
 - Historical success rate
 - Current load
 - Cost efficiency
-- Latency estimates
+- Latency estimates (online per worker/tool model, see latency_model.py)
 """
 
 import asyncio
 import logging
 import random
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from src.models.task import Task, TaskStatus
-from src.models.worker import Worker, WorkerStatus
+from src.metrics import ROUTER_DECISION_DURATION, time_async
+from src.models.task import Task
+from src.models.worker import Worker
+from src.services.batch_router import SIMILAR_TOOLS, SIMILAR_TOOL_SCORE, assign, build_score_matrix
+from src.services.deadline_scheduler import edf_ranks
+from src.services.latency_model import LatencyModel, get_latency_model
 
 logger = logging.getLogger(__name__)
 
@@ -86,7 +91,7 @@ class CostTracker:
 
     def estimate_cost(self, worker: Worker, task: Task) -> float:
         """Estimate cost for a task on a worker."""
-        tool = task.tool if hasattr(task, 'tool') else 'ollama'
+        tool = getattr(task, "tool_preference", None) or 'ollama'
         cost_info = self.COST_MAP.get(tool, {"input": 0.001, "output": 0.005, "is_local": False})
 
         if cost_info["is_local"]:
@@ -112,12 +117,16 @@ class IntelligentRouter:
     3. Current load - How busy is the worker?
     4. Cost efficiency - Is it a local or API-based tool?
     5. Latency estimate - Expected response time
+
+    route_task() decides one task at a time; route_tasks() assigns a whole
+    batch in one solve over a task x worker score matrix.
     """
 
     def __init__(
         self,
         factors: Optional[RoutingFactors] = None,
-        exploration_rate: float = 0.1
+        exploration_rate: float = 0.1,
+        latency_model: Optional[LatencyModel] = None
     ):
         """
         Initialize the router.
@@ -125,14 +134,17 @@ class IntelligentRouter:
         Args:
             factors: Scoring weights for different factors
             exploration_rate: Probability of selecting non-optimal worker (for exploration)
+            latency_model: Online latency model (default: shared instance)
         """
         self.factors = factors or RoutingFactors()
         self.exploration_rate = exploration_rate
+        self.latency_model = latency_model or get_latency_model()
         self.cost_tracker = CostTracker()
         self._performance_cache: Dict[UUID, WorkerPerformance] = {}
         self._cache_ttl = timedelta(minutes=5)
         self._last_cache_update: Optional[datetime] = None
 
+    @time_async(ROUTER_DECISION_DURATION, mode="single")
     async def route_task(
         self,
         task: Task,
@@ -154,16 +166,16 @@ class IntelligentRouter:
         candidates = await self._get_capable_workers(task, db)
 
         if not candidates:
-            logger.warning(f"No capable workers found for task {task.id}")
+            logger.warning(f"No capable workers found for task {task.task_id}")
             return None
 
         # If preferred worker is available and capable, use it
         if preferred_worker_id:
             for worker in candidates:
-                if worker.id == preferred_worker_id:
+                if worker.worker_id == preferred_worker_id:
                     return RoutingDecision(
-                        worker_id=worker.id,
-                        worker_name=worker.name,
+                        worker_id=worker.worker_id,
+                        worker_name=worker.machine_name,
                         score=1.0,
                         reason="Preferred worker selected"
                     )
@@ -183,8 +195,8 @@ class IntelligentRouter:
         if selected:
             worker, score, factors = selected
             return RoutingDecision(
-                worker_id=worker.id,
-                worker_name=worker.name,
+                worker_id=worker.worker_id,
+                worker_name=worker.machine_name,
                 score=score,
                 factors=factors,
                 reason=self._generate_reason(factors)
@@ -192,23 +204,117 @@ class IntelligentRouter:
 
         return None
 
-    async def _get_capable_workers(
+    @time_async(ROUTER_DECISION_DURATION, mode="batch")
+    async def route_tasks(
         self,
-        task: Task,
-        db: AsyncSession
-    ) -> List[Worker]:
-        """Get workers that can handle the task."""
-        # Get all online/idle workers
+        tasks: Sequence[Task],
+        db: AsyncSession,
+        capacities: Optional[Dict[UUID, int]] = None,
+        method: str = "auto"
+    ) -> Dict[Any, Optional[RoutingDecision]]:
+        """
+        Route a batch of tasks in one assignment solve.
+
+        Scores every task/worker pair at once and assigns tasks so that no
+        worker exceeds its free capacity, instead of deciding each task
+        independently. Higher-priority tasks are placed first when there
+        are not enough slots (earliest deadline first within a priority,
+        tasks that cannot meet their deadline last). No exploration is applied.
+
+        Args:
+            tasks: Pending tasks to route
+            db: Database session
+            capacities: Free slots per worker ID (default: 1 per worker)
+            method: "greedy", "optimal" (Hungarian) or "auto" (optimal for small batches)
+
+        Returns:
+            Mapping of task ID to RoutingDecision, or None if unassigned
+        """
+        if not tasks:
+            return {}
+
+        workers = await self._get_available_workers(db)
+        if not workers:
+            logger.warning(f"No available workers for batch of {len(tasks)} tasks")
+            return {task.task_id: None for task in tasks}
+
+        # Per-worker factors (one performance lookup per worker, not per pair)
+        performances = [await self._get_worker_performance(w.worker_id, db) for w in workers]
+        success = np.array([p.success_rate for p in performances])
+        load = np.array([self._score_current_load(w) for w in workers])
+
+        # Per-task factors
+        task_tools = [getattr(t, "tool_preference", None) for t in tasks]
+        cost = np.array([self._score_cost_efficiency(workers[0], t) for t in tasks])
+        priorities = edf_ranks(tasks, latency_model=self.latency_model)
+
+        # Latency depends on (worker, tool): one row per distinct tool
+        tools = sorted(set(task_tools), key=lambda tool: tool or "")
+        tool_rows = {
+            tool: [self._score_latency(w, p, tool) for w, p in zip(workers, performances)]
+            for tool in tools
+        }
+        latency = np.array([tool_rows[tool] for tool in task_tools])
+
+        scores, capability = build_score_matrix(
+            task_tools=task_tools,
+            worker_tools=[w.tools or [] for w in workers],
+            weights=asdict(self.factors),
+            success=success,
+            load=load,
+            latency=latency,
+            cost=cost
+        )
+
+        capacities = capacities or {}
+        capacity = [capacities.get(w.worker_id, 1) for w in workers]
+        assignment = assign(scores, capacity, priorities, method=method)
+
+        decisions: Dict[Any, Optional[RoutingDecision]] = {}
+        for t, task in enumerate(tasks):
+            w = int(assignment[t])
+            if w < 0:
+                decisions[task.task_id] = None
+                continue
+            factors = {
+                "capability_match": float(capability[t, w]),
+                "historical_success": float(success[w]),
+                "current_load": float(load[w]),
+                "cost_efficiency": float(cost[t]),
+                "latency_estimate": float(latency[t, w]),
+            }
+            decisions[task.task_id] = RoutingDecision(
+                worker_id=workers[w].worker_id,
+                worker_name=workers[w].machine_name,
+                score=float(scores[t, w]),
+                factors=factors,
+                reason=self._generate_reason(factors)
+            )
+
+        assigned = sum(1 for d in decisions.values() if d is not None)
+        logger.info(f"Batch routed {assigned}/{len(tasks)} tasks across {len(workers)} workers")
+        return decisions
+
+    async def _get_available_workers(self, db: AsyncSession) -> List[Worker]:
+        """Get all online/idle active workers."""
         query = select(Worker).where(
-            Worker.status.in_([WorkerStatus.ONLINE, WorkerStatus.IDLE]),
+            Worker.status.in_(["online", "idle"]),
             Worker.is_active == True
         )
 
         result = await db.execute(query)
-        workers = result.scalars().all()
+        return list(result.scalars().all())
+
+    async def _get_capable_workers(
+        self,
+        task: Task,
+        db: AsyncSession
+    ) -> List[Worker]:
+        """Get workers that can handle the task."""
+        workers = await self._get_available_workers(db)
 
         # Filter by tool capability
-        tool_required = getattr(task, 'tool', None)
+        tool_required = getattr(task, 'tool_preference', None)
         if tool_required:
             capable = []
             for worker in workers:
@@ -241,7 +347,7 @@ class IntelligentRouter:
         total += capability_score * self.factors.capability_match
 
         # 2. Historical success rate
-        performance = await self._get_worker_performance(worker.id, db)
+        performance = await self._get_worker_performance(worker.worker_id, db)
         success_score = performance.success_rate
         factors["historical_success"] = success_score
         total += success_score * self.factors.historical_success
@@ -257,7 +363,7 @@ class IntelligentRouter:
         total += cost_score * self.factors.cost_efficiency
 
         # 5. Latency estimate
-        latency_score = self._score_latency(worker, performance)
+        latency_score = self._score_latency(worker, performance, getattr(task, 'tool_preference', None))
         factors["latency_estimate"] = latency_score
         total += latency_score * self.factors.latency_estimate
 
@@ -265,7 +371,7 @@ class IntelligentRouter:
 
     async def _score_capability(self, worker: Worker, task: Task) -> float:
         """Score based on tool capability match."""
-        tool_required = getattr(task, 'tool', None)
+        tool_required = getattr(task, 'tool_preference', None)
 
         if not tool_required:
             return 1.0  # Any worker can handle generic tasks
@@ -276,16 +382,9 @@ class IntelligentRouter:
             return 1.0
 
         # Partial match for similar tools
-        similar_tools = {
-            "claude_code": ["codex_cli", "gemini_cli"],
-            "gemini_cli": ["claude_code", "codex_cli"],
-            "ollama": ["gemini_cli"],
-        }
-
-        if tool_required in similar_tools:
-            for alt in similar_tools[tool_required]:
-                if alt in tools:
-                    return 0.7  # Can handle but not optimal
+        for alt in SIMILAR_TOOLS.get(tool_required, ()):
+            if alt in tools:
+                return SIMILAR_TOOL_SCORE  # Can handle but not optimal
 
         return 0.0
 
@@ -302,16 +401,16 @@ class IntelligentRouter:
                 return cached
 
         # Calculate from database
-        total_query = select(func.count(Task.id)).where(
+        total_query = select(func.count(Task.task_id)).where(
             Task.worker_id == worker_id,
-            Task.status.in_([TaskStatus.COMPLETED, TaskStatus.FAILED])
+            Task.status.in_(["completed", "failed"])
         )
         total_result = await db.execute(total_query)
         total_tasks = total_result.scalar() or 0
 
-        success_query = select(func.count(Task.id)).where(
+        success_query = select(func.count(Task.task_id)).where(
             Task.worker_id == worker_id,
-            Task.status == TaskStatus.COMPLETED
+            Task.status == "completed"
         )
         success_result = await db.execute(success_query)
         successful_tasks = success_result.scalar() or 0
@@ -334,11 +433,11 @@ class IntelligentRouter:
     def _score_current_load(self, worker: Worker) -> float:
         """Score based on current worker load."""
         # Prefer idle workers
-        if worker.status == WorkerStatus.IDLE:
+        if worker.status == "idle":
             return 1.0
-        elif worker.status == WorkerStatus.ONLINE:
+        elif worker.status == "online":
             return 0.7
-        elif worker.status == WorkerStatus.BUSY:
+        elif worker.status == "busy":
             return 0.3
         return 0.0
 
@@ -353,8 +452,18 @@ class IntelligentRouter:
         # Scale inversely with cost
         return 1.0 / (1.0 + cost * 10)
 
-    def _score_latency(self, worker: Worker, performance: WorkerPerformance) -> float:
+    def _score_latency(
+        self,
+        worker: Worker,
+        performance: WorkerPerformance,
+        tool: Optional[str] = None
+    ) -> float:
         """Score based on expected latency."""
+        # Expected completion (queue wait + p50 service time) from the online model
+        model_score = self.latency_model.latency_score(worker.worker_id, tool)
+        if model_score is not None:
+            return model_score
+
         # Use historical execution time if available
         if performance.avg_execution_time > 0:
             # Assume 60 seconds is baseline
@@ -362,9 +471,9 @@ class IntelligentRouter:
             return min(ratio, 1.0)
 
         # Default based on worker status
-        if worker.status == WorkerStatus.IDLE:
+        if worker.status == "idle":
             return 1.0
-        elif worker.status == WorkerStatus.ONLINE:
+        elif worker.status == "online":
             return 0.8
         return 0.5
 
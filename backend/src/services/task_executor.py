@@ -18,6 +18,7 @@ from sqlalchemy import select
 from src.models.worker import Worker
 from src.models.task import Task, TaskStatus
 from src.logging_config import get_logger
+from src.tracing import inject_context
 
 logger = get_logger(__name__)
 
@@ -168,6 +169,7 @@ class TaskExecutor:
                 'execution_id': execution_id,
                 'full_prompt': prompt,
                 'config': config,
+                'trace': inject_context(),
             }
         )
         self.db.add(task)
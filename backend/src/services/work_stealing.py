@@ -0,0 +1,398 @@
+"""
+Work Stealing
+
+Rebalances tasks that are bound to a worker (status "assigned") but have not
+started, so a stalled or slow worker does not hold work that an idle peer
+could run now.
+
+- plan_steals(): pure policy; picks queued tasks and idle capable thieves
+- WorkStealer: background pass that loads the per-worker backlog, applies
+  the plan and moves each task with a compare-and-swap on Task.version
+
+A steal only succeeds if the task is still "assigned" to the victim at the
+version that was read, so a task that started (assigned -> running), finished
+or was stolen by another pass in the meantime is never executed twice. The
+victim is sent a task_cancel and the thief receives the task.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+
+from src.models.task import Task
+from src.models.worker import Worker
+from src.schemas.worker import WorkerTaskAssignment
+from src.services.latency_model import LatencyModel, get_latency_model
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedTask:
+    """An assigned, not yet started task as seen by the planner."""
+    task_id: UUID
+    worker_id: UUID
+    version: int
+    tool: Optional[str]
+    priority: int
+    waiting_seconds: float
+
+
+@dataclass
+class Steal:
+    """A planned move of a task from its worker to an idle worker."""
+    task: QueuedTask
+    thief_id: UUID
+
+    @property
+    def victim_id(self) -> UUID:
+        return self.task.worker_id
+
+
+@dataclass
+class WorkerBacklog:
+    """Per-worker state used to decide which tasks are stealable."""
+    stalled: bool = False  # offline or heartbeat timed out
+    running: int = 0
+    queued: List[QueuedTask] = field(default_factory=list)
+
+
+def stealable_tasks(
+    backlogs: Mapping[UUID, WorkerBacklog],
+    steal_after_seconds: float
+) -> List[QueuedTask]:
+    """
+    Tasks that can be moved without risking a task that is already executing.
+
+    A stalled worker's tasks are all stealable. Otherwise, if the worker has
+    nothing running, the task pull_task hands out next (highest priority,
+    then longest waiting) may be starting right now and is left alone; the
+    tasks queued behind it are stealable once they have waited
+    steal_after_seconds. A task that started anyway is protected by the
+    worker's start report (assigned -> running compare-and-swap).
+
+    Returns:
+        Stealable tasks, fullest backlog first, then priority, then wait
+    """
+    candidates = []
+    for backlog in backlogs.values():
+        queued = sorted(backlog.queued, key=lambda t: (-t.priority, -t.waiting_seconds))
+        if not backlog.stalled:
+            if backlog.running == 0:
+                queued = queued[1:]
+            queued = [t for t in queued if t.waiting_seconds >= steal_after_seconds]
+        depth = len(backlog.queued)
+        candidates.extend((depth, t) for t in queued)
+
+    candidates.sort(key=lambda c: (-c[0], -c[1].priority, -c[1].waiting_seconds))
+    return [t for _, t in candidates]
+
+
+def plan_steals(
+    backlogs: Mapping[UUID, WorkerBacklog],
+    idle_workers: Mapping[UUID, Sequence[str]],
+    steal_after_seconds: float,
+    max_steals: int = 50,
+    rank: Optional[Callable[[UUID, Optional[str]], float]] = None
+) -> List[Steal]:
+    """
+    Match stealable tasks to idle workers (one task per idle worker).
+
+    Args:
+        backlogs: Backlog per worker ID
+        idle_workers: Tools per idle worker ID (empty = accepts any task)
+        steal_after_seconds: Minimum wait before a queued task is moved
+        max_steals: Upper bound on moves per pass
+        rank: Preference among capable thieves (higher first), e.g. latency score
+
+    Returns:
+        Planned steals
+    """
+    free = dict(idle_workers)
+    plan: List[Steal] = []
+
+    for task in stealable_tasks(backlogs, steal_after_seconds):
+        if not free or len(plan) >= max_steals:
+            break
+        capable = [
+            worker_id for worker_id, tools in free.items()
+            if worker_id != task.worker_id
+            and (not task.tool or not tools or task.tool in tools)
+        ]
+        if not capable:
+            continue
+        if rank is not None:
+            capable.sort(key=lambda worker_id: rank(worker_id, task.tool), reverse=True)
+        thief = capable[0]
+        del free[thief]
+        plan.append(Steal(task=task, thief_id=thief))
+
+    return plan
+
+
+async def _notify_workers(steal: Steal, task: Task) -> None:
+    """Cancel the task on the victim and push it to the thief over WebSocket."""
+    from src.api.v1.websocket import send_task_cancel, send_task_to_worker
+
+    await send_task_cancel(
+        str(steal.victim_id), str(task.task_id), reason="Reassigned to an idle worker"
+    )
+    assignment = WorkerTaskAssignment(
+        task_id=task.task_id,
+        description=task.description,
+        tool_preference=task.tool_preference,
+        priority=task.priority,
+        workflow_id=task.workflow_id,
+        metadata=task.task_metadata,
+    )
+    # run_once() has already moved the outstanding work to the thief
+    await send_task_to_worker(
+        str(steal.thief_id), assignment.model_dump(mode="json"), track_latency=False
+    )
+
+
+class WorkStealer:
+    """
+    Periodic rebalancer for assigned-but-not-started tasks.
+
+    Usage:
+        stealer = WorkStealer(AsyncSessionLocal)
+        await stealer.start()
+        ...
+        await stealer.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        steal_after_seconds: float = 30.0,
+        interval_seconds: float = 5.0,
+        heartbeat_timeout_seconds: float = 120.0,
+        max_steals_per_pass: int = 50,
+        latency_model: Optional[LatencyModel] = None,
+        on_steal: Optional[Callable[[Steal, Task], Awaitable[None]]] = _notify_workers
+    ):
+        """
+        Initialize the rebalancer.
+
+        Args:
+            session_factory: Async session factory (e.g. AsyncSessionLocal)
+            steal_after_seconds: Minimum wait before a queued task is moved
+            interval_seconds: Seconds between passes
+            heartbeat_timeout_seconds: Heartbeat age after which a worker is stalled
+            max_steals_per_pass: Upper bound on moves per pass
+            latency_model: Ranks thieves by expected completion (default: shared instance)
+            on_steal: Called after each committed steal
+        """
+        self.session_factory = session_factory
+        self.steal_after_seconds = steal_after_seconds
+        self.interval_seconds = interval_seconds
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.max_steals_per_pass = max_steals_per_pass
+        self.latency_model = latency_model or get_latency_model()
+        self.on_steal = on_steal
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"passes": 0, "planned": 0, "stolen": 0, "lost_races": 0, "errors": 0}
+
+    async def start(self) -> None:
+        """Start the background loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Work stealer started (every {self.interval_seconds}s)")
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Work stealer stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Work stealing pass failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> List[Steal]:
+        """
+        Run one rebalancing pass.
+
+        Returns:
+            Steals that were committed
+        """
+        self.stats["passes"] += 1
+        async with self.session_factory() as db:
+            backlogs, idle = await self._load_state(db)
+            if not idle:
+                return []
+
+            plan = plan_steals(
+                backlogs,
+                idle,
+                self.steal_after_seconds,
+                max_steals=self.max_steals_per_pass,
+                rank=lambda worker_id, tool: self.latency_model.latency_score(worker_id, tool) or 0.0,
+            )
+            self.stats["planned"] += len(plan)
+
+            committed = []
+            for steal in plan:
+                task = await self.try_steal(db, steal)
+                if task is not None:
+                    committed.append((steal, task))
+
+        for steal, task in committed:
+            self.latency_model.task_released(steal.victim_id, steal.task.task_id)
+            self.latency_model.task_assigned(steal.thief_id, steal.task.tool, task_id=steal.task.task_id)
+            logger.info(
+                f"Stole task {steal.task.task_id} from worker {steal.victim_id} "
+                f"for worker {steal.thief_id} after {steal.task.waiting_seconds:.0f}s"
+            )
+            if self.on_steal is not None:
+                try:
+                    await self.on_steal(steal, task)
+                except Exception as e:
+                    logger.warning(f"Failed to notify workers of stolen task {steal.task.task_id}: {e}")
+
+        return [steal for steal, _ in committed]
+
+    async def try_steal(self, db, steal: Steal) -> Optional[Task]:
+        """
+        Move one task with compare-and-swap on Task.version.
+
+        The thief is claimed (idle -> busy) and the task moved in one
+        transaction; either update matching no row rolls both back.
+
+        Returns:
+            The moved task, or None if the task or thief changed meanwhile
+        """
+        claimed = await db.execute(
+            update(Worker)
+            .where(Worker.worker_id == steal.thief_id, Worker.status == "idle")
+            .values(status="busy")
+        )
+        if claimed.rowcount != 1:
+            await db.rollback()
+            self.stats["lost_races"] += 1
+            return None
+
+        moved = await db.execute(
+            update(Task)
+            .where(
+                Task.task_id == steal.task.task_id,
+                Task.version == steal.task.version,
+                Task.status == "assigned",
+                Task.worker_id == steal.victim_id,
+            )
+            .values(
+                worker_id=steal.thief_id,
+                version=Task.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(Task)
+        )
+        task = moved.scalar_one_or_none()
+        if task is None:
+            await db.rollback()
+            self.stats["lost_races"] += 1
+            return None
+
+        await db.commit()
+        self.stats["stolen"] += 1
+        return task
+
+    async def _load_state(self, db):
+        """Per-worker backlogs and idle workers from the database."""
+        now = datetime.now(timezone.utc)
+        heartbeat_cutoff = now - timedelta(seconds=self.heartbeat_timeout_seconds)
+
+        result = await db.execute(select(Worker).where(Worker.is_active == True))
+        workers = {w.worker_id: w for w in result.scalars().all()}
+
+        result = await db.execute(
+            select(
+                Task.task_id, Task.worker_id, Task.version, Task.status,
+                Task.tool_preference, Task.priority, Task.updated_at,
+            ).where(
+                Task.status.in_(["assigned", "running"]),
+                Task.worker_id.is_not(None),
+            )
+        )
+
+        backlogs: Dict[UUID, WorkerBacklog] = {}
+        for row in result.all():
+            backlog = backlogs.get(row.worker_id)
+            if backlog is None:
+                worker = workers.get(row.worker_id)
+                stalled = (
+                    worker is None
+                    or worker.status == "offline"
+                    or _as_utc(worker.last_heartbeat) < heartbeat_cutoff
+                )
+                backlog = backlogs[row.worker_id] = WorkerBacklog(stalled=stalled)
+            if row.status == "running":
+                backlog.running += 1
+                continue
+            backlog.queued.append(QueuedTask(
+                task_id=row.task_id,
+                worker_id=row.worker_id,
+                version=row.version,
+                tool=row.tool_preference,
+                priority=row.priority or 5,
+                waiting_seconds=(now - _as_utc(row.updated_at)).total_seconds(),
+            ))
+
+        idle = {
+            worker_id: worker.tools or []
+            for worker_id, worker in workers.items()
+            if worker.status == "idle" and _as_utc(worker.last_heartbeat) >= heartbeat_cutoff
+        }
+        return backlogs, idle
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rebalancer statistics."""
+        return {**self.stats, "running": self._task is not None and not self._task.done()}
+
+
+def _as_utc(value: Optional[datetime]) -> datetime:
+    """Treat naive timestamps (datetime.utcnow()) as UTC; missing as epoch."""
+    if value is None:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# Singleton instance
+_work_stealer: Optional[WorkStealer] = None
+
+
+def get_work_stealer() -> WorkStealer:
+    """Get the singleton work stealer."""
+    global _work_stealer
+    if _work_stealer is None:
+        from src.config import settings
+        from src.database import AsyncSessionLocal
+
+        _work_stealer = WorkStealer(
+            AsyncSessionLocal,
+            steal_after_seconds=settings.WORK_STEALING_AFTER_SECONDS,
+            interval_seconds=settings.WORK_STEALING_INTERVAL_SECONDS,
+            heartbeat_timeout_seconds=settings.WORKER_HEARTBEAT_TIMEOUT,
+        )
+    return _work_stealer
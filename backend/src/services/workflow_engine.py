@@ -15,6 +15,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from src.models.workflow import Workflow, WorkflowNode, WorkflowEdge, WorkflowStatus, NodeStatus
+from src.workflows.prompt_template import render_prompt
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -383,17 +384,7 @@ class WorkflowEngine:
 
     def _build_prompt(self, template: str, context: Dict[str, Any]) -> str:
         """Build prompt from template and context."""
-        if not template:
-            return str(context)
-
-        # Simple variable substitution
-        result = template
-        for key, value in context.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
-
-        return result
+        return render_prompt(template, context)
 
     async def _simulate_execution(
         self,
@@ -0,0 +1,343 @@
+"""
+Distributed Tracing
+
+OpenTelemetry spans for a workflow execution across every hop:
+DAGExecutor -> NodeExecutor -> MCPBus -> transport -> WebSocket -> worker
+TaskExecutor -> tool. Trace context travels in W3C traceparent form:
+
+- task metadata["trace"] (tasks pulled by workers)
+- the "trace" field of WebSocket messages (pushed tasks, cancellations)
+- JSON-RPC params["_meta"] (MCP requests)
+
+Sampling is decided once at the root (ParentBased(TraceIdRatioBased)) and
+carried in the traceparent flags, so workers follow the backend's decision.
+Unsampled spans are non-recording: they only carry IDs for propagation.
+
+Spans are exported in batches from a background thread, either over
+OTLP/HTTP or as JSON lines to a local file. A file can be turned into a
+per-workflow waterfall with:
+
+    python -m src.tracing traces.jsonl [--trace TRACE_ID | --workflow WORKFLOW_ID]
+"""
+
+import argparse
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+TRACER_NAME = "garageswarm"
+
+# Span attribute separating waiting (queued tasks) from work in waterfalls
+PHASE_ATTRIBUTE = "garageswarm.phase"
+
+# Attributes that tell same-named spans apart in a waterfall, by preference
+DETAIL_ATTRIBUTES = ("node.id", "tool.path", "mcp.tool", "tool.name", "task.id", "rpc.method", "message.type")
+
+_provider: Optional[TracerProvider] = None
+_tracer: Optional[trace.Tracer] = None
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(span_to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def span_to_dict(span: ReadableSpan) -> Dict[str, Any]:
+    """Flatten a finished span into the file exporter's JSON format."""
+    return {
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "name": span.name,
+        "service": span.resource.attributes.get("service.name"),
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+def configure_tracing(
+    exporter: str = "none",
+    sample_rate: float = 0.05,
+    service_name: str = "garageswarm-backend",
+    file_path: str = "traces.jsonl",
+    otlp_endpoint: Optional[str] = None,
+) -> Optional[TracerProvider]:
+    """
+    Install the span pipeline for this process.
+
+    With exporter "none" no provider is installed; spans are no-ops and no
+    trace context is propagated.
+
+    Args:
+        exporter: "otlp", "file" or "none"
+        sample_rate: Fraction of new traces to record (0.0 - 1.0)
+        service_name: service.name resource attribute
+        file_path: Output path for the file exporter
+        otlp_endpoint: OTLP/HTTP traces endpoint (default: OTEL_EXPORTER_* env or localhost)
+
+    Returns:
+        The configured provider, or None when tracing is disabled
+    """
+    global _provider, _tracer
+
+    shutdown_tracing()
+    if exporter == "none":
+        return None
+
+    if exporter == "file":
+        span_exporter: SpanExporter = FileSpanExporter(file_path)
+    elif exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter(endpoint=otlp_endpoint)
+    else:
+        raise ValueError(f"Unknown trace exporter: {exporter}")
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = _provider.get_tracer(TRACER_NAME)
+    return _provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and uninstall the provider."""
+    global _provider, _tracer
+
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def get_tracer() -> trace.Tracer:
+    """Tracer for backend spans (no-op until tracing is configured)."""
+    return _tracer or trace.get_tracer(TRACER_NAME)
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    carrier: Optional[Mapping[str, str]] = None,
+    record_exception: bool = True,
+) -> Iterator[trace.Span]:
+    """
+    Start a span as the current span.
+
+    Args:
+        name: Span name
+        attributes: Initial attributes (None values are dropped)
+        carrier: Trace context from another process; the current span is
+            the parent when omitted
+        record_exception: Record escaping exceptions and mark the span as
+            an error (disable for control-flow exceptions)
+
+    Yields:
+        The span
+    """
+    parent = extract_context(carrier) if carrier else None
+    if attributes:
+        attributes = {key: value for key, value in attributes.items() if value is not None}
+    with get_tracer().start_as_current_span(
+        name,
+        context=parent,
+        attributes=attributes,
+        record_exception=record_exception,
+        set_status_on_exception=record_exception,
+    ) as span:
+        yield span
+
+
+def record_span(
+    name: str,
+    start: datetime,
+    end: datetime,
+    carrier: Optional[Mapping[str, str]] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Record a span for an interval that has already passed (e.g. queue wait).
+
+    Args:
+        name: Span name
+        start: Interval start (naive datetimes are taken as UTC)
+        end: Interval end
+        carrier: Parent trace context; the current span when omitted
+        attributes: Span attributes
+    """
+    parent = extract_context(carrier) if carrier else None
+    span = get_tracer().start_span(
+        name, context=parent, attributes=attributes, start_time=_to_ns(start)
+    )
+    span.end(end_time=_to_ns(end))
+
+
+def _to_ns(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1e9)
+
+
+def inject_context(carrier: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Write the current trace context (traceparent/tracestate) into a carrier.
+
+    Args:
+        carrier: Dict to write into (default: a new dict)
+
+    Returns:
+        The carrier; empty when there is no active trace
+    """
+    carrier = {} if carrier is None else carrier
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Mapping[str, str]]) -> Context:
+    """Trace context from a carrier written by inject_context()."""
+    return propagate.extract(carrier or {})
+
+
+def with_trace_meta(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Add the current trace context to JSON-RPC params as params["_meta"].
+
+    Args:
+        params: Request params
+
+    Returns:
+        New params with _meta, or the given params when there is no active trace
+    """
+    carrier = inject_context()
+    if not carrier:
+        return params
+    params = dict(params or {})
+    params["_meta"] = {**params.get("_meta", {}), **carrier}
+    return params
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans written by FileSpanExporter."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def waterfall(spans: Sequence[Dict[str, Any]], trace_id: str) -> List[Dict[str, Any]]:
+    """
+    Order one trace's spans as a waterfall (parents before children, by start).
+
+    Args:
+        spans: Spans in FileSpanExporter format
+        trace_id: Trace to lay out
+
+    Returns:
+        Rows with name, detail, service, phase, status, depth, offset_ms and duration_ms
+    """
+    spans = [s for s in spans if s["trace_id"] == trace_id]
+    if not spans:
+        return []
+
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    origin = min(s["start_ns"] for s in spans)
+    rows: List[Dict[str, Any]] = []
+
+    def visit(parent: Optional[str], depth: int) -> None:
+        for s in sorted(children.get(parent, []), key=lambda s: s["start_ns"]):
+            detail = next(
+                (s["attributes"][key] for key in DETAIL_ATTRIBUTES if key in s["attributes"]), None
+            )
+            rows.append({
+                "name": s["name"],
+                "detail": detail,
+                "service": s.get("service"),
+                "phase": s["attributes"].get(PHASE_ATTRIBUTE, "execution"),
+                "status": s["status"],
+                "depth": depth,
+                "offset_ms": (s["start_ns"] - origin) / 1e6,
+                "duration_ms": (s["end_ns"] - s["start_ns"]) / 1e6,
+            })
+            visit(s["span_id"], depth + 1)
+
+    visit(None, 0)
+    return rows
+
+
+def format_waterfall(rows: Sequence[Dict[str, Any]], width: int = 40) -> str:
+    """Render waterfall rows as text bars ('.' marks queue time)."""
+    if not rows:
+        return "(no spans)"
+
+    total = max(r["offset_ms"] + r["duration_ms"] for r in rows) or 1.0
+    lines = []
+    for r in rows:
+        start = int(r["offset_ms"] / total * width)
+        length = max(1, int(r["duration_ms"] / total * width))
+        bar = " " * start + ("." if r["phase"] == "queue" else "#") * length
+        label = "  " * r["depth"] + r["name"] + (f" [{r['detail']}]" if r.get("detail") else "")
+        lines.append(
+            f"{label:<56} {r['service'] or '':<20} {r['offset_ms']:>10.1f} "
+            f"{r['duration_ms']:>10.1f}  |{bar:<{width}}|"
+        )
+    queued = sum(r["duration_ms"] for r in rows if r["phase"] == "queue")
+    lines.append(f"total {total:.1f} ms, queued {queued:.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Print a trace waterfall from a span file")
+    parser.add_argument("path", help="File written by the 'file' trace exporter")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--trace", help="Trace ID (default: most recent trace)")
+    group.add_argument("--workflow", help="Workflow ID")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.path)
+    trace_id = args.trace
+    if args.workflow:
+        trace_id = next(
+            (s["trace_id"] for s in reversed(spans)
+             if s["attributes"].get("workflow.id") == args.workflow),
+            None,
+        )
+    elif trace_id is None and spans:
+        trace_id = max(spans, key=lambda s: s["start_ns"])["trace_id"]
+
+    print(f"trace {trace_id}")
+    print(format_waterfall(waterfall(spans, trace_id) if trace_id else []))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ Components:
 - State: Workflow state management
 - Executor: Node execution with MCP Bus integration
 - Checkpoints: Recovery and persistence
+- Result Cache: Reuse of deterministic task results
+- Prompt Templates: Compiled placeholder substitution
 """
 
 from .nodes import (
@@ -23,7 +25,7 @@ from .nodes import (
     LoopNode,
     SubflowNode,
 )
-from .state import WorkflowState, WorkflowContext
+from .state import CopyOnWriteDict, WorkflowState, WorkflowContext
 from .graph import WorkflowGraph
 from .executor import (
     NodeExecutor,
@@ -35,6 +37,24 @@ from .executor import (
     RouterDecisionError,
     TimeoutError,
 )
+from .result_cache import (
+    ResultCache,
+    make_cache_key,
+    get_result_cache,
+    create_result_cache,
+)
+from .hedging import (
+    DurationHistory,
+    HedgeBudget,
+    hedged,
+    get_duration_history,
+)
+from .prompt_template import (
+    PromptTemplate,
+    compile_template,
+    render_prompt,
+    substitute_inputs,
+)
 from .checkpoints import (
     Checkpoint,
     CheckpointStore,
@@ -59,6 +79,7 @@ __all__ = [
     # State
     "WorkflowState",
     "WorkflowContext",
+    "CopyOnWriteDict",
     # Graph
     "WorkflowGraph",
     # Executor
@@ -77,4 +98,19 @@ __all__ = [
     "RedisCheckpointBackend",
     "get_checkpoint_store",
     "create_checkpoint_store",
+    # Result Cache
+    "ResultCache",
+    "make_cache_key",
+    "get_result_cache",
+    "create_result_cache",
+    # Hedged Execution
+    "DurationHistory",
+    "HedgeBudget",
+    "hedged",
+    "get_duration_history",
+    # Prompt Templates
+    "PromptTemplate",
+    "compile_template",
+    "render_prompt",
+    "substitute_inputs",
 ]
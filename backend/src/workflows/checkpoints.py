@@ -19,7 +19,9 @@ import redis.asyncio as redis
 from pydantic import BaseModel, Field
 from redis.asyncio import Redis
 
-from .state import WorkflowState
+from src.metrics import instrument_redis
+
+from .state import WorkflowState, as_plain_dict
 
 logger = logging.getLogger(__name__)
 
@@ -193,11 +195,11 @@ class RedisCheckpointBackend(CheckpointStorageBackend):
     async def connect(self) -> None:
         """Connect to Redis."""
         if self._redis is None:
-            self._redis = await redis.from_url(
+            self._redis = instrument_redis(await redis.from_url(
                 self._redis_url,
                 encoding="utf-8",
                 decode_responses=True
-            )
+            ), "checkpoints")
         self._connected = True
         logger.info("Checkpoint storage connected to Redis")
 
@@ -536,7 +538,9 @@ class CheckpointStore:
         base_dict["parallel_branches"] = {
             k: list(v) for k, v in state.parallel_branches.items()
         }
-        base_dict["parallel_results"] = state.parallel_results
+        base_dict["parallel_results"] = {
+            k: as_plain_dict(v) for k, v in state.parallel_results.items()
+        }
         base_dict["loop_iterations"] = state.loop_iterations
         base_dict["pending_reviews"] = state.pending_reviews
 
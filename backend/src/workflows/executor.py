@@ -8,11 +8,13 @@ Handles task execution, condition evaluation, router decisions, and loop control
 import asyncio
 import logging
 import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 from src.mcp import get_mcp_bus, ToolResult, ToolResultStatus
+from src.tracing import start_span
 
 from .nodes import (
     BaseNode,
@@ -22,6 +24,8 @@ from .nodes import (
     RouterNode,
     TaskNode,
 )
+from .hedging import DurationHistory, HedgeBudget, get_duration_history, hedged
+from .result_cache import ResultCache, get_result_cache, make_cache_key
 from .state import WorkflowState
 
 
@@ -40,6 +44,9 @@ class ExecutionMetrics:
     status: str = "pending"
     error: Optional[str] = None
     tool_invocations: int = 0
+    cache_hit: bool = False
+    hedged: bool = False
+    hedge_won: bool = False
 
     def complete(self, status: str = "completed", error: Optional[str] = None) -> None:
         """Mark execution as complete."""
@@ -60,6 +67,9 @@ class ExecutionMetrics:
             "status": self.status,
             "error": self.error,
             "tool_invocations": self.tool_invocations,
+            "cache_hit": self.cache_hit,
+            "hedged": self.hedged,
+            "hedge_won": self.hedge_won,
         }
 
 
@@ -73,6 +83,7 @@ class ExecutionContext:
     max_retries: int = 3
     debug: bool = False
     llm_router: Optional[Callable] = None  # Callback for LLM routing decisions
+    hedge_budget: Optional[HedgeBudget] = None  # Shared across the workflow's nodes
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     # Metrics tracking
@@ -112,6 +123,11 @@ class TimeoutError(ExecutorError):
     pass
 
 
+def _is_successful_result(result: Any) -> bool:
+    """Whether a tool call result counts as success."""
+    return not isinstance(result, ToolResult) or result.status == ToolResultStatus.SUCCESS
+
+
 class NodeExecutor:
     """
     Executor for workflow nodes.
@@ -121,18 +137,111 @@ class NodeExecutor:
     and execution metrics tracking.
     """
 
-    def __init__(self, llm_router: Optional[Callable] = None):
+    def __init__(
+        self,
+        llm_router: Optional[Callable] = None,
+        result_cache: Optional[ResultCache] = None,
+        duration_history: Optional[DurationHistory] = None
+    ):
         """
         Initialize the node executor.
 
         Args:
             llm_router: Optional callback for LLM-based routing decisions.
                         Signature: async def router(prompt: str, routes: Dict[str, str], state: Dict) -> str
+            result_cache: Cache for nodes with ``cache`` enabled (defaults to the shared instance)
+            duration_history: Tool durations used to trigger hedging (defaults to the shared instance)
         """
         self._bus = get_mcp_bus()
         self._llm_router = llm_router
+        self._result_cache = result_cache
+        self._duration_history = duration_history
         logger.info("NodeExecutor initialized")
 
+    @property
+    def result_cache(self) -> ResultCache:
+        """Cache used for nodes with ``cache`` enabled."""
+        return self._result_cache or get_result_cache()
+
+    @property
+    def duration_history(self) -> DurationHistory:
+        """Historical tool durations used to trigger hedging."""
+        return self._duration_history or get_duration_history()
+
+    async def _invoke_tool(
+        self,
+        node: TaskNode,
+        arguments: Dict[str, Any],
+        timeout: float,
+        metrics: ExecutionMetrics,
+        context: Optional[ExecutionContext] = None
+    ) -> Any:
+        """
+        Invoke the node's tool, hedging stragglers when enabled.
+
+        A hedged node whose call outlives its trigger (hedge_after, or the
+        tool's historical p95) gets a duplicate on the first alternate tool
+        path (or the same path); the first successful result wins and the
+        loser is cancelled through the bus's cancel hook. Both calls skip
+        the bus's coalescing: a same-path duplicate would otherwise join the
+        primary's execution instead of running a second attempt.
+        """
+        def call(tool_path: str, **kwargs):
+            return asyncio.wait_for(
+                self._bus.invoke_tool(
+                    tool_path=tool_path,
+                    arguments=arguments,
+                    timeout=timeout,
+                    **kwargs
+                ),
+                timeout=timeout
+            )
+
+        with start_span(
+            "node_executor.invoke_tool",
+            {"tool.path": node.tool_path, "task.attempt": metrics.retry_count + 1},
+        ) as span:
+            started = time.monotonic()
+            delay = None
+            budget = context.hedge_budget if context else None
+            if node.hedge and budget is not None:
+                delay = node.hedge_after
+                if delay is None:
+                    delay = self.duration_history.quantile(node.tool_path)
+
+            if delay is None:
+                result = await call(node.tool_path)
+                metrics.tool_invocations += 1
+            else:
+                paths = [node.tool_path, (node.hedge_tool_paths or [node.tool_path])[0]]
+                # Both calls may run on the same server: cancel by invocation
+                invocation_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+
+                async def cancel_loser(index: int) -> None:
+                    await self._bus.cancel_tool_execution(paths[index], invocation_ids[index])
+
+                result, winner, launched = await hedged(
+                    lambda: call(paths[0], invocation_id=invocation_ids[0], coalesce=False),
+                    lambda: call(paths[1], invocation_id=invocation_ids[1], coalesce=False),
+                    delay=delay,
+                    budget=budget,
+                    is_success=_is_successful_result,
+                    on_cancel=cancel_loser,
+                )
+                metrics.tool_invocations += 2 if launched else 1
+                metrics.hedged = metrics.hedged or launched
+                metrics.hedge_won = winner == 1
+                if launched:
+                    logger.info(
+                        f"Task {node.name} hedged after {delay:.2f}s; "
+                        f"{'duplicate' if winner == 1 else 'primary'} won"
+                    )
+
+            span.set_attribute("task.hedged", metrics.hedged)
+            if _is_successful_result(result):
+                self.duration_history.record(node.tool_path, time.monotonic() - started)
+            return result
+
     async def execute_task(
         self,
         node: TaskNode,
@@ -164,12 +273,27 @@ class NodeExecutor:
 
         logger.info(f"Executing task node: {node.name} (tool: {node.tool_path})")
 
-        # Resolve input arguments from state
-        resolved_inputs = node.resolve_inputs(state.to_dict())
+        # Resolve input arguments from state (per-key lookups, no full copy)
+        state_view = state.view()
+        resolved_inputs = node.resolve_inputs(state_view)
 
         # Merge static arguments with resolved inputs
         arguments = {**node.arguments, **resolved_inputs}
 
+        # Serve deterministic nodes from the result cache
+        cache_key: Optional[str] = None
+        if node.cache:
+            dependencies = {key: state_view.get(key) for key in node.cache_dependencies}
+            cache_key = make_cache_key(node.tool_path, arguments, dependencies)
+            hit, cached = await self.result_cache.get(cache_key)
+            if hit:
+                metrics.cache_hit = True
+                metrics.complete("completed")
+                state.update(node.output_key, cached)
+                state.mark_completed(node.id, cached)
+                logger.info(f"Task {node.name} served from result cache")
+                return cached
+
         # Determine timeout
         timeout = node.timeout
         if context and context.timeout:
@@ -191,17 +315,8 @@ class NodeExecutor:
                     f"with arguments: {arguments}"
                 )
 
-                # Invoke tool via MCP Bus with timeout
-                result = await asyncio.wait_for(
-                    self._bus.invoke_tool(
-                        tool_path=node.tool_path,
-                        arguments=arguments,
-                        timeout=timeout
-                    ),
-                    timeout=timeout
-                )
-
-                metrics.tool_invocations += 1
+                # Invoke tool via MCP Bus with timeout (hedged if enabled)
+                result = await self._invoke_tool(node, arguments, timeout, metrics, context)
 
                 # Check result status
                 if isinstance(result, ToolResult):
@@ -213,6 +328,9 @@ class NodeExecutor:
                         state.update(node.output_key, output_value)
                         state.mark_completed(node.id, output_value)
 
+                        if cache_key is not None:
+                            await self.result_cache.set(cache_key, output_value, ttl=node.cache_ttl)
+
                         logger.info(
                             f"Task {node.name} completed successfully "
                             f"(time: {metrics.execution_time:.2f}s)"
@@ -304,11 +422,8 @@ class NodeExecutor:
         logger.info(f"Evaluating condition node: {node.name}")
 
         try:
-            # Build state dictionary for evaluation
-            state_dict = {
-                **state.input,
-                **state.outputs
-            }
+            # View of state for evaluation
+            state_dict = state.view()
 
             # Evaluate conditions
             result = node.evaluate(state_dict)
@@ -561,13 +676,11 @@ Respond with ONLY the route name, nothing else."""
             # Update node's iteration tracker
             node.current_iteration = iteration
 
-            # Build state dictionary for evaluation
-            state_dict = {
-                **state.input,
-                **state.outputs,
-                "_loop_iteration": iteration,
-                "_break_loop": state.outputs.get("_break_loop", False)
-            }
+            # View of state for evaluation
+            state_dict = state.view(
+                _loop_iteration=iteration,
+                _break_loop=state.outputs.get("_break_loop", False)
+            )
 
             # Execute the loop node (it handles condition evaluation)
             result = await node.execute(state_dict)
@@ -640,8 +753,7 @@ Respond with ONLY the route name, nothing else."""
                 result = await self.execute_loop(node, state, context)
             else:
                 # For other node types, use default execute
-                state_dict = {**state.input, **state.outputs}
-                result = await node.execute(state_dict)
+                result = await node.execute(state.view())
                 state.mark_completed(node.id, result)
 
             node.status = NodeStatus.COMPLETED
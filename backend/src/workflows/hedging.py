@@ -0,0 +1,167 @@
+"""
+Hedged Execution
+
+Opt-in speculative execution for straggling task nodes. When a TaskNode with
+``hedge`` enabled runs longer than its tool's historical p95 duration, a
+duplicate invocation is launched (on an alternate tool path if configured),
+the first successful result wins and the loser is cancelled.
+
+- DurationHistory: streaming per tool path durations (t-digest)
+- HedgeBudget: caps duplicate launches per workflow execution
+- hedged(): race a primary call against a delayed backup
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.services.latency_model import TDigest
+
+logger = logging.getLogger(__name__)
+
+# Samples needed before a tool's p95 is trusted as a hedging trigger
+HEDGE_MIN_SAMPLES = 20
+HEDGE_QUANTILE = 0.95
+
+
+class DurationHistory:
+    """Historical invocation durations per tool path."""
+
+    def __init__(self, min_samples: int = HEDGE_MIN_SAMPLES):
+        """
+        Initialize history.
+
+        Args:
+            min_samples: Samples needed before quantiles are reported
+        """
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._digests: Dict[str, TDigest] = {}
+
+    def record(self, tool_path: str, seconds: float) -> None:
+        """Record a successful invocation duration."""
+        with self._lock:
+            digest = self._digests.get(tool_path)
+            if digest is None:
+                digest = self._digests[tool_path] = TDigest()
+            digest.add(seconds)
+
+    def quantile(self, tool_path: str, q: float = HEDGE_QUANTILE) -> Optional[float]:
+        """
+        Duration quantile for a tool path.
+
+        Returns:
+            Seconds, or None with fewer than min_samples samples
+        """
+        with self._lock:
+            digest = self._digests.get(tool_path)
+            if digest is None or digest.count < self.min_samples:
+                return None
+            return digest.quantile(q)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sample counts and p95 per tool path."""
+        with self._lock:
+            return {
+                tool_path: {"count": int(digest.count), "p95": digest.quantile(HEDGE_QUANTILE)}
+                for tool_path, digest in self._digests.items()
+            }
+
+
+@dataclass
+class HedgeBudget:
+    """Duplicate invocations allowed for one workflow execution."""
+    max_hedges: int = 3
+    used: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(self.max_hedges - self.used, 0)
+
+    def try_acquire(self) -> bool:
+        """Reserve one hedge; False when the budget is spent."""
+        if self.used >= self.max_hedges:
+            return False
+        self.used += 1
+        return True
+
+
+async def hedged(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    delay: float,
+    budget: Optional[HedgeBudget] = None,
+    is_success: Callable[[Any], bool] = lambda result: True,
+    on_cancel: Optional[Callable[[int], Awaitable[Any]]] = None
+) -> Tuple[Any, int, bool]:
+    """
+    Run primary; if it is still running after delay, race a backup.
+
+    The first call to finish successfully wins and the other is cancelled.
+    If a call fails, the other one (if any) is awaited instead. When both
+    fail, the last outcome is returned (or raised).
+
+    Args:
+        primary: Factory for the primary call
+        backup: Factory for the duplicate call
+        delay: Seconds before the duplicate is launched
+        budget: Hedge budget (no budget = unlimited)
+        is_success: Whether a returned value counts as success
+        on_cancel: Called with the loser's index (0 primary, 1 backup) after
+            it was cancelled, e.g. to stop remote work
+
+    Returns:
+        Tuple of (result, winner index, whether a duplicate was launched)
+    """
+    calls = {asyncio.ensure_future(primary()): 0}
+    launched = False
+    try:
+        done, _ = await asyncio.wait(calls, timeout=max(delay, 0.0))
+        if not done:
+            if budget is None or budget.try_acquire():
+                launched = True
+                calls[asyncio.ensure_future(backup())] = 1
+                logger.info(f"Launched hedged duplicate after {delay:.2f}s")
+            else:
+                logger.debug("Hedge budget exhausted; waiting on primary")
+
+        pending = set(calls)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winners = [
+                f for f in done
+                if f.exception() is None and is_success(f.result())
+            ]
+            if not winners and pending:
+                continue
+
+            future = winners[0] if winners else next(iter(done))
+            for loser in pending:
+                loser.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                if on_cancel is not None:
+                    for loser in pending:
+                        try:
+                            await on_cancel(calls[loser])
+                        except Exception as e:
+                            logger.warning(f"Failed to cancel hedged call: {e}")
+            return future.result(), calls[future], launched
+    finally:
+        for future in calls:
+            if not future.done():
+                future.cancel()
+
+
+# Singleton instance
+_duration_history: Optional[DurationHistory] = None
+
+
+def get_duration_history() -> DurationHistory:
+    """Get the shared duration history."""
+    global _duration_history
+    if _duration_history is None:
+        _duration_history = DurationHistory()
+    return _duration_history
@@ -14,6 +14,7 @@ Defines different node types for workflow execution:
 
 import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -84,10 +85,15 @@ class BaseNode(BaseModel, ABC):
     class Config:
         arbitrary_types_allowed = True
 
-    def resolve_inputs(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Resolve input values from workflow state."""
+    def resolve_inputs(self, state: Mapping) -> Dict[str, Any]:
+        """
+        Resolve input values from workflow state.
+
+        With an input mapping only the mapped keys are looked up, so the
+        cost does not depend on how much state has accumulated.
+        """
         if not self.input_mapping:
-            return state.copy()
+            return dict(state)
 
         resolved = {}
         for state_key, input_key in self.input_mapping.items():
@@ -109,6 +115,8 @@ class TaskNode(BaseNode):
     - tool_path: MCP tool path (server.tool_name)
     - arguments: Static arguments
     - timeout: Execution timeout
+    - cache: Reuse results of identical invocations (deterministic tools only)
+    - hedge: Launch a duplicate when the call outlives the tool's p95 duration
     """
     node_type: NodeType = NodeType.TASK
 
@@ -117,6 +125,16 @@ class TaskNode(BaseNode):
     arguments: Dict[str, Any] = Field(default_factory=dict)
     timeout: float = 60.0
 
+    # Result caching (opt-in)
+    cache: bool = False
+    cache_ttl: Optional[int] = None  # Seconds; None uses the cache default
+    cache_dependencies: List[str] = Field(default_factory=list)  # Extra state keys folded into the key
+
+    # Hedged execution (opt-in, bounded by the workflow's hedge budget)
+    hedge: bool = False
+    hedge_after: Optional[float] = None  # Seconds; None uses the tool's historical p95
+    hedge_tool_paths: List[str] = Field(default_factory=list)  # Tools for the duplicate; default: tool_path
+
     # For direct agent execution (legacy support)
     agent_config: Dict[str, Any] = Field(default_factory=dict)
 
@@ -180,7 +198,7 @@ class ConditionNode(BaseNode):
         value = data
 
         for key in keys:
-            if isinstance(value, dict) and key in value:
+            if isinstance(value, Mapping) and key in value:
                 value = value[key]
             else:
                 return None
@@ -0,0 +1,219 @@
+"""
+Compiled Prompt Templates
+
+Prompts and template placeholders are parsed once into a segment list of
+literal text and placeholder lookups; rendering is then a single join over
+the segments. The cost of rendering depends on the template, not on how
+many keys the context holds.
+
+Two placeholder syntaxes are supported:
+- ``{key}`` for agent prompts (DAGExecutor, WorkflowEngine)
+- ``${input.key}`` for workflow template inputs (TemplateLoader)
+
+Keys may be dotted paths into nested mappings (``{review.score}``,
+``${input.repo.url}``). A key present literally in the context wins over
+the nested lookup. Placeholders that cannot be resolved are left as-is.
+"""
+
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Union
+
+
+# Placeholder syntaxes
+BRACE = "brace"
+INPUT = "input"
+
+_PATTERNS = {
+    BRACE: re.compile(r"\{([^{}]+)\}"),
+    INPUT: re.compile(r"\$\{input\.([^}]+)\}"),
+}
+
+# Compiled templates kept per (syntax, source)
+TEMPLATE_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+
+class _Placeholder:
+    """A placeholder segment: lookup key, its dotted path and source text."""
+
+    __slots__ = ("key", "path", "text")
+
+    def __init__(self, key: str, text: str):
+        self.key = key
+        self.path = tuple(key.split("."))
+        self.text = text
+
+    def lookup(self, context: Mapping) -> Any:
+        """Resolve against the context, or return _MISSING."""
+        if self.key in context:
+            return context[self.key]
+        if len(self.path) == 1:
+            return _MISSING
+
+        value: Any = context
+        for part in self.path:
+            if isinstance(value, Mapping) and part in value:
+                value = value[part]
+            else:
+                return _MISSING
+        return value
+
+
+class PromptTemplate:
+    """
+    A template parsed into literal and placeholder segments.
+
+    Use compile_template() rather than constructing directly so parsed
+    templates are shared.
+    """
+
+    __slots__ = ("source", "syntax", "_segments", "_placeholders")
+
+    def __init__(self, source: str, syntax: str = BRACE):
+        """
+        Parse a template.
+
+        Args:
+            source: Template text
+            syntax: BRACE for ``{key}`` or INPUT for ``${input.key}``
+        """
+        if syntax not in _PATTERNS:
+            raise ValueError(f"Unknown template syntax: {syntax}")
+
+        self.source = source
+        self.syntax = syntax
+
+        segments: List[Union[str, _Placeholder]] = []
+        position = 0
+        for match in _PATTERNS[syntax].finditer(source):
+            if match.start() > position:
+                segments.append(source[position:match.start()])
+            segments.append(_Placeholder(match.group(1), match.group(0)))
+            position = match.end()
+        if position < len(source):
+            segments.append(source[position:])
+
+        self._segments: Tuple[Union[str, _Placeholder], ...] = tuple(segments)
+        self._placeholders = tuple(s for s in segments if isinstance(s, _Placeholder))
+
+    @property
+    def has_placeholders(self) -> bool:
+        """Whether the template contains any placeholder."""
+        return bool(self._placeholders)
+
+    @property
+    def placeholder_keys(self) -> List[str]:
+        """Placeholder keys in template order."""
+        return [p.key for p in self._placeholders]
+
+    @property
+    def is_single_placeholder(self) -> bool:
+        """Whether the whole template is exactly one placeholder."""
+        return len(self._segments) == 1 and bool(self._placeholders)
+
+    def render(self, context: Mapping) -> str:
+        """
+        Render the template to a string.
+
+        Args:
+            context: Values for placeholders
+
+        Returns:
+            Rendered text; unresolved placeholders are kept verbatim
+        """
+        if not self._placeholders:
+            return self.source
+
+        parts = []
+        for segment in self._segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+                continue
+            value = segment.lookup(context)
+            if value is _MISSING:
+                parts.append(segment.text)
+            elif isinstance(value, str):
+                parts.append(value)
+            else:
+                parts.append(str(value))
+        return "".join(parts)
+
+    def resolve(self, context: Mapping) -> Any:
+        """
+        Render, keeping the value's type when the template is one placeholder.
+
+        ``"${input.files}"`` resolves to the list itself rather than its
+        string form. Unresolved single placeholders return the source text.
+
+        Args:
+            context: Values for placeholders
+
+        Returns:
+            The raw value or the rendered text
+        """
+        if self.is_single_placeholder:
+            value = self._placeholders[0].lookup(context)
+            return self.source if value is _MISSING else value
+        return self.render(context)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(source: str, syntax: str = BRACE) -> PromptTemplate:
+    """
+    Get the compiled form of a template (cached).
+
+    Args:
+        source: Template text
+        syntax: BRACE or INPUT
+
+    Returns:
+        Shared PromptTemplate instance
+    """
+    return PromptTemplate(source, syntax)
+
+
+def render_prompt(template: Optional[str], context: Mapping) -> str:
+    """
+    Build a prompt from a ``{key}`` template.
+
+    Args:
+        template: Prompt template (empty falls back to the context's repr)
+        context: Values for placeholders
+
+    Returns:
+        Rendered prompt
+    """
+    if not template:
+        return str(context)
+    return compile_template(template, BRACE).render(context)
+
+
+def substitute_inputs(data: Any, input_data: Mapping) -> Any:
+    """
+    Recursively substitute ``${input.key}`` placeholders in a structure.
+
+    Strings that are exactly one placeholder take the input value as-is;
+    other strings are rendered. Dicts and lists are walked.
+
+    Args:
+        data: Data structure to process
+        input_data: Input values
+
+    Returns:
+        Data with substitutions applied
+    """
+    if isinstance(data, str):
+        if "${input." not in data:
+            return data
+        return compile_template(data, INPUT).resolve(input_data)
+
+    if isinstance(data, dict):
+        return {key: substitute_inputs(value, input_data) for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [substitute_inputs(item, input_data) for item in data]
+
+    return data
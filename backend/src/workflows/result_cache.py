@@ -0,0 +1,344 @@
+"""
+Content-addressed Result Cache
+
+Caches successful results of deterministic TaskNodes so identical
+invocations (same tool, same arguments, same declared inputs) are served
+without calling the MCP Bus again. Typical hits are analysis steps over an
+unchanged repository and re-executions of a workflow that failed further
+downstream.
+
+Caching is opt-in per node (``TaskNode.cache``). Two tiers:
+- In-process LRU with TTL, entry-count and byte-size bounds
+- Optional Redis tier shared across processes and restarts
+
+Results are stored as JSON; values that do not serialize are not cached.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import redis.asyncio as redis
+from redis.asyncio import Redis
+
+from src.metrics import instrument_redis
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key derivation changes so old entries are not reused
+CACHE_KEY_VERSION = 1
+
+
+def _normalize(value: Any) -> Any:
+    """Convert a value to a canonical JSON-compatible form."""
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(v) for v in value), key=repr)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def make_cache_key(
+    tool_path: str,
+    arguments: Dict[str, Any],
+    dependencies: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Derive the cache key for a tool invocation.
+
+    Args:
+        tool_path: MCP tool path
+        arguments: Final tool arguments (static arguments + resolved inputs)
+        dependencies: Declared input dependencies (state key -> value)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "tool": tool_path,
+        "args": _normalize(arguments),
+        "deps": _normalize(dependencies or {}),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for task results.
+
+    The memory tier evicts least recently used entries once either
+    ``max_entries`` or ``max_bytes`` is exceeded; expired entries are
+    dropped on access. The Redis tier relies on key TTLs. Redis errors are
+    logged and treated as misses so the cache never fails a task.
+    """
+
+    KEY_RESULT = "workflow:result_cache:{key}"
+
+    DEFAULT_TTL = 24 * 3600
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: int = DEFAULT_TTL,
+        redis_client: Optional[Redis] = None,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Initialize result cache.
+
+        Args:
+            max_entries: Maximum entries kept in memory
+            max_bytes: Maximum serialized bytes kept in memory
+            default_ttl: Entry lifetime in seconds when the node sets none
+            redis_client: Existing Redis client for the shared tier
+            redis_url: Redis URL for the shared tier (connected in connect())
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._redis: Optional[Redis] = redis_client
+        self._redis_url = redis_url
+
+        # key -> (expires_at, serialized result)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+
+        self._stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "skipped": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "redis_errors": 0,
+        }
+
+    @property
+    def redis_enabled(self) -> bool:
+        """Whether the Redis tier is active."""
+        return self._redis is not None
+
+    async def connect(self) -> None:
+        """Connect the Redis tier if a URL was given."""
+        if self._redis is None and self._redis_url:
+            self._redis = instrument_redis(await redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            ), "result_cache")
+            await self._redis.ping()
+            logger.info("Result cache connected to Redis")
+
+    async def disconnect(self) -> None:
+        """Disconnect the Redis tier."""
+        if self._redis is not None and self._redis_url:
+            await self._redis.close()
+        self._redis = None
+
+    # ==================== Memory Tier ====================
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        """Get a serialized entry from memory, honouring TTL."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _memory_set(self, key: str, payload: str, ttl: int) -> None:
+        """Store a serialized entry in memory and evict down to the bounds."""
+        size = len(payload)
+        if size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, payload)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry from memory."""
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    # ==================== Public API ====================
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            Tuple of (hit, result). Each hit returns a fresh copy.
+        """
+        payload = self._memory_get(key)
+        if payload is not None:
+            self._stats["memory_hits"] += 1
+            return True, json.loads(payload)
+
+        if self._redis is not None:
+            try:
+                redis_key = self.KEY_RESULT.format(key=key)
+                payload = await self._redis.get(redis_key)
+                if payload is not None:
+                    ttl = await self._redis.ttl(redis_key)
+                    self._memory_set(key, payload, ttl if ttl and ttl > 0 else self._default_ttl)
+                    self._stats["redis_hits"] += 1
+                    return True, json.loads(payload)
+            except Exception as e:
+                self._stats["redis_errors"] += 1
+                logger.warning(f"Result cache Redis lookup failed: {e}")
+
+        self._stats["misses"] += 1
+        return False, None
+
+    async def set(self, key: str, result: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Store a result.
+
+        Args:
+            key: Cache key from make_cache_key()
+            result: JSON-serializable result
+            ttl: Lifetime in seconds (default: the cache's default_ttl)
+
+        Returns:
+            True if stored, False if the result could not be serialized
+        """
+        try:
+            payload = json.dumps(result, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            self._stats["skipped"] += 1
+            logger.debug(f"Result not cacheable: {e}")
+            return False
+
+        ttl = ttl or self._default_ttl
+        self._memory_set(key, payload, ttl)
+        self._stats["stores"] += 1
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(self.KEY_RESULT.format(key=key), payload, ex=ttl)
+            except Exception as e:
+                self._stats["redis_errors"] += 1
+                logger.warning(f"Result cache Redis write failed: {e}")
+
+        return True
+
+    async def invalidate(self, keys: Iterable[str]) -> int:
+        """
+        Remove entries from both tiers.
+
+        Args:
+            keys: Cache keys to remove
+
+        Returns:
+            Number of in-memory entries removed
+        """
+        removed = 0
+        keys = list(keys)
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+                removed += 1
+        if self._redis is not None and keys:
+            try:
+                await self._redis.delete(*(self.KEY_RESULT.format(key=k) for k in keys))
+            except Exception as e:
+                self._stats["redis_errors"] += 1
+                logger.warning(f"Result cache Redis delete failed: {e}")
+        return removed
+
+    def clear(self) -> None:
+        """Clear the memory tier."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters, hit rate and memory usage
+        """
+        hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "redis_enabled": self.redis_enabled,
+        }
+
+
+# Singleton instance
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the singleton result cache (memory tier only until configured)."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
+
+
+async def create_result_cache(
+    redis_url: str = "redis://localhost:6379",
+    max_entries: int = ResultCache.DEFAULT_MAX_ENTRIES,
+    max_bytes: int = ResultCache.DEFAULT_MAX_BYTES,
+    default_ttl: int = ResultCache.DEFAULT_TTL
+) -> ResultCache:
+    """
+    Create a Redis-backed result cache and install it as the singleton.
+
+    Args:
+        redis_url: Redis connection URL
+        max_entries: Maximum entries kept in memory
+        max_bytes: Maximum serialized bytes kept in memory
+        default_ttl: Default entry lifetime in seconds
+
+    Returns:
+        Connected ResultCache instance
+    """
+    global _result_cache
+    cache = ResultCache(
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+        default_ttl=default_ttl,
+        redis_url=redis_url
+    )
+    await cache.connect()
+    _result_cache = cache
+    return cache
@@ -6,15 +6,194 @@ Manages workflow execution state with:
 - State updates and merging
 - Parallel result aggregation
 - Checkpoint support
+- Structurally shared snapshots (copy-on-write outputs)
 """
 
 import copy
 import json
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+
+_MISSING = object()
+_DELETED = object()
+
+# Immutable value types that can be shared between snapshots without copying
+_ATOMIC_TYPES = frozenset({str, int, float, bool, bytes, type(None), datetime})
+
+
+class CopyOnWriteDict(MutableMapping):
+    """
+    Dictionary with O(1) snapshots that share structure.
+
+    Entries live in a stack of frozen layers, shared between snapshots and
+    never modified, plus a private layer that takes all writes. snapshot()
+    freezes the private layer and hands the same stack to the copy, so no
+    stored value is touched.
+
+    Shared values are isolated lazily: the first read of a mutable value
+    from a frozen layer deep-copies it into the private layer, so in-place
+    changes to nested values never leak between snapshots. Immutable values
+    (strings, numbers) are returned as-is, which is what keeps large LLM
+    outputs cheap to share.
+
+    Frozen layers are merged geometrically as they accumulate, keeping the
+    stack depth logarithmic in the number of entries.
+    """
+
+    __slots__ = ("_layers", "_local", "_len")
+
+    def __init__(self, data: Optional[Mapping] = None):
+        self._layers: Tuple[Dict[str, Any], ...] = ()  # newest first
+        self._local: Dict[str, Any] = dict(data) if data else {}
+        self._len = len(self._local)
+
+    def _find(self, key: str) -> Any:
+        """Look up the raw stored value (may be a tombstone)."""
+        value = self._local.get(key, _MISSING)
+        if value is _MISSING:
+            for layer in self._layers:
+                value = layer.get(key, _MISSING)
+                if value is not _MISSING:
+                    break
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._local.get(key, _MISSING)
+        if value is not _MISSING:
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+
+        for layer in self._layers:
+            value = layer.get(key, _MISSING)
+            if value is not _MISSING:
+                break
+        if value is _MISSING or value is _DELETED:
+            raise KeyError(key)
+
+        if type(value) not in _ATOMIC_TYPES:
+            # First access to a shared mutable value: take a private copy
+            value = copy.deepcopy(value)
+            self._local[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        value = self._find(key)
+        return value is not _MISSING and value is not _DELETED
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self:
+            self._len += 1
+        self._local[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if self._layers:
+            self._local[key] = _DELETED
+        else:
+            del self._local[key]
+        self._len -= 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, value in self._merged().items() if value is not _DELETED)
+
+    def __repr__(self) -> str:
+        return f"CopyOnWriteDict({self._entries()!r})"
+
+    def __copy__(self) -> "CopyOnWriteDict":
+        return self.snapshot()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "CopyOnWriteDict":
+        return CopyOnWriteDict(copy.deepcopy(self._entries(), memo))
+
+    def __reduce__(self):
+        return (CopyOnWriteDict, (self._entries(),))
+
+    def _merged(self) -> Dict[str, Any]:
+        """All stored entries in insertion order, tombstones included."""
+        if not self._layers:
+            return self._local
+        merged: Dict[str, Any] = {}
+        for layer in reversed(self._layers):
+            merged.update(layer)
+        merged.update(self._local)
+        return merged
+
+    def _entries(self) -> Dict[str, Any]:
+        """Current entries without tombstones; shared values are not copied."""
+        return {k: v for k, v in self._merged().items() if v is not _DELETED}
+
+    def _freeze(self) -> None:
+        """Move the private layer onto the shared stack."""
+        if not self._local:
+            return
+        layers = [self._local, *self._layers]
+        # Fold a layer into the one below while it is at least half its size
+        while len(layers) > 1 and len(layers[0]) * 2 >= len(layers[1]):
+            newer = layers.pop(0)
+            older = layers.pop(0)
+            merged = {**older, **newer}
+            if not layers:
+                # Bottom layer: tombstones no longer hide anything
+                merged = {k: v for k, v in merged.items() if v is not _DELETED}
+            layers.insert(0, merged)
+        self._layers = tuple(layers)
+        self._local = {}
+
+    def snapshot(self) -> "CopyOnWriteDict":
+        """
+        Take an independent copy that shares all stored values.
+
+        Returns:
+            New CopyOnWriteDict; writes to either side are not visible
+            to the other.
+        """
+        self._freeze()
+        clone = CopyOnWriteDict.__new__(CopyOnWriteDict)
+        clone._layers = self._layers
+        clone._local = {}
+        clone._len = self._len
+        return clone
+
+    def copy(self) -> "CopyOnWriteDict":
+        """Same as snapshot(), for dict compatibility."""
+        return self.snapshot()
+
+    def clear(self) -> None:
+        self._layers = ()
+        self._local = {}
+        self._len = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build a plain dict of the current entries.
+
+        Mutable values are deep-copied, so the result never aliases a value
+        stored here: stored values end up shared with every later snapshot,
+        and changes made through the result must not reach them.
+        """
+        memo: Dict[int, Any] = {}
+        return {
+            k: v if type(v) in _ATOMIC_TYPES else copy.deepcopy(v, memo)
+            for k, v in self._entries().items()
+        }
+
+
+def as_plain_dict(data: Mapping) -> Dict[str, Any]:
+    """Convert a state mapping to a plain dict (no-op for dicts)."""
+    if isinstance(data, CopyOnWriteDict):
+        return data.to_dict()
+    return data if isinstance(data, dict) else dict(data)
 
 
 class WorkflowContext(BaseModel):
@@ -32,11 +211,20 @@ class WorkflowContext(BaseModel):
     timeout: float = 3600.0  # 1 hour default
     max_retries: int = 3
     debug: bool = False
+    hedge_budget: int = 3  # Duplicate invocations allowed for hedged task nodes
+
+    # Deadline (explicit deadline wins over the SLO class target)
+    deadline: Optional[datetime] = None
+    slo_class: Optional[str] = None  # "interactive", "standard" or "batch"
+    shed_hopeless: bool = False  # Abort once the remaining work cannot meet the deadline
 
     # Metadata
     tags: List[str] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    # Caller's trace context (W3C traceparent carrier); execution joins that trace
+    trace: Dict[str, str] = Field(default_factory=dict)
+
 
 class WorkflowState(BaseModel):
     """
@@ -47,12 +235,15 @@ class WorkflowState(BaseModel):
     - Execution progress
     - Intermediate results
     - Error information
+
+    Input, outputs and parallel results are CopyOnWriteDicts, so clone()
+    and from_dict() share stored values instead of deep-copying them.
     """
     # Initial input
-    input: Dict[str, Any] = Field(default_factory=dict)
+    input: CopyOnWriteDict = Field(default_factory=CopyOnWriteDict)
 
     # Node outputs (node_id -> output)
-    outputs: Dict[str, Any] = Field(default_factory=dict)
+    outputs: CopyOnWriteDict = Field(default_factory=CopyOnWriteDict)
 
     # Current execution pointer
     current_node: Optional[str] = None
@@ -61,7 +252,7 @@ class WorkflowState(BaseModel):
 
     # Parallel execution tracking
     parallel_branches: Dict[str, Set[str]] = Field(default_factory=dict)  # join_id -> branch_ids
-    parallel_results: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # join_id -> {branch_id: result}
+    parallel_results: Dict[str, CopyOnWriteDict] = Field(default_factory=dict)  # join_id -> {branch_id: result}
 
     # Loop tracking
     loop_iterations: Dict[str, int] = Field(default_factory=dict)  # loop_node_id -> iteration
@@ -79,6 +270,27 @@ class WorkflowState(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @field_validator("input", "outputs", mode="before")
+    @classmethod
+    def _wrap_mapping(cls, value: Any) -> Any:
+        """Accept plain dicts for the copy-on-write fields."""
+        if value is None:
+            return CopyOnWriteDict()
+        if isinstance(value, Mapping) and not isinstance(value, CopyOnWriteDict):
+            return CopyOnWriteDict(value)
+        return value
+
+    @field_validator("parallel_results", mode="before")
+    @classmethod
+    def _wrap_parallel_results(cls, value: Any) -> Any:
+        """Accept plain dicts for per-join branch results."""
+        if isinstance(value, Mapping):
+            return {
+                join_id: results if isinstance(results, CopyOnWriteDict) else CopyOnWriteDict(results)
+                for join_id, results in value.items()
+            }
+        return value
+
     def update(self, key: str, value: Any) -> None:
         """Update a single output value."""
         self.outputs[key] = value
@@ -119,7 +331,7 @@ class WorkflowState(BaseModel):
     def start_parallel(self, join_id: str, branch_ids: List[str]) -> None:
         """Start tracking parallel branches."""
         self.parallel_branches[join_id] = set(branch_ids)
-        self.parallel_results[join_id] = {}
+        self.parallel_results[join_id] = CopyOnWriteDict()
 
     def complete_branch(self, join_id: str, branch_id: str, result: Any) -> bool:
         """
@@ -128,7 +340,7 @@ class WorkflowState(BaseModel):
         Returns True if all branches are complete.
         """
         if join_id not in self.parallel_results:
-            self.parallel_results[join_id] = {}
+            self.parallel_results[join_id] = CopyOnWriteDict()
 
         self.parallel_results[join_id][branch_id] = result
 
@@ -162,11 +374,26 @@ class WorkflowState(BaseModel):
         if node_id in self.pending_reviews:
             self.pending_reviews.remove(node_id)
 
+    def view(self, **extra: Any) -> Mapping:
+        """
+        Read-only view of input and outputs merged, without copying.
+
+        Lookups resolve like ``{**input, **outputs, **extra}`` but cost one
+        probe per key instead of rebuilding the whole map.
+
+        Args:
+            **extra: Additional values that take precedence
+
+        Returns:
+            Mapping over the current state
+        """
+        return ChainMap(extra, self.outputs, self.input)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
-            "input": self.input,
-            "outputs": self.outputs,
+            "input": as_plain_dict(self.input),
+            "outputs": as_plain_dict(self.outputs),
             "current_node": self.current_node,
             "completed_nodes": list(self.completed_nodes),
             "failed_nodes": list(self.failed_nodes),
@@ -177,8 +404,25 @@ class WorkflowState(BaseModel):
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "WorkflowState":
-        """Create from dictionary."""
-        data = copy.deepcopy(data)
+        """
+        Create from dictionary.
+
+        Input and outputs share the values in ``data``; mutable values are
+        copied on first access, so the source dict is never modified.
+        """
+        data = dict(data)
+        for key in ("input", "outputs"):
+            if key in data and data[key] is not None:
+                data[key] = CopyOnWriteDict(data[key]).snapshot()
+        if "parallel_results" in data:
+            data["parallel_results"] = {
+                join_id: CopyOnWriteDict(results).snapshot()
+                for join_id, results in data["parallel_results"].items()
+            }
+        # Bookkeeping fields are small; copy them outright
+        for key in ("parallel_branches", "loop_iterations", "pending_reviews", "errors"):
+            if key in data:
+                data[key] = copy.deepcopy(data[key])
         if "completed_nodes" in data:
             data["completed_nodes"] = set(data["completed_nodes"])
         if "failed_nodes" in data:
@@ -190,18 +434,31 @@ class WorkflowState(BaseModel):
         return cls(**data)
 
     def clone(self) -> "WorkflowState":
-        """Create a deep copy of state."""
-        return WorkflowState(
-            input=copy.deepcopy(self.input),
-            outputs=copy.deepcopy(self.outputs),
+        """
+        Create an isolated copy of state.
+
+        Stored values are shared with this state rather than deep-copied;
+        see CopyOnWriteDict. Only the bookkeeping collections (node ID sets,
+        counters, reviews, errors) are copied.
+        """
+        for join_id, results in self.parallel_results.items():
+            if not isinstance(results, CopyOnWriteDict):
+                self.parallel_results[join_id] = CopyOnWriteDict(results)
+        for key in ("input", "outputs"):
+            if not isinstance(getattr(self, key), CopyOnWriteDict):
+                setattr(self, key, CopyOnWriteDict(getattr(self, key)))
+
+        return WorkflowState.model_construct(
+            input=self.input.snapshot(),
+            outputs=self.outputs.snapshot(),
             current_node=self.current_node,
             completed_nodes=self.completed_nodes.copy(),
             failed_nodes=self.failed_nodes.copy(),
             parallel_branches={k: v.copy() for k, v in self.parallel_branches.items()},
-            parallel_results=copy.deepcopy(self.parallel_results),
+            parallel_results={k: v.snapshot() for k, v in self.parallel_results.items()},
             loop_iterations=self.loop_iterations.copy(),
             pending_reviews=self.pending_reviews.copy(),
-            errors=copy.deepcopy(self.errors),
+            errors=[dict(e) for e in self.errors],
             started_at=self.started_at,
             last_updated=self.last_updated
         )
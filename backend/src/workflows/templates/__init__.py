@@ -6,6 +6,7 @@ Provides template loading, parsing, and validation for YAML-based workflow defin
 Components:
 - TemplateLoader: Discovers and loads templates from the templates directory
 - TemplateMetadata: Metadata model for template information
+- TemplateWatcher: Filesystem-event driven template index and preloader
 - Template validation utilities
 """
 
@@ -14,9 +15,12 @@ from .loader import (
     TemplateMetadata,
     TemplateValidationError,
 )
+from .watcher import TemplateIndex, TemplateWatcher
 
 __all__ = [
     "TemplateLoader",
     "TemplateMetadata",
     "TemplateValidationError",
+    "TemplateIndex",
+    "TemplateWatcher",
 ]
@@ -3,10 +3,21 @@ Workflow Template Loader
 
 Loads, parses, and validates YAML workflow templates.
 Supports template discovery, caching, and conversion to WorkflowGraph.
+
+Each template version is validated and compiled once into a prototype
+WorkflowGraph. Instantiating a workflow clones the prototype and applies
+input bindings only to the node fields that contain placeholders.
+
+With watching enabled, file discovery and freshness checks are served from
+an in-memory index maintained by TemplateWatcher.
 """
 
+import copy
 import hashlib
 import os
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union
@@ -15,7 +26,9 @@ import yaml
 from pydantic import BaseModel, Field, validator
 
 from ..graph import WorkflowGraph
-from ..nodes import NodeType, create_node
+from ..nodes import BaseNode, NodeType, create_node
+from ..prompt_template import substitute_inputs
+from .watcher import TemplateWatcher
 
 
 class TemplateValidationError(Exception):
@@ -64,9 +77,29 @@ class TemplateMetadata(BaseModel):
         return v
 
 
+# Marker for input placeholders in template values
+INPUT_PLACEHOLDER = "${input."
+
+
+def _has_placeholder(value: Any) -> bool:
+    """Check whether a value contains an input placeholder anywhere."""
+    if isinstance(value, str):
+        return INPUT_PLACEHOLDER in value
+    if isinstance(value, dict):
+        return any(_has_placeholder(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_has_placeholder(v) for v in value)
+    return False
+
+
 class CachedTemplate:
     """
-    Cached template with metadata and content hash.
+    Cached template with metadata, content hash and compiled prototype.
+
+    ``bindings`` maps node IDs to the node fields that contain input
+    placeholders; only those fields are substituted per instance.
+    ``containers`` lists the remaining list/dict fields, which are the only
+    values that need copying so instances do not share mutable state.
     """
 
     def __init__(
@@ -74,12 +107,31 @@ class CachedTemplate:
         metadata: TemplateMetadata,
         raw_content: Dict[str, Any],
         content_hash: str,
-        loaded_at: datetime
+        loaded_at: datetime,
+        prototype: Optional[WorkflowGraph] = None,
+        file_signature: Optional[tuple] = None
     ):
         self.metadata = metadata
         self.raw_content = raw_content
         self.content_hash = content_hash
         self.loaded_at = loaded_at
+        self.prototype = prototype
+        self.file_signature = file_signature
+        self.bindings: Dict[str, List[str]] = {}
+        self.containers: Dict[str, List[str]] = {}
+
+        if prototype is not None:
+            for node_id, node in prototype.nodes.items():
+                bound = []
+                containers = []
+                for name in type(node).model_fields:
+                    value = getattr(node, name)
+                    if _has_placeholder(value):
+                        bound.append(name)
+                    elif isinstance(value, (list, dict)):
+                        containers.append(name)
+                self.bindings[node_id] = bound
+                self.containers[node_id] = containers
 
 
 class TemplateLoader:
@@ -92,6 +144,8 @@ class TemplateLoader:
     - Validates template structure
     - Creates WorkflowGraph from templates
     - Caches loaded templates
+    - Optionally watches the directory (start_watching) so lookups and
+      listings are served from memory
 
     Usage:
         loader = TemplateLoader("/path/to/templates")
@@ -115,7 +169,11 @@ class TemplateLoader:
     def __init__(
         self,
         templates_dir: Optional[Union[str, Path]] = None,
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        max_cache_size: int = 128,
+        watch: bool = False,
+        poll_interval: float = 2.0,
+        preload: bool = True
     ):
         """
         Initialize template loader.
@@ -124,6 +182,10 @@ class TemplateLoader:
             templates_dir: Directory containing YAML templates.
                           Defaults to 'templates/' in the workflows package.
             cache_enabled: Whether to cache loaded templates.
+            max_cache_size: Maximum number of compiled templates kept.
+            watch: Start watching the directory for changes immediately.
+            poll_interval: Seconds between scans when watchdog is unavailable.
+            preload: Compile new and changed templates in the background while watching.
         """
         if templates_dir is None:
             # Default to templates/ directory relative to this file
@@ -132,11 +194,59 @@ class TemplateLoader:
             self.templates_dir = Path(templates_dir)
 
         self.cache_enabled = cache_enabled
-        self._cache: Dict[str, CachedTemplate] = {}
+        self.max_cache_size = max(1, max_cache_size)
+        self._cache: "OrderedDict[str, CachedTemplate]" = OrderedDict()
+        self._cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "evictions": 0,
+            "instantiations": 0,
+        }
+        self._lock = threading.RLock()
+        self._watcher = None
 
         # Ensure templates directory exists
         self.templates_dir.mkdir(parents=True, exist_ok=True)
 
+        if watch:
+            self.start_watching(poll_interval=poll_interval, preload=preload)
+
+    @property
+    def watching(self) -> bool:
+        """Whether the in-memory template index is active."""
+        return self._watcher is not None and self._watcher.running
+
+    def start_watching(self, poll_interval: float = 2.0, preload: bool = True) -> None:
+        """
+        Index the templates directory and follow changes in the background.
+
+        Uses watchdog when installed, otherwise polls every poll_interval.
+
+        Args:
+            poll_interval: Seconds between scans when polling.
+            preload: Compile new and changed templates before first use.
+        """
+        if self.watching:
+            return
+        self._watcher = TemplateWatcher(self, poll_interval=poll_interval, preload=preload)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher and fall back to disk lookups."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def preload(self, template_id: str) -> None:
+        """
+        Compile a template into the cache ahead of first use.
+
+        Args:
+            template_id: ID of the template.
+        """
+        self._get_compiled(template_id)
+
     def _compute_hash(self, content: str) -> str:
         """Compute SHA256 hash of content."""
         return hashlib.sha256(content.encode()).hexdigest()
@@ -148,6 +258,14 @@ class TemplateLoader:
         except OSError:
             return None
 
+    def _get_file_signature(self, path: Path) -> Optional[tuple]:
+        """Get (mtime_ns, size) used to detect changed template files."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
     def _discover_template_files(self) -> List[Path]:
         """
         Discover all YAML template files in the templates directory.
@@ -482,51 +600,153 @@ class TemplateLoader:
             template_id: ID of the template to load.
 
         Returns:
-            WorkflowGraph instance.
+            WorkflowGraph instance (a fresh copy of the compiled prototype).
 
         Raises:
             FileNotFoundError: If template not found.
             TemplateValidationError: If template is invalid.
         """
-        # Check cache first
-        if self.cache_enabled and template_id in self._cache:
-            cached = self._cache[template_id]
-            # Verify cache is still valid
-            if cached.metadata.source_path:
-                path = Path(cached.metadata.source_path)
-                if path.exists():
-                    with open(path, "r", encoding="utf-8") as f:
-                        current_hash = self._compute_hash(f.read())
-                    if current_hash == cached.content_hash:
-                        return self._build_graph_from_content(cached.raw_content)
+        compiled = self._get_compiled(template_id)
+        return self._instantiate(compiled, compiled.prototype.id)
+
+    def _get_compiled(self, template_id: str) -> CachedTemplate:
+        """
+        Get the compiled template, reusing the cached prototype when valid.
+
+        A cached entry is checked against the file's mtime and size; the
+        file is only re-read when those change, and only recompiled when
+        its content hash changes.
+
+        Args:
+            template_id: ID of the template.
+
+        Returns:
+            CachedTemplate with a compiled prototype.
+
+        Raises:
+            FileNotFoundError: If template not found.
+            TemplateValidationError: If template is invalid.
+        """
+        with self._lock:
+            return self._get_compiled_locked(template_id)
+
+    def _get_compiled_locked(self, template_id: str) -> CachedTemplate:
+        """Body of _get_compiled; caller holds the lock."""
+        cached = self._cache.get(template_id) if self.cache_enabled else None
+        if cached is not None and cached.metadata.source_path:
+            path = Path(cached.metadata.source_path)
+            if self.watching:
+                # The watcher keeps signatures current; no stat needed
+                signature = self._watcher.index.signature(path)
+            else:
+                signature = self._get_file_signature(path)
+            if signature is not None and signature == cached.file_signature:
+                self._cache.move_to_end(template_id)
+                self._cache_stats["hits"] += 1
+                return cached
+
+            if signature is not None:
+                # File touched: only recompile if the content changed
+                with open(path, "r", encoding="utf-8") as f:
+                    current_hash = self._compute_hash(f.read())
+                if current_hash == cached.content_hash:
+                    cached.file_signature = signature
+                    self._cache.move_to_end(template_id)
+                    self._cache_stats["hits"] += 1
+                    return cached
+
+            self._cache_stats["reloads"] += 1
+            del self._cache[template_id]
+
+        self._cache_stats["misses"] += 1
 
         # Find template file
         template_path = self._find_template_file(template_id)
         if not template_path:
             raise FileNotFoundError(f"Template not found: {template_id}")
 
+        signature = self._get_file_signature(template_path)
+        with open(template_path, "r", encoding="utf-8") as f:
+            raw_content = f.read()
+
+        try:
+            content = yaml.safe_load(raw_content)
+        except yaml.YAMLError as e:
+            raise TemplateValidationError([f"Failed to parse YAML: {e}"])
+        if not isinstance(content, dict):
+            raise TemplateValidationError(["Template must be a dictionary"])
+
         # Validate template
-        errors = self.validate_template(template_path)
+        errors = self._validate_content(content)
         if errors:
             raise TemplateValidationError(errors)
 
-        # Load and parse
-        with open(template_path, "r", encoding="utf-8") as f:
-            raw_content = f.read()
-
-        content = yaml.safe_load(raw_content)
+        metadata = self._extract_metadata(content, str(template_path))
+        compiled = CachedTemplate(
+            metadata=metadata,
+            raw_content=content,
+            content_hash=self._compute_hash(raw_content),
+            loaded_at=datetime.utcnow(),
+            prototype=self._build_graph_from_content(content),
+            file_signature=signature
+        )
 
-        # Cache the template
         if self.cache_enabled:
-            metadata = self._extract_metadata(content, str(template_path))
-            self._cache[template_id] = CachedTemplate(
-                metadata=metadata,
-                raw_content=content,
-                content_hash=self._compute_hash(raw_content),
-                loaded_at=datetime.utcnow()
-            )
+            self._cache[template_id] = compiled
+            while len(self._cache) > self.max_cache_size:
+                self._cache.popitem(last=False)
+                self._cache_stats["evictions"] += 1
+
+        return compiled
 
-        return self._build_graph_from_content(content)
+    def _instantiate(
+        self,
+        compiled: CachedTemplate,
+        graph_id: str,
+        name: Optional[str] = None,
+        input_data: Optional[Dict[str, Any]] = None
+    ) -> WorkflowGraph:
+        """
+        Clone the compiled prototype, applying input bindings.
+
+        Nodes are copied without re-validation. Fields listed in the
+        template's bindings are substituted from input_data; other
+        container fields are deep-copied and scalars are shared.
+
+        Args:
+            compiled: Compiled template.
+            graph_id: ID for the new graph.
+            name: Name for the new graph (defaults to the prototype's).
+            input_data: Input values for ${input.*} placeholders.
+
+        Returns:
+            New WorkflowGraph instance.
+        """
+        prototype = compiled.prototype
+        nodes: Dict[str, BaseNode] = {}
+        for node_id, node in prototype.nodes.items():
+            update = {
+                field: copy.deepcopy(getattr(node, field))
+                for field in compiled.containers[node_id]
+            }
+            for field in compiled.bindings[node_id]:
+                value = getattr(node, field)
+                update[field] = (
+                    self._substitute_inputs(value, input_data)
+                    if input_data is not None else copy.deepcopy(value)
+                )
+            nodes[node_id] = node.model_copy(update=update)
+
+        self._cache_stats["instantiations"] += 1
+        return WorkflowGraph.model_construct(
+            id=graph_id,
+            name=name if name is not None else prototype.name,
+            description=prototype.description,
+            nodes=nodes,
+            edges=defaultdict(list, {k: list(v) for k, v in prototype.edges.items()}),
+            entry_node=prototype.entry_node,
+            exit_nodes=list(prototype.exit_nodes)
+        )
 
     def _find_template_file(self, template_id: str) -> Optional[Path]:
         """
@@ -538,6 +758,9 @@ class TemplateLoader:
         Returns:
             Path to template file or None.
         """
+        if self.watching:
+            return self._watcher.index.find(template_id)
+
         # Try direct file names
         for ext in [".yaml", ".yml"]:
             path = self.templates_dir / f"{template_id}{ext}"
@@ -571,9 +794,10 @@ class TemplateLoader:
             description=content.get("description", "")
         )
 
-        # Add nodes
+        # Add nodes (working on copies; content stays cached as parsed)
         nodes = content.get("nodes", [])
         for node_data in nodes:
+            node_data = dict(node_data)
             node_type = node_data.pop("node_type", node_data.pop("type", "task"))
             node = create_node(node_type, **node_data)
             graph.add_node(node)
@@ -618,6 +842,9 @@ class TemplateLoader:
         Returns:
             List of TemplateMetadata for all discovered templates.
         """
+        if self.watching:
+            return [m.model_copy() for m in self._watcher.index.metadata()]
+
         templates = []
 
         for path in self._discover_template_files():
@@ -660,6 +887,11 @@ class TemplateLoader:
         if not template_path:
             raise FileNotFoundError(f"Template not found: {template_id}")
 
+        if self.watching:
+            entry = self._watcher.index.get(template_path)
+            if entry is not None and entry.metadata is not None:
+                return entry.metadata.model_copy()
+
         content = self._parse_yaml(template_path)
         metadata = self._extract_metadata(content, str(template_path))
 
@@ -696,52 +928,25 @@ class TemplateLoader:
             FileNotFoundError: If template not found.
             TemplateValidationError: If template or input is invalid.
         """
-        # Load the template
-        graph = self.load_template(template_id)
-
-        # Get metadata for input validation
-        metadata = self.get_template_metadata(template_id)
+        # Load the compiled template (validated once per version)
+        compiled = self._get_compiled(template_id)
 
         # Validate input data
-        input_errors = self._validate_input_data(input_data, metadata.input_schema)
+        input_errors = self._validate_input_data(
+            input_data, compiled.metadata.input_schema
+        )
         if input_errors:
             raise TemplateValidationError(input_errors)
 
-        # Generate unique workflow ID
-        import uuid
+        # Clone the prototype with a unique ID and bound inputs
         workflow_id = f"{template_id}_{uuid.uuid4().hex[:8]}"
-
-        # Create new graph with unique ID
-        workflow_graph = WorkflowGraph(
-            id=workflow_id,
-            name=f"{graph.name} (Instance)",
-            description=graph.description
+        return self._instantiate(
+            compiled,
+            workflow_id,
+            name=f"{compiled.prototype.name} (Instance)",
+            input_data=input_data
         )
 
-        # Copy nodes with input data substitution
-        for node_id, node in graph.nodes.items():
-            # Clone the node
-            node_dict = node.model_dump()
-
-            # Apply input substitution to node configuration
-            node_dict = self._substitute_inputs(node_dict, input_data)
-
-            # Create new node
-            node_type = node_dict.pop("node_type", NodeType.TASK)
-            new_node = create_node(node_type, **node_dict)
-            workflow_graph.add_node(new_node)
-
-        # Copy edges
-        for from_node, to_nodes in graph.edges.items():
-            for to_node in to_nodes:
-                workflow_graph.add_edge(from_node, to_node)
-
-        # Copy entry/exit
-        workflow_graph.entry_node = graph.entry_node
-        workflow_graph.exit_nodes = graph.exit_nodes.copy()
-
-        return workflow_graph
-
     def _validate_input_data(
         self,
         input_data: Dict[str, Any],
@@ -856,7 +1061,8 @@ class TemplateLoader:
         """
         Recursively substitute input placeholders in data.
 
-        Supports placeholders like ${input.field_name}
+        Supports placeholders like ${input.field_name} and nested paths
+        like ${input.repo.url}. Each distinct string is parsed once.
 
         Args:
             data: Data structure to process.
@@ -865,41 +1071,14 @@ class TemplateLoader:
         Returns:
             Data with substitutions applied.
         """
-        if isinstance(data, str):
-            # Replace ${input.field} placeholders
-            import re
-            pattern = r"\$\{input\.([^}]+)\}"
-
-            def replace_match(match):
-                field_name = match.group(1)
-                value = input_data.get(field_name, match.group(0))
-                return str(value) if not isinstance(value, str) else value
-
-            # Check if entire string is a placeholder
-            full_match = re.fullmatch(pattern, data)
-            if full_match:
-                field_name = full_match.group(1)
-                return input_data.get(field_name, data)
-
-            return re.sub(pattern, replace_match, data)
-
-        elif isinstance(data, dict):
-            return {
-                key: self._substitute_inputs(value, input_data)
-                for key, value in data.items()
-            }
-
-        elif isinstance(data, list):
-            return [
-                self._substitute_inputs(item, input_data)
-                for item in data
-            ]
-
-        return data
+        return substitute_inputs(data, input_data)
 
     def clear_cache(self) -> None:
-        """Clear the template cache."""
-        self._cache.clear()
+        """Clear the template cache and its statistics."""
+        with self._lock:
+            self._cache.clear()
+            for key in self._cache_stats:
+                self._cache_stats[key] = 0
 
     def remove_from_cache(self, template_id: str) -> bool:
         """
@@ -911,10 +1090,11 @@ class TemplateLoader:
         Returns:
             True if template was in cache.
         """
-        if template_id in self._cache:
-            del self._cache[template_id]
-            return True
-        return False
+        with self._lock:
+            if template_id in self._cache:
+                del self._cache[template_id]
+                return True
+            return False
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
@@ -923,11 +1103,16 @@ class TemplateLoader:
         Returns:
             Dictionary with cache statistics.
         """
+        lookups = self._cache_stats["hits"] + self._cache_stats["misses"]
         return {
             "enabled": self.cache_enabled,
             "size": len(self._cache),
+            "max_size": self.max_cache_size,
             "templates": list(self._cache.keys()),
             "total_size_bytes": sum(
                 len(str(c.raw_content)) for c in self._cache.values()
-            )
+            ),
+            **self._cache_stats,
+            "hit_rate": self._cache_stats["hits"] / lookups if lookups else 0.0,
+            "watcher": self._watcher.get_stats() if self._watcher else None,
         }
@@ -0,0 +1,399 @@
+"""
+Template Watcher
+
+Keeps an in-memory index of template files up to date from filesystem
+events, so template lookups and listings do not touch the disk in the
+steady state.
+
+- Uses watchdog (inotify/FSEvents/ReadDirectoryChangesW) when installed,
+  otherwise polls the directory from a background thread
+- Events are queued and applied by a single worker thread, which also
+  preloads (parses and compiles) new or changed templates before first use
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .loader import TemplateLoader, TemplateMetadata
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = (".yaml", ".yml")
+
+# Queue marker requesting a full directory rescan
+_RESCAN = object()
+# Queue marker stopping the worker thread
+_STOP = object()
+
+
+@dataclass
+class IndexEntry:
+    """Indexed template file."""
+    path: Path
+    signature: Tuple[int, int]  # (mtime_ns, size)
+    metadata: Optional["TemplateMetadata"] = None  # None if the file is invalid
+
+
+class TemplateIndex:
+    """
+    In-memory index of template files.
+
+    Readers never block; writes come from the watcher's worker thread and
+    replace whole entries under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, IndexEntry] = {}
+        self._by_id: Dict[str, Path] = {}
+        self._by_stem: Dict[str, Path] = {}
+
+    def get(self, path: Path) -> Optional[IndexEntry]:
+        """Get the entry for a path."""
+        return self._entries.get(path)
+
+    def signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        """Get the last seen (mtime_ns, size) of a path."""
+        entry = self._entries.get(path)
+        return entry.signature if entry else None
+
+    def paths(self) -> List[Path]:
+        """All indexed paths, sorted."""
+        return sorted(self._entries)
+
+    def find(self, template_id: str) -> Optional[Path]:
+        """Find a template path by file name, then by declared ID."""
+        return self._by_stem.get(template_id) or self._by_id.get(template_id)
+
+    def metadata(self) -> List["TemplateMetadata"]:
+        """Metadata of all valid templates, sorted by path."""
+        entries = sorted(self._entries.values(), key=lambda e: e.path)
+        return [e.metadata for e in entries if e.metadata is not None]
+
+    def put(self, entry: IndexEntry, top_level: bool) -> Optional[str]:
+        """
+        Add or replace an entry.
+
+        Returns:
+            Template ID previously indexed for this path, if any
+        """
+        with self._lock:
+            previous = self._entries.get(entry.path)
+            previous_id = previous.metadata.id if previous and previous.metadata else None
+            if previous_id and self._by_id.get(previous_id) == entry.path:
+                del self._by_id[previous_id]
+
+            self._entries[entry.path] = entry
+            if entry.metadata is not None and entry.metadata.id:
+                self._by_id.setdefault(entry.metadata.id, entry.path)
+            if top_level:
+                self._by_stem.setdefault(entry.path.stem, entry.path)
+            return previous_id
+
+    def remove(self, path: Path) -> Optional[str]:
+        """
+        Remove a path.
+
+        Returns:
+            Template ID that was indexed for this path, if any
+        """
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return None
+            if self._by_stem.get(path.stem) == path:
+                del self._by_stem[path.stem]
+            template_id = entry.metadata.id if entry.metadata else None
+            if template_id and self._by_id.get(template_id) == path:
+                del self._by_id[template_id]
+                # Another file may declare the same ID
+                for other in sorted(self._entries.values(), key=lambda e: e.path):
+                    if other.metadata is not None and other.metadata.id == template_id:
+                        self._by_id[template_id] = other.path
+                        break
+            return template_id
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forward watchdog events to the watcher queue."""
+
+    def __init__(self, watcher: "TemplateWatcher"):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            if event.event_type in ("created", "moved", "deleted"):
+                self._watcher.request_rescan()
+            return
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path:
+                self._watcher.notify(Path(path))
+
+
+class TemplateWatcher:
+    """
+    Watches a TemplateLoader's directory and maintains its index.
+
+    Usage:
+        watcher = TemplateWatcher(loader)
+        watcher.start()
+        ...
+        watcher.stop()
+    """
+
+    def __init__(
+        self,
+        loader: "TemplateLoader",
+        poll_interval: float = 2.0,
+        preload: bool = True,
+        use_watchdog: Optional[bool] = None
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            loader: Loader whose templates directory is watched.
+            poll_interval: Seconds between scans when polling.
+            preload: Compile new and changed templates in the background.
+            use_watchdog: Force watchdog on/off (default: use it if installed).
+        """
+        self.loader = loader
+        self.templates_dir = Path(loader.templates_dir)
+        self.poll_interval = poll_interval
+        self.preload = preload
+        self.use_watchdog = WATCHDOG_AVAILABLE if use_watchdog is None else use_watchdog
+        if self.use_watchdog and not WATCHDOG_AVAILABLE:
+            raise RuntimeError("watchdog is not installed")
+
+        self.index = TemplateIndex()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._poller: Optional[threading.Thread] = None
+        self._observer = None
+
+        self.stats = {
+            "events": 0,
+            "rescans": 0,
+            "updates": 0,
+            "removals": 0,
+            "preloaded": 0,
+            "preload_errors": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher is active."""
+        return self._worker is not None and self._worker.is_alive()
+
+    @property
+    def mode(self) -> str:
+        """Change detection mode."""
+        return "watchdog" if self.use_watchdog else "polling"
+
+    def start(self) -> None:
+        """Index the directory once, then follow changes in the background."""
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._scan()
+
+        self._worker = threading.Thread(
+            target=self._run_worker, name="template-watcher", daemon=True
+        )
+        self._worker.start()
+
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), str(self.templates_dir), recursive=True)
+            self._observer.start()
+        else:
+            self._poller = threading.Thread(
+                target=self._run_poller, name="template-poller", daemon=True
+            )
+            self._poller.start()
+
+        if self.preload:
+            for path in self.index.paths():
+                self._queue.put(("preload", path))
+
+        logger.info(
+            f"Template watcher started ({self.mode}) on {self.templates_dir} "
+            f"with {len(self.index.paths())} templates"
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop watching."""
+        self._stop_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+        if self._poller is not None:
+            self._poller.join(timeout)
+            self._poller = None
+        if self._worker is not None:
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+            self._worker = None
+        logger.info("Template watcher stopped")
+
+    def notify(self, path: Path) -> None:
+        """Queue a changed path (called from watchdog or the poller)."""
+        if path.suffix in TEMPLATE_SUFFIXES:
+            self.stats["events"] += 1
+            self._queue.put(("refresh", path))
+
+    def request_rescan(self) -> None:
+        """Queue a full directory rescan."""
+        self._queue.put(_RESCAN)
+
+    def wait_idle(self) -> None:
+        """Block until all queued events have been applied."""
+        self._queue.join()
+
+    def poll_once(self) -> None:
+        """Compare the directory against the index and queue differences."""
+        seen = set()
+        for path in self._discover():
+            seen.add(path)
+            if self.loader._get_file_signature(path) != self.index.signature(path):
+                self.notify(path)
+        for path in self.index.paths():
+            if path not in seen:
+                self.notify(path)
+
+    # ==================== Internals ====================
+
+    def _discover(self) -> List[Path]:
+        """List template files under the directory."""
+        if not self.templates_dir.exists():
+            return []
+        return sorted(
+            p for p in self.templates_dir.rglob("*")
+            if p.suffix in TEMPLATE_SUFFIXES and p.is_file()
+        )
+
+    def _scan(self) -> None:
+        """Reconcile the index with the directory contents."""
+        self.stats["rescans"] += 1
+        found = set(self._discover())
+        for path in self.index.paths():
+            if path not in found:
+                self._remove(path)
+        for path in sorted(found):
+            self._refresh(path, preload=False)
+
+    def _run_poller(self) -> None:
+        """Polling fallback loop."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"Template poll failed: {e}")
+
+    def _run_worker(self) -> None:
+        """Apply queued events."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if item is _RESCAN:
+                    self._scan()
+                else:
+                    action, path = item
+                    if action == "preload":
+                        self._preload(path)
+                    else:
+                        self._refresh(path, preload=self.preload)
+            except Exception as e:
+                logger.warning(f"Template watcher failed to apply event: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _refresh(self, path: Path, preload: bool) -> None:
+        """Re-index one path after a change."""
+        signature = self.loader._get_file_signature(path)
+        if signature is None:
+            self._remove(path)
+            return
+        if signature == self.index.signature(path):
+            return
+
+        metadata = None
+        try:
+            content = self.loader._parse_yaml(path)
+            metadata = self.loader._extract_metadata(content, str(path))
+            mtime = datetime.fromtimestamp(signature[0] / 1e9)
+            if not metadata.created_at:
+                metadata.created_at = mtime
+            if not metadata.updated_at:
+                metadata.updated_at = mtime
+        except Exception as e:
+            logger.warning(f"Skipping invalid template {path}: {e}")
+
+        top_level = path.parent == self.templates_dir
+        previous_id = self.index.put(IndexEntry(path, signature, metadata), top_level)
+        self.stats["updates"] += 1
+
+        for template_id in {previous_id, metadata.id if metadata else None, path.stem}:
+            if template_id:
+                self.loader.remove_from_cache(template_id)
+
+        if preload and metadata is not None:
+            self._preload(path)
+
+    def _remove(self, path: Path) -> None:
+        """Drop a deleted path from the index and the loader cache."""
+        template_id = self.index.remove(path)
+        self.stats["removals"] += 1
+        for key in {template_id, path.stem}:
+            if key:
+                self.loader.remove_from_cache(key)
+
+    def _preload(self, path: Path) -> None:
+        """Compile a template into the loader cache ahead of first use."""
+        entry = self.index.get(path)
+        if entry is None or entry.metadata is None or not entry.metadata.id:
+            return
+        try:
+            self.loader.preload(entry.metadata.id)
+            self.stats["preloaded"] += 1
+        except Exception as e:
+            self.stats["preload_errors"] += 1
+            logger.warning(f"Failed to preload template {entry.metadata.id}: {e}")
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get watcher statistics.
+
+        Returns:
+            Dictionary with event counters, mode and index size.
+        """
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "running": self.running,
+            "indexed": len(self.index.paths()),
+            "pending": self._queue.qsize(),
+        }
@@ -0,0 +1,93 @@
+"""
+Tests for batch task assignment (src/services/batch_router.py).
+"""
+
+import numpy as np
+import pytest
+
+from src.services.batch_router import (
+    assign,
+    assign_greedy,
+    assign_optimal,
+    build_score_matrix,
+    capability_matrix,
+)
+
+
+WEIGHTS = {
+    "capability_match": 0.30,
+    "historical_success": 0.25,
+    "current_load": 0.20,
+    "cost_efficiency": 0.15,
+    "latency_estimate": 0.10,
+}
+
+
+class TestScoreMatrix:
+    """Tests for score matrix construction."""
+
+    def test_capability_matrix(self):
+        """Test exact, similar and generic tool matches."""
+        matrix = capability_matrix(
+            ["claude_code", "ollama", None],
+            [["claude_code"], ["gemini_cli"], []]
+        )
+
+        assert matrix.tolist() == [
+            [1.0, 0.7, 0.0],
+            [0.0, 0.7, 0.0],
+            [1.0, 1.0, 1.0],
+        ]
+
+    def test_only_exact_matches_are_feasible(self):
+        """Test weighted scores and -inf for unsupported tools."""
+        scores, _ = build_score_matrix(
+            task_tools=["ollama"],
+            worker_tools=[["ollama"], ["gemini_cli"]],
+            weights=WEIGHTS,
+            success=np.array([1.0, 1.0]),
+            load=np.array([1.0, 1.0]),
+            latency=np.array([1.0, 1.0]),
+            cost=np.array([1.0]),
+        )
+
+        assert scores[0, 0] == pytest.approx(1.0)
+        assert scores[0, 1] == -np.inf
+
+
+class TestAssignment:
+    """Tests for the greedy and optimal solvers."""
+
+    def test_greedy_respects_capacity_and_priority(self):
+        """Test full workers are skipped and urgent tasks win contested slots."""
+        scores = np.array([
+            [0.9, 0.5],
+            [0.9, 0.5],
+            [0.9, -np.inf],
+        ])
+
+        assignment = assign_greedy(scores, capacity=[1, 1], priorities=[1, 5, 9])
+
+        assert assignment.tolist() == [-1, 1, 0]
+
+    def test_optimal_beats_greedy(self):
+        """Test the exact solver finds the better global assignment."""
+        scores = np.array([
+            [0.9, 0.8],
+            [0.85, -np.inf],
+        ])
+
+        greedy = assign_greedy(scores, capacity=[1, 1])
+        optimal = assign_optimal(scores, capacity=[1, 1])
+
+        assert (greedy >= 0).sum() == 1
+        assert optimal.tolist() == [1, 0]
+
+    def test_optimal_with_more_tasks_than_slots(self):
+        """Test capacity slots are filled by the highest-utility tasks."""
+        scores = np.array([[0.5, 0.4], [0.6, 0.3], [0.7, 0.2]])
+
+        assignment = assign(scores, capacity=[1, 1], priorities=[9, 1, 5], method="optimal")
+
+        assert sorted(assignment.tolist()) == [-1, 0, 1]
+        assert assignment[1] == -1
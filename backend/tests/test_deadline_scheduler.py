@@ -0,0 +1,127 @@
+"""
+Tests for deadline-aware scheduling (src/services/deadline_scheduler.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.services.dag_executor import DAGExecutor, DeadlineExceededError
+from src.services.deadline_scheduler import (
+    SLO_CLASSES,
+    edf_ranks,
+    order_edf,
+    remaining_critical_path_seconds,
+    resolve_deadline,
+)
+from src.services.latency_model import LatencyModel
+from src.workflows.executor import NodeExecutor
+from src.workflows.graph import WorkflowGraph
+from src.workflows.hedging import DurationHistory
+from src.workflows.state import WorkflowContext, WorkflowState
+from src.workflows.nodes import TaskNode
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def task(name, priority=5, deadline_in=None, tool="claude_code", age=0):
+    return SimpleNamespace(
+        name=name,
+        priority=priority,
+        deadline=NOW + timedelta(seconds=deadline_in) if deadline_in is not None else None,
+        created_at=NOW - timedelta(seconds=age),
+        tool_preference=tool,
+    )
+
+
+class TestDeadlineScheduler:
+    """Tests for deadline resolution and EDF ordering."""
+
+    def test_resolve_deadline(self):
+        """Test explicit deadlines win and SLO classes derive one from creation."""
+        created = datetime(2026, 1, 1, 12, 0)  # naive = UTC
+        explicit = NOW + timedelta(minutes=1)
+
+        assert resolve_deadline(created, explicit, "batch") == explicit
+        assert resolve_deadline(created, slo_class="interactive") == NOW + SLO_CLASSES["interactive"]
+        assert resolve_deadline(created) is None
+        with pytest.raises(ValueError):
+            resolve_deadline(created, slo_class="urgent")
+
+    def test_edf_within_priority_demotes_hopeless(self):
+        """Test EDF order within a priority, hopeless tasks after all others."""
+        model = LatencyModel()
+        for _ in range(3):
+            model.record_completion("w1", "claude_code", 120_000)  # p50 = 2 min
+
+        tasks = [
+            task("best_effort", age=600),
+            task("late", deadline_in=3600),
+            task("hopeless", deadline_in=60),  # 2 min of work, 1 min left
+            task("soon", deadline_in=600),
+            task("urgent", priority=8, deadline_in=7200),
+        ]
+
+        ordered = order_edf(tasks, now=NOW, latency_model=model)
+
+        assert [t.name for t in ordered] == ["urgent", "soon", "late", "best_effort", "hopeless"]
+        assert edf_ranks(tasks, now=NOW, latency_model=model) == [2, 3, 1, 4, 5]
+
+    def test_remaining_critical_path(self):
+        """Test the longest chain of unfinished nodes bounds the time left."""
+        graph = WorkflowGraph(id="cp", name="Critical Path")
+        for node_id in ("start", "fast", "slow", "end"):
+            graph.add_node(TaskNode(id=node_id, name=node_id))
+        graph.add_edge("start", "fast")
+        graph.add_edge("start", "slow")
+        graph.add_edge("fast", "end")
+        graph.add_edge("slow", "end")
+        durations = {"start": 10.0, "fast": 5.0, "slow": 50.0, "end": 20.0}
+
+        def duration_of(node):
+            return durations[node.id]
+
+        assert remaining_critical_path_seconds(graph, set(), duration_of) == 80.0
+        assert remaining_critical_path_seconds(graph, {"start", "slow"}, duration_of) == 25.0
+        assert remaining_critical_path_seconds(graph, set(durations), duration_of) == 0.0
+
+
+def chain(length):
+    graph = WorkflowGraph(id="chain", name="Chain")
+    for i in range(length):
+        graph.add_node(TaskNode(id=f"n{i}", name=f"n{i}", tool_path="ollama.generate", timeout=60))
+        if i:
+            graph.add_edge(f"n{i - 1}", f"n{i}")
+    return graph
+
+
+class TestWorkflowDeadlines:
+    """Tests for slack checks of running workflows."""
+
+    def executor(self, history, deadline_in):
+        executor = DAGExecutor(node_executor=NodeExecutor(duration_history=history))
+        context = WorkflowContext(workflow_id=uuid4(), workflow_name="chain", shed_hopeless=True)
+        executor._deadlines[str(context.workflow_id)] = (
+            datetime.now(timezone.utc) + deadline_in
+        )
+        return executor, context
+
+    @pytest.mark.asyncio
+    async def test_nodes_without_history_are_not_shed(self):
+        """Test default timeouts alone never make a workflow hopeless."""
+        executor, context = self.executor(DurationHistory(), SLO_CLASSES["interactive"])
+
+        await executor._check_deadline(chain(10), WorkflowState(), context)
+
+    @pytest.mark.asyncio
+    async def test_observed_durations_shed_hopeless_work(self):
+        """Test a chain whose observed p50 exceeds the deadline is aborted."""
+        history = DurationHistory(min_samples=1)
+        history.record("ollama.generate", 40.0)
+        executor, context = self.executor(history, SLO_CLASSES["interactive"])
+
+        await executor._check_deadline(chain(5), WorkflowState(), context)
+        with pytest.raises(DeadlineExceededError):
+            await executor._check_deadline(chain(10), WorkflowState(), context)
@@ -0,0 +1,181 @@
+"""
+Tests for the online latency model (src/services/latency_model.py).
+"""
+
+import random
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.api.v1 import websocket, workers
+from src.models.task import Task
+from src.models.worker import Worker
+from src.schemas.worker import TaskCompleteRequest
+from src.services.latency_model import LATENCY_BASELINE_MS, LatencyModel, TDigest, service_time_ms
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeSession:
+    """Answers queries in order; usable as ``async with``."""
+
+    def __init__(self, *results):
+        self._results = list(results)
+
+    async def execute(self, statement):
+        return FakeResult(self._results.pop(0))
+
+    async def commit(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_assignment(model, worker=None):
+    """A running ollama task assigned to the worker and recorded in the model."""
+    worker = worker or Worker(worker_id=uuid4(), machine_name="box", machine_id="box", status="busy")
+    task = Task(task_id=uuid4(), description="task", tool_preference="ollama",
+                status="running", worker_id=worker.worker_id, version=1)
+    model.task_assigned(worker.worker_id, "ollama", task_id=task.task_id)
+    return worker, task
+
+
+class TestTDigest:
+    """Tests for streaming quantiles."""
+
+    def test_quantiles_match_exact(self):
+        """Test estimates stay close to exact quantiles with bounded centroids."""
+        rng = random.Random(1)
+        values = [rng.lognormvariate(10, 0.6) for _ in range(20_000)]
+        digest = TDigest()
+        for value in values:
+            digest.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * len(ordered))]
+            assert digest.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert digest.centroids <= 200
+        assert digest.quantile(0.0) == pytest.approx(min(values))
+
+    def test_empty_and_single(self):
+        """Test digests without and with one sample."""
+        digest = TDigest()
+        assert digest.quantile(0.5) is None
+
+        digest.add(42.0)
+        assert digest.quantile(0.5) == 42.0
+
+
+class TestLatencyModel:
+    """Tests for per worker/tool estimates."""
+
+    def test_expected_completion_includes_queue_wait(self):
+        """Test a fast but backed-up worker loses to an idle slower one."""
+        model = LatencyModel(min_samples=1)
+        for _ in range(5):
+            model.record_completion("fast", "ollama", 10_000)
+            model.record_completion("slow", "ollama", 30_000)
+
+        assert model.p50_service_ms("fast", "ollama") == pytest.approx(10_000)
+        assert model.latency_score("fast", "ollama") > model.latency_score("slow", "ollama")
+
+        for _ in range(3):
+            model.task_assigned("fast", "ollama")
+        assert model.expected_completion_ms("fast", "ollama") == pytest.approx(40_000)
+        assert model.latency_score("fast", "ollama") < model.latency_score("slow", "ollama")
+
+        model.record_completion("fast", "ollama", None)
+        assert model.queue_wait_ms("fast") == pytest.approx(20_000)
+
+    def test_fallbacks_and_failures(self):
+        """Test tool-wide fallback, min samples and ignored failure timings."""
+        model = LatencyModel(min_samples=2)
+        model.record_completion("a", "claude_code", 20_000)
+        assert model.latency_score("a", "claude_code") is None
+
+        model.record_completion("a", "claude_code", 20_000)
+        model.record_completion("a", "claude_code", 1, success=False)
+        assert model.p50_service_ms("a", "claude_code") == pytest.approx(20_000)
+
+        # Unseen worker uses the fleet-wide estimate for the tool
+        assert model.latency_score("b", "claude_code") == pytest.approx(
+            LATENCY_BASELINE_MS / (LATENCY_BASELINE_MS + 20_000)
+        )
+        assert model.latency_score("b", "ollama") is None
+
+    def test_release_by_task_id(self):
+        """Test a finished task removes its own estimate, whatever the finish order."""
+        model = LatencyModel(min_samples=1)
+        model.record_completion("w", "ollama", 10_000)
+        model.record_completion("w", "claude_code", 30_000)
+        model.task_assigned("w", "ollama", task_id="first")
+        model.task_assigned("w", "claude_code", task_id="second")
+        assert model.queue_wait_ms("w") == pytest.approx(40_000)
+
+        model.record_completion("w", "claude_code", None, task_id="second")
+        model.task_released("w", task_id="unknown")
+
+        assert model.queue_wait_ms("w") == pytest.approx(10_000)
+        model.task_released("w", task_id="first")
+        assert model.get_stats()["outstanding"] == {}
+
+
+class TestCompletionReports:
+    """Tests that worker result reports feed the model."""
+
+    def test_service_time_sources(self):
+        """Test the worker's measurement wins over timestamps, which need a start."""
+        started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        completed = datetime(2026, 1, 1, 0, 0, 2)
+
+        assert service_time_ms(1500, started, completed) == 1500
+        assert service_time_ms(None, started, completed) == pytest.approx(2000)
+        assert service_time_ms(None, None, completed) is None
+
+    @pytest.mark.asyncio
+    async def test_task_complete_records_execution_time(self, monkeypatch):
+        """Test /task-complete releases the task and records the reported time."""
+        model = LatencyModel(min_samples=1)
+        monkeypatch.setattr(workers, "get_latency_model", lambda: model)
+        worker, task = make_assignment(model)
+
+        await workers.complete_task(
+            worker.worker_id,
+            TaskCompleteRequest(task_id=task.task_id, execution_time_ms=4200),
+            FakeSession([worker], [task]),
+        )
+
+        assert model.p50_service_ms(worker.worker_id, "ollama") == pytest.approx(4200)
+        assert model.queue_wait_ms(worker.worker_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_outbox_results_release_outstanding_work(self, monkeypatch):
+        """Test results replayed over WebSocket record completions like HTTP ones."""
+        model = LatencyModel(min_samples=1)
+        monkeypatch.setattr(websocket, "get_latency_model", lambda: model)
+        worker, done = make_assignment(model)
+        _, failed = make_assignment(model, worker)
+        sessions = [FakeSession([done], [worker]), FakeSession([failed], [worker])]
+        monkeypatch.setattr(websocket, "AsyncSessionLocal", lambda: sessions.pop(0))
+
+        await websocket.handle_task_result(str(worker.worker_id), {
+            "task_id": str(done.task_id), "result": {}, "execution_time_ms": 900,
+        })
+        await websocket.handle_task_failed(str(worker.worker_id), {
+            "task_id": str(failed.task_id), "error": "boom",
+        })
+
+        assert model.p50_service_ms(worker.worker_id, "ollama") == pytest.approx(900)
+        assert model.get_stats()["outstanding"] == {}
@@ -0,0 +1,161 @@
+"""
+Tests for single-flight coalescing and scoped cancellation in the MCP bus
+(src/mcp/bus.py).
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from src.mcp.bus import MCPBus, ToolInvocationError
+from src.mcp.servers.claude_code import ClaudeCodeMCPServer
+from src.mcp.types import MCPServerConfig, ToolDefinition, ToolResult, ToolResultStatus
+
+
+@pytest.fixture
+async def bus():
+    bus = MCPBus()
+    await bus.register_server("ollama", MCPServerConfig(name="ollama"))
+    await bus.register_tool_manually(
+        "ollama",
+        ToolDefinition(name="list_models", description="List models", metadata={"idempotent": True}),
+    )
+    await bus.register_tool_manually("ollama", ToolDefinition(name="generate", description="Generate"))
+    return bus
+
+
+def count_calls(bus: MCPBus, error: Exception = None):
+    """Replace the tool call with a slow stub that counts executions."""
+    calls = []
+
+    async def execute(server_name, tool, arguments, timeout=None, invocation_id=None):
+        calls.append(tool.name)
+        await asyncio.sleep(0.05)
+        if error is not None:
+            raise error
+        return {"tool": tool.name, "arguments": arguments}
+
+    bus._execute_tool_call = execute
+    return calls
+
+
+class TestSingleFlight:
+    """Tests for coalescing identical concurrent tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_identical_idempotent_calls_share_one_execution(self, bus):
+        """Test same tool + canonical arguments run once; other calls run separately."""
+        calls = count_calls(bus)
+
+        results = await asyncio.gather(
+            *(bus.invoke_tool("ollama.list_models", {"host": "a", "tag": 1}) for _ in range(4)),
+            bus.invoke_tool("ollama.list_models", {"tag": 1, "host": "a"}),  # Same, reordered
+            bus.invoke_tool("ollama.list_models", {"host": "b"}),
+            *(bus.invoke_tool("ollama.generate", {"prompt": "hi"}) for _ in range(2)),
+        )
+
+        assert sorted(calls) == ["generate", "generate", "list_models", "list_models"]
+        assert [r.metadata.get("coalesced", False) for r in results[:5]] == [False] + [True] * 4
+        assert results[4].result == results[0].result
+        health = await bus.health_check()
+        assert health["coalesced_calls"] == 4
+        assert health["inflight_coalesced_calls"] == 0
+
+        # Finished calls are not cached
+        await bus.invoke_tool("ollama.list_models", {"host": "a", "tag": 1})
+        assert calls.count("list_models") == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared(self, bus):
+        """Test every joined caller sees the error of the shared execution."""
+        calls = count_calls(bus, error=RuntimeError("ollama down"))
+
+        results = await asyncio.gather(
+            *(bus.invoke_tool("ollama.list_models") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(r, ToolInvocationError) for r in results)
+
+
+class FakeServer:
+    """In-process server whose calls run until cancelled by invocation ID."""
+
+    def __init__(self):
+        self.running = {}
+        self.cancelled = []
+
+    async def call_tool(self, name, arguments, invocation_id=None):
+        self.running[invocation_id] = asyncio.Event()
+        await self.running[invocation_id].wait()
+        status = ToolResultStatus.CANCELLED if invocation_id in self.cancelled else ToolResultStatus.SUCCESS
+        return ToolResult(tool_path=name, status=status, result={"id": invocation_id})
+
+    async def cancel_execution(self, invocation_id):
+        self.cancelled.append(invocation_id)
+        self.running[invocation_id].set()
+        return True
+
+
+class TestCancellation:
+    """Tests for cancelling one invocation among concurrent calls."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_reaches_only_the_given_invocation(self):
+        """Test the connection's cancel hook gets the loser's ID, not the winner's."""
+        server = FakeServer()
+        bus = MCPBus()
+        await bus.register_server("claude_code", MCPServerConfig(name="claude_code"), connection=server)
+        await bus.register_tool_manually("claude_code", ToolDefinition(name="execute", description="Run"))
+
+        calls = [
+            asyncio.create_task(bus.invoke_tool("claude_code.execute", {}, invocation_id=i))
+            for i in ("primary", "duplicate")
+        ]
+        while len(server.running) < 2:
+            await asyncio.sleep(0)
+
+        assert not await bus.cancel_tool_execution("ollama.execute", "duplicate")
+        assert await bus.cancel_tool_execution("claude_code.execute", "duplicate")
+        server.running["primary"].set()
+        primary, duplicate = await asyncio.gather(*calls)
+
+        assert server.cancelled == ["duplicate"]
+        assert primary.status == ToolResultStatus.SUCCESS
+        assert primary.tool_path == "claude_code.execute"
+        assert duplicate.status == ToolResultStatus.CANCELLED
+        # Finished and unknown invocations are not cancelled again
+        assert not await bus.cancel_tool_execution("claude_code.execute", "primary")
+        assert not await bus.cancel_tool_execution("claude_code.execute", "unknown")
+
+    @pytest.mark.asyncio
+    async def test_claude_code_terminates_only_the_given_process(self):
+        """Test cancelling one invocation leaves a concurrent CLI process running."""
+        server = ClaudeCodeMCPServer()
+        server._register_tools()
+        server._initialized = True
+
+        async def run_cli(arguments):
+            return await server._run_process(
+                [sys.executable, "-c", "import time; time.sleep(30)"], None, "", 30
+            )
+
+        server._get_tool_handler = lambda name: run_cli
+        calls = {
+            i: asyncio.create_task(server.call_tool("execute", {}, invocation_id=i))
+            for i in ("primary", "duplicate")
+        }
+        while len(server._executions) < 2:
+            await asyncio.sleep(0.01)
+        primary_process = server._executions["primary"]
+
+        assert await server.cancel_execution("duplicate")
+        await calls["duplicate"]
+
+        assert primary_process.returncode is None
+        assert not await server.cancel_execution("duplicate")
+        assert await server.cancel_execution("primary")
+        await calls["primary"]
+        assert server._executions == {}
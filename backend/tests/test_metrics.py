@@ -0,0 +1,106 @@
+"""
+Tests for the Prometheus metrics helpers (src/metrics.py).
+"""
+
+import asyncio
+
+import pytest
+from prometheus_client import CollectorRegistry, Histogram
+
+from src.database import PoolTimedSession
+from src.metrics import DB_POOL_WAIT, REDIS_COMMAND_DURATION, instrument_redis, render_metrics, time_async
+
+
+class FakePipeline:
+    def __init__(self, transaction: bool):
+        self.is_transaction = transaction
+
+    async def execute(self):
+        return [True]
+
+
+class FakeRedis:
+    async def execute_command(self, *args, **options):
+        return "OK"
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(transaction)
+
+    async def get(self, key):
+        return await self.execute_command("GET", key)
+
+
+def sample_count(histogram, **labels) -> float:
+    """Number of observations recorded for one label set."""
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels == labels:
+                return sample.value
+    return 0.0
+
+
+class TestMetrics:
+    """Tests for timing helpers and the exposition output."""
+
+    @pytest.mark.asyncio
+    async def test_time_async_observes_awaited_duration(self):
+        """Test the coroutine body is timed, including when it raises."""
+        histogram = Histogram("test_op_seconds", "test", ["mode"], registry=CollectorRegistry())
+
+        @time_async(histogram, mode="single")
+        async def op(fail: bool = False):
+            await asyncio.sleep(0.01)
+            if fail:
+                raise RuntimeError("boom")
+            return "done"
+
+        assert await op() == "done"
+        with pytest.raises(RuntimeError):
+            await op(fail=True)
+
+        assert sample_count(histogram, mode="single") == 2
+        total = next(
+            s.value for s in histogram.collect()[0].samples
+            if s.name.endswith("_sum")
+        )
+        assert total >= 0.02
+
+    @pytest.mark.asyncio
+    async def test_instrument_redis_labels_commands_and_pipelines(self):
+        """Test commands are labelled by name and pipelines by MULTI/PIPELINE."""
+        client = instrument_redis(FakeRedis(), "test_component")
+
+        assert await client.get("key") == "OK"
+        assert await client.pipeline().execute() == [True]
+        assert await client.pipeline(transaction=False).execute() == [True]
+
+        for command in ("GET", "MULTI", "PIPELINE"):
+            assert sample_count(
+                REDIS_COMMAND_DURATION, component="test_component", command=command
+            ) == 1
+
+    def test_render_metrics(self):
+        """Test the exposition output contains the backend metric families."""
+        payload, content_type = render_metrics()
+
+        assert content_type.startswith("text/plain")
+        text = payload.decode()
+        assert "garageswarm_dag_node_duration_seconds" in text
+        assert "garageswarm_redis_command_duration_seconds" in text
+
+    def test_pool_wait_observed_only_on_checkout(self):
+        """Test sessions record pool wait when they first use a connection, not on creation."""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import sessionmaker
+
+        make_session = sessionmaker(create_engine("sqlite://"), class_=PoolTimedSession)
+        before = sample_count(DB_POOL_WAIT)
+
+        with make_session() as session:
+            assert sample_count(DB_POOL_WAIT) == before
+            session.execute(text("select 1"))
+            session.execute(text("select 2"))
+            session.commit()
+            session.execute(text("select 3"))
+
+        assert sample_count(DB_POOL_WAIT) == before + 2
@@ -0,0 +1,154 @@
+"""
+Tests for the Ollama request scheduler (src/mcp/servers/ollama_scheduler.py).
+"""
+
+import asyncio
+
+import pytest
+
+from src.mcp.servers.ollama import OllamaMCPServer, OllamaServerConfig
+from src.mcp.servers.ollama_scheduler import OllamaRequestScheduler, resolve_num_parallel
+
+
+def recorder(log, gate=None):
+    """Build factories that log (model, tag) when they start running."""
+    def make(model, tag):
+        async def call():
+            log.append((model, tag))
+            if gate is not None:
+                await gate.wait()
+            else:
+                await asyncio.sleep(0)
+            return tag
+        return call
+    return make
+
+
+async def hold(scheduler, gate):
+    """Occupy the only slot with a model "a" request until the gate opens."""
+    blocker = asyncio.create_task(scheduler.submit("a", recorder([], gate)("a", "hold")))
+    await asyncio.sleep(0)
+    return blocker
+
+
+class TestOllamaRequestScheduler:
+    """Tests for model grouping, priority and the concurrency cap."""
+
+    def test_resolve_num_parallel(self, monkeypatch):
+        """Test explicit config wins over OLLAMA_NUM_PARALLEL."""
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "3")
+        assert resolve_num_parallel() == 3
+        assert resolve_num_parallel(6) == 6
+
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "bogus")
+        assert resolve_num_parallel() == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped(self):
+        """Test no more than max_parallel calls run at once."""
+        scheduler = OllamaRequestScheduler(max_parallel=2)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(scheduler.submit("llama2", call) for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.get_stats()["completed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_requests_grouped_by_model(self):
+        """Test interleaved arrivals are served one model at a time."""
+        scheduler = OllamaRequestScheduler(max_parallel=1)
+        log = []
+        make = recorder(log)
+        gate = asyncio.Event()
+
+        blocker = await hold(scheduler, gate)
+        tasks = [asyncio.create_task(scheduler.submit(m, make(m, i))) for i, m in enumerate("abababab")]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert [m for m, _ in log] == list("aaaabbbb")
+        assert scheduler.get_stats()["model_switches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_priority_and_max_batch(self):
+        """Test a more urgent model ends the group, and long groups yield to waiters."""
+        scheduler = OllamaRequestScheduler(max_parallel=1, max_batch=2)
+        log = []
+        make = recorder(log)
+        gate = asyncio.Event()
+
+        blocker = await hold(scheduler, gate)
+        tasks = [asyncio.create_task(scheduler.submit("a", make("a", i))) for i in range(3)]
+        tasks.append(asyncio.create_task(scheduler.submit("b", make("b", "urgent"), priority=9)))
+        tasks.append(asyncio.create_task(scheduler.submit("c", make("c", "waiting"))))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert [m for m, _ in log] == ["b", "a", "a", "c", "a"]
+
+    @pytest.mark.asyncio
+    async def test_errors_and_cancellation(self):
+        """Test failures propagate and cancelled waiters leave the queue."""
+        scheduler = OllamaRequestScheduler(max_parallel=1)
+        gate = asyncio.Event()
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        blocker = await hold(scheduler, gate)
+        waiting = asyncio.create_task(scheduler.submit("a", recorder([])("a", "never")))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        gate.set()
+        await blocker
+
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("a", boom)
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        stats = scheduler.get_stats()
+        assert (stats["failed"], stats["cancelled"], stats["queued"], stats["in_flight"]) == (1, 1, {}, 0)
+
+
+class TestOllamaServerScheduling:
+    """Tests that the MCP server sends generation through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_generate_requests_are_scheduled(self):
+        """Test generate calls share the server's parallelism cap and keep their model."""
+        server = OllamaMCPServer(OllamaServerConfig(num_parallel=1))
+        running = 0
+        peak = 0
+        models = []
+
+        async def request(url, payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            models.append(payload["model"])
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"response": payload["prompt"], "eval_count": 1}
+
+        server._make_request_with_retry = request
+        results = await asyncio.gather(*(
+            server._tool_generate({"prompt": f"p{i}", "model": model, "priority": 5})
+            for i, model in enumerate(["a", "b", "a"])
+        ))
+
+        assert [r.content[0]["text"] for r in results] == ["p0", "p1", "p2"]
+        assert peak == 1
+        assert sorted(models) == ["a", "a", "b"]
+        assert server.get_scheduler_stats()["completed"] == 3
@@ -0,0 +1,150 @@
+"""
+Tests for worker outbox deduplication (src/services/outbox_sequences.py).
+"""
+
+import pytest
+
+from src.api.v1 import websocket
+from src.services import outbox_sequences
+from src.services.outbox_sequences import OutboxSequenceTracker
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    def acks(self):
+        return [m["data"]["seq"] for m in self.sent if m["type"] == "ack"]
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = OutboxSequenceTracker(redis_client=FakeRedis())
+    monkeypatch.setattr(outbox_sequences, "_outbox_tracker", tracker)
+    return tracker
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    dispatched = []
+
+    async def dispatch_message(worker_id, message, ws):
+        if message.get("fail"):
+            raise RuntimeError("handler failed")
+        dispatched.append(message["seq"])
+
+    monkeypatch.setattr(websocket, "dispatch_message", dispatch_message)
+    return dispatched
+
+
+def outbox_message(seq, **extra):
+    return {"type": "task_progress", "stream": "s1", "seq": seq, "data": {}, **extra}
+
+
+class TestOutboxSequenceTracker:
+    """Tests for gap-aware deduplication and persistence."""
+
+    @pytest.mark.asyncio
+    async def test_ack_waits_for_gap(self, tracker):
+        """Test a message past a gap is remembered but not acknowledged until the gap fills."""
+        for seq in (1, 2, 4, 5):
+            assert not await tracker.is_duplicate("w1", "s1", seq)
+            tracker.mark_processed("w1", "s1", seq)
+
+        assert tracker.acked("w1", "s1") == 2
+        assert not await tracker.is_duplicate("w1", "s1", 3)
+        assert await tracker.is_duplicate("w1", "s1", 4)
+
+        tracker.mark_processed("w1", "s1", 3)
+        assert tracker.acked("w1", "s1") == 5
+
+    @pytest.mark.asyncio
+    async def test_first_message_sets_baseline(self, tracker):
+        """Test a stream without state starts at the worker's oldest unacked message."""
+        assert not await tracker.is_duplicate("w1", "s1", 120)
+        tracker.mark_processed("w1", "s1", 120)
+
+        assert tracker.acked("w1", "s1") == 120
+        assert await tracker.is_duplicate("w1", "s1", 119)
+
+    @pytest.mark.asyncio
+    async def test_state_survives_restart_and_disconnect(self, tracker):
+        """Test persisted state is reloaded after a disconnect or by a new process."""
+        for seq in (1, 3):
+            await tracker.is_duplicate("w1", "s1", seq)
+            tracker.mark_processed("w1", "s1", seq)
+        await tracker.persist("w1", "s1")
+
+        tracker.forget("w1")
+        assert tracker.acked("w1", "s1") is None
+        assert await tracker.is_duplicate("w1", "s1", 3)
+
+        restarted = OutboxSequenceTracker(redis_client=tracker._redis)
+        assert await restarted.is_duplicate("w1", "s1", 3)
+        assert not await restarted.is_duplicate("w1", "s1", 2)
+        assert restarted.acked("w1", "s1") == 1
+        assert tracker._redis.ttls == {"ws:outbox:w1:s1": OutboxSequenceTracker.DEFAULT_TTL}
+
+    @pytest.mark.asyncio
+    async def test_memory_only_state_pruned_when_idle(self):
+        """Test without Redis, disconnect keeps state and idle streams expire by TTL."""
+        tracker = OutboxSequenceTracker(ttl=10)
+        await tracker.is_duplicate("w1", "s1", 1)
+        tracker.mark_processed("w1", "s1", 1)
+
+        tracker.forget("w1")
+        assert tracker.acked("w1", "s1") == 1
+
+        tracker._streams["w1", "s1"].touched -= 11
+        tracker._last_prune -= tracker.PRUNE_INTERVAL
+        await tracker.is_duplicate("w2", "s9", 1)
+        assert tracker.acked("w1", "s1") is None
+
+
+class TestOutboxMessages:
+    """Tests for outbox handling on the WebSocket endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_replay_after_gap_applies_missing_message(self, tracker, dispatched):
+        """Test a message lost live is applied on replay while its successor is skipped."""
+        ws = FakeWebSocket()
+
+        await websocket.handle_message("w1", outbox_message(1), ws)
+        await websocket.handle_message("w1", outbox_message(3), ws)
+        await websocket.handle_message("w1", {
+            "type": "batch", "stream": "s1",
+            "messages": [outbox_message(2), outbox_message(3), outbox_message(4)],
+        }, ws)
+
+        assert dispatched == [1, 3, 2, 4]
+        assert ws.acks() == [1, 1, 4]
+
+    @pytest.mark.asyncio
+    async def test_failed_replay_is_not_acknowledged(self, tracker, dispatched):
+        """Test the batch stops at a failing message and the ack stays before it."""
+        ws = FakeWebSocket()
+
+        await websocket.handle_message("w1", {
+            "type": "batch", "stream": "s1",
+            "messages": [outbox_message(1), outbox_message(2, fail=True), outbox_message(3)],
+        }, ws)
+
+        assert dispatched == [1]
+        assert ws.acks() == [1]
+        assert not await tracker.is_duplicate("w1", "s1", 2)
@@ -0,0 +1,106 @@
+"""
+Tests for pull-mode task assignment (src/api/v1/workers.py).
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.api.v1 import websocket, workers
+from src.models.task import Task
+from src.models.worker import Worker
+from src.services.latency_model import LatencyModel
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Answers pull_task's worker, bound-task and candidate queries in order."""
+
+    def __init__(self, worker, candidates):
+        self._results = [[worker], [], candidates]
+
+    async def execute(self, statement):
+        return FakeResult(self._results.pop(0))
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, instance):
+        pass
+
+
+def make_task(tool, model=None, priority=5):
+    return Task(
+        task_id=uuid4(), description="task", tool_preference=tool, status="pending",
+        priority=priority, created_at=datetime.now(timezone.utc),
+        task_metadata={"model": model} if model else {}
+    )
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+
+    async def send_to_worker(worker_id, message):
+        sent.append((worker_id, message))
+        return True
+
+    monkeypatch.setattr(websocket.manager, "send_to_worker", send_to_worker)
+    monkeypatch.setattr(workers, "get_latency_model", lambda: LatencyModel())
+    return sent
+
+
+class TestModelPrewarm:
+    """Tests for model_prewarm hints sent for queued Ollama tasks."""
+
+    @pytest.mark.asyncio
+    async def test_pull_hints_models_of_queued_tasks(self, sent, monkeypatch):
+        """Test the puller is told which models the tasks behind its task need."""
+        worker = Worker(worker_id=uuid4(), machine_name="box", machine_id="box",
+                        status="idle", tools=["ollama"], is_active=True)
+        monkeypatch.setitem(websocket.manager.active_connections, str(worker.worker_id), object())
+        pulled = make_task("ollama", "llama3", priority=9)
+        queued = [
+            make_task("ollama", "mistral"),
+            make_task("ollama", "mistral"),
+            make_task(None),
+            make_task("ollama", "qwen2"),
+            make_task("ollama", "phi3"),
+        ]
+
+        assignment = await workers.pull_task(worker.worker_id, db=FakeSession(worker, [pulled, *queued]))
+
+        assert assignment.task_id == pulled.task_id
+        assert sent == [(str(worker.worker_id), {
+            "type": "model_prewarm",
+            "data": {"tool": "ollama", "models": ["mistral", "qwen2"]},
+            "timestamp": sent[0][1]["timestamp"],
+        })]
+
+    @pytest.mark.asyncio
+    async def test_no_hint_without_websocket_or_models(self, sent):
+        """Test pull-only workers and queues without Ollama models get no message."""
+        worker = Worker(worker_id=uuid4(), machine_name="box", machine_id="box",
+                        status="idle", tools=["ollama"], is_active=True)
+
+        await workers.pull_task(
+            worker.worker_id,
+            db=FakeSession(worker, [make_task("ollama", "llama3"), make_task("ollama", "mistral")])
+        )
+        assert sent == []
+
+        assert workers._queued_models([make_task("claude_code", "opus"), make_task("ollama")]) == []
@@ -0,0 +1,647 @@
+"""
+Tests for human review queues and indexes (src/collaboration/review.py).
+"""
+
+import asyncio
+import copy
+import fnmatch
+from uuid import uuid4
+
+import pytest
+
+from src.collaboration.review import (
+    DecisionType,
+    HumanReviewManager,
+    NotificationHandler,
+    NotificationService,
+    NotificationType,
+    ReviewStatus,
+    ReviewType,
+    Urgency,
+    WebhookNotificationHandler,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the review manager uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+        self.lists = {}
+        self.transactions = 0  # Executed MULTI/EXEC pipelines
+        self.fail_exec = False  # Make the next pipeline execute() fail
+
+    def dump(self):
+        return copy.deepcopy((self.values, self.zsets, self.lists))
+
+    # Strings
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            for store in (self.values, self.zsets, self.lists):
+                removed += store.pop(key, None) is not None
+        return removed
+
+    async def expire(self, key, seconds):
+        return True
+
+    # Lists
+
+    async def lpush(self, key, *values):
+        self.lists.setdefault(key, [])[:0] = reversed(values)
+        return len(self.lists[key])
+
+    async def lrange(self, key, start, stop):
+        items = self.lists.get(key, [])
+        return items[start:None if stop == -1 else stop + 1]
+
+    # Sorted sets
+
+    def _ranked(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+
+    def _store(self, key, members):
+        if members:
+            self.zsets[key] = members
+        else:
+            self.zsets.pop(key, None)
+        return len(members)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        removed = sum(zset.pop(member, None) is not None for member in members)
+        self._store(key, zset)
+        return removed
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrange(self, key, start, stop, withscores=False):
+        items = self._ranked(key)[start:None if stop == -1 else stop + 1]
+        return items if withscores else [member for member, _ in items]
+
+    async def zrevrange(self, key, start, stop):
+        items = self._ranked(key)[::-1][start:None if stop == -1 else stop + 1]
+        return [member for member, _ in items]
+
+    async def zrangebyscore(self, key, low, high, start=None, num=None):
+        low, high = float(low), float(high)
+        members = [member for member, score in self._ranked(key) if low <= score <= high]
+        if start is not None:
+            members = members[start:start + num]
+        return members
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        low, high = float(low), float(high)
+        due = [member for member, score in zset.items() if low <= score <= high]
+        for member in due:
+            del zset[member]
+        self._store(key, zset)
+        return len(due)
+
+    def _weighted(self, keys):
+        return keys.items() if isinstance(keys, dict) else [(key, 1) for key in keys]
+
+    async def zunionstore(self, dest, keys, aggregate="SUM"):
+        combine = max if aggregate == "MAX" else (lambda a, b: a + b)
+        members = {}
+        for key, weight in self._weighted(keys):
+            for member, score in self.zsets.get(key, {}).items():
+                score *= weight
+                members[member] = combine(members[member], score) if member in members else score
+        return self._store(dest, members)
+
+    async def zinterstore(self, dest, keys, aggregate="SUM"):
+        combine = max if aggregate == "MAX" else (lambda a, b: a + b)
+        weighted = list(self._weighted(keys))
+        members = None
+        for key, weight in weighted:
+            zset = self.zsets.get(key, {})
+            if members is None:
+                members = {member: score * weight for member, score in zset.items()}
+            else:
+                members = {
+                    member: combine(score, zset[member] * weight)
+                    for member, score in members.items() if member in zset
+                }
+        return self._store(dest, members or {})
+
+    # Pipelines
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+    def keys_matching(self, pattern):
+        return [key for key in self.zsets if fnmatch.fnmatch(key, pattern)]
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute() (none if it fails)."""
+
+    def __init__(self, redis, transaction=True):
+        self._redis = redis
+        self._transaction = transaction
+        self._commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self._commands = self._commands, []
+        if self._redis.fail_exec:
+            self._redis.fail_exec = False
+            raise ConnectionError("EXEC failed")
+        self._redis.transactions += self._transaction
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+@pytest.fixture
+async def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+async def manager(redis_client):
+    manager = HumanReviewManager(redis_client=redis_client, expiry_sweeper=False)
+    await manager.connect()
+    yield manager
+    await manager.disconnect()
+
+
+async def create(manager, **kwargs):
+    return await manager.create_review_request(
+        workflow_id=kwargs.pop("workflow_id", uuid4()),
+        node_id="review",
+        state=kwargs.pop("state", {"draft": "text"}),
+        instructions="Check it",
+        **kwargs
+    )
+
+
+def members(redis_client, key):
+    return set(redis_client.zsets.get(key, {}))
+
+
+class TestIndexMembership:
+    """Tests that lifecycle transitions keep the queues and indexes in step."""
+
+    @pytest.mark.asyncio
+    async def test_created_request_is_indexed(self, manager, redis_client):
+        """Test a new request joins every queue and index it matches."""
+        user = uuid4()
+        request = await create(
+            manager, review_type=ReviewType.INPUT, urgency=Urgency.HIGH,
+            tags=["legal", "legal", "pii"], assigned_to=user
+        )
+        rid = request.request_id
+
+        for key in [
+            manager.KEY_QUEUE,
+            manager.KEY_EXPIRY,
+            manager.KEY_WORKFLOW_REVIEWS.format(workflow_id=str(request.workflow_id)),
+            manager.KEY_USER_QUEUE.format(user_id=str(user)),
+            manager.KEY_INDEX_STATUS.format(status="pending"),
+            manager.KEY_INDEX_TYPE.format(review_type="input"),
+            manager.KEY_INDEX_URGENCY.format(urgency="high"),
+            manager.KEY_INDEX_TAG.format(tag="legal"),
+            manager.KEY_INDEX_TAG.format(tag="pii"),
+        ]:
+            assert members(redis_client, key) == {rid}, key
+
+    @pytest.mark.asyncio
+    async def test_assign_moves_request_between_user_queues(self, manager, redis_client):
+        """Test reassignment leaves the request only in the new user's queue."""
+        first, second = uuid4(), uuid4()
+        request = await create(manager, assigned_to=first)
+
+        await manager.assign_review(request.request_id, second, notify=False)
+
+        assert members(redis_client, manager.KEY_USER_QUEUE.format(user_id=str(first))) == set()
+        assert members(redis_client, manager.KEY_USER_QUEUE.format(user_id=str(second))) == {
+            request.request_id
+        }
+        assert [r.request_id for r in await manager.get_pending_reviews(user_id=second)] == [
+            request.request_id
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("finish", ["decide", "cancel"])
+    async def test_finished_request_leaves_every_index(self, manager, redis_client, finish):
+        """Test deciding or cancelling removes the request from all sorted sets."""
+        request = await create(manager, tags=["legal"], assigned_to=uuid4())
+
+        if finish == "decide":
+            await manager.submit_decision(request.request_id, DecisionType.APPROVE, uuid4())
+        else:
+            await manager.cancel_review(request.request_id, reason="obsolete")
+
+        assert all(request.request_id not in zset for zset in redis_client.zsets.values())
+        assert await manager.get_pending_reviews() == []
+
+    @pytest.mark.asyncio
+    async def test_deferred_request_stays_queued(self, manager, redis_client):
+        """Test a deferred decision keeps the request pending and indexed."""
+        request = await create(manager)
+
+        await manager.submit_decision(request.request_id, DecisionType.DEFER, uuid4())
+
+        assert members(redis_client, manager.KEY_QUEUE) == {request.request_id}
+        assert [r.request_id for r in await manager.get_pending_reviews()] == [request.request_id]
+
+
+class TestFilteredPagination:
+    """Tests that filters and paging are resolved in the index query."""
+
+    @pytest.mark.asyncio
+    async def test_filters_intersect_and_tags_union(self, manager):
+        """Test type/urgency filters must all match while any tag matches."""
+        legal = await create(manager, urgency=Urgency.HIGH, tags=["legal"])
+        pii = await create(manager, urgency=Urgency.HIGH, tags=["pii"])
+        await create(manager, urgency=Urgency.LOW, tags=["legal"])
+        await create(manager, review_type=ReviewType.INPUT, urgency=Urgency.HIGH, tags=["pii"])
+
+        found = await manager.get_pending_reviews(
+            review_type=ReviewType.APPROVAL, urgency=Urgency.HIGH, tags=["legal", "pii"]
+        )
+
+        assert {r.request_id for r in found} == {legal.request_id, pii.request_id}
+
+    @pytest.mark.asyncio
+    async def test_pages_are_newest_first_and_disjoint(self, manager):
+        """Test offset/limit walk the filtered queue without gaps or repeats."""
+        created = [(await create(manager, tags=["batch"])).request_id for _ in range(5)]
+        await create(manager, tags=["other"])
+
+        pages = [
+            [r.request_id for r in await manager.get_pending_reviews(tags=["batch"], limit=2, offset=offset)]
+            for offset in (0, 2, 4)
+        ]
+
+        assert pages == [created[::-1][0:2], created[::-1][2:4], created[::-1][4:]]
+
+    @pytest.mark.asyncio
+    async def test_unswept_expired_requests_do_not_shorten_pages(self, manager, redis_client):
+        """Test requests past expires_at are skipped in Redis, so pages stay full."""
+        live = [(await create(manager)).request_id for _ in range(3)]
+        for _ in range(3):
+            await create(manager, timeout_hours=-1)
+
+        page = await manager.get_pending_reviews(limit=3)
+
+        assert [r.request_id for r in page] == live[::-1]
+        assert redis_client.keys_matching("review:query:*") == []
+
+    @pytest.mark.asyncio
+    async def test_stale_queue_entries_are_skipped(self, manager, redis_client):
+        """Test queued requests that are no longer active are not returned, with or without filters."""
+        kept = await create(manager)
+        stale = await create(manager)
+        stale.status = ReviewStatus.APPROVED
+        await redis_client.set(manager.KEY_REQUEST.format(request_id=stale.request_id), stale.model_dump_json())
+        await redis_client.zrem(manager.KEY_INDEX_STATUS.format(status="pending"), stale.request_id)
+
+        assert [r.request_id for r in await manager.get_pending_reviews(limit=1)] == [kept.request_id]
+        page = await manager.get_pending_reviews(status=ReviewStatus.PENDING, limit=1)
+        assert [r.request_id for r in page] == [kept.request_id]
+        assert await manager.get_pending_reviews(status=ReviewStatus.IN_PROGRESS) == []
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_listing_pages_queue_directly(self, manager, redis_client, monkeypatch):
+        """Test the plain listing builds no temporary sets and reads past unswept requests."""
+        async def no_set_operations(*args, **kwargs):
+            raise AssertionError("unfiltered listing must not intersect sets")
+
+        monkeypatch.setattr(redis_client, "zinterstore", no_set_operations)
+        monkeypatch.setattr(redis_client, "zunionstore", no_set_operations)
+        monkeypatch.setattr(manager, "PAGE_OVERFETCH", 1)
+        live = [(await create(manager)).request_id for _ in range(4)]
+        for _ in range(5):
+            await create(manager, timeout_hours=-1)
+
+        # The five unswept requests still count towards offset
+        pages = [
+            [r.request_id for r in await manager.get_pending_reviews(limit=2, offset=offset)]
+            for offset in (0, 7)
+        ]
+
+        assert pages == [live[::-1][:2], live[::-1][2:]]
+
+
+class TestExpirySweep:
+    """Tests for expiring due requests from the expiry index."""
+
+    @pytest.mark.asyncio
+    async def test_sweep_expires_only_due_requests(self, manager, redis_client):
+        """Test due requests are expired and unindexed; the rest are untouched."""
+        due = await create(manager, timeout_hours=-1, tags=["legal"])
+        live = await create(manager, tags=["legal"])
+
+        assert await manager.check_expired_reviews(batch_size=1) == [due.request_id]
+
+        expired = await manager.get_review_request(due.request_id)
+        assert expired.status == ReviewStatus.EXPIRED
+        assert all(due.request_id not in zset for zset in redis_client.zsets.values())
+        assert members(redis_client, manager.KEY_EXPIRY) == {live.request_id}
+        assert await manager.check_expired_reviews() == []
+
+    @pytest.mark.asyncio
+    async def test_sweep_drops_evicted_requests(self, manager, redis_client):
+        """Test a due entry whose request data is gone is removed from the queue."""
+        due = await create(manager, timeout_hours=-1)
+        await redis_client.delete(manager.KEY_REQUEST.format(request_id=due.request_id))
+
+        assert await manager.check_expired_reviews() == []
+        assert members(redis_client, manager.KEY_QUEUE) == set()
+        assert members(redis_client, manager.KEY_EXPIRY) == set()
+
+
+    @pytest.mark.asyncio
+    async def test_connect_starts_sweeper(self, redis_client):
+        """Test connect() runs the sweeper, which expires requests without a manual check."""
+        manager = HumanReviewManager(redis_client=redis_client)
+        await manager.connect()
+        try:
+            due = await create(manager, timeout_hours=-1)
+            for _ in range(50):
+                if (await manager.get_review_request(due.request_id)).status == ReviewStatus.EXPIRED:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert (await manager.get_review_request(due.request_id)).status == ReviewStatus.EXPIRED
+        finally:
+            await manager.disconnect()
+
+        assert manager._expiry_task is None
+
+    @pytest.mark.asyncio
+    async def test_sweeper_can_be_disabled(self, manager):
+        """Test expiry_sweeper=False leaves sweeping to the caller."""
+        assert manager._expiry_task is None
+
+
+class TestSnapshots:
+    """Tests for state snapshots stored outside the request."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_loaded_on_demand(self, manager, redis_client):
+        """Test the stored request omits the snapshot until it is asked for."""
+        state = {"draft": "x" * 1000, "items": [1, 2, 3]}
+        request = await create(manager, state=state)
+
+        stored = await manager.get_review_request(request.request_id)
+        assert stored.state_snapshot == {}
+        assert stored.snapshot_size > 0
+        assert "x" * 1000 not in redis_client.values[manager.KEY_REQUEST.format(request_id=request.request_id)]
+
+        assert (await manager.get_review_request(request.request_id, include_snapshot=True)).state_snapshot == state
+        assert await manager.get_review_snapshot(request.request_id) == state
+        assert (await manager.get_pending_reviews())[0].state_snapshot == {}
+
+    @pytest.mark.asyncio
+    async def test_evicted_snapshot_loads_empty(self, manager, redis_client):
+        """Test a missing snapshot key yields an empty state rather than an error."""
+        request = await create(manager)
+        await redis_client.delete(request.snapshot_key)
+
+        assert await manager.get_review_snapshot(request.request_id) == {}
+
+    @pytest.mark.asyncio
+    async def test_decision_callbacks_receive_snapshot(self, manager):
+        """Test callbacks get the stored state, not the empty placeholder."""
+        state = {"draft": "text", "score": 0.9}
+        request = await create(manager, state=state)
+        seen = []
+
+        async def on_decision(request, decision):
+            seen.append((request.state_snapshot, decision.decision_type))
+
+        manager.register_decision_callback(on_decision)
+        await manager.submit_decision(request.request_id, DecisionType.APPROVE, uuid4())
+
+        assert seen == [(state, DecisionType.APPROVE)]
+
+
+class FakeHandler(NotificationHandler):
+    """Records deliveries; fails each recipient's first ``failures`` attempts."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.attempts = []
+        self.running = 0
+        self.peak = 0
+
+    async def send(self, recipient, subject, body, urgency, metadata):
+        self.attempts.append(recipient)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return self.attempts.count(recipient) > self.failures
+
+
+def notification_service(handler, **kwargs):
+    service = NotificationService(retry_delay=0.01, **kwargs)
+    service.register_handler(NotificationType.WEBSOCKET, handler)
+    return service
+
+
+def review_request():
+    return type("Request", (), {
+        "request_id": "r1", "workflow_id": uuid4(), "workflow_name": "wf", "node_id": "review",
+        "node_name": None, "review_type": ReviewType.APPROVAL, "urgency": Urgency.NORMAL,
+        "instructions": "Check it", "expires_at": None, "required_fields": [], "context_summary": None,
+    })()
+
+
+class TestNotificationService:
+    """Tests for bounded fan-out and queued retries."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_bounded(self):
+        """Test recipients are notified concurrently, at most max_concurrency at once."""
+        handler = FakeHandler(delay=0.01)
+        service = notification_service(handler, max_concurrency=2)
+
+        results = await service.notify_review_created(review_request(), [f"u{i}" for i in range(6)] + ["u0"])
+
+        assert results == {f"u{i}": True for i in range(6)}
+        assert handler.peak == 2
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_retried_until_max_attempts(self):
+        """Test failures are retried through the queue with backoff, then given up."""
+        flaky = FakeHandler(failures=1)
+        service = notification_service(flaky)
+        assert await service.notify_review_created(review_request(), ["u1"]) == {"u1": False}
+        await service._drain()
+        assert flaky.attempts == ["u1", "u1"]
+        await service.close()
+
+        broken = FakeHandler(failures=10)
+        service = notification_service(broken, max_attempts=3)
+        await service.notify_review_created(review_request(), ["u1"])
+        await service._drain()
+        assert len(broken.attempts) == 3
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_queued_fan_out_returns_before_delivery(self):
+        """Test wait=False does no I/O in the caller and delivers in the background."""
+        handler = FakeHandler()
+        service = notification_service(handler)
+
+        assert await service.notify_review_created(review_request(), ["u1", "u2"], wait=False) == {}
+        assert handler.attempts == []
+
+        await service._drain()
+        assert sorted(handler.attempts) == ["u1", "u2"]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_close_drains_queue(self):
+        """Test notifications queued just before shutdown are still delivered."""
+        handler = FakeHandler(failures=1, delay=0.01)
+        service = notification_service(handler)
+
+        await service.notify_review_created(review_request(), ["u1", "u2", "u3"], wait=False)
+        await service.close()
+
+        assert sorted(set(handler.attempts)) == ["u1", "u2", "u3"]
+        assert len(handler.attempts) == 6
+
+    @pytest.mark.asyncio
+    async def test_close_logs_dropped_notifications(self, caplog):
+        """Test deliveries still pending after the drain timeout are logged."""
+        handler = FakeHandler(delay=5)
+        service = notification_service(handler, max_concurrency=1)
+
+        await service.notify_review_created(review_request(), ["u1", "u2"], wait=False)
+        await asyncio.sleep(0)
+        await service.close(drain_timeout=0.01)
+
+        assert "Dropped 2 undelivered notifications" in caplog.text
+        assert "u2" in caplog.text
+
+
+class TestWebhookNotificationHandler:
+    """Tests for per-URL batching and the pooled session."""
+
+    @pytest.mark.asyncio
+    async def test_notifications_batched_per_url(self):
+        """Test sends within the window become one POST per URL."""
+        handler = WebhookNotificationHandler(batch_window=0.02)
+        posts = []
+
+        async def post(url, payload):
+            posts.append((url, payload))
+            return True
+
+        handler._post = post
+        results = await asyncio.gather(
+            *(handler.send("http://a/hook", f"s{i}", "body", Urgency.NORMAL, {}) for i in range(3)),
+            handler.send("http://b/hook", "single", "body", Urgency.HIGH, {"request_id": "r1"}),
+        )
+
+        assert all(results)
+        assert sorted(url for url, _ in posts) == ["http://a/hook", "http://b/hook"]
+        batched = dict(posts)
+        assert [n["subject"] for n in batched["http://a/hook"]["notifications"]] == ["s0", "s1", "s2"]
+        assert batched["http://b/hook"]["request_id"] == "r1"
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushed_early_and_session_reused(self):
+        """Test max_batch_size flushes without waiting and every POST shares one session."""
+        handler = WebhookNotificationHandler(batch_window=60, max_batch_size=2)
+        posts = []
+
+        async def post(url, payload):
+            posts.append(handler._get_session())
+            return True
+
+        handler._post = post
+        await asyncio.wait_for(asyncio.gather(
+            *(handler.send("http://a/hook", "s", "b", Urgency.LOW, {}) for _ in range(4))
+        ), timeout=1)
+
+        assert len(posts) == 2 and posts[0] is posts[1]
+        await handler.close()
+        assert posts[0].closed
+
+
+class TestTransitions:
+    """Tests that every lifecycle transition is one all-or-nothing MULTI/EXEC."""
+
+    TRANSITIONS = {
+        "submit_decision": lambda m, r: m.submit_decision(r.request_id, DecisionType.APPROVE, uuid4()),
+        "assign_review": lambda m, r: m.assign_review(r.request_id, uuid4(), notify=False),
+        "cancel_review": lambda m, r: m.cancel_review(r.request_id, "obsolete"),
+        "_handle_expiration": lambda m, r: m._handle_expiration(r),
+    }
+
+    @pytest.mark.asyncio
+    async def test_create_is_one_transaction(self, manager, redis_client):
+        """Test creation writes everything in one EXEC and nothing if it fails."""
+        before = redis_client.dump()
+        redis_client.fail_exec = True
+        with pytest.raises(ConnectionError):
+            await create(manager, tags=["docs"], assigned_to=uuid4())
+        assert redis_client.dump() == before
+        assert redis_client.transactions == 0
+
+        request = await create(manager, tags=["docs"], assigned_to=uuid4())
+        assert redis_client.transactions == 1
+        assert await manager.get_review_request(request.request_id) is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("transition", TRANSITIONS)
+    async def test_transition_is_one_transaction(self, manager, redis_client, transition):
+        """Test each transition runs exactly one EXEC."""
+        request = await create(manager, tags=["docs"], assigned_to=uuid4())
+        redis_client.transactions = 0
+
+        await self.TRANSITIONS[transition](manager, request)
+
+        assert redis_client.transactions == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("transition", TRANSITIONS)
+    async def test_failed_transition_applies_nothing(self, manager, redis_client, transition):
+        """Test a failing EXEC leaves the request, queues, indexes and events untouched."""
+        request = await create(manager, tags=["docs"], assigned_to=uuid4())
+        before = redis_client.dump()
+        redis_client.fail_exec = True
+
+        with pytest.raises(ConnectionError):
+            await self.TRANSITIONS[transition](manager, request)
+
+        assert redis_client.dump() == before
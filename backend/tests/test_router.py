@@ -0,0 +1,172 @@
+"""
+Tests for the intelligent task router (src/services/router.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.api.v1 import websocket
+from src.models.task import Task
+from src.models.worker import Worker
+from src.services.latency_model import LatencyModel
+from src.services.router import IntelligentRouter
+
+
+class FakeResult:
+    def __init__(self, rows=None, count=0):
+        self._rows = rows or []
+        self._count = count
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return self._count
+
+
+class FakeSession:
+    """Answers the router's worker query and task-count queries."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if statement.column_descriptions[0].get("entity") is Worker:
+            return FakeResult(rows=self.workers)
+        return FakeResult(count=0)
+
+
+def decisions_timed(mode: str) -> float:
+    return REGISTRY.get_sample_value(
+        "garageswarm_router_decision_duration_seconds_count", {"mode": mode}
+    ) or 0.0
+
+
+def make_worker(name, tools, status="idle"):
+    return Worker(
+        worker_id=uuid4(), machine_name=name, machine_id=name,
+        status=status, tools=tools, is_active=True
+    )
+
+
+def make_task(tool, priority=5, deadline=None):
+    return Task(
+        task_id=uuid4(), description="task", tool_preference=tool, status="pending",
+        priority=priority, deadline=deadline, created_at=datetime.now(timezone.utc)
+    )
+
+
+class TestRouteTasks:
+    """Tests for batch routing against the Task and Worker models."""
+
+    @pytest.mark.asyncio
+    async def test_route_tasks_assigns_by_tool(self):
+        """Test each task lands on the worker that supports its tool."""
+        ollama = make_worker("ollama-box", ["ollama"])
+        claude = make_worker("claude-box", ["claude_code"])
+        tasks = [make_task("claude_code"), make_task("ollama")]
+        router = IntelligentRouter(latency_model=LatencyModel())
+
+        decisions = await router.route_tasks(tasks, FakeSession([ollama, claude]))
+
+        assert decisions[tasks[0].task_id].worker_id == claude.worker_id
+        assert decisions[tasks[0].task_id].worker_name == "claude-box"
+        assert decisions[tasks[1].task_id].worker_id == ollama.worker_id
+        assert decisions[tasks[1].task_id].factors["capability_match"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_route_tasks_places_urgent_task_first(self):
+        """Test the earlier deadline wins the only free slot."""
+        worker = make_worker("box", ["ollama"])
+        soon = datetime.now(timezone.utc) + timedelta(minutes=5)
+        relaxed = make_task("ollama", deadline=soon + timedelta(hours=1))
+        urgent = make_task("ollama", deadline=soon)
+        router = IntelligentRouter(latency_model=LatencyModel())
+
+        decisions = await router.route_tasks(
+            [relaxed, urgent], FakeSession([worker]), capacities={worker.worker_id: 1}
+        )
+
+        assert decisions[urgent.task_id].worker_id == worker.worker_id
+        assert decisions[relaxed.task_id] is None
+
+    @pytest.mark.asyncio
+    async def test_route_tasks_without_workers(self):
+        """Test every task is left unassigned when no worker is available."""
+        tasks = [make_task("ollama")]
+        router = IntelligentRouter(latency_model=LatencyModel())
+
+        assert await router.route_tasks(tasks, FakeSession([])) == {tasks[0].task_id: None}
+
+
+class TestRouteTask:
+    """Tests for single-task routing."""
+
+    @pytest.mark.asyncio
+    async def test_route_task_prefers_idle_capable_worker(self):
+        """Test busy and incapable workers lose to an idle capable one."""
+        busy = make_worker("busy-box", ["ollama"], status="busy")
+        idle = make_worker("idle-box", ["ollama"])
+        other = make_worker("other-box", ["gemini_cli"])
+        router = IntelligentRouter(exploration_rate=0.0, latency_model=LatencyModel())
+
+        decision = await router.route_task(make_task("ollama"), FakeSession([busy, idle, other]))
+
+        assert decision.worker_id == idle.worker_id
+        assert decision.factors["current_load"] == 1.0
+
+
+class TestAssignmentAccounting:
+    """Tests for outstanding-work tracking of pushed assignments."""
+
+    @pytest.mark.asyncio
+    async def test_pushed_task_counts_as_outstanding(self, monkeypatch):
+        """Test a WebSocket assignment queues work for the worker's latency score."""
+        model = LatencyModel(min_samples=1)
+        worker_id = uuid4()
+        model.record_completion(worker_id, "ollama", 10_000)
+        sent = []
+
+        async def send_to_worker(target, message):
+            sent.append(target)
+            return True
+
+        monkeypatch.setattr(websocket, "get_latency_model", lambda: model)
+        monkeypatch.setattr(websocket.manager, "send_to_worker", send_to_worker)
+        before = model.latency_score(worker_id, "ollama")
+
+        assert await websocket.send_task_to_worker(str(worker_id), {"tool_preference": "ollama"})
+        assert await websocket.send_task_to_worker(
+            str(worker_id), {"tool_preference": "ollama"}, track_latency=False
+        )
+
+        assert sent == [str(worker_id)] * 2
+        assert model.latency_score(worker_id, "ollama") < before
+        model.task_released(worker_id)
+        assert model.latency_score(worker_id, "ollama") == before
+
+
+class TestRouterMetrics:
+    """Tests for router decision timing."""
+
+    @pytest.mark.asyncio
+    async def test_decisions_are_timed_by_mode(self):
+        """Test single and batch routing each observe the decision histogram."""
+        worker = make_worker("box", ["ollama"])
+        router = IntelligentRouter(exploration_rate=0.0, latency_model=LatencyModel())
+        single = decisions_timed("single")
+        batch = decisions_timed("batch")
+
+        await router.route_task(make_task("ollama"), FakeSession([worker]))
+        await router.route_tasks([make_task("ollama")], FakeSession([worker]))
+
+        assert decisions_timed("single") == single + 1
+        assert decisions_timed("batch") == batch + 1
@@ -0,0 +1,132 @@
+"""
+Tests for the warm CLI session pool (src/mcp/servers/session_pool.py).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from src.mcp.servers.session_pool import CLISession, CLISessionError, CLISessionPool
+
+# Stand-in CLI: text mode echoes stdin; stream-json mode answers each user
+# message with a result event that counts the turns this process has seen
+FAKE_CLI = """
+import json, sys
+if sys.argv[1] == "text":
+    prompt = sys.stdin.read()
+    if "SLOW" in prompt:
+        import time; time.sleep(30)
+    print("echo: " + prompt.strip())
+    sys.exit(0)
+turns = 0
+for line in sys.stdin:
+    turns += 1
+    text = json.loads(line)["message"]["content"][0]["text"]
+    print(json.dumps({"type": "assistant", "message": {"content": text}}))
+    print(json.dumps({
+        "type": "result", "subtype": "success", "is_error": "FAIL" in text,
+        "result": f"turn {turns}: {text}", "session_id": "fake",
+    }), flush=True)
+"""
+
+
+def fake_cmd(mode: str = "text"):
+    return [sys.executable, "-c", FAKE_CLI, mode]
+
+
+class TestCLISession:
+    """Tests for individual sessions."""
+
+    @pytest.mark.asyncio
+    async def test_oneshot_run(self):
+        """Test a oneshot session sends the prompt on stdin and reads to EOF."""
+        session = CLISession(fake_cmd(), cwd=None, env=dict(os.environ))
+        await session.start()
+
+        result = await session.run("hello", timeout=10)
+
+        assert result["exit_code"] == 0
+        assert result["stdout"] == "echo: hello"
+        assert not session.alive
+        with pytest.raises(CLISessionError):
+            await session.run("again", timeout=10)
+
+    @pytest.mark.asyncio
+    async def test_stream_json_turn_result(self):
+        """Test a stream-json turn returns the result event, including errors."""
+        session = CLISession(fake_cmd("stream-json"), cwd=None, env=dict(os.environ), mode="stream-json")
+        await session.start()
+
+        ok = await session.run("hi", timeout=10)
+        failed = await session.run("FAIL", timeout=10)
+        await session.close()
+
+        assert (ok["stdout"], ok["exit_code"], ok["session_id"]) == ("turn 1: hi", 0, "fake")
+        assert (failed["stdout"], failed["exit_code"]) == ("turn 2: FAIL", 1)
+
+    @pytest.mark.asyncio
+    async def test_timeout_marks_session_broken(self):
+        """Test a timed-out session is never handed out again."""
+        session = CLISession(fake_cmd(), cwd=None, env=dict(os.environ))
+        await session.start()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await session.run("SLOW", timeout=0.2)
+
+        assert session.broken and not session.alive
+        await session.close()
+
+
+class TestCLISessionPool:
+    """Tests for checkout, refill and recycling."""
+
+    @pytest.mark.asyncio
+    async def test_prewarmed_session_is_a_hit(self):
+        """Test acquire returns a prewarmed session and recycles it after the task."""
+        pool = CLISessionPool(env=dict(os.environ))
+        await pool.prewarm(fake_cmd())
+
+        session = await pool.acquire(fake_cmd())
+        result = await session.run("hi", timeout=10)
+        await pool.release(session)
+
+        assert result["stdout"] == "echo: hi"
+        stats = pool.get_stats()
+        assert (stats["hits"], stats["misses"], stats["recycled"]) == (1, 0, 1)
+        await pool.close()
+        assert pool.get_stats()["idle_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_json_conversation_not_shared_between_tasks(self):
+        """Test each task gets a fresh stream-json process, so turns never carry over."""
+        pool = CLISessionPool(env=dict(os.environ), mode="stream-json")
+        cmd = fake_cmd("stream-json")
+        outputs = []
+
+        for prompt in ("first task", "second task"):
+            session = await pool.acquire(cmd)
+            outputs.append((await session.run(prompt, timeout=10))["stdout"])
+            await pool.release(session)
+
+        assert outputs == ["turn 1: first task", "turn 1: second task"]
+        assert pool.get_stats()["recycled"] == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_dead_idle_session_discarded(self):
+        """Test sessions whose process exited are not handed out."""
+        pool = CLISessionPool(env=dict(os.environ), mode="stream-json")
+        cmd = fake_cmd("stream-json")
+        session = await pool.acquire(cmd)
+        await pool.release(session)
+        session.process.kill()
+        await session.process.wait()
+
+        replacement = await pool.acquire(cmd)
+
+        assert replacement is not session
+        assert pool.get_stats()["discarded"] == 1
+        await pool.release(replacement)
+        await pool.close()
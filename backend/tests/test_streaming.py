@@ -0,0 +1,127 @@
+"""
+Tests for bounded CLI output capture (src/mcp/servers/streaming.py).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from src.mcp.servers.streaming import (
+    JSONStreamScanner,
+    OutputCollector,
+    pump_stream,
+    sweep_spill_files,
+)
+
+
+class TestJSONStreamScanner:
+    """Tests for incremental JSON detection."""
+
+    @pytest.mark.asyncio
+    async def test_value_split_across_chunks(self):
+        """Test a value split over chunks, with escapes at the boundary, parses once."""
+        scanner = JSONStreamScanner()
+
+        for chunk in ['Result: {"a": [1, ', '2], "s": "x}\\', '"y"} {"b": 2}']:
+            await scanner.feed(chunk)
+
+        assert scanner.first_value == {"a": [1, 2], "s": 'x}"y'}
+        assert scanner.last_value == {"b": 2}
+        assert scanner.value_count == 2
+
+    @pytest.mark.asyncio
+    async def test_oversize_value_abandoned(self):
+        """Test candidates above the size cap are dropped."""
+        scanner = JSONStreamScanner(max_value_chars=16)
+
+        await scanner.feed('{"long": "' + "x" * 100 + '"} {"ok": 1}')
+
+        assert scanner.first_value == {"ok": 1}
+
+
+class TestOutputCollector:
+    """Tests for line forwarding, spilling and spill cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_lines_forwarded_incrementally(self):
+        """Test complete lines are forwarded as they arrive."""
+        lines = []
+        collector = OutputCollector("stdout", on_line=lambda line, name: lines.append(line))
+
+        await collector.feed(b"first\nsec")
+        assert lines == ["first"]
+        await collector.feed(b"ond\r\nthird")
+        await collector.finish()
+
+        assert lines == ["first", "second", "third"]
+        assert collector.get_text() == "first\nsecond\r\nthird"
+
+    @pytest.mark.asyncio
+    async def test_spills_beyond_cap_until_closed(self, tmp_path):
+        """Test the full output goes to a spill file that close() removes."""
+        collector = OutputCollector("stdout", max_memory_bytes=1024, spill_dir=str(tmp_path))
+
+        for i in range(100):
+            await collector.feed(f"line {i:04d} ".encode() * 10 + b"\n")
+        await collector.finish()
+
+        assert collector.truncated
+        assert os.path.getsize(collector.spill_path) == collector.total_bytes
+        assert collector.spill_path in collector.get_text()
+
+        collector.close()
+        assert not os.path.exists(collector.spill_path)
+        assert collector.get_text().endswith("line 0099 " * 10)
+
+    @pytest.mark.asyncio
+    async def test_new_spill_sweeps_expired_files(self, tmp_path):
+        """Test spilling removes old spill files and leaves everything else."""
+        old = tmp_path / "garageswarm-old.stdout.log"
+        recent = tmp_path / "garageswarm-recent.stdout.log"
+        other = tmp_path / "notes.log"
+        for path in (old, recent, other):
+            path.write_text("x")
+        os.utime(old, (0, 0))
+        os.utime(other, (0, 0))
+
+        collector = OutputCollector("stdout", max_memory_bytes=16, spill_dir=str(tmp_path), spill_ttl=60)
+        await collector.feed(b"x" * 64)
+        await collector.finish()
+
+        assert not old.exists()
+        assert recent.exists() and other.exists()
+        assert os.path.exists(collector.spill_path)
+        assert sweep_spill_files(str(tmp_path / "missing")) == 0
+
+
+class TestPumpStream:
+    """Tests for reading real subprocess output."""
+
+    @pytest.mark.asyncio
+    async def test_pump_subprocess_output(self, tmp_path):
+        """Test streaming a subprocess that prints more than the cap."""
+        script = (
+            "import json\n"
+            "for i in range(2000): print('x' * 100)\n"
+            "print(json.dumps({'result': 'ok'}))\n"
+        )
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", script, stdout=asyncio.subprocess.PIPE
+        )
+        lines = []
+        scanner = JSONStreamScanner()
+        collector = OutputCollector(
+            "stdout",
+            max_memory_bytes=8 * 1024,
+            on_line=lambda line, name: lines.append(line),
+            scanner=scanner,
+            spill_dir=str(tmp_path)
+        )
+
+        await asyncio.gather(pump_stream(process.stdout, collector), process.wait())
+
+        assert len(lines) == 2001
+        assert scanner.last_value == {"result": "ok"}
+        assert os.path.getsize(collector.spill_path) == collector.total_bytes
@@ -0,0 +1,98 @@
+"""
+Tests for distributed tracing (src/tracing.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.mcp.bus import MCPBus
+from src.mcp.types import MCPServerConfig, ToolDefinition
+from src.tracing import (
+    PHASE_ATTRIBUTE,
+    configure_tracing,
+    inject_context,
+    load_spans,
+    record_span,
+    shutdown_tracing,
+    start_span,
+    waterfall,
+    with_trace_meta,
+)
+
+
+@pytest.fixture
+def span_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    yield path
+    shutdown_tracing()
+
+
+class TestTracing:
+    """Tests for span recording, propagation and waterfalls."""
+
+    @pytest.mark.asyncio
+    async def test_spans_share_trace_across_hops(self, span_file):
+        """Test workflow, MCP and queue spans form one trace with propagated context."""
+        configure_tracing(exporter="file", sample_rate=1.0, file_path=str(span_file))
+        bus = MCPBus()
+        await bus.register_server("ollama", MCPServerConfig(name="ollama"))
+        await bus.register_tool_manually("ollama", ToolDefinition(name="generate", description="Generate"))
+
+        seen = {}
+
+        async def execute(server_name, tool, arguments, timeout=None, invocation_id=None):
+            seen["meta"] = with_trace_meta({"name": tool.name})["_meta"]
+            return {"ok": True}
+
+        bus._execute_tool_call = execute
+
+        with start_span("workflow.execute", {"workflow.id": "wf-1"}):
+            await bus.invoke_tool("ollama.generate", {"prompt": "hi"})
+            carrier = inject_context()
+
+        created = datetime.now(timezone.utc) - timedelta(milliseconds=50)
+        record_span(
+            "task.queued", created, created + timedelta(milliseconds=40),
+            carrier=carrier, attributes={PHASE_ATTRIBUTE: "queue"},
+        )
+        shutdown_tracing()
+
+        spans = load_spans(str(span_file))
+        trace_id = carrier["traceparent"].split("-")[1]
+        assert {s["trace_id"] for s in spans} == {trace_id}
+        assert seen["meta"]["traceparent"].split("-")[1] == trace_id
+
+        by_name = {s["name"]: s for s in spans}
+        root = by_name["workflow.execute"]
+        assert by_name["mcp.invoke_tool"]["parent_id"] == root["span_id"]
+        assert by_name["mcp.invoke_tool"]["attributes"]["mcp.status"] == "success"
+        assert by_name["task.queued"]["parent_id"] == root["span_id"]
+
+        rows = waterfall(spans, trace_id)
+        assert [(r["name"], r["depth"]) for r in rows][0] == ("workflow.execute", 0)
+        assert {r["name"]: r["phase"] for r in rows}["task.queued"] == "queue"
+        assert next(r for r in rows if r["name"] == "task.queued")["duration_ms"] == pytest.approx(40, abs=1)
+
+    def test_unsampled_traces_propagate_without_recording(self, span_file):
+        """Test unsampled spans still carry IDs downstream but export nothing."""
+        configure_tracing(exporter="file", sample_rate=0.0, file_path=str(span_file))
+
+        with start_span("workflow.execute"):
+            carrier = inject_context()
+            params = with_trace_meta({"name": "generate"})
+
+        with start_span("websocket.send", carrier=carrier):
+            child = inject_context()
+        shutdown_tracing()
+
+        assert int(carrier["traceparent"].split("-")[3], 16) & 1 == 0  # Sampled flag off
+        assert params["_meta"] == carrier
+        assert child["traceparent"].split("-")[1] == carrier["traceparent"].split("-")[1]
+        assert not span_file.exists()
+
+    def test_disabled_tracing_leaves_messages_unchanged(self):
+        """Test no trace context is added when tracing is not configured."""
+        with start_span("workflow.execute"):
+            assert inject_context() == {}
+            assert with_trace_meta({"name": "generate"}) == {"name": "generate"}
@@ -0,0 +1,114 @@
+"""
+Tests for work stealing (src/services/work_stealing.py).
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.services.latency_model import LatencyModel
+from src.services.work_stealing import (
+    QueuedTask,
+    Steal,
+    WorkerBacklog,
+    WorkStealer,
+    plan_steals,
+)
+
+
+def queued(worker_id, waiting, tool=None, priority=5):
+    return QueuedTask(
+        task_id=uuid4(),
+        worker_id=worker_id,
+        version=1,
+        tool=tool,
+        priority=priority,
+        waiting_seconds=waiting,
+    )
+
+
+class TestPlanSteals:
+    """Tests for the stealing policy."""
+
+    def test_head_of_queue_is_left_alone(self):
+        """Test the oldest task of a live worker with nothing running is kept."""
+        slow, idle = uuid4(), uuid4()
+        head, second, fresh = queued(slow, 300), queued(slow, 120), queued(slow, 5)
+
+        plan = plan_steals(
+            {slow: WorkerBacklog(queued=[fresh, head, second])},
+            {idle: []},
+            steal_after_seconds=30,
+        )
+
+        assert [(s.task, s.thief_id) for s in plan] == [(second, idle)]
+
+    def test_task_pulled_next_is_left_alone(self):
+        """Test the protected task is the one pull_task returns, not the oldest."""
+        slow, idle = uuid4(), uuid4()
+        oldest = queued(slow, 300, priority=3)
+        urgent = queued(slow, 60, priority=8)
+
+        plan = plan_steals(
+            {slow: WorkerBacklog(queued=[oldest, urgent])},
+            {idle: []},
+            steal_after_seconds=30,
+        )
+
+        assert [s.task for s in plan] == [oldest]
+
+    def test_stalled_worker_and_tool_match(self):
+        """Test all tasks of a stalled worker go to capable idle workers only."""
+        stalled, ollama_worker, claude_worker = uuid4(), uuid4(), uuid4()
+        urgent = queued(stalled, 1, tool="ollama", priority=9)
+        other = queued(stalled, 1, tool="claude_code", priority=1)
+
+        plan = plan_steals(
+            {stalled: WorkerBacklog(stalled=True, queued=[other, urgent])},
+            {ollama_worker: ["ollama"], claude_worker: ["claude_code"]},
+            steal_after_seconds=30,
+        )
+
+        assert {(s.task.task_id, s.thief_id) for s in plan} == {
+            (urgent.task_id, ollama_worker),
+            (other.task_id, claude_worker),
+        }
+
+
+class TestCompareAndSwap:
+    """Tests for the versioned task move."""
+
+    def make_db(self, worker_rows, moved_task):
+        db = MagicMock()
+        claimed = MagicMock(rowcount=worker_rows)
+        moved = MagicMock()
+        moved.scalar_one_or_none.return_value = moved_task
+        db.execute = AsyncMock(side_effect=[claimed, moved])
+        db.commit = AsyncMock()
+        db.rollback = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_steal_commits_on_match(self):
+        """Test a steal commits when thief and task version both match."""
+        stealer = WorkStealer(MagicMock(), latency_model=LatencyModel(), on_steal=None)
+        steal = Steal(task=queued(uuid4(), 60), thief_id=uuid4())
+        task = MagicMock()
+        db = self.make_db(1, task)
+
+        assert await stealer.try_steal(db, steal) is task
+        db.commit.assert_awaited_once()
+        assert stealer.stats["stolen"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lost_race_rolls_back(self):
+        """Test a task that started or moved meanwhile is not stolen."""
+        stealer = WorkStealer(MagicMock(), latency_model=LatencyModel(), on_steal=None)
+        steal = Steal(task=queued(uuid4(), 60), thief_id=uuid4())
+        db = self.make_db(1, None)
+
+        assert await stealer.try_steal(db, steal) is None
+        db.rollback.assert_awaited_once()
+        db.commit.assert_not_awaited()
+        assert stealer.stats["lost_races"] == 1
@@ -29,12 +29,16 @@ from src.workflows.nodes import (
     TaskNode,
     create_node,
 )
-from src.workflows.state import WorkflowContext, WorkflowState
+from src.workflows.state import CopyOnWriteDict, WorkflowContext, WorkflowState
+from src.workflows.hedging import DurationHistory, HedgeBudget, hedged
+from src.workflows.result_cache import ResultCache, make_cache_key
+from src.workflows.prompt_template import compile_template, render_prompt, substitute_inputs
 from src.workflows.graph import (
     WorkflowGraph,
     build_simple_chain,
     build_parallel_workflow,
 )
+from src.workflows.templates import TemplateLoader
 
 
 # =============================================================================
@@ -1033,6 +1037,540 @@ class TestWorkflowState:
         assert cloned.outputs["mutable"]["nested"] == "value"
         assert "node_2" not in cloned.completed_nodes
 
+    def test_state_clone_shares_outputs(self, workflow_state: WorkflowState):
+        """Test clone shares stored values until they are accessed."""
+        text = "x" * 10_000
+        workflow_state.outputs["text"] = text
+
+        cloned = workflow_state.clone()
+        cloned.update("extra", 1)
+
+        assert cloned.outputs["text"] is text
+        assert "extra" not in workflow_state.outputs
+
+    def test_state_from_dict_leaves_source_untouched(self):
+        """Test restored state does not write through to the source dict."""
+        data = {"input": {}, "outputs": {"result": {"items": [1]}}}
+
+        state = WorkflowState.from_dict(data)
+        state.outputs["result"]["items"].append(2)
+        state.update("new", True)
+
+        assert data["outputs"] == {"result": {"items": [1]}}
+
+    def test_state_view(self, workflow_state: WorkflowState):
+        """Test view merges input and outputs with outputs taking precedence."""
+        workflow_state.input["key"] = "from_input"
+        workflow_state.outputs["key"] = "from_output"
+
+        view = workflow_state.view(extra=1)
+
+        assert view["key"] == "from_output"
+        assert view["extra"] == 1
+        assert "missing" not in view
+
+
+class TestCopyOnWriteDict:
+    """Tests for the structurally shared state mapping."""
+
+    def test_snapshot_isolation(self):
+        """Test writes and deletes on either side stay local."""
+        original = CopyOnWriteDict({"a": 1, "b": {"x": 1}})
+        snap = original.snapshot()
+
+        original["c"] = 3
+        del original["a"]
+        original["b"]["x"] = 2
+
+        assert snap == {"a": 1, "b": {"x": 1}}
+        assert original == {"b": {"x": 2}, "c": 3}
+        assert len(snap) == 2 and len(original) == 2
+
+    def test_layers_stay_shallow(self):
+        """Test repeated snapshots keep lookups bounded."""
+        data = CopyOnWriteDict()
+        for i in range(1000):
+            data[f"k{i}"] = i
+            data.snapshot()
+
+        assert len(data._layers) <= 11
+        assert data["k0"] == 0 and len(data) == 1000
+        assert list(data)[:3] == ["k0", "k1", "k2"]
+
+    def test_copy_and_serialization(self):
+        """Test copies round-trip to plain values."""
+        data = CopyOnWriteDict({"a": [1]})
+        data.snapshot()
+        del data["a"]
+        data["b"] = 2
+
+        assert copy.deepcopy(data) == {"b": 2}
+        assert data.to_dict() == {"b": 2}
+        assert isinstance(data.to_dict(), dict)
+
+    def test_to_dict_reference_held_across_clone(self):
+        """Test values from to_dict() stay private to the caller across clone()."""
+        state = WorkflowState(outputs={"node": {"items": [1]}, "text": "shared"})
+        before = state.to_dict()["outputs"]
+        clone = state.clone()
+        after = clone.to_dict()["outputs"]
+
+        before["node"]["items"].append(2)
+        after["node"]["items"].append(3)
+
+        assert state.outputs["node"] == {"items": [1]}
+        assert clone.outputs["node"] == {"items": [1]}
+        assert after["text"] is state.outputs["text"]
+
+
+# =============================================================================
+# Result Cache Tests
+# =============================================================================
+
+
+class TestResultCache:
+    """Tests for the content-addressed result cache."""
+
+    def test_key_is_canonical(self):
+        """Test key ignores argument order but not values or dependencies."""
+        a = make_cache_key("ollama.generate", {"prompt": "p", "opts": {"t": 0, "k": 1}})
+        b = make_cache_key("ollama.generate", {"opts": {"k": 1, "t": 0}, "prompt": "p"})
+
+        assert a == b
+        assert a != make_cache_key("ollama.generate", {"prompt": "q", "opts": {"t": 0, "k": 1}})
+        assert a != make_cache_key("ollama.chat", {"prompt": "p", "opts": {"t": 0, "k": 1}})
+        assert a != make_cache_key(
+            "ollama.generate", {"prompt": "p", "opts": {"t": 0, "k": 1}}, {"repo": "abc"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_lru_and_size_bounds(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResultCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+
+        assert (await cache.get("b")) == (False, None)
+        assert (await cache.get("a")) == (True, 1)
+
+        small = ResultCache(max_bytes=10)
+        await small.set("big", "x" * 20)
+        assert small.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_unserializable(self):
+        """Test expired entries miss and non-JSON results are skipped."""
+        cache = ResultCache()
+        with patch("src.workflows.result_cache.time.monotonic", return_value=100.0):
+            await cache.set("k", {"v": 1}, ttl=10)
+        with patch("src.workflows.result_cache.time.monotonic", return_value=111.0):
+            assert (await cache.get("k")) == (False, None)
+
+        assert await cache.set("obj", object()) is False
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_executor_serves_repeat_from_cache(self):
+        """Test a cacheable node only invokes the tool once."""
+        from src.mcp import ToolResult, ToolResultStatus
+        from src.workflows.executor import NodeExecutor
+
+        bus = MagicMock()
+        bus.invoke_tool = AsyncMock(return_value=ToolResult(
+            tool_path="ollama.generate",
+            status=ToolResultStatus.SUCCESS,
+            result={"text": "summary"}
+        ))
+        executor = NodeExecutor.__new__(NodeExecutor)
+        executor._bus = bus
+        executor._llm_router = None
+        executor._result_cache = ResultCache()
+        executor._duration_history = DurationHistory()
+
+        node = TaskNode(
+            id="summarize",
+            name="Summarize",
+            tool_path="ollama.generate",
+            input_mapping={"code": "prompt"},
+            output_key="summary",
+            cache=True
+        )
+
+        first = await executor.execute_task(node, WorkflowState(input={"code": "x = 1"}))
+        repeat_state = WorkflowState(input={"code": "x = 1"})
+        second = await executor.execute_task(node, repeat_state)
+        await executor.execute_task(node, WorkflowState(input={"code": "x = 2"}))
+
+        assert bus.invoke_tool.await_count == 2
+        assert first == second == {"text": "summary"}
+        assert repeat_state.outputs["summary"] == {"text": "summary"}
+        assert "summarize" in repeat_state.completed_nodes
+
+
+# =============================================================================
+# Hedged Execution Tests
+# =============================================================================
+
+
+class TestHedging:
+    """Tests for hedged execution of straggling task nodes."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_wins_and_loser_is_cancelled(self):
+        """Test a slow primary loses to the duplicate and is cancelled."""
+        import asyncio
+
+        cancelled = []
+
+        async def slow():
+            await asyncio.sleep(5)
+            return "primary"
+
+        async def fast():
+            return "duplicate"
+
+        async def on_cancel(index):
+            cancelled.append(index)
+
+        budget = HedgeBudget(max_hedges=1)
+        result, winner, launched = await hedged(slow, fast, 0.01, budget, on_cancel=on_cancel)
+
+        assert (result, winner, launched) == ("duplicate", 1, True)
+        assert cancelled == [0]
+        assert budget.remaining == 0
+
+        # Budget spent: no duplicate, the primary is awaited
+        async def primary():
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        result, winner, launched = await hedged(primary, fast, 0.01, budget)
+        assert (result, winner, launched) == ("primary", 0, False)
+
+    @pytest.mark.asyncio
+    async def test_failed_call_falls_back_to_other(self):
+        """Test an unsuccessful finisher does not win the race."""
+        import asyncio
+
+        async def primary():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        async def broken():
+            return "error"
+
+        result, winner, _ = await hedged(
+            primary, broken, 0.0, is_success=lambda r: r == "ok"
+        )
+
+        assert (result, winner) == ("ok", 0)
+
+    @pytest.mark.asyncio
+    async def test_executor_hedges_straggler(self):
+        """Test a hedged node takes the duplicate's result on an alternate tool."""
+        import asyncio
+        from src.mcp import ToolResult, ToolResultStatus
+        from src.workflows.executor import ExecutionContext, NodeExecutor
+
+        invocations = {}
+
+        async def invoke_tool(tool_path, arguments, timeout, invocation_id=None, coalesce=True):
+            assert not coalesce
+            invocations[tool_path] = invocation_id
+            if tool_path == "ollama.generate":
+                await asyncio.sleep(5)
+            return ToolResult(
+                tool_path=tool_path,
+                status=ToolResultStatus.SUCCESS,
+                result={"tool": tool_path}
+            )
+
+        bus = MagicMock()
+        bus.invoke_tool = invoke_tool
+        bus.cancel_tool_execution = AsyncMock(return_value=True)
+        executor = NodeExecutor.__new__(NodeExecutor)
+        executor._bus = bus
+        executor._llm_router = None
+        executor._result_cache = ResultCache()
+        executor._duration_history = DurationHistory()
+
+        node = TaskNode(
+            id="draft",
+            name="Draft",
+            tool_path="ollama.generate",
+            output_key="draft",
+            timeout=10,
+            hedge=True,
+            hedge_after=0.01,
+            hedge_tool_paths=["claude_code.generate"]
+        )
+        state = WorkflowState()
+        context = ExecutionContext(
+            workflow_id="wf",
+            execution_id="wf_draft",
+            state=state,
+            hedge_budget=HedgeBudget(max_hedges=1)
+        )
+
+        result = await executor.execute_task(node, state, context)
+
+        assert result == {"tool": "claude_code.generate"}
+        bus.cancel_tool_execution.assert_awaited_once_with(
+            "ollama.generate", invocations["ollama.generate"]
+        )
+        assert invocations["ollama.generate"] != invocations["claude_code.generate"]
+        metrics = context.get_metrics("draft")
+        assert metrics.hedged and metrics.hedge_won
+        assert metrics.tool_invocations == 2
+
+    @pytest.mark.asyncio
+    async def test_same_path_hedge_runs_second_execution(self):
+        """Test a duplicate on the primary's own idempotent tool is not coalesced into it."""
+        import asyncio
+        from src.mcp.bus import MCPBus
+        from src.mcp.types import MCPServerConfig, ToolDefinition
+        from src.workflows.executor import ExecutionContext, NodeExecutor
+
+        bus = MCPBus()
+        await bus.register_server("gemini", MCPServerConfig(name="gemini"))
+        await bus.register_tool_manually(
+            "gemini",
+            ToolDefinition(name="analyze", description="Analyze", metadata={"idempotent": True}),
+        )
+        executions = []
+
+        async def execute(server_name, tool, arguments, timeout=None, invocation_id=None):
+            executions.append(invocation_id)
+            if len(executions) == 1:
+                await asyncio.sleep(5)
+            return {"attempt": len(executions)}
+
+        bus._execute_tool_call = execute
+        bus.cancel_tool_execution = AsyncMock(return_value=True)
+        executor = NodeExecutor.__new__(NodeExecutor)
+        executor._bus = bus
+        executor._llm_router = None
+        executor._result_cache = ResultCache()
+        executor._duration_history = DurationHistory()
+
+        node = TaskNode(
+            id="review",
+            name="Review",
+            tool_path="gemini.analyze",
+            output_key="review",
+            timeout=10,
+            hedge=True,
+            hedge_after=0.01,
+        )
+        state = WorkflowState()
+        context = ExecutionContext(
+            workflow_id="wf",
+            execution_id="wf_review",
+            state=state,
+            hedge_budget=HedgeBudget(max_hedges=1)
+        )
+
+        result = await executor.execute_task(node, state, context)
+
+        assert result == {"attempt": 2}
+        assert len(executions) == 2 and executions[0] != executions[1]
+        assert (await bus.health_check())["coalesced_calls"] == 0
+        assert context.get_metrics("review").hedge_won
+
+
+# =============================================================================
+# Prompt Template Tests
+# =============================================================================
+
+
+class TestPromptTemplate:
+    """Tests for compiled prompt templates."""
+
+    def test_render_brace_placeholders(self):
+        """Test known keys are substituted and unknown ones kept."""
+        prompt = render_prompt(
+            "Review {file} ({meta.lines} lines) for {missing}",
+            {"file": "a.py", "meta": {"lines": 42}, "unused": 1}
+        )
+
+        assert prompt == "Review a.py (42 lines) for {missing}"
+        assert render_prompt("", {"a": 1}) == "{'a': 1}"
+
+    def test_values_are_not_rescanned(self):
+        """Test substituted values containing braces stay literal."""
+        assert render_prompt("{a} {b}", {"a": "{b}", "b": "x"}) == "{b} x"
+
+    def test_templates_are_compiled_once(self):
+        """Test the same source returns the shared compiled template."""
+        template = compile_template("Hello {name}")
+
+        assert compile_template("Hello {name}") is template
+        assert template.placeholder_keys == ["name"]
+
+    def test_substitute_inputs_nested(self):
+        """Test ${input.*} substitution keeps types and supports paths."""
+        data = {
+            "files": "${input.files}",
+            "prompt": "Clone ${input.repo.url} at ${input.repo.ref}",
+            "steps": ["${input.missing}", 3],
+        }
+        result = substitute_inputs(data, {
+            "files": ["a.py", "b.py"],
+            "repo": {"url": "git@host:r.git", "ref": "main"},
+        })
+
+        assert result["files"] == ["a.py", "b.py"]
+        assert result["prompt"] == "Clone git@host:r.git at main"
+        assert result["steps"] == ["${input.missing}", 3]
+
+
+# =============================================================================
+# Template Loader Tests
+# =============================================================================
+
+
+TEMPLATE_YAML = """
+id: {id}
+name: {name}
+input_schema:
+  repo:
+    type: object
+    required: true
+nodes:
+  - id: fetch
+    name: Fetch
+    tool_path: git.clone
+    arguments:
+      url: ${{input.repo.url}}
+  - id: check
+    name: Check
+    type: condition
+    conditions:
+      - field: ok
+        operator: "=="
+        value: true
+    true_branch: done
+  - id: done
+    name: Done
+    tool_path: ollama.generate
+edges:
+  - from: fetch
+    to: check
+  - from: check
+    to: done
+"""
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Directory with a single review template."""
+    (tmp_path / "review.yaml").write_text(TEMPLATE_YAML.format(id="review", name="Review"))
+    return tmp_path
+
+
+class TestTemplateLoader:
+    """Tests for compiled template prototypes."""
+
+    def test_instances_are_independent(self, template_dir):
+        """Test each instance gets its own bound, unshared nodes."""
+        loader = TemplateLoader(template_dir)
+
+        first = loader.create_workflow_from_template("review", {"repo": {"url": "a"}})
+        second = loader.create_workflow_from_template("review", {"repo": {"url": "b"}})
+        first.nodes["check"].conditions[0]["value"] = False
+
+        assert first.id != second.id
+        assert first.nodes["fetch"].arguments == {"url": "a"}
+        assert second.nodes["fetch"].arguments == {"url": "b"}
+        assert isinstance(second.nodes["check"], ConditionNode)
+        assert second.nodes["check"].conditions[0]["value"] is True
+        assert second.get_next_nodes("fetch") == ["check"]
+        assert second.exit_nodes == ["done"]
+
+    def test_cache_hits_and_mtime_invalidation(self, template_dir):
+        """Test prototypes are reused until the file content changes."""
+        import os
+
+        loader = TemplateLoader(template_dir)
+        loader.load_template("review")
+        loader.load_template("review")
+
+        path = template_dir / "review.yaml"
+        path.write_text(TEMPLATE_YAML.format(id="review", name="Review v2"))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert loader.load_template("review").name == "Review v2"
+        stats = loader.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["reloads"] == 1
+
+    def test_cache_is_bounded(self, template_dir):
+        """Test least recently used prototypes are evicted."""
+        for name in ("alpha", "beta"):
+            (template_dir / f"{name}.yaml").write_text(TEMPLATE_YAML.format(id=name, name=name))
+        loader = TemplateLoader(template_dir, max_cache_size=2)
+
+        for template_id in ("review", "alpha", "beta"):
+            loader.load_template(template_id)
+
+        stats = loader.get_cache_stats()
+        assert stats["templates"] == ["alpha", "beta"]
+        assert stats["evictions"] == 1
+
+
+class TestTemplateWatcher:
+    """Tests for the in-memory template index."""
+
+    def test_lookups_do_not_touch_disk(self, template_dir):
+        """Test watched lookups are served from the index and cache."""
+        loader = TemplateLoader(template_dir, watch=True, poll_interval=60)
+        try:
+            loader._watcher.wait_idle()
+            with patch.object(loader, "_get_file_signature", side_effect=AssertionError), \
+                    patch.object(loader, "_discover_template_files", side_effect=AssertionError):
+                assert [m.id for m in loader.list_templates()] == ["review"]
+                graph = loader.create_workflow_from_template("review", {"repo": {"url": "a"}})
+
+            assert graph.nodes["fetch"].arguments == {"url": "a"}
+            assert loader.get_cache_stats()["watcher"]["preloaded"] == 1
+        finally:
+            loader.stop_watching()
+
+    def test_changes_update_index(self, template_dir):
+        """Test added, changed and removed files are picked up."""
+        loader = TemplateLoader(template_dir, watch=True, poll_interval=60)
+        try:
+            watcher = loader._watcher
+            (template_dir / "nested").mkdir()
+            (template_dir / "nested" / "alpha.yml").write_text(
+                TEMPLATE_YAML.format(id="alpha", name="Alpha")
+            )
+            (template_dir / "review.yaml").write_text(
+                TEMPLATE_YAML.format(id="review", name="Review v2") + "\n"
+            )
+            watcher.poll_once()
+            watcher.wait_idle()
+
+            assert sorted(m.id for m in loader.list_templates()) == ["alpha", "review"]
+            assert loader.load_template("review").name == "Review v2"
+            assert "alpha" in loader.get_cache_stats()["templates"]
+
+            (template_dir / "review.yaml").unlink()
+            watcher.poll_once()
+            watcher.wait_idle()
+
+            assert [m.id for m in loader.list_templates()] == ["alpha"]
+            with pytest.raises(FileNotFoundError):
+                loader.load_template("review")
+        finally:
+            loader.stop_watching()
+
 
 # =============================================================================
 # Graph Tests
@@ -0,0 +1,192 @@
+"""Latency benchmark: shared backend HTTP pool vs separate clients
+
+Runs a worker-like request mix against a local stand-in backend: in every
+round a heartbeat, a task poll, a result upload and a burst of log lines are
+sent concurrently. The server charges a fixed cost for every new connection
+(TCP + TLS handshake stand-in) and counts the sockets it sees.
+
+Cases:
+- per-request: a new client per request (no connection reuse at all)
+- separate: two clients with httpx default limits (up to 100 connections
+  each), e.g. a standalone ResultReporter next to the ConnectionManager
+- shared: one BackendHTTPPool client for all traffic
+
+HTTP/2 is only negotiated over TLS with the h2 package installed, so this
+local run compares HTTP/1.1 keep-alive pooling; with HTTP/2 the shared case
+multiplexes the same traffic over a single connection.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--rounds 50] [--log-burst 20] [--connect-cost 0.01]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agent.http_pool import BackendHTTPPool
+
+
+class FakeBackend:
+    """In-process backend stand-in that counts connections"""
+
+    def __init__(self, connect_cost: float = 0.01, handler_time: float = 0.002):
+        self.connect_cost = connect_cost
+        self.handler_time = handler_time
+        self.connections = 0
+        self._seen_transports = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    @web.middleware
+    async def _connection_middleware(self, request, handler):
+        transport = request.transport  # Keep a reference so ids are not reused
+        if transport not in self._seen_transports:
+            self._seen_transports.add(transport)
+            self.connections += 1
+            await asyncio.sleep(self.connect_cost)
+        return await handler(request)
+
+    async def _ok(self, request):
+        if request.can_read_body:
+            await request.read()
+        await asyncio.sleep(self.handler_time)
+        return web.json_response({"ok": True})
+
+    def reset(self):
+        self.connections = 0
+        self._seen_transports.clear()
+
+    async def start(self) -> str:
+        app = web.Application(middlewares=[self._connection_middleware])
+        app.router.add_route("*", "/{tail:.*}", self._ok)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class PerRequestClients:
+    """A new client for every request"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def send(self, component: str, method: str, path: str, **kwargs):
+        async with httpx.AsyncClient(base_url=self.url) as client:
+            return await client.request(method, path, **kwargs)
+
+    async def close(self):
+        pass
+
+
+class SeparateClients:
+    """One default client for the connection manager, one for the result reporter"""
+
+    def __init__(self, url: str):
+        self.manager = httpx.AsyncClient(base_url=url)
+        self.reporter = httpx.AsyncClient(base_url=url)
+
+    async def send(self, component: str, method: str, path: str, **kwargs):
+        client = self.reporter if component == "result" else self.manager
+        return await client.request(method, path, **kwargs)
+
+    async def close(self):
+        await self.manager.aclose()
+        await self.reporter.aclose()
+
+
+class SharedPool:
+    """All traffic through one BackendHTTPPool"""
+
+    def __init__(self, url: str):
+        self.pool = BackendHTTPPool({"backend_url": url})
+
+    async def send(self, component: str, method: str, path: str, **kwargs):
+        return await self.pool.client.request(method, path, **kwargs)
+
+    async def close(self):
+        await self.pool.close()
+
+
+async def run_case(name: str, clients, server: FakeBackend, rounds: int, log_burst: int, gap: float):
+    server.reset()
+    latencies = []
+
+    async def timed(component, method, path, **kwargs):
+        start = time.perf_counter()
+        response = await clients.send(component, method, path, **kwargs)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    for i in range(rounds):
+        requests = [
+            timed("heartbeat", "POST", "/api/v1/workers/w/heartbeat", json={"status": "busy"}),
+            timed("poll", "GET", "/api/v1/workers/w/pull-task"),
+            timed("result", "POST", "/api/v1/tasks/t/result", json={"output": "x" * 2000}),
+        ]
+        requests += [
+            timed("log", "POST", "/api/v1/tasks/t/log", json={"line": f"line {i}.{j}"})
+            for j in range(log_burst)
+        ]
+        await asyncio.gather(*requests)
+        await asyncio.sleep(gap)
+    elapsed = time.perf_counter() - started
+
+    await clients.close()
+    latencies.sort()
+    return {
+        "case": name,
+        "requests": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "req_s": len(latencies) / elapsed,
+        "sockets": server.connections,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backend HTTP pool benchmark")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--log-burst", type=int, default=20, help="Log lines sent per round")
+    parser.add_argument("--connect-cost", type=float, default=0.01, help="Cost of a new connection (s)")
+    parser.add_argument("--gap", type=float, default=0.01, help="Pause between rounds (s)")
+    args = parser.parse_args()
+
+    server = FakeBackend(connect_cost=args.connect_cost)
+    url = await server.start()
+    cases = [
+        ("per-request", PerRequestClients(url)),
+        ("separate", SeparateClients(url)),
+        ("shared", SharedPool(url)),
+    ]
+
+    print(f"rounds={args.rounds} log_burst={args.log_burst} connect_cost={args.connect_cost}s")
+    print(f"{'case':<13}{'requests':>9}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>9}{'sockets':>9}")
+    try:
+        for name, clients in cases:
+            s = await run_case(name, clients, server, args.rounds, args.log_burst, args.gap)
+            print(
+                f"{s['case']:<13}{s['requests']:>9}{s['p50_ms']:>9.1f}{s['p99_ms']:>9.1f}"
+                f"{s['req_s']:>9.0f}{s['sockets']:>9}"
+            )
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
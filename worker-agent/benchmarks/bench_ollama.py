@@ -0,0 +1,120 @@
+"""Latency benchmark: Ollama connection reuse and model residency
+
+Runs a task stream against the local stand-in in ``fake_ollama.py``. The
+workload mostly targets one model with an occasional second model, with an
+idle gap between tasks that is longer than the default keep_alive, which is
+what makes Ollama reload models between tasks in practice.
+
+Cases:
+- per-request: emulates the previous behaviour; a new HTTP session per task,
+  /api/tags queried before every generation, no keep_alive management
+- pooled: one session per tool, cached model inventory, hot models pinned
+  with a long keep_alive and prewarmed at startup
+
+Times are scaled down: keep_alive values are in seconds rather than minutes.
+
+Usage:
+    python benchmarks/bench_ollama.py [--tasks 30] [--gap 0.4] [--load-time 0.5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_ollama import FakeOllama
+from tools.ollama import OllamaTool
+
+
+class PerRequestOllamaTool(OllamaTool):
+    """OllamaTool that drops its session after every task"""
+
+    async def execute(self, instructions, context=None):
+        try:
+            return await super().execute(instructions, context)
+        finally:
+            await self.close()
+
+
+def workload(tasks: int):
+    """Mostly the primary model, every fifth task on a secondary model"""
+    return ["codellama" if i % 5 == 4 else "llama2" for i in range(tasks)]
+
+
+async def run_case(name: str, tool: OllamaTool, server: FakeOllama, models, gap: float, prewarm: bool):
+    server.stats = {k: 0 for k in server.stats}
+    server.resident.clear()
+    if prewarm:
+        await tool.prewarm()
+
+    latencies = []
+    load_ns = 0
+    for i, model in enumerate(models):
+        start = time.perf_counter()
+        result = await tool.execute(f"task {i}", {"model": model})
+        latencies.append(time.perf_counter() - start)
+        if not result["success"]:
+            raise RuntimeError(f"{name}: task {i} failed: {result['error']}")
+        load_ns += result["metadata"]["load_duration"]
+        await asyncio.sleep(gap)
+    await tool.close()
+
+    latencies.sort()
+    return {
+        "case": name,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "load_s": load_ns / 1e9,
+        **server.stats
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Ollama connection/residency benchmark")
+    parser.add_argument("--tasks", type=int, default=30)
+    parser.add_argument("--gap", type=float, default=0.4, help="Idle time between tasks (s)")
+    parser.add_argument("--load-time", type=float, default=0.5, help="Simulated model load (s)")
+    parser.add_argument("--keep-alive", type=float, default=0.3, help="Default keep_alive (s)")
+    args = parser.parse_args()
+
+    server = FakeOllama(load_time=args.load_time, default_keep_alive=args.keep_alive)
+    url = await server.start()
+    models = workload(args.tasks)
+
+    base_config = {"url": url, "model": "llama2", "auto_pull": True, "max_retries": 1}
+    cases = [
+        ("per-request", PerRequestOllamaTool({
+            **base_config,
+            "model_cache_ttl": 0,
+            "keep_alive": args.keep_alive,
+            "hot_threshold": 10 ** 9  # never pin
+        }), False),
+        ("pooled", OllamaTool({
+            **base_config,
+            "keep_alive": args.keep_alive,
+            "hot_keep_alive": 60
+        }), True),
+    ]
+
+    print(f"tasks={args.tasks} gap={args.gap}s load={args.load_time}s keep_alive={args.keep_alive}s")
+    print(f"{'case':<14}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'loads':>7}{'load s':>8}{'conns':>7}{'tags':>6}")
+    try:
+        for name, tool, prewarm in cases:
+            s = await run_case(name, tool, server, models, args.gap, prewarm)
+            print(
+                f"{s['case']:<14}{s['mean_ms']:>10.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                f"{s['loads']:>7}{s['load_s']:>8.2f}{s['connections']:>7}{s['tags']:>6}"
+            )
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Latency benchmark: cold CLI spawn vs warm session pool
+
+Runs the same sequence of prompts through ClaudeCodeTool three ways, using
+``fake_cli.py`` as the CLI so that startup cost is controlled:
+
+- cold: a new process per task (the default)
+- pool-oneshot: pre-spawned processes, one task each
+- pool-stream-json: pre-spawned stream-json sessions, one task each
+
+Tasks are issued back to back with a small gap, as a worker would see them
+when pulling from a queue; the gap is what lets the pool refill.
+
+Usage:
+    python benchmarks/bench_session_pool.py [--tasks 20] [--startup 0.5] [--work 0.2] [--gap 0.0]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools.claude_code import ClaudeCodeTool
+
+FAKE_CLI = Path(__file__).parent / "fake_cli.py"
+
+
+def make_tool(startup: float, work: float, pool: dict = None) -> ClaudeCodeTool:
+    """Create a ClaudeCodeTool whose CLI is the fake stub"""
+    tool = ClaudeCodeTool({
+        "cli_path": sys.executable,
+        "max_retries": 0,
+        "enable_json_parsing": False,
+        "session_pool": pool or {"enabled": False}
+    })
+    # Run the stub through the interpreter: python fake_cli.py --startup N -p ...
+    original_build = tool._build_command
+
+    def build(additional_args=None, files=None):
+        cmd = original_build(additional_args, files)
+        return [cmd[0], str(FAKE_CLI), "--startup", str(startup), "--work", str(work)] + cmd[1:]
+
+    tool._build_command = build
+    return tool
+
+
+async def run_case(name: str, tool: ClaudeCodeTool, tasks: int, gap: float) -> dict:
+    """Run tasks sequentially and collect per-task latency"""
+    await tool.prewarm()
+    latencies = []
+    for i in range(tasks):
+        start = time.perf_counter()
+        result = await tool.execute(f"task {i}", {"retry": False})
+        latencies.append(time.perf_counter() - start)
+        if not result["success"]:
+            raise RuntimeError(f"{name}: task {i} failed: {result['error']}")
+        if gap:
+            await asyncio.sleep(gap)
+    await tool.close()
+
+    latencies.sort()
+    return {
+        "case": name,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="CLI session pool benchmark")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--startup", type=float, default=0.5, help="Simulated CLI startup (s)")
+    parser.add_argument("--work", type=float, default=0.2, help="Simulated time per prompt (s)")
+    parser.add_argument("--gap", type=float, default=0.0, help="Idle time between tasks (s)")
+    args = parser.parse_args()
+
+    cases = [
+        ("cold", make_tool(args.startup, args.work)),
+        ("pool-oneshot", make_tool(args.startup, args.work, {"enabled": True, "mode": "oneshot"})),
+        ("pool-stream-json", make_tool(args.startup, args.work, {"enabled": True, "mode": "stream-json"})),
+    ]
+
+    print(f"tasks={args.tasks} startup={args.startup}s work={args.work}s gap={args.gap}s")
+    print(f"{'case':<18}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, tool in cases:
+        stats = await run_case(name, tool, args.tasks, args.gap)
+        print(f"{stats['case']:<18}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
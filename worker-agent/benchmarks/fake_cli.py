@@ -0,0 +1,76 @@
+"""Fake AI CLI used by benchmarks and tests
+
+Simulates the parts of a CLI like ``claude`` that matter for process
+pooling: a fixed startup cost before input is read, then a short response.
+
+Usage:
+    python benchmarks/fake_cli.py [--startup SECONDS] [--work SECONDS]
+        [--input-format text|stream-json]
+
+Text mode reads the whole prompt from stdin and prints a reply. Stream-json
+mode reads one JSON user message per line and writes an ``assistant`` event
+followed by a ``result`` event for each, staying alive until stdin closes.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def _prompt_text(message: dict) -> str:
+    content = message.get("message", {}).get("content", "")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fake AI CLI")
+    parser.add_argument("-p", action="store_true", help="Print mode (ignored)")
+    parser.add_argument("--startup", type=float, default=0.5, help="Simulated startup time")
+    parser.add_argument("--work", type=float, default=0.0, help="Simulated time per prompt")
+    parser.add_argument("--input-format", default="text", choices=["text", "stream-json"])
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("--verbose", action="store_true")
+    args, _ = parser.parse_known_args()
+
+    # Interpreter/Node startup, config and credential loading
+    time.sleep(args.startup)
+
+    if args.input_format == "text":
+        prompt = sys.stdin.read()
+        time.sleep(args.work)
+        if "FAIL" in prompt:
+            print("simulated failure", file=sys.stderr)
+            return 2
+        print(f"echo: {prompt.strip()}")
+        return 0
+
+    turns = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        turns += 1
+        prompt = _prompt_text(json.loads(line))
+        time.sleep(args.work)
+        reply = f"echo: {prompt.strip()}"
+        print(json.dumps({
+            "type": "assistant",
+            "message": {"role": "assistant", "content": [{"type": "text", "text": reply}]}
+        }))
+        print(json.dumps({
+            "type": "result",
+            "subtype": "success",
+            "is_error": "FAIL" in prompt,
+            "result": reply,
+            "num_turns": turns,
+            "session_id": "fake-session"
+        }))
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
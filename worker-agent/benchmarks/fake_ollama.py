@@ -0,0 +1,156 @@
+"""Local HTTP stand-in for the Ollama API
+
+Implements just enough of ``/api/tags``, ``/api/generate`` and ``/api/chat``
+to exercise OllamaTool without a GPU:
+
+- A model must be loaded before it can generate; loading costs
+  ``load_time`` seconds and is reported as ``load_duration``
+- A loaded model stays resident for the request's ``keep_alive`` (seconds
+  or Go-style "5m"/"30s" strings), then is unloaded
+- The first request on a new TCP connection pays ``connect_cost`` seconds,
+  standing in for connection setup to a remote Ollama host
+- ``/api/tags`` takes ``tags_time`` seconds
+
+Usage (standalone):
+    python benchmarks/fake_ollama.py --port 11500
+"""
+
+import argparse
+import asyncio
+import re
+import time
+from typing import Dict, Optional, Union
+
+from aiohttp import web
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h)?$")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, None: 1.0}
+
+
+def parse_keep_alive(value: Union[str, int, float, None], default: float) -> float:
+    """Convert an Ollama keep_alive value to seconds"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _DURATION.match(str(value).strip())
+    if not match:
+        return default
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+class FakeOllama:
+    """In-process fake Ollama server"""
+
+    def __init__(
+        self,
+        models=("llama2", "codellama"),
+        load_time: float = 0.5,
+        gen_time: float = 0.02,
+        tags_time: float = 0.01,
+        connect_cost: float = 0.005,
+        default_keep_alive: float = 300.0
+    ):
+        self.models = list(models)
+        self.load_time = load_time
+        self.gen_time = gen_time
+        self.tags_time = tags_time
+        self.connect_cost = connect_cost
+        self.default_keep_alive = default_keep_alive
+
+        self.resident: Dict[str, float] = {}  # model -> unload deadline
+        self.stats = {"connections": 0, "tags": 0, "loads": 0, "generations": 0}
+        self._seen_transports = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    def _app(self) -> web.Application:
+        app = web.Application(middlewares=[self._connection_middleware])
+        app.router.add_get("/api/tags", self._tags)
+        app.router.add_post("/api/generate", self._generate)
+        app.router.add_post("/api/chat", self._generate)
+        return app
+
+    @web.middleware
+    async def _connection_middleware(self, request, handler):
+        transport = id(request.transport)
+        if transport not in self._seen_transports:
+            self._seen_transports.add(transport)
+            self.stats["connections"] += 1
+            await asyncio.sleep(self.connect_cost)
+        return await handler(request)
+
+    async def _tags(self, request):
+        self.stats["tags"] += 1
+        await asyncio.sleep(self.tags_time)
+        return web.json_response({"models": [{"name": f"{m}:latest"} for m in self.models]})
+
+    async def _ensure_loaded(self, model: str, keep_alive: float) -> int:
+        now = time.monotonic()
+        load_ns = 0
+        if self.resident.get(model, 0) <= now:
+            self.stats["loads"] += 1
+            await asyncio.sleep(self.load_time)
+            load_ns = int(self.load_time * 1e9)
+        self.resident[model] = time.monotonic() + keep_alive
+        return load_ns
+
+    async def _generate(self, request):
+        body = await request.json()
+        model = body.get("model", "").split(":")[0]
+        if model not in self.models:
+            return web.json_response({"error": f"model '{model}' not found"}, status=404)
+
+        keep_alive = parse_keep_alive(body.get("keep_alive"), self.default_keep_alive)
+        load_ns = await self._ensure_loaded(model, keep_alive)
+
+        prompt = body.get("prompt")
+        if prompt is None and "messages" in body:
+            prompt = body["messages"][-1]["content"]
+        if not prompt:
+            # Empty request only loads the model
+            return web.json_response({"model": model, "done": True, "load_duration": load_ns})
+
+        self.stats["generations"] += 1
+        await asyncio.sleep(self.gen_time)
+        text = f"echo: {prompt}"
+        result = {
+            "model": model,
+            "done": True,
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": len(text.split()),
+            "load_duration": load_ns,
+            "eval_duration": int(self.gen_time * 1e9)
+        }
+        if "messages" in body:
+            result["message"] = {"role": "assistant", "content": text}
+        else:
+            result["response"] = text
+        return web.json_response(result)
+
+    async def start(self, port: int = 0) -> str:
+        """Start serving on localhost; returns the base URL"""
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(port: int):
+    server = FakeOllama()
+    url = await server.start(port)
+    print(f"Fake Ollama listening on {url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--port", type=int, default=11500)
+    asyncio.run(_serve(parser.parse_args().port))
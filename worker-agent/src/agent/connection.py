@@ -8,6 +8,9 @@ import httpx
 import websockets
 import structlog
 
+from config import get_outbox_path
+from .http_pool import BackendHTTPPool
+from .outbox import Outbox
 from .websocket_client import WebSocketClient
 
 logger = structlog.get_logger()
@@ -24,6 +27,8 @@ class ConnectionManager:
         """
         self.backend_url = config["backend_url"]
         self.api_key = config.get("api_key", "")
+        # Shared pooled client for all backend HTTP traffic
+        self.http_pool = BackendHTTPPool(config)
         self.client: Optional[httpx.AsyncClient] = None
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self.ws_url = self.backend_url.replace("http://", "ws://").replace("https://", "wss://")
@@ -32,19 +37,15 @@ class ConnectionManager:
         # WebSocket client instance
         self.ws_client: Optional[WebSocketClient] = None
 
+        # Durable outbox for WebSocket results/progress (opened on first connect)
+        self.use_outbox = config.get("use_outbox", True)
+        self.outbox_path = config.get("outbox_path") or str(get_outbox_path())
+        self.outbox: Optional[Outbox] = None
+
     async def connect(self):
         """Initialize HTTP client with API key authentication"""
         if self.client is None:
-            headers = {
-                "User-Agent": "MultiAgent-Worker/1.0",
-                "X-Worker-API-Key": self.api_key,
-            }
-            self.client = httpx.AsyncClient(
-                base_url=self.backend_url,
-                timeout=30.0,
-                headers=headers
-            )
-            logger.info("HTTP client initialized", backend_url=self.backend_url)
+            self.client = self.http_pool.client
 
     async def close(self):
         """Close HTTP and WebSocket connections"""
@@ -54,11 +55,15 @@ class ConnectionManager:
             self.ws_client = None
             logger.info("WebSocket client closed")
 
+        # Close outbox (pending messages stay on disk for the next run)
+        if self.outbox:
+            self.outbox.close()
+            self.outbox = None
+
         # Close HTTP client
         if self.client:
-            await self.client.aclose()
+            await self.http_pool.close()
             self.client = None
-            logger.info("HTTP client closed")
 
         # Close legacy WebSocket (if any)
         if self.ws:
@@ -120,7 +125,8 @@ class ConnectionManager:
         self,
         worker_id: UUID,
         resources: dict,
-        status: str = "online"
+        status: str = "online",
+        tools: Optional[List[str]] = None
     ) -> dict:
         """Send heartbeat to backend
 
@@ -131,6 +137,7 @@ class ConnectionManager:
                 - memory_percent: Memory usage percentage
                 - disk_percent: Disk usage percentage
             status: Worker status (online, busy, idle)
+            tools: Tools that can currently take tasks (omitted if None)
 
         Returns:
             Backend response dictionary
@@ -141,14 +148,18 @@ class ConnectionManager:
         if not self.client:
             await self.connect()
 
+        payload = {
+            "status": status,
+            "cpu_percent": resources.get("cpu_percent"),
+            "memory_percent": resources.get("memory_percent"),
+            "disk_percent": resources.get("disk_percent"),
+        }
+        if tools is not None:
+            payload["tools"] = tools
+
         response = await self.client.post(
             f"/api/v1/workers/{worker_id}/heartbeat",
-            json={
-                "status": status,
-                "cpu_percent": resources.get("cpu_percent"),
-                "memory_percent": resources.get("memory_percent"),
-                "disk_percent": resources.get("disk_percent"),
-            }
+            json=payload
         )
         response.raise_for_status()
         return response.json()
@@ -208,6 +219,16 @@ class ConnectionManager:
             This method will run indefinitely with automatic reconnection.
             Call disconnect_websocket() to stop the connection.
         """
+        if self.use_outbox and self.outbox is None:
+            try:
+                self.outbox = Outbox(self.outbox_path)
+            except Exception as e:
+                logger.error(
+                    "Failed to open outbox, results will only be queued in memory",
+                    path=self.outbox_path,
+                    error=str(e)
+                )
+
         # Create WebSocket client if not already created
         if self.ws_client is None:
             self.ws_client = WebSocketClient(
@@ -216,7 +237,8 @@ class ConnectionManager:
                 message_handler=message_handler,
                 on_connect=on_connect,
                 on_disconnect=on_disconnect,
-                api_key=self.api_key
+                api_key=self.api_key,
+                outbox=self.outbox
             )
 
         # Connect (this will run indefinitely with auto-reconnect)
@@ -349,7 +371,7 @@ class ConnectionManager:
 
             # Map backend field names to worker-agent expected format
             # Backend sends: task_id, description, tool_preference, priority, workflow_id, metadata
-            # Worker expects: subtask_id, description, assigned_tool, context
+            # Worker expects: subtask_id, description, assigned_tool, context, trace
             task_data = {
                 "subtask_id": str(backend_data.get("task_id")),
                 "description": backend_data.get("description"),
@@ -357,6 +379,7 @@ class ConnectionManager:
                 "context": backend_data.get("metadata") or {},
                 "priority": backend_data.get("priority"),
                 "workflow_id": str(backend_data.get("workflow_id")) if backend_data.get("workflow_id") else None,
+                "trace": (backend_data.get("metadata") or {}).get("trace"),
             }
 
             logger.info(
@@ -395,6 +418,8 @@ class ConnectionManager:
                 - error: Optional[str] - Error message if failed
                 - metadata: dict - Execution metadata
                 - execution_time: float - Execution time in seconds (optional)
+                - execution_time_ms: int - Measured execution time (optional,
+                  feeds the backend's latency model)
 
         Returns:
             Backend response dictionary
@@ -422,7 +447,8 @@ class ConnectionManager:
                     "output": result.get("output"),
                     "metadata": result.get("metadata", {}),
                     "execution_time": result.get("execution_time", 0.0)
-                }
+                },
+                "execution_time_ms": result.get("execution_time_ms")
             }
             response = await self.client.post(
                 f"/api/v1/workers/{worker_id}/task-complete",
@@ -444,6 +470,48 @@ class ConnectionManager:
         logger.info("Task result uploaded successfully", task_id=str(subtask_id))
         return response.json()
 
+    async def report_task_started(self, worker_id: UUID, subtask_id: UUID) -> bool:
+        """Claim an assigned task before executing it
+
+        The first progress report moves the task from assigned to running
+        with a compare-and-swap, so the backend can no longer steal it for
+        another worker. A 409 means the task was moved elsewhere first.
+
+        Args:
+            worker_id: Worker UUID
+            subtask_id: Task/Subtask UUID
+
+        Returns:
+            False if the task was reassigned and must not be executed, True
+            otherwise (including when the backend is unreachable)
+        """
+        if not self.client:
+            await self.connect()
+
+        try:
+            response = await self.client.post(
+                f"/api/v1/workers/{worker_id}/tasks/{subtask_id}/progress",
+                json={"progress": 0, "message": "started"},
+                timeout=10.0
+            )
+            if response.status_code == 409:
+                logger.warning(
+                    "Task was reassigned before it started",
+                    worker_id=str(worker_id),
+                    subtask_id=str(subtask_id)
+                )
+                return False
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            # Without a claim the task may be stolen, but dropping it would lose it
+            logger.warning(
+                "Failed to report task start",
+                subtask_id=str(subtask_id),
+                error=str(e)
+            )
+            return True
+
     async def stream_execution_log(
         self,
         subtask_id: UUID,
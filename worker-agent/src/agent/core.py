@@ -3,6 +3,7 @@
 import asyncio
 import signal
 import sys
+import time
 from typing import Dict, Optional
 from uuid import UUID
 
@@ -10,6 +11,9 @@ import structlog
 
 from config import load_or_create_machine_id
 from tools.base import BaseTool
+from tools.health_monitor import ToolHealthMonitor
+from utils.circuit_breaker import get_circuit_breakers
+from utils.tracing import configure_tracing, shutdown_tracing, start_span, task_trace_context
 from .connection import ConnectionManager
 from .executor import TaskExecutor
 from .monitor import ResourceMonitor
@@ -24,6 +28,7 @@ class WorkerAgent:
     - Connection to backend
     - Task execution
     - Resource monitoring
+    - Tool health monitoring (circuit breakers)
     - Heartbeat loop
     - Graceful shutdown handling
     """
@@ -41,10 +46,22 @@ class WorkerAgent:
         self.worker_id: Optional[UUID] = None
         self.machine_id = load_or_create_machine_id()
 
+        # Tool circuit breakers, shared by the executor and the health monitor
+        health_config = config.get("health_monitor", {})
+        self.circuit_breakers = get_circuit_breakers()
+        self.circuit_breakers.configure(
+            failure_threshold=health_config.get("failure_threshold", 3),
+            reset_timeout=health_config.get("reset_timeout", 30.0)
+        )
+
+        # Spans continue the backend's trace of each task (config section tracing)
+        configure_tracing(config.get("tracing", {}))
+
         # Initialize components
         self.connection_manager = ConnectionManager(config)
-        self.task_executor = TaskExecutor()
+        self.task_executor = TaskExecutor(circuit_breakers=self.circuit_breakers)
         self.resource_monitor = ResourceMonitor()
+        self.health_monitor: Optional[ToolHealthMonitor] = None
 
         # State
         self.running = False
@@ -53,6 +70,7 @@ class WorkerAgent:
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.ws_task: Optional[asyncio.Task] = None
         self.polling_task: Optional[asyncio.Task] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
         self._shutdown_event: Optional[asyncio.Event] = None
         self.use_websocket = config.get("use_websocket", True)
         self.use_polling = config.get("use_polling_fallback", True)
@@ -102,6 +120,11 @@ class WorkerAgent:
 
             self.running = True
 
+            # Pre-spawn tool sessions in the background so startup is not delayed
+            self._prewarm_task = asyncio.create_task(self.task_executor.prewarm_tools())
+
+            await self._start_health_monitor()
+
             # Step 2: Start heartbeat loop
             self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
@@ -188,6 +211,9 @@ class WorkerAgent:
                 logger.error("Failed to unregister worker", error=str(e))
 
         # Step 4: Cancel background tasks
+        if self.health_monitor:
+            await self.health_monitor.stop()
+
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
             try:
@@ -209,15 +235,58 @@ class WorkerAgent:
             except asyncio.CancelledError:
                 pass
 
-        # Step 5: Close connections
+        if self._prewarm_task and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
+            try:
+                await self._prewarm_task
+            except asyncio.CancelledError:
+                pass
+
+        # Step 5: Close tools and connections
+        try:
+            await self.task_executor.close_tools()
+        except Exception as e:
+            logger.error("Failed to close tools", error=str(e))
+
         await self.connection_manager.close()
 
+        shutdown_tracing()
+
         # Signal shutdown complete
         if self._shutdown_event:
             self._shutdown_event.set()
 
         logger.info("Worker Agent stopped gracefully")
 
+    async def _start_health_monitor(self):
+        """Start background tool health probes (config section health_monitor)"""
+        health_config = self.config.get("health_monitor", {})
+        if not health_config.get("enabled", True):
+            return
+
+        ollama_config = self.config.get("ollama", {})
+        probe_config = {
+            "claude_code": {"cli_path": self.config.get("claude", {}).get("cli_path", "claude")},
+            "gemini": self.config.get("gemini", {}),
+            "ollama": {
+                "url": ollama_config.get("base_url", "http://localhost:11434"),
+                "model": ollama_config.get("model"),
+            },
+        }
+
+        self.health_monitor = ToolHealthMonitor(
+            tools=self.task_executor.get_available_tools(),
+            config=probe_config,
+            circuit_breakers=self.circuit_breakers,
+            healthy_interval=health_config.get("healthy_interval", ToolHealthMonitor.DEFAULT_HEALTHY_INTERVAL),
+            degraded_interval=health_config.get("degraded_interval", ToolHealthMonitor.DEFAULT_DEGRADED_INTERVAL)
+        )
+        try:
+            await self.health_monitor.start()
+        except Exception as e:
+            logger.error("Failed to start tool health monitor", error=str(e))
+            self.health_monitor = None
+
     async def _wait_for_task_completion(self):
         """Wait for the current task to complete"""
         while self.task_executor.is_busy:
@@ -289,11 +358,12 @@ class WorkerAgent:
                 else:
                     status = "idle"
 
-                # Send heartbeat
+                # Send heartbeat, advertising only tools whose circuit is closed
                 await self.connection_manager.send_heartbeat(
                     worker_id=self.worker_id,
                     resources=resources,
-                    status=status
+                    status=status,
+                    tools=self.task_executor.get_healthy_tools()
                 )
 
                 logger.debug(
@@ -429,12 +499,19 @@ class WorkerAgent:
                 })
                 return
             # Task assigned to this worker
-            await self._handle_task_assignment(message.get("data"))
+            task_data = message.get("data")
+            if message.get("trace"):
+                task_data = {**task_data, "trace": message["trace"]}
+            await self._handle_task_assignment(task_data)
 
         elif msg_type == "task_cancel":
             # Task cancellation request
             await self._handle_task_cancel(message.get("data"))
 
+        elif msg_type == "model_prewarm":
+            # Backend hint about models needed by tasks queued for this worker
+            self._handle_model_prewarm(message.get("data") or {})
+
         elif msg_type == "ping":
             # Ping/pong for keep-alive
             await self.connection_manager.send_websocket_message({
@@ -445,6 +522,25 @@ class WorkerAgent:
         else:
             logger.warning("Unknown message type", type=msg_type)
 
+    def _handle_model_prewarm(self, prewarm_data: dict):
+        """Start loading models for upcoming tasks in the background
+
+        Args:
+            prewarm_data: Data containing:
+                - tool: Tool name (default: "ollama")
+                - models: Model names to load
+        """
+        tool_name = prewarm_data.get("tool", "ollama")
+        models = prewarm_data.get("models") or []
+        tool = self.task_executor.tools.get(tool_name)
+
+        if tool is None or not hasattr(tool, "schedule_prewarm"):
+            logger.debug("Ignoring model prewarm hint", tool=tool_name)
+            return
+
+        logger.info("Prewarming models", tool=tool_name, models=models)
+        tool.schedule_prewarm(models)
+
     async def _handle_task_assignment(self, task_data: dict):
         """Handle task assignment
 
@@ -474,83 +570,146 @@ class WorkerAgent:
 
         self.task_executor.set_log_callback(log_stream_callback)
 
-        try:
-            # Step 1: Update worker status to "busy"
-            await self.connection_manager.update_worker_status(
-                worker_id=self.worker_id,
-                status="busy",
-                current_task=UUID(subtask_id) if subtask_id else None
-            )
+        with start_span(
+            "worker.task",
+            {"task.id": subtask_id, "tool.name": task_data.get("assigned_tool")},
+            carrier=task_trace_context(task_data)
+        ):
+            try:
+                # Step 1: Update worker status to "busy"
+                await self.connection_manager.update_worker_status(
+                    worker_id=self.worker_id,
+                    status="busy",
+                    current_task=UUID(subtask_id) if subtask_id else None
+                )
 
-            # Step 2: Stream initial log
-            await self.connection_manager.stream_execution_log(
-                subtask_id=UUID(subtask_id),
-                log_line=f"Worker received task assignment: {task_data.get('description', '')[:100]}",
-                log_level="info"
-            )
+                # Step 2: Claim the task (assigned -> running) so it cannot be
+                # stolen while it executes here
+                if not await self.connection_manager.report_task_started(
+                    worker_id=self.worker_id,
+                    subtask_id=UUID(subtask_id)
+                ):
+                    logger.info("Abandoning reassigned task", subtask_id=subtask_id)
+                    return
 
-            # Step 3: Execute task (logs will be streamed via callback)
-            result = await self.task_executor.execute_task(task_data)
+                # Step 3: Stream initial log
+                await self.connection_manager.stream_execution_log(
+                    subtask_id=UUID(subtask_id),
+                    log_line=f"Worker received task assignment: {task_data.get('description', '')[:100]}",
+                    log_level="info"
+                )
 
-            # Step 4: Stream completion log
-            await self.connection_manager.stream_execution_log(
-                subtask_id=UUID(subtask_id),
-                log_line=f"Task execution {'completed successfully' if result.get('success') else 'failed'}",
-                log_level="info" if result.get("success") else "error"
-            )
+                # Step 4: Execute task (logs will be streamed via callback)
+                started = time.monotonic()
+                result = await self.task_executor.execute_task(task_data)
+                result.setdefault("execution_time_ms", int((time.monotonic() - started) * 1000))
 
-            # Step 5: Upload result to backend using new endpoint
-            await self.connection_manager.upload_subtask_result(
-                worker_id=self.worker_id,
-                subtask_id=UUID(subtask_id),
-                result=result
-            )
+                # Step 5: Stream completion log
+                await self.connection_manager.stream_execution_log(
+                    subtask_id=UUID(subtask_id),
+                    log_line=f"Task execution {'completed successfully' if result.get('success') else 'failed'}",
+                    log_level="info" if result.get("success") else "error"
+                )
 
-            logger.info(
-                "Task result uploaded",
-                subtask_id=subtask_id,
-                success=result.get("success")
-            )
+                # Step 6: Upload result to backend using new endpoint
+                await self._upload_result(subtask_id, result)
 
-        except Exception as e:
-            logger.error("Task handling error", subtask_id=subtask_id, error=str(e))
+                logger.info(
+                    "Task result uploaded",
+                    subtask_id=subtask_id,
+                    success=result.get("success")
+                )
 
-            # Stream error log
-            await self.connection_manager.stream_execution_log(
-                subtask_id=UUID(subtask_id),
-                log_line=f"Task handling error: {str(e)}",
-                log_level="error"
-            )
+            except Exception as e:
+                logger.error("Task handling error", subtask_id=subtask_id, error=str(e))
 
-            # Report error using new endpoint
-            try:
+                # Stream error log
+                await self.connection_manager.stream_execution_log(
+                    subtask_id=UUID(subtask_id),
+                    log_line=f"Task handling error: {str(e)}",
+                    log_level="error"
+                )
+
+                # Report error using new endpoint
+                try:
+                    await self.connection_manager.upload_subtask_result(
+                        worker_id=self.worker_id,
+                        subtask_id=UUID(subtask_id),
+                        result={
+                            "success": False,
+                            "output": None,
+                            "error": f"Task handling error: {str(e)}",
+                            "metadata": {}
+                        }
+                    )
+                except Exception as upload_error:
+                    logger.error(
+                        "Failed to upload error result",
+                        subtask_id=subtask_id,
+                        error=str(upload_error)
+                    )
+
+            finally:
+                # Step 7: Update worker status back to "online"
+                await self.connection_manager.update_worker_status(
+                    worker_id=self.worker_id,
+                    status="online",
+                    current_task=None
+                )
+
+                # Clear log callback
+                self.task_executor.set_log_callback(None)
+
+    async def _upload_result(self, subtask_id: str, result: dict):
+        """Upload a task result, falling back to the durable outbox
+
+        If the HTTP upload fails and a WebSocket outbox is available, the
+        result is handed to the outbox instead of being discarded, so it is
+        delivered after reconnect (or after a restart) without re-running
+        the task.
+
+        Args:
+            subtask_id: Subtask UUID string
+            result: Task result dictionary
+        """
+        try:
+            with start_span("worker.upload_result", {"task.id": subtask_id}):
                 await self.connection_manager.upload_subtask_result(
                     worker_id=self.worker_id,
                     subtask_id=UUID(subtask_id),
-                    result={
-                        "success": False,
-                        "output": None,
-                        "error": f"Task handling error: {str(e)}",
-                        "metadata": {}
-                    }
-                )
-            except Exception as upload_error:
-                logger.error(
-                    "Failed to upload error result",
-                    subtask_id=subtask_id,
-                    error=str(upload_error)
+                    result=result
                 )
+        except Exception as e:
+            if self.connection_manager.outbox is None:
+                raise
 
-        finally:
-            # Step 6: Update worker status back to "online"
-            await self.connection_manager.update_worker_status(
-                worker_id=self.worker_id,
-                status="online",
-                current_task=None
+            logger.warning(
+                "Result upload failed, storing result in outbox",
+                subtask_id=subtask_id,
+                error=str(e)
             )
-
-            # Clear log callback
-            self.task_executor.set_log_callback(None)
+            if result.get("success"):
+                message = {
+                    "type": "task_result",
+                    "data": {
+                        "task_id": subtask_id,
+                        "result": {
+                            "output": result.get("output"),
+                            "metadata": result.get("metadata", {}),
+                            "execution_time": result.get("execution_time", 0.0)
+                        },
+                        "execution_time_ms": result.get("execution_time_ms")
+                    }
+                }
+            else:
+                message = {
+                    "type": "task_failed",
+                    "data": {
+                        "task_id": subtask_id,
+                        "error": result.get("error", "Unknown error")
+                    }
+                }
+            await self.connection_manager.send_websocket_message(message)
 
     async def _handle_task_cancel(self, cancel_data: dict):
         """Handle task cancellation request from backend
@@ -632,6 +791,7 @@ class WorkerAgent:
             "polling_enabled": self.use_polling,
             "polling_interval": self.polling_interval,
             "executor_status": self.task_executor.get_status(),
+            "tool_health": self.health_monitor.get_status() if self.health_monitor else {},
             "resources": self.resource_monitor.get_resources()
         }
 
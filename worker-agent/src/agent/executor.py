@@ -8,6 +8,8 @@ from uuid import UUID
 import structlog
 
 from tools.base import BaseTool
+from utils.circuit_breaker import CircuitBreakerRegistry, get_circuit_breakers
+from utils.tracing import start_span
 from .result_reporter import ResultReporter
 
 logger = structlog.get_logger()
@@ -26,12 +28,21 @@ class TaskExecutor:
         is_cancelled: Whether current task has been cancelled
         result_reporter: Optional ResultReporter for automatic result submission
         worker_id: Worker ID for result reporting (required if result_reporter is set)
+        circuit_breakers: Per-tool circuit breakers; tasks for a tool whose
+            circuit is open fail fast without invoking the tool
     """
 
+    # Maximum buffered tool output lines awaiting the log callback
+    OUTPUT_QUEUE_SIZE = 1000
+
+    # Seconds to wait for buffered output to flush after a task finishes
+    OUTPUT_FLUSH_TIMEOUT = 5.0
+
     def __init__(
         self,
         result_reporter: Optional[ResultReporter] = None,
-        worker_id: Optional[str] = None
+        worker_id: Optional[str] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None
     ):
         """Initialize task executor
 
@@ -39,6 +50,7 @@ class TaskExecutor:
             result_reporter: Optional ResultReporter instance for automatic
                 result submission to backend
             worker_id: Worker ID (required if result_reporter is provided)
+            circuit_breakers: Breaker registry (default: process-wide registry)
         """
         self.tools: Dict[str, BaseTool] = {}
         self.current_task: Optional[UUID] = None
@@ -48,10 +60,16 @@ class TaskExecutor:
         self._execution_task: Optional[asyncio.Task] = None
         self.log_callback: Optional[Callable[[str, str], None]] = None
 
+        # Incremental tool output forwarding (active only during execution)
+        self._output_queue: Optional[asyncio.Queue] = None
+        self._dropped_output_lines = 0
+
         # Result reporting integration
         self.result_reporter: Optional[ResultReporter] = result_reporter
         self.worker_id: Optional[str] = worker_id
 
+        self.circuit_breakers = circuit_breakers or get_circuit_breakers()
+
         if result_reporter and not worker_id:
             logger.warning(
                 "ResultReporter provided without worker_id - automatic result reporting disabled"
@@ -85,6 +103,14 @@ class TaskExecutor:
         """
         return list(self.tools.keys())
 
+    def get_healthy_tools(self) -> list[str]:
+        """Get registered tools whose circuit breaker is not open
+
+        Returns:
+            List of tool names that can currently take tasks
+        """
+        return [name for name in self.tools if not self.circuit_breakers.get(name).is_open]
+
     def has_tool(self, tool_name: str) -> bool:
         """Check if tool is registered
 
@@ -191,6 +217,56 @@ class TaskExecutor:
             except Exception as e:
                 logger.debug(f"Failed to stream log: {e}")
 
+    def _forward_tool_output(self, line: str, stream_name: str):
+        """Queue one line of tool output for streaming to the backend
+
+        Lines are handed to a background drain task so a slow log endpoint
+        never stalls the tool's output pipe. When the queue is full, lines
+        are dropped and counted instead.
+
+        Args:
+            line: Output line
+            stream_name: Source stream ("stdout" or "stderr")
+        """
+        if not line or self._output_queue is None:
+            return
+        level = "warning" if stream_name == "stderr" else "info"
+        try:
+            self._output_queue.put_nowait((line, level))
+        except asyncio.QueueFull:
+            self._dropped_output_lines += 1
+
+    async def _drain_tool_output(self):
+        """Send queued tool output lines to the log callback"""
+        while True:
+            line, level = await self._output_queue.get()
+            try:
+                if asyncio.iscoroutinefunction(self.log_callback):
+                    await self.log_callback(line, level)
+                elif self.log_callback:
+                    self.log_callback(line, level)
+            except Exception as e:
+                logger.debug(f"Failed to stream tool output: {e}")
+            finally:
+                self._output_queue.task_done()
+
+    async def _stop_output_forwarding(self, drain_task: asyncio.Task):
+        """Flush remaining output lines (briefly) and stop the drain task"""
+        try:
+            await asyncio.wait_for(self._output_queue.join(), timeout=self.OUTPUT_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        drain_task.cancel()
+        try:
+            await drain_task
+        except asyncio.CancelledError:
+            pass
+
+        if self._dropped_output_lines:
+            logger.warning("Tool output lines dropped", count=self._dropped_output_lines)
+        self._output_queue = None
+        self._dropped_output_lines = 0
+
     async def execute_task(self, subtask: dict) -> dict:
         """Execute a subtask using the assigned tool
 
@@ -200,6 +276,7 @@ class TaskExecutor:
                 - description: Task description
                 - assigned_tool: Name of tool to use
                 - context: Optional context data
+                - priority: Optional task priority (passed to tools that schedule requests)
 
         Returns:
             Result dictionary containing:
@@ -212,6 +289,8 @@ class TaskExecutor:
         tool_name = subtask.get("assigned_tool")
         description = subtask.get("description")
         context = subtask.get("context", {})
+        if subtask.get("priority") is not None:
+            context = {"priority": subtask["priority"], **(context or {})}
 
         # Reset cancellation state for new task
         self.reset_cancellation()
@@ -242,13 +321,30 @@ class TaskExecutor:
                 "metadata": {}
             }
 
+        # Fail fast while the tool is known to be down
+        breaker = self.circuit_breakers.get(tool_name)
+        if not breaker.allow():
+            error_msg = f"Tool '{tool_name}' is unavailable (circuit open)"
+            await self._log(error_msg, level="warning")
+            return {
+                "success": False,
+                "output": None,
+                "error": error_msg,
+                "metadata": {
+                    "circuit_open": True,
+                    "retry_after": round(breaker.retry_after(), 2)
+                }
+            }
+
         # Mark as busy
         self.is_busy = True
         self.current_task = subtask_id
+        output_drain_task: Optional[asyncio.Task] = None
 
         try:
             # Check for cancellation before starting
             if self.is_cancelled:
+                breaker.release()
                 return {
                     "success": False,
                     "output": None,
@@ -264,14 +360,23 @@ class TaskExecutor:
                 level="info"
             )
 
+            # Forward tool output to the backend as it is produced
+            if self.log_callback and isinstance(tool, BaseTool):
+                self._output_queue = asyncio.Queue(maxsize=self.OUTPUT_QUEUE_SIZE)
+                output_drain_task = asyncio.create_task(self._drain_tool_output())
+                tool.set_output_callback(self._forward_tool_output)
+
             # Execute task
-            result = await tool.execute(
-                instructions=description,
-                context=context
-            )
+            with start_span("tool.execute", {"tool.name": tool_name}) as span:
+                result = await tool.execute(
+                    instructions=description,
+                    context=context
+                )
+                span.set_attribute("tool.success", bool(result.get("success")))
 
             # Check for cancellation after execution
             if self.is_cancelled:
+                breaker.release()  # Cancellation says nothing about tool health
                 return {
                     "success": False,
                     "output": result.get("output"),
@@ -284,9 +389,15 @@ class TaskExecutor:
                 level="info" if result.get("success") else "warning"
             )
 
+            if result.get("success"):
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
             return result
 
         except asyncio.CancelledError:
+            breaker.release()  # Cancellation says nothing about tool health
             await self._log("Task execution was cancelled", level="warning")
             return {
                 "success": False,
@@ -296,6 +407,7 @@ class TaskExecutor:
             }
 
         except Exception as e:
+            breaker.record_failure()
             error_msg = f"Execution error: {str(e)}"
             await self._log(error_msg, level="error")
 
@@ -307,6 +419,12 @@ class TaskExecutor:
             }
 
         finally:
+            tool = self.tools.get(tool_name)
+            if isinstance(tool, BaseTool):
+                tool.set_output_callback(None)
+            if output_drain_task is not None:
+                await self._stop_output_forwarding(output_drain_task)
+
             # Mark as not busy
             self.is_busy = False
             self.current_task = None
@@ -446,6 +564,7 @@ class TaskExecutor:
             "is_busy": self.is_busy,
             "current_task": str(self.current_task) if self.current_task else None,
             "available_tools": list(self.tools.keys()),
+            "healthy_tools": self.get_healthy_tools(),
             "tool_count": len(self.tools),
             "is_cancelled": self.is_cancelled,
             "result_reporter_configured": self.result_reporter is not None,
@@ -499,3 +618,21 @@ class TaskExecutor:
         """Reset cancellation state for new task"""
         self.is_cancelled = False
         self._cancel_event.clear()
+
+    async def prewarm_tools(self):
+        """Let registered tools prepare resources before the first task"""
+        for tool_name, tool in self.tools.items():
+            if hasattr(tool, 'prewarm'):
+                try:
+                    await tool.prewarm()
+                except Exception as e:
+                    logger.warning("Failed to prewarm tool", tool=tool_name, error=str(e))
+
+    async def close_tools(self):
+        """Release resources held by registered tools"""
+        for tool_name, tool in self.tools.items():
+            if hasattr(tool, 'close'):
+                try:
+                    await tool.close()
+                except Exception as e:
+                    logger.warning("Failed to close tool", tool=tool_name, error=str(e))
@@ -0,0 +1,182 @@
+"""Shared HTTP connection pool for worker-to-backend traffic
+
+Heartbeats, task polls, results and log lines all go through one
+httpx.AsyncClient so they share a small number of warm keep-alive
+connections instead of each component opening its own.
+
+- HTTP/2 (multiplexed streams on one connection) when the h2 package is
+  installed and the backend negotiates it via TLS ALPN; HTTP/1.1 keep-alive
+  otherwise
+- Bounded pool (max_connections / max_keepalive_connections)
+- Connection failures are retried by the transport before a request fails
+- A "backend" circuit breaker: after consecutive transport errors or 5xx
+  gateway responses, requests fail immediately with httpx.ConnectError
+  (which callers already treat as a transient connection error) until the
+  reset timeout elapses
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+import structlog
+
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, get_circuit_breakers
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Responses that mean the backend (or its proxy) is down rather than the request being bad
+BACKEND_UNAVAILABLE_STATUSES = {502, 503, 504}
+
+BACKEND_CIRCUIT = "backend"
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that fails fast while the backend circuit is open"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        """Initialize transport
+
+        Args:
+            transport: Transport that performs the requests
+            breaker: Circuit breaker for the backend
+        """
+        self._transport = transport
+        self._breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._breaker.allow():
+            raise httpx.ConnectError(
+                f"Backend circuit open (retry in {self._breaker.retry_after():.1f}s)",
+                request=request
+            )
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            self._breaker.release()
+            raise
+
+        if response.status_code in BACKEND_UNAVAILABLE_STATUSES:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class BackendHTTPPool:
+    """Lazily created, shared AsyncClient for the backend API
+
+    Example:
+        pool = BackendHTTPPool(config)
+        client = pool.client
+        response = await client.post("/api/v1/workers/register", json=payload)
+        await pool.close()
+    """
+
+    DEFAULTS: Dict[str, Any] = {
+        "http2": True,
+        "max_connections": 10,
+        # Equal to max_connections so bursts do not churn sockets
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 60.0,
+        "connect_retries": 2,
+        "timeout": 30.0,
+        "connect_timeout": 5.0,
+    }
+
+    def __init__(
+        self,
+        config: dict,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None
+    ):
+        """Initialize pool
+
+        Args:
+            config: Agent configuration (backend_url, api_key and an optional
+                http_pool section overriding DEFAULTS)
+            circuit_breakers: Breaker registry (default: process-wide registry)
+        """
+        self.backend_url = config["backend_url"].rstrip("/")
+        self.api_key = config.get("api_key", "")
+        self.settings = {**self.DEFAULTS, **config.get("http_pool", {})}
+        self.breaker = (circuit_breakers or get_circuit_breakers()).get(BACKEND_CIRCUIT)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http2(self) -> bool:
+        """Whether HTTP/2 is enabled (requested and h2 installed)"""
+        return bool(self.settings["http2"]) and HTTP2_AVAILABLE
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created on first use"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        if settings["http2"] and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+
+        limits = httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"]
+        )
+        transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=limits,
+            retries=settings["connect_retries"]
+        )
+        client = httpx.AsyncClient(
+            base_url=self.backend_url,
+            headers={
+                "User-Agent": "MultiAgent-Worker/1.0",
+                "X-Worker-API-Key": self.api_key,
+            },
+            timeout=httpx.Timeout(settings["timeout"], connect=settings["connect_timeout"]),
+            transport=CircuitBreakerTransport(transport, self.breaker)
+        )
+        logger.info(
+            "Backend HTTP pool initialized",
+            backend_url=self.backend_url,
+            http2=self.http2,
+            max_connections=settings["max_connections"]
+        )
+        return client
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the client has been created and not closed"""
+        return self._client is not None and not self._client.is_closed
+
+    async def close(self):
+        """Close the shared client and its connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Backend HTTP pool closed")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool settings and backend circuit state"""
+        return {
+            "backend_url": self.backend_url,
+            "http2": self.http2,
+            "max_connections": self.settings["max_connections"],
+            "max_keepalive_connections": self.settings["max_keepalive_connections"],
+            "open": self.is_open,
+            "circuit": self.breaker.get_status(),
+        }
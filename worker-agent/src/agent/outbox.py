@@ -0,0 +1,143 @@
+"""Durable outbox for outgoing WebSocket messages
+
+Messages that must survive a worker crash (task results, progress updates)
+are appended to a small SQLite database before they are sent. Each entry gets
+a monotonically increasing sequence number; entries are removed only once the
+backend acknowledges them, so a restarted worker replays whatever was still
+in flight instead of re-running the task that produced it.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class Outbox:
+    """Append-only, SQLite-backed message outbox
+
+    Features:
+    - Sequence numbers assigned on append (stable across restarts)
+    - Cumulative acknowledgement: ``ack(seq)`` drops everything up to ``seq``
+    - A per-database stream id so the backend can deduplicate by
+      (stream, seq) even if the outbox file is recreated
+    - Messages are serialized once on append and replayed verbatim
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """Initialize outbox
+
+        Args:
+            path: Database file path (``":memory:"`` for a non-durable outbox)
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            self.path = str(Path(self.path).expanduser())
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # autocommit; each append is its own transaction
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " message_type TEXT,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'stream_id'").fetchone()
+        if row:
+            self.stream_id = row[0]
+        else:
+            self.stream_id = str(uuid.uuid4())
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('stream_id', ?)",
+                (self.stream_id,)
+            )
+
+        logger.info(
+            "Outbox opened",
+            path=self.path,
+            stream_id=self.stream_id,
+            pending=self.pending_count()
+        )
+
+    def append(self, message: dict) -> Tuple[int, str]:
+        """Persist a message and assign it a sequence number
+
+        The stored payload is the message with ``seq`` and ``stream`` fields
+        added, serialized once so replays do not re-encode it.
+
+        Args:
+            message: Message dictionary
+
+        Returns:
+            Tuple of (sequence number, serialized payload)
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (message_type, payload, created_at) VALUES (?, '', ?)",
+                (message.get("type"), time.time())
+            )
+            seq = cursor.lastrowid
+            payload = json.dumps({**message, "seq": seq, "stream": self.stream_id})
+            self._conn.execute("UPDATE outbox SET payload = ? WHERE seq = ?", (payload, seq))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return seq, payload
+
+    def pending(self, after_seq: int = 0, limit: int = 100) -> List[Tuple[int, str]]:
+        """Get unacknowledged messages in sequence order
+
+        Args:
+            after_seq: Only return messages with a sequence number above this
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of (sequence number, serialized payload) tuples
+        """
+        return self._conn.execute(
+            "SELECT seq, payload FROM outbox WHERE seq > ? ORDER BY seq LIMIT ?",
+            (after_seq, limit)
+        ).fetchall()
+
+    def ack(self, seq: int) -> int:
+        """Acknowledge all messages up to and including ``seq``
+
+        Args:
+            seq: Highest sequence number confirmed by the backend
+
+        Returns:
+            Number of messages removed
+        """
+        cursor = self._conn.execute("DELETE FROM outbox WHERE seq <= ?", (seq,))
+        if cursor.rowcount:
+            logger.debug("Outbox messages acknowledged", up_to_seq=seq, removed=cursor.rowcount)
+        return cursor.rowcount
+
+    def pending_count(self) -> int:
+        """Get number of unacknowledged messages"""
+        return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -9,6 +9,8 @@ import structlog
 import websockets
 from websockets.exceptions import WebSocketException
 
+from .outbox import Outbox
+
 logger = structlog.get_logger()
 
 
@@ -20,6 +22,9 @@ class WebSocketClient:
     - Heartbeat/ping-pong to keep connection alive
     - Graceful handling of connection failures
     - Message queue for sending during reconnection
+    - Optional durable outbox: result/progress messages are persisted with
+      sequence numbers, replayed in batches after reconnect and dropped
+      only once the backend acknowledges them
     """
 
     # Reconnection backoff configuration
@@ -31,6 +36,12 @@ class WebSocketClient:
     HEARTBEAT_INTERVAL = 30.0  # seconds
     HEARTBEAT_TIMEOUT = 10.0  # seconds
 
+    # Message types that go through the durable outbox (when configured)
+    DURABLE_MESSAGE_TYPES = frozenset({"task_result", "task_failed", "task_progress"})
+
+    # Maximum number of outbox entries sent in a single replay frame
+    REPLAY_BATCH_SIZE = 100
+
     def __init__(
         self,
         ws_url: str,
@@ -38,7 +49,8 @@ class WebSocketClient:
         message_handler: Callable[[dict], Any],
         on_connect: Optional[Callable[[], Any]] = None,
         on_disconnect: Optional[Callable[[], Any]] = None,
-        api_key: str = ""
+        api_key: str = "",
+        outbox: Optional[Outbox] = None
     ):
         """Initialize WebSocket client
 
@@ -49,6 +61,7 @@ class WebSocketClient:
             on_connect: Optional callback when connection established
             on_disconnect: Optional callback when connection lost
             api_key: Worker API key for authentication
+            outbox: Optional durable outbox for result/progress messages
         """
         self.ws_url = ws_url
         self.worker_id = worker_id
@@ -71,6 +84,11 @@ class WebSocketClient:
         # Message queue for sending during disconnection
         self.send_queue: asyncio.Queue = asyncio.Queue()
 
+        # Durable outbox; live sends are held back until replay has caught up
+        # so the backend always sees sequence numbers in order
+        self.outbox = outbox
+        self._outbox_replayed = False
+
         # Connection attempt tracking
         self._connection_attempt = 0
 
@@ -138,7 +156,8 @@ class WebSocketClient:
                     self.receive_task = asyncio.create_task(self._receive_loop())
                     self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
-                    # Process queued messages
+                    # Replay durable outbox, then in-memory queued messages
+                    await self._replay_outbox()
                     await self._process_send_queue()
 
                     # Wait for tasks to complete (connection lost)
@@ -215,7 +234,13 @@ class WebSocketClient:
             message: Message dictionary to send
 
         If not connected, the message will be queued for sending when reconnected.
+        Durable message types are written to the outbox first and stay there
+        until the backend acknowledges their sequence number.
         """
+        if self.outbox is not None and message.get("type") in self.DURABLE_MESSAGE_TYPES:
+            await self._send_durable(message)
+            return
+
         # Check connection state atomically
         async with self._state_lock:
             is_connected = self.connected and self.ws is not None and not self.ws.closed
@@ -240,6 +265,87 @@ class WebSocketClient:
             )
             await self.send_queue.put(message)
 
+    async def _send_durable(self, message: dict):
+        """Persist message to the outbox and send it if the link is caught up
+
+        Args:
+            message: Message dictionary to send
+        """
+        seq, payload = self.outbox.append(message)
+
+        async with self._state_lock:
+            ws_ref = self.ws if self.connected and self._outbox_replayed else None
+
+        if ws_ref is None or ws_ref.closed:
+            logger.debug(
+                "Message stored in outbox for replay",
+                message_type=message.get("type"),
+                seq=seq
+            )
+            return
+
+        try:
+            await ws_ref.send(payload)
+            logger.debug("Durable message sent", message_type=message.get("type"), seq=seq)
+        except Exception as e:
+            # Still in the outbox; it will be replayed on the next connection
+            logger.warning("Failed to send durable message", seq=seq, error=str(e))
+
+    async def _replay_outbox(self):
+        """Replay unacknowledged outbox messages in batches
+
+        Each frame carries up to REPLAY_BATCH_SIZE stored payloads joined
+        without re-encoding. The backend deduplicates by (stream, seq), so
+        messages that were delivered but not yet acknowledged are harmless.
+        """
+        if self.outbox is None:
+            return
+
+        last_seq = 0
+        replayed = 0
+        while self.connected and self.ws and not self.ws.closed:
+            batch = self.outbox.pending(after_seq=last_seq, limit=self.REPLAY_BATCH_SIZE)
+            if not batch:
+                # No await between this check and the flag flip, so nothing
+                # appended meanwhile can slip past the replay
+                self._outbox_replayed = True
+                break
+
+            frame = (
+                '{"type": "batch", "stream": ' + json.dumps(self.outbox.stream_id)
+                + ', "messages": [' + ", ".join(payload for _, payload in batch) + ']}'
+            )
+            try:
+                await self.ws.send(frame)
+            except Exception as e:
+                logger.warning("Outbox replay interrupted", error=str(e), last_seq=last_seq)
+                break
+
+            last_seq = batch[-1][0]
+            replayed += len(batch)
+
+        if replayed:
+            logger.info("Outbox messages replayed", count=replayed, last_seq=last_seq)
+
+    def _handle_ack(self, data: dict):
+        """Apply a cumulative acknowledgement from the backend
+
+        Args:
+            data: Ack message containing ``stream`` and ``seq``
+        """
+        if self.outbox is None:
+            return
+
+        ack = data.get("data", {})
+        if ack.get("stream") != self.outbox.stream_id:
+            logger.debug("Ignoring ack for unknown outbox stream", stream=ack.get("stream"))
+            return
+
+        try:
+            self.outbox.ack(int(ack["seq"]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Invalid outbox ack", error=str(e))
+
     async def _receive_loop(self):
         """Receive messages from WebSocket"""
         try:
@@ -248,6 +354,10 @@ class WebSocketClient:
                     data = json.loads(message)
                     logger.debug("Message received", message_type=data.get("type"))
 
+                    if data.get("type") == "ack":
+                        self._handle_ack(data)
+                        continue
+
                     # Handle message with user-provided handler
                     try:
                         if asyncio.iscoroutinefunction(self.message_handler):
@@ -341,6 +451,7 @@ class WebSocketClient:
         async with self._state_lock:
             was_connected = self.connected
             self.connected = False
+            self._outbox_replayed = False
             self.ws = None
 
         # Call on_disconnect callback (outside lock to prevent deadlock)
@@ -375,6 +486,7 @@ class WebSocketClient:
             "running": self.running,
             "reconnect_delay": self.reconnect_delay,
             "queued_messages": self.send_queue.qsize(),
+            "outbox_pending": self.outbox.pending_count() if self.outbox else 0,
             "ws_url": self.ws_url,
             "worker_id": str(self.worker_id)
         }
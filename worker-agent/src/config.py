@@ -130,6 +130,15 @@ def get_machine_id_path() -> Path:
     return Path.home() / ".multi_agent_worker_id"
 
 
+def get_outbox_path() -> Path:
+    """Get default path to the durable WebSocket outbox
+
+    Returns:
+        Path to outbox database in home directory
+    """
+    return Path.home() / ".multi_agent_worker_outbox.db"
+
+
 def load_or_create_machine_id() -> str:
     """Load existing machine ID or create a new one
 
@@ -5,6 +5,7 @@ from .claude_code import ClaudeCodeTool
 from .gemini_cli import GeminiCLI
 from .ollama import OllamaTool
 from .health_checker import ToolHealthChecker, HealthStatus, quick_health_check
+from .health_monitor import ToolHealthMonitor
 
 __all__ = [
     "BaseTool",
@@ -13,5 +14,6 @@ __all__ = [
     "OllamaTool",
     "ToolHealthChecker",
     "HealthStatus",
-    "quick_health_check"
+    "quick_health_check",
+    "ToolHealthMonitor"
 ]
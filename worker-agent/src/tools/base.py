@@ -1,7 +1,8 @@
 """Base tool interface for AI tool integration"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 
 class BaseTool(ABC):
@@ -18,6 +19,29 @@ class BaseTool(ABC):
         """
         self.config = config
         self.name = self.__class__.__name__
+        self.output_callback: Optional[Callable[[str, str], Any]] = None
+
+    def set_output_callback(self, callback: Optional[Callable[[str, str], Any]]):
+        """Set callback for incremental tool output
+
+        Args:
+            callback: Sync or async function taking (line, stream_name),
+                or None to stop forwarding
+        """
+        self.output_callback = callback
+
+    async def _emit_output(self, line: str, stream_name: str = "stdout"):
+        """Forward one line of output to the output callback, if set
+
+        Args:
+            line: Output line
+            stream_name: Source stream ("stdout" or "stderr")
+        """
+        if self.output_callback is None:
+            return
+        result = self.output_callback(line, stream_name)
+        if asyncio.iscoroutine(result):
+            await result
 
     @abstractmethod
     async def execute(
@@ -128,3 +152,17 @@ class BaseTool(ABC):
         # Default implementation - no-op
         # Tools should override this for proper cancellation support
         return True
+
+    async def prewarm(self):
+        """Prepare resources ahead of the first task
+
+        Override this method to pre-spawn processes, open connections, etc.
+        """
+        pass
+
+    async def close(self):
+        """Release resources held by the tool
+
+        Override this method to terminate pooled processes, close sessions, etc.
+        """
+        pass
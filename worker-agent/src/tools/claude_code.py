@@ -9,6 +9,13 @@ from typing import Any, Dict, Optional, List
 import structlog
 
 from .base import BaseTool
+from .streaming import (
+    DEFAULT_MAX_MEMORY_BYTES,
+    JSONStreamScanner,
+    OutputCollector,
+    pump_stream,
+)
+from .session_pool import CLISession, CLISessionPool
 
 # Import retry utility if available, otherwise define inline
 try:
@@ -118,6 +125,16 @@ class ClaudeCodeTool(BaseTool):
                 - retry_base_delay: Base delay for retry backoff (default: 1.0)
                 - enable_json_parsing: Parse JSON responses (default: True)
                 - json_output_marker: Marker for JSON output start (default: "```json")
+                - max_output_bytes: Output kept in memory per stream before
+                  spilling to a temp file (default: 4 MiB)
+                - spill_directory: Directory for spilled output (default: system temp)
+                - session_pool: Warm CLI session pool settings (disabled by default):
+                    - enabled: Use pre-spawned CLI processes (default: False)
+                    - mode: "oneshot" (prompt on stdin, output read to EOF) or
+                      "stream-json" (prompt as a user message, answer from the
+                      result event); either way one task per process (default: "oneshot")
+                    - max_idle: Warm sessions kept per working directory (default: 1)
+                    - idle_timeout: Seconds before an idle session is recycled (default: 300)
         """
         super().__init__(config)
         self.cli_path = config.get("cli_path", "claude")
@@ -133,8 +150,32 @@ class ClaudeCodeTool(BaseTool):
         self.enable_json_parsing = config.get("enable_json_parsing", True)
         self.json_output_marker = config.get("json_output_marker", "```json")
 
+        # Output streaming configuration
+        self.max_output_bytes = config.get("max_output_bytes", DEFAULT_MAX_MEMORY_BYTES)
+        self.spill_directory = config.get("spill_directory")
+
+        # Environment is built once; os.environ is not re-copied per task
+        self._env = os.environ.copy()
+        self._env.update(self.env_vars)
+
+        # Warm session pool configuration
+        pool_config = config.get("session_pool") or {}
+        self.use_session_pool = pool_config.get("enabled", False)
+        self.session_mode = pool_config.get("mode", "oneshot")
+        self._session_pool: Optional[CLISessionPool] = None
+        if self.use_session_pool:
+            self._session_pool = CLISessionPool(
+                env=self._env,
+                mode=self.session_mode,
+                max_idle=pool_config.get("max_idle", 1),
+                idle_timeout=pool_config.get("idle_timeout", 300.0),
+                max_output_bytes=self.max_output_bytes,
+                spill_dir=self.spill_directory
+            )
+
         # Cancellation support
         self._current_process: Optional[asyncio.subprocess.Process] = None
+        self._current_session: Optional[CLISession] = None
         self._cancelled = False
 
     async def execute(
@@ -283,39 +324,28 @@ class ClaudeCodeTool(BaseTool):
 
         try:
             # Build command
-            cmd = [self.cli_path]
-
-            # Add print mode flag for non-interactive execution
-            cmd.extend(["-p"])
-
-            # Add additional arguments
-            if additional_args:
-                cmd.extend(additional_args)
-
-            # Add file paths if provided
-            if files:
-                for file_path in files:
-                    if os.path.exists(file_path):
-                        cmd.extend(["--file", file_path])
-                    else:
-                        logger.warning("File not found", file_path=file_path)
+            cmd = self._build_command(additional_args, files)
 
             # Note: Instructions are passed via stdin for better handling of long prompts
-            # cmd.append(instructions)  # Removed - using stdin instead
-
-            # Prepare environment variables
-            env = os.environ.copy()
-            env.update(self.env_vars)
-
-            # Execute subprocess with stdin input
-            result = await self._run_subprocess(
-                cmd=cmd,
-                working_dir=working_dir,
-                timeout=timeout,
-                env=env,
-                stream=stream_output,
-                stdin_input=instructions  # Pass instructions via stdin
-            )
+            if self._session_pool is not None:
+                result = await self._run_pooled(
+                    cmd=cmd,
+                    working_dir=working_dir,
+                    timeout=timeout,
+                    stream=stream_output,
+                    prompt=instructions,
+                    parse_json=parse_json
+                )
+            else:
+                result = await self._run_subprocess(
+                    cmd=cmd,
+                    working_dir=working_dir,
+                    timeout=timeout,
+                    env=self._env,
+                    stream=stream_output,
+                    stdin_input=instructions,  # Pass instructions via stdin
+                    parse_json=parse_json
+                )
 
             duration = time.time() - start_time
 
@@ -332,10 +362,14 @@ class ClaudeCodeTool(BaseTool):
             output = result["stdout"]
             stderr = result["stderr"]
 
-            # Parse JSON from output if enabled
+            # Parse JSON from output if enabled; spilled output was scanned
+            # incrementally, so use the last complete value seen
             parsed_json = None
             if parse_json and output:
-                parsed_json = self._parse_json_output(output)
+                if result.get("stdout_truncated"):
+                    parsed_json = result.get("json_value")
+                else:
+                    parsed_json = self._parse_json_output(output)
 
             # Check for errors
             if not success:
@@ -373,7 +407,10 @@ class ClaudeCodeTool(BaseTool):
                     "working_directory": working_dir,
                     "command": " ".join(cmd),
                     "files_included": len(files),
-                    "has_json": parsed_json is not None
+                    "has_json": parsed_json is not None,
+                    "output_bytes": result.get("stdout_bytes"),
+                    "output_file": result.get("stdout_path"),
+                    "pooled_session": self._session_pool is not None
                 }
             }
 
@@ -399,6 +436,78 @@ class ClaudeCodeTool(BaseTool):
                 details={"exception_type": type(e).__name__}
             )
 
+    def _build_command(
+        self,
+        additional_args: Optional[List[str]] = None,
+        files: Optional[List[str]] = None
+    ) -> List[str]:
+        """Build the Claude Code command line (the prompt is sent via stdin)
+
+        Args:
+            additional_args: Additional CLI arguments
+            files: File paths to include in context
+
+        Returns:
+            Command list
+        """
+        # Print mode flag for non-interactive execution
+        cmd = [self.cli_path, "-p"]
+
+        if self._session_pool is not None and self.session_mode == "stream-json":
+            cmd.extend([
+                "--input-format", "stream-json",
+                "--output-format", "stream-json",
+                "--verbose"
+            ])
+
+        if additional_args:
+            cmd.extend(additional_args)
+
+        if files:
+            for file_path in files:
+                if os.path.exists(file_path):
+                    cmd.extend(["--file", file_path])
+                else:
+                    logger.warning("File not found", file_path=file_path)
+
+        return cmd
+
+    async def _run_pooled(
+        self,
+        cmd: List[str],
+        working_dir: Optional[str],
+        timeout: int,
+        stream: bool,
+        prompt: str,
+        parse_json: bool
+    ) -> Dict[str, Any]:
+        """Run a prompt on a warm session from the pool
+
+        Args:
+            cmd: Command list (pool key together with working_dir)
+            working_dir: Working directory
+            timeout: Timeout in seconds
+            stream: Whether to log output lines
+            prompt: Prompt text
+            parse_json: Scan stdout for JSON values while it streams
+
+        Returns:
+            Dictionary shaped like ``_run_subprocess`` output
+        """
+        async def on_line(line: str, stream_name: str):
+            """Log and forward each output line as it arrives"""
+            if stream:
+                logger.debug(f"Claude Code {stream_name}", line=line)
+            await self._emit_output(line, stream_name)
+
+        session = await self._session_pool.acquire(cmd, working_dir)
+        self._current_session = session
+        try:
+            return await session.run(prompt, timeout=timeout, on_line=on_line, parse_json=parse_json)
+        finally:
+            self._current_session = None
+            await self._session_pool.release(session)
+
     async def _run_subprocess(
         self,
         cmd: List[str],
@@ -406,10 +515,15 @@ class ClaudeCodeTool(BaseTool):
         timeout: int,
         env: Dict[str, str],
         stream: bool = True,
-        stdin_input: Optional[str] = None
+        stdin_input: Optional[str] = None,
+        parse_json: bool = False
     ) -> Dict[str, Any]:
         """Run subprocess with timeout and stream support
 
+        Output is read in chunks; complete lines are forwarded to the output
+        callback as they arrive and each stream keeps at most
+        ``max_output_bytes`` in memory (the rest is spilled to a temp file).
+
         Args:
             cmd: Command list
             working_dir: Working directory
@@ -417,9 +531,11 @@ class ClaudeCodeTool(BaseTool):
             env: Environment variables
             stream: Whether to stream output
             stdin_input: Optional input to send via stdin
+            parse_json: Scan stdout for JSON values while it streams
 
         Returns:
-            Dictionary with stdout, stderr, and exit_code
+            Dictionary with stdout, stderr, exit_code, stdout_truncated,
+            stdout_bytes, stdout_path and json_value
         """
         logger.debug("Starting subprocess", command=" ".join(cmd), has_stdin=stdin_input is not None)
 
@@ -436,31 +552,29 @@ class ClaudeCodeTool(BaseTool):
         # Store process reference for cancellation
         self._current_process = process
 
-        stdout_lines = []
-        stderr_lines = []
+        async def on_line(line: str, stream_name: str):
+            """Log and forward each output line as it arrives"""
+            if stream:
+                logger.debug(f"Claude Code {stream_name}", line=line)
+            await self._emit_output(line, stream_name)
+
+        scanner = JSONStreamScanner(max_value_chars=self.max_output_bytes) if parse_json else None
+        stdout = OutputCollector(
+            "stdout",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            scanner=scanner,
+            spill_dir=self.spill_directory
+        )
+        stderr = OutputCollector(
+            "stderr",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            spill_dir=self.spill_directory
+        )
 
-        async def read_stream(stream_obj, lines_buffer, stream_name):
-            """Read from stream and optionally log"""
-            try:
-                while True:
-                    # Check for cancellation
-                    if self._cancelled:
-                        break
-
-                    line = await stream_obj.readline()
-                    if not line:
-                        break
-
-                    decoded_line = line.decode('utf-8', errors='replace').rstrip()
-                    lines_buffer.append(decoded_line)
-
-                    if stream:
-                        logger.debug(
-                            f"Claude Code {stream_name}",
-                            line=decoded_line
-                        )
-            except Exception as e:
-                logger.warning(f"Error reading {stream_name}", error=str(e))
+        def is_cancelled() -> bool:
+            return self._cancelled
 
         try:
             # Write stdin input if provided
@@ -474,8 +588,8 @@ class ClaudeCodeTool(BaseTool):
             # Read stdout and stderr concurrently with timeout
             await asyncio.wait_for(
                 asyncio.gather(
-                    read_stream(process.stdout, stdout_lines, "stdout"),
-                    read_stream(process.stderr, stderr_lines, "stderr"),
+                    pump_stream(process.stdout, stdout, should_stop=is_cancelled),
+                    pump_stream(process.stderr, stderr, should_stop=is_cancelled),
                     process.wait()
                 ),
                 timeout=timeout
@@ -487,15 +601,33 @@ class ClaudeCodeTool(BaseTool):
             # Kill process on timeout
             logger.warning("Subprocess timeout, terminating process")
             await self._terminate_process(process)
+            stdout.close()
+            stderr.close()
+            raise
+
+        except BaseException:
+            # Nothing is reported for a failed run, so drop its spill files
+            stdout.close()
+            stderr.close()
             raise
 
         finally:
             self._current_process = None
 
+        # Only a successful run reports its stdout spill file (as output_file)
+        keep_stdout = exit_code == 0 and not self._cancelled
+        stderr.close()
+        if not keep_stdout:
+            stdout.close()
+
         return {
-            "stdout": "\n".join(stdout_lines),
-            "stderr": "\n".join(stderr_lines),
-            "exit_code": exit_code
+            "stdout": stdout.get_text(),
+            "stderr": stderr.get_text(),
+            "exit_code": exit_code,
+            "stdout_truncated": stdout.truncated,
+            "stdout_bytes": stdout.total_bytes,
+            "stdout_path": stdout.spill_path if keep_stdout else None,
+            "json_value": scanner.last_value if scanner else None
         }
 
     async def _terminate_process(self, process: asyncio.subprocess.Process):
@@ -619,6 +751,22 @@ class ClaudeCodeTool(BaseTool):
             logger.info("Cancelling Claude Code execution")
             await self._terminate_process(self._current_process)
 
+        if self._current_session is not None:
+            logger.info("Cancelling pooled Claude Code session")
+            self._current_session.broken = True
+            await self._current_session.close()
+
+    async def prewarm(self):
+        """Pre-spawn a session for the default working directory"""
+        if self._session_pool is not None:
+            await self._session_pool.prewarm(self._build_command(), self.default_working_dir)
+            logger.info("Claude Code session pool prewarmed", stats=self._session_pool.get_stats())
+
+    async def close(self):
+        """Terminate pooled sessions"""
+        if self._session_pool is not None:
+            await self._session_pool.close()
+
     async def validate_config(self) -> bool:
         """Validate tool configuration
 
@@ -802,18 +950,22 @@ class ClaudeCodeTool(BaseTool):
             ],
             "features": {
                 "streaming": True,
+                "bounded_output": True,
                 "file_context": True,
                 "timeout_support": True,
                 "working_directory": True,
                 "json_parsing": self.enable_json_parsing,
                 "retry_logic": True,
                 "cancellation": True,
-                "error_classification": True
+                "error_classification": True,
+                "session_pool": self._session_pool is not None
             },
             "config": {
                 "default_timeout": self.default_timeout,
                 "default_working_dir": self.default_working_dir,
                 "max_retries": self.max_retries,
-                "retry_base_delay": self.retry_base_delay
-            }
+                "retry_base_delay": self.retry_base_delay,
+                "session_mode": self.session_mode if self._session_pool is not None else None
+            },
+            "session_pool": self._session_pool.get_stats() if self._session_pool is not None else None
         }
@@ -9,6 +9,8 @@ from typing import Any, Dict, Optional
 import structlog
 
 from .base import BaseTool
+from .session_pool import CLISession, CLISessionPool
+from .streaming import DEFAULT_MAX_MEMORY_BYTES, OutputCollector, pump_stream
 
 logger = structlog.get_logger()
 
@@ -66,6 +68,13 @@ class GeminiCLI(BaseTool):
                 - temperature: Sampling temperature 0.0-2.0 (default: 0.7)
                 - max_output_tokens: Maximum tokens in response (default: 2048)
                 - working_directory: Default working directory for execution
+                - max_output_bytes: Output kept in memory per stream before
+                  spilling to a temp file (default: 4 MiB)
+                - spill_directory: Directory for spilled output (default: system temp)
+                - session_pool: Warm CLI process pool settings (disabled by default):
+                    - enabled: Send prompts via stdin to pre-spawned processes (default: False)
+                    - max_idle: Warm processes kept ready (default: 1)
+                    - idle_timeout: Seconds before an idle process is recycled (default: 300)
         """
         super().__init__(config)
 
@@ -81,6 +90,8 @@ class GeminiCLI(BaseTool):
         self.max_retries = config.get("max_retries", self.DEFAULT_MAX_RETRIES)
         self.stream = config.get("stream", False)
         self.working_dir = config.get("working_directory")
+        self.max_output_bytes = config.get("max_output_bytes", DEFAULT_MAX_MEMORY_BYTES)
+        self.spill_directory = config.get("spill_directory")
 
         # Generation parameters
         self.temperature = config.get("temperature", 0.7)
@@ -93,6 +104,24 @@ class GeminiCLI(BaseTool):
         self.request_count = 0
         self.rate_limit_window_start = time.time()
 
+        # Warm process pool; Gemini CLI has no multi-turn stdin protocol, so
+        # pooled processes are spawned ahead of time and serve one prompt each
+        pool_config = config.get("session_pool") or {}
+        self._session_pool: Optional[CLISessionPool] = None
+        self._current_session: Optional[CLISession] = None
+        if pool_config.get("enabled", False):
+            env = os.environ.copy()
+            if self.api_key:
+                env["GOOGLE_API_KEY"] = self.api_key
+            self._session_pool = CLISessionPool(
+                env=env,
+                mode="oneshot",
+                max_idle=pool_config.get("max_idle", 1),
+                idle_timeout=pool_config.get("idle_timeout", 300.0),
+                max_output_bytes=self.max_output_bytes,
+                spill_dir=self.spill_directory
+            )
+
         logger.info(
             "GeminiCLI initialized",
             cli_path=self.cli_path,
@@ -259,11 +288,14 @@ class GeminiCLI(BaseTool):
                 )
 
                 # Execute the subprocess
-                result = await self._run_subprocess(
-                    cmd=cmd,
-                    env=env,
-                    timeout=self.timeout
-                )
+                if self._session_pool is not None:
+                    result = await self._run_pooled(cmd=cmd, prompt=prompt, timeout=self.timeout)
+                else:
+                    result = await self._run_subprocess(
+                        cmd=cmd,
+                        env=env,
+                        timeout=self.timeout
+                    )
 
                 # Check for rate limit errors in output
                 stderr = result.get("stderr", "")
@@ -409,7 +441,8 @@ class GeminiCLI(BaseTool):
                     "timeout": self.timeout,
                     "working_directory": working_dir,
                     "command": " ".join(cmd[:3]) + "...",  # Don't log full prompt
-                    "stream": self.stream
+                    "stream": self.stream,
+                    "output_file": result.get("stdout_path")
                 }
             }
 
@@ -474,8 +507,9 @@ class GeminiCLI(BaseTool):
         if additional_args:
             cmd.extend(additional_args)
 
-        # Add the prompt as the last argument
-        cmd.append(prompt)
+        # Add the prompt as the last argument; pooled processes read it from stdin
+        if self._session_pool is None:
+            cmd.append(prompt)
 
         return cmd
 
@@ -539,7 +573,8 @@ class GeminiCLI(BaseTool):
             timeout: Timeout in seconds
 
         Returns:
-            Dictionary with stdout, stderr, and exit_code
+            Dictionary with stdout, stderr, exit_code, stdout_truncated
+            and stdout_path
         """
         logger.debug("Starting subprocess", command=" ".join(cmd[:5]) + "...")
 
@@ -552,31 +587,31 @@ class GeminiCLI(BaseTool):
             env=env
         )
 
-        stdout_lines = []
-        stderr_lines = []
-
-        async def read_stream(stream, lines_buffer, stream_name):
-            """Read from stream and optionally log"""
-            while True:
-                line = await stream.readline()
-                if not line:
-                    break
-
-                decoded_line = line.decode('utf-8', errors='replace').rstrip()
-                lines_buffer.append(decoded_line)
-
-                if self.stream:
-                    logger.debug(
-                        f"Gemini CLI {stream_name}",
-                        line=decoded_line
-                    )
+        async def on_line(line: str, stream_name: str):
+            """Log and forward each output line as it arrives"""
+            if self.stream:
+                logger.debug(f"Gemini CLI {stream_name}", line=line)
+            await self._emit_output(line, stream_name)
+
+        stdout = OutputCollector(
+            "stdout",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            spill_dir=self.spill_directory
+        )
+        stderr = OutputCollector(
+            "stderr",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            spill_dir=self.spill_directory
+        )
 
         try:
             # Read stdout and stderr concurrently with timeout
             await asyncio.wait_for(
                 asyncio.gather(
-                    read_stream(process.stdout, stdout_lines, "stdout"),
-                    read_stream(process.stderr, stderr_lines, "stderr"),
+                    pump_stream(process.stdout, stdout),
+                    pump_stream(process.stderr, stderr),
                     process.wait()
                 ),
                 timeout=timeout
@@ -592,14 +627,66 @@ class GeminiCLI(BaseTool):
                 await process.wait()
             except Exception as e:
                 logger.error("Error killing process", error=str(e))
+            stdout.close()
+            stderr.close()
+            raise
+
+        except BaseException:
+            # Nothing is reported for a failed run, so drop its spill files
+            stdout.close()
+            stderr.close()
             raise
 
+        # Only a successful run reports its stdout spill file (as output_file)
+        keep_stdout = exit_code == 0
+        stderr.close()
+        if not keep_stdout:
+            stdout.close()
+
         return {
-            "stdout": "\n".join(stdout_lines),
-            "stderr": "\n".join(stderr_lines),
-            "exit_code": exit_code
+            "stdout": stdout.get_text(),
+            "stderr": stderr.get_text(),
+            "exit_code": exit_code,
+            "stdout_truncated": stdout.truncated,
+            "stdout_path": stdout.spill_path if keep_stdout else None
         }
 
+    async def _run_pooled(self, cmd: list, prompt: str, timeout: int) -> Dict[str, Any]:
+        """Run a prompt on a pre-spawned CLI process
+
+        Args:
+            cmd: Command list (without the prompt)
+            prompt: Prompt text, written to stdin
+            timeout: Timeout in seconds
+
+        Returns:
+            Dictionary shaped like ``_run_subprocess`` output
+        """
+        async def on_line(line: str, stream_name: str):
+            """Log and forward each output line as it arrives"""
+            if self.stream:
+                logger.debug(f"Gemini CLI {stream_name}", line=line)
+            await self._emit_output(line, stream_name)
+
+        session = await self._session_pool.acquire(cmd, self.working_dir)
+        self._current_session = session
+        try:
+            return await session.run(prompt, timeout=timeout, on_line=on_line)
+        finally:
+            self._current_session = None
+            await self._session_pool.release(session)
+
+    async def prewarm(self):
+        """Pre-spawn a CLI process for prompts without extra arguments"""
+        if self._session_pool is not None:
+            await self._session_pool.prewarm(self._build_command("", {}), self.working_dir)
+            logger.info("Gemini CLI session pool prewarmed", stats=self._session_pool.get_stats())
+
+    async def close(self):
+        """Terminate pooled CLI processes"""
+        if self._session_pool is not None:
+            await self._session_pool.close()
+
     async def cancel(self) -> bool:
         """Cancel any ongoing execution
 
@@ -609,6 +696,9 @@ class GeminiCLI(BaseTool):
             True if cancellation was successful, False otherwise
         """
         logger.info("Cancellation requested for GeminiCLI")
+        if self._current_session is not None:
+            self._current_session.broken = True
+            await self._current_session.close()
         # Note: The subprocess is managed within _run_subprocess method
         # Cancellation is handled via asyncio.CancelledError propagation
         # and process.kill() in the timeout handler
@@ -638,7 +728,8 @@ class GeminiCLI(BaseTool):
                 "retry_logic": True,
                 "rate_limiting": True,
                 "context_support": True,
-                "cancellation": True
+                "cancellation": True,
+                "session_pool": self._session_pool is not None
             },
             "config": {
                 "model": self.model_name,
@@ -0,0 +1,204 @@
+"""Background Tool Health Monitor
+
+Probes registered tools in the background and caches the results, so the
+heartbeat and the executor read tool health without paying for a probe
+(CLI spawn, API round trip) on the request path.
+
+Probe intervals adapt to the last result: a healthy tool is re-checked
+rarely, a degraded or unhealthy one often, so recovery is noticed quickly.
+Results feed the shared circuit breakers: an unhealthy probe trips the
+tool's breaker, a healthy probe closes it.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import structlog
+
+from utils.circuit_breaker import CircuitBreakerRegistry, get_circuit_breakers
+from .health_checker import HealthStatus, ToolHealthChecker
+
+logger = structlog.get_logger()
+
+
+class ToolHealthMonitor:
+    """Adaptive background health checks with cached results
+
+    Example:
+        monitor = ToolHealthMonitor(["claude_code", "ollama"], probe_config)
+        await monitor.start()
+        healthy = monitor.available_tools()
+        await monitor.stop()
+    """
+
+    # Registered tool name -> ToolHealthChecker probe and its config key
+    PROBES = {
+        "claude_code": ("check_claude_code", "claude_code"),
+        "gemini_cli": ("check_gemini", "gemini"),
+        "ollama": ("check_ollama", "ollama"),
+    }
+
+    DEFAULT_HEALTHY_INTERVAL = 300.0
+    DEFAULT_DEGRADED_INTERVAL = 15.0
+
+    def __init__(
+        self,
+        tools: Iterable[str],
+        config: Optional[Dict[str, Any]] = None,
+        checker: Optional[ToolHealthChecker] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        healthy_interval: float = DEFAULT_HEALTHY_INTERVAL,
+        degraded_interval: float = DEFAULT_DEGRADED_INTERVAL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize health monitor
+
+        Args:
+            tools: Registered tool names to monitor (tools without a probe are skipped)
+            config: Probe configuration keyed like ToolHealthChecker.check_all_tools
+            checker: Health checker (default: ToolHealthChecker with quick timeout)
+            circuit_breakers: Breaker registry shared with the executor
+            healthy_interval: Seconds between probes of a healthy tool
+            degraded_interval: Seconds between probes of a degraded or unhealthy tool
+            clock: Monotonic time source
+        """
+        self.tools = [name for name in tools if name in self.PROBES]
+        self.config = config or {}
+        self.checker = checker or ToolHealthChecker(timeout=ToolHealthChecker.QUICK_TIMEOUT)
+        self.circuit_breakers = circuit_breakers or get_circuit_breakers()
+        self.healthy_interval = healthy_interval
+        self.degraded_interval = degraded_interval
+        self._clock = clock
+
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._next_probe: Dict[str, float] = {name: 0.0 for name in self.tools}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Run an initial probe of every tool and start the background loop"""
+        if self._task is not None:
+            return
+        await self.probe_due()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Tool health monitor started",
+            tools=self.tools,
+            healthy_interval=self.healthy_interval,
+            degraded_interval=self.degraded_interval
+        )
+
+    async def stop(self):
+        """Stop the background loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Tool health monitor stopped")
+
+    async def _run(self):
+        """Probe tools as they come due"""
+        while True:
+            try:
+                await self.probe_due()
+            except Exception as e:
+                logger.error("Tool health probe error", error=str(e))
+            await asyncio.sleep(self._seconds_until_next_probe())
+
+    def _seconds_until_next_probe(self) -> float:
+        """Sleep time until the earliest scheduled probe (at least 1s)"""
+        if not self._next_probe:
+            return self.healthy_interval
+        return max(min(self._next_probe.values()) - self._clock(), 1.0)
+
+    async def probe_due(self) -> Dict[str, Dict[str, Any]]:
+        """Probe every tool whose next check is due, concurrently
+
+        Returns:
+            Fresh results by tool name
+        """
+        now = self._clock()
+        due = [name for name in self.tools if self._next_probe[name] <= now]
+        if not due:
+            return {}
+
+        results = await asyncio.gather(
+            *(self._probe(name) for name in due),
+            return_exceptions=True
+        )
+        fresh = {}
+        for name, result in zip(due, results):
+            if isinstance(result, Exception):
+                result = {
+                    "name": name,
+                    "status": HealthStatus.UNHEALTHY,
+                    "available": False,
+                    "error": f"Health check failed: {str(result)}",
+                    "checked_at": time.time()
+                }
+            fresh[name] = self._record(name, result)
+        return fresh
+
+    async def _probe(self, name: str) -> Dict[str, Any]:
+        """Run the health check for one tool"""
+        method, config_key = self.PROBES[name]
+        return await getattr(self.checker, method)(self.config.get(config_key, {}))
+
+    def _record(self, name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a probe result, update the breaker and schedule the next probe"""
+        status = result.get("status", HealthStatus.UNKNOWN)
+        previous = self._results.get(name, {}).get("status")
+        self._results[name] = result
+
+        breaker = self.circuit_breakers.get(name)
+        if status == HealthStatus.UNHEALTHY:
+            breaker.trip()
+        elif status in (HealthStatus.HEALTHY, HealthStatus.DEGRADED):
+            breaker.record_success()
+
+        interval = self.healthy_interval if status == HealthStatus.HEALTHY else self.degraded_interval
+        self._next_probe[name] = self._clock() + interval
+
+        if status != previous:
+            logger.info(
+                "Tool health changed",
+                tool=name,
+                status=status,
+                previous=previous,
+                next_probe_in=interval
+            )
+        return result
+
+    def available_tools(self, registered: Optional[Iterable[str]] = None) -> List[str]:
+        """Registered tools whose circuit is not open
+
+        Args:
+            registered: Tool names to filter (default: monitored tools)
+
+        Returns:
+            Tool names that may currently receive tasks
+        """
+        names = self.tools if registered is None else registered
+        return [name for name in names if not self.circuit_breakers.get(name).is_open]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get cached health and breaker state per tool
+
+        Returns:
+            Dictionary keyed by tool name with status, checked_at,
+            next_probe_in and circuit
+        """
+        now = self._clock()
+        return {
+            name: {
+                "status": self._results.get(name, {}).get("status", HealthStatus.UNKNOWN),
+                "checked_at": self._results.get(name, {}).get("checked_at"),
+                "next_probe_in": round(max(self._next_probe[name] - now, 0.0), 1),
+                "circuit": self.circuit_breakers.get(name).get_status(),
+            }
+            for name in self.tools
+        }
@@ -1,12 +1,18 @@
 """Ollama Local LLM tool implementation using aiohttp"""
 
 import asyncio
+import functools
 import time
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
+import structlog
 
 from .base import BaseTool
+from .ollama_residency import ModelResidencyManager
+from .ollama_scheduler import OllamaRequestScheduler
+
+logger = structlog.get_logger()
 
 
 class OllamaTool(BaseTool):
@@ -23,6 +29,8 @@ class OllamaTool(BaseTool):
     DEFAULT_CONNECT_TIMEOUT = 10.0  # 10 seconds for connection
     DEFAULT_MAX_RETRIES = 3
     DEFAULT_RETRY_DELAY = 1.0
+    DEFAULT_MODEL_CACHE_TTL = 60.0  # Seconds a /api/tags listing is trusted
+    DEFAULT_MAX_CONNECTIONS = 8
 
     # API endpoints
     GENERATE_ENDPOINT = "/api/generate"
@@ -47,6 +55,17 @@ class OllamaTool(BaseTool):
                 - max_retries: Maximum connection retry attempts (default: 3)
                 - retry_delay: Delay between retries in seconds (default: 1.0)
                 - auto_pull: Auto-pull model if not available (default: False)
+                - model_cache_ttl: Seconds to reuse the model list (default: 60)
+                - max_connections: Connection pool size (default: 8)
+                - keep_alive: keep_alive sent for models that are not hot (default: "5m")
+                - hot_keep_alive: keep_alive for frequently used models (default: "30m")
+                - hot_threshold: Uses within hot_window before a model is hot (default: 2)
+                - hot_window: Window in seconds for counting uses (default: 900)
+                - max_pinned_models: Models kept resident with hot_keep_alive (default: 1)
+                - prewarm_models: Models loaded when the worker starts (default: [model])
+                - num_parallel: Concurrent requests sent to Ollama
+                  (default: OLLAMA_NUM_PARALLEL or 4)
+                - max_batch: Consecutive requests for one model while others wait (default: 16)
         """
         super().__init__(config)
         self.url = config.get("url", self.DEFAULT_URL).rstrip("/")
@@ -59,6 +78,59 @@ class OllamaTool(BaseTool):
         self.max_retries = config.get("max_retries", self.DEFAULT_MAX_RETRIES)
         self.retry_delay = config.get("retry_delay", self.DEFAULT_RETRY_DELAY)
         self.auto_pull = config.get("auto_pull", False)
+        self.model_cache_ttl = config.get("model_cache_ttl", self.DEFAULT_MODEL_CACHE_TTL)
+        self.max_connections = config.get("max_connections", self.DEFAULT_MAX_CONNECTIONS)
+        self.prewarm_model_names = config.get("prewarm_models", [self.model])
+
+        # One pooled HTTP session per tool instance (created lazily on the running loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Cached /api/tags inventory
+        self._model_cache: Optional[List[Dict[str, Any]]] = None
+        self._model_cache_time = 0.0
+        self._model_cache_lock: Optional[asyncio.Lock] = None
+
+        # keep_alive selection and background model loads
+        self.residency = ModelResidencyManager(
+            default_keep_alive=config.get("keep_alive", "5m"),
+            hot_keep_alive=config.get("hot_keep_alive", "30m"),
+            hot_threshold=config.get("hot_threshold", 2),
+            hot_window=config.get("hot_window", 900.0),
+            max_pinned=config.get("max_pinned_models", 1)
+        )
+        self._warming: Dict[str, asyncio.Task] = {}
+
+        # Requests are grouped by model and capped at the server's parallelism
+        self.scheduler = OllamaRequestScheduler(
+            max_parallel=config.get("num_parallel"),
+            max_batch=config.get("max_batch", 16)
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use
+
+        The session keeps connections to Ollama alive between requests.
+        Per-request timeouts are passed on each call.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(
+                    total=self.timeout,
+                    connect=self.connect_timeout
+                )
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and stop background model loads"""
+        self.scheduler.close()
+        for task in self._warming.values():
+            task.cancel()
+        self._warming.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def execute(
         self,
@@ -77,6 +149,7 @@ class OllamaTool(BaseTool):
                 - max_tokens: Override default max_tokens
                 - stream: Override default stream setting
                 - callback: Optional callback for streaming (fn(chunk: str))
+                - priority: Scheduling priority 1-10, higher first (default: 5)
 
         Returns:
             Dictionary with:
@@ -96,6 +169,7 @@ class OllamaTool(BaseTool):
         system_prompt = context.get("system_prompt")
         stream = context.get("stream", self.stream)
         callback = context.get("callback")
+        priority = context.get("priority", 5)
 
         # Ensure model is available
         if self.auto_pull:
@@ -112,54 +186,56 @@ class OllamaTool(BaseTool):
                     }
                 }
 
-        try:
-            timeout = aiohttp.ClientTimeout(
-                total=self.timeout,
-                connect=self.connect_timeout
-            )
+        self.residency.record_use(model)
+        self._release_demoted_models()
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                if use_chat:
-                    # Use chat endpoint
-                    result = await self._chat_completion(
-                        session=session,
-                        prompt=instructions,
-                        system_prompt=system_prompt,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        stream=stream,
-                        callback=callback
-                    )
-                else:
-                    # Use generate endpoint
-                    result = await self._generate_completion(
-                        session=session,
-                        prompt=instructions,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        stream=stream,
-                        callback=callback
-                    )
-
-                duration = time.time() - start_time
+        try:
+            session = self._get_session()
+            if use_chat:
+                # Use chat endpoint
+                completion = functools.partial(
+                    self._chat_completion,
+                    session=session,
+                    prompt=instructions,
+                    system_prompt=system_prompt,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    callback=callback
+                )
+            else:
+                # Use generate endpoint
+                completion = functools.partial(
+                    self._generate_completion,
+                    session=session,
+                    prompt=instructions,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    callback=callback
+                )
+            result = await self.scheduler.submit(model, completion, priority=priority)
+
+            duration = time.time() - start_time
 
-                return {
-                    "success": True,
-                    "output": result["response"],
-                    "error": None,
-                    "metadata": {
-                        "model": model,
-                        "duration": duration,
-                        "prompt_tokens": result.get("prompt_eval_count", 0),
-                        "completion_tokens": result.get("eval_count", 0),
-                        "total_tokens": result.get("prompt_eval_count", 0) + result.get("eval_count", 0),
-                        "load_duration": result.get("load_duration", 0),
-                        "eval_duration": result.get("eval_duration", 0),
-                        "streamed": stream
-                    }
+            return {
+                "success": True,
+                "output": result["response"],
+                "error": None,
+                "metadata": {
+                    "model": model,
+                    "duration": duration,
+                    "prompt_tokens": result.get("prompt_eval_count", 0),
+                    "completion_tokens": result.get("eval_count", 0),
+                    "total_tokens": result.get("prompt_eval_count", 0) + result.get("eval_count", 0),
+                    "load_duration": result.get("load_duration", 0),
+                    "eval_duration": result.get("eval_duration", 0),
+                    "keep_alive": self.residency.keep_alive_for(model),
+                    "streamed": stream
                 }
+            }
 
         except aiohttp.ClientConnectorError as e:
             return {
@@ -238,6 +314,7 @@ class OllamaTool(BaseTool):
             "model": model,
             "prompt": prompt,
             "stream": stream,
+            "keep_alive": self.residency.keep_alive_for(model),
             "options": {
                 "temperature": temperature,
             }
@@ -288,6 +365,7 @@ class OllamaTool(BaseTool):
             "model": model,
             "messages": messages,
             "stream": stream,
+            "keep_alive": self.residency.keep_alive_for(model),
             "options": {
                 "temperature": temperature,
             }
@@ -459,23 +537,9 @@ class OllamaTool(BaseTool):
             True if Ollama is healthy, False otherwise
         """
         try:
-            timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Try to list available models
-                url = f"{self.url}{self.TAGS_ENDPOINT}"
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    # Check if our configured model is available
-                    models = data.get("models", [])
-
-                    # Extract model names
-                    available_models = [m.get("name", "").split(":")[0] for m in models]
-
-                    # Check if our model is available (exact match or base name match)
-                    model_base = self.model.split(":")[0]
-                    return model_base in available_models or self.model in [m.get("name", "") for m in models]
+            # A live listing doubles as a connectivity check and refreshes the cache
+            models = await self._get_models(force_refresh=True)
+            return self._model_in(self.model, models)
 
         except Exception:
             return False
@@ -489,39 +553,30 @@ class OllamaTool(BaseTool):
         start_time = time.time()
 
         try:
-            timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.TAGS_ENDPOINT}"
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    latency = (time.time() - start_time) * 1000
-                    models = data.get("models", [])
-                    available_models = [m.get("name", "") for m in models]
-
-                    model_base = self.model.split(":")[0]
-                    model_available = (
-                        model_base in [m.split(":")[0] for m in available_models] or
-                        self.model in available_models
-                    )
-
-                    status = "healthy" if model_available else "degraded"
-
-                    return {
-                        "status": status,
-                        "available": True,
-                        "latency": round(latency, 2),
-                        "version": data.get("version"),
-                        "error": None if model_available else f"Model '{self.model}' not found",
-                        "metadata": {
-                            "tool_name": self.name,
-                            "url": self.url,
-                            "model": self.model,
-                            "model_available": model_available,
-                            "available_models": available_models
-                        }
-                    }
+            data = await self._fetch_tags()
+
+            latency = (time.time() - start_time) * 1000
+            models = data.get("models", [])
+            available_models = [m.get("name", "") for m in models]
+            model_available = self._model_in(self.model, models)
+
+            status = "healthy" if model_available else "degraded"
+
+            return {
+                "status": status,
+                "available": True,
+                "latency": round(latency, 2),
+                "version": data.get("version"),
+                "error": None if model_available else f"Model '{self.model}' not found",
+                "metadata": {
+                    "tool_name": self.name,
+                    "url": self.url,
+                    "model": self.model,
+                    "model_available": model_available,
+                    "available_models": available_models,
+                    "pinned_models": self.residency.get_stats()["pinned"]
+                }
+            }
         except aiohttp.ClientConnectorError as e:
             latency = (time.time() - start_time) * 1000
             return {
@@ -561,30 +616,148 @@ class OllamaTool(BaseTool):
             Dictionary with 'available' bool and optional 'error' string
         """
         try:
-            # Check if model exists
-            timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.TAGS_ENDPOINT}"
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            # Check the cached inventory first; a miss may just be a stale
+            # cache, so confirm against the server before pulling
+            if self._model_in(model, await self._get_models()):
+                return {"available": True}
+            if self._model_in(model, await self._get_models(force_refresh=True)):
+                return {"available": True}
+
+            # Model not found, try to pull
+            if self.auto_pull:
+                await self.pull_model(model)
+                return {"available": True}
+
+            return {"available": False, "error": f"Model '{model}' not found"}
+
+        except Exception as e:
+            return {"available": False, "error": str(e)}
+
+    @staticmethod
+    def _model_in(model: str, models: List[Dict[str, Any]]) -> bool:
+        """Check a model name against a /api/tags listing (exact or base name match)"""
+        names = [m.get("name", "") for m in models]
+        model_base = model.split(":")[0]
+        return model in names or model_base in [n.split(":")[0] for n in names]
+
+    async def _fetch_tags(self) -> Dict[str, Any]:
+        """Fetch /api/tags and refresh the model cache
+
+        Returns:
+            Raw response dictionary
+        """
+        timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
+        url = f"{self.url}{self.TAGS_ENDPOINT}"
+        async with self._get_session().get(url, timeout=timeout) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        self._model_cache = data.get("models", [])
+        self._model_cache_time = time.monotonic()
+        return data
+
+    async def _get_models(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get the model inventory, using the cached listing within its TTL
+
+        Concurrent callers share a single refresh.
+
+        Args:
+            force_refresh: Ignore the cache and query the server
+
+        Returns:
+            List of model dictionaries from /api/tags
+        """
+        if self._model_cache_lock is None:
+            self._model_cache_lock = asyncio.Lock()
 
-                    models = data.get("models", [])
-                    available_models = [m.get("name", "") for m in models]
-                    model_base = model.split(":")[0]
+        async with self._model_cache_lock:
+            fresh = (
+                self._model_cache is not None
+                and time.monotonic() - self._model_cache_time < self.model_cache_ttl
+            )
+            if force_refresh or not fresh:
+                await self._fetch_tags()
+            return self._model_cache
+
+    def invalidate_model_cache(self):
+        """Forget the cached model inventory"""
+        self._model_cache = None
+        self._model_cache_time = 0.0
 
-                    if model_base in [m.split(":")[0] for m in available_models] or model in available_models:
-                        return {"available": True}
+    async def prewarm_model(self, model: str, keep_alive: Optional[Any] = None) -> Dict[str, Any]:
+        """Load a model into memory without generating anything
 
-                    # Model not found, try to pull
-                    if self.auto_pull:
-                        await self.pull_model(model)
-                        return {"available": True}
+        Ollama loads the model for a generate request with no prompt and
+        keeps it resident for the request's keep_alive.
+
+        Args:
+            model: Model name
+            keep_alive: keep_alive override (default: chosen by the residency manager)
+
+        Returns:
+            Dictionary with success status and load duration (nanoseconds)
+        """
+        url = f"{self.url}{self.GENERATE_ENDPOINT}"
+        payload = {
+            "model": model,
+            "stream": False,
+            "keep_alive": keep_alive if keep_alive is not None else self.residency.keep_alive_for(model)
+        }
 
-                    return {"available": False, "error": f"Model '{model}' not found"}
+        async def load():
+            async with self._get_session().post(url, json=payload) as response:
+                response.raise_for_status()
+                return await response.json()
 
+        try:
+            # Lowest priority: loads wait for the current model's group to drain
+            data = await self.scheduler.submit(model, load, priority=1)
+            logger.debug("Ollama model prewarmed", model=model, load_duration=data.get("load_duration"))
+            return {"success": True, "model": model, "load_duration": data.get("load_duration", 0), "error": None}
         except Exception as e:
-            return {"available": False, "error": str(e)}
+            logger.warning("Failed to prewarm Ollama model", model=model, error=str(e))
+            return {"success": False, "model": model, "load_duration": 0, "error": str(e)}
+
+    def schedule_prewarm(self, models: List[str]) -> None:
+        """Load models in the background, e.g. for tasks queued next
+
+        A model already being loaded is not requested twice.
+
+        Args:
+            models: Model names
+        """
+        for model in models:
+            task = self._warming.get(model)
+            if task is not None and not task.done():
+                continue
+            task = asyncio.create_task(self.prewarm_model(model))
+            self._warming[model] = task
+            task.add_done_callback(
+                lambda t, m=model: self._warming.pop(m, None) if self._warming.get(m) is t else None
+            )
+
+    async def prewarm(self):
+        """Load the configured models before the first task
+
+        Configured models are expected to be this worker's main workload, so
+        they start out hot; they lose the pin if real usage goes elsewhere.
+        """
+        models = [m for m in self.prewarm_model_names if m]
+        for model in models:
+            self.residency.record_use(model, count=self.residency.hot_threshold)
+        if models:
+            await asyncio.gather(*(self.prewarm_model(m) for m in models))
+
+    def _release_demoted_models(self) -> None:
+        """Shorten keep_alive for models that are no longer hot
+
+        A demoted model was loaded with ``hot_keep_alive``; re-issuing a load
+        with the default keep_alive lets Ollama unload it on the normal
+        schedule instead of holding it for the full pinned period.
+        """
+        demoted = self.residency.take_demoted()
+        if demoted:
+            self.schedule_prewarm(demoted)
 
     async def pull_model(self, model: str) -> Dict[str, Any]:
         """Pull a model from Ollama library
@@ -598,20 +771,20 @@ class OllamaTool(BaseTool):
         try:
             # Use longer timeout for model pulling (can take several minutes)
             timeout = aiohttp.ClientTimeout(total=600.0, connect=10.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.PULL_ENDPOINT}"
-                payload = {"name": model, "stream": False}
+            url = f"{self.url}{self.PULL_ENDPOINT}"
+            payload = {"name": model, "stream": False}
 
-                async with session.post(url, json=payload) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            async with self._get_session().post(url, json=payload, timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
 
-                    return {
-                        "success": True,
-                        "model": model,
-                        "status": data.get("status", "pulled"),
-                        "error": None
-                    }
+            self.invalidate_model_cache()
+            return {
+                "success": True,
+                "model": model,
+                "status": data.get("status", "pulled"),
+                "error": None
+            }
 
         except Exception as e:
             return {
@@ -632,19 +805,19 @@ class OllamaTool(BaseTool):
         """
         try:
             timeout = aiohttp.ClientTimeout(total=30.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.DELETE_ENDPOINT}"
-                payload = {"name": model}
+            url = f"{self.url}{self.DELETE_ENDPOINT}"
+            payload = {"name": model}
 
-                async with session.delete(url, json=payload) as response:
-                    response.raise_for_status()
+            async with self._get_session().delete(url, json=payload, timeout=timeout) as response:
+                response.raise_for_status()
 
-                    return {
-                        "success": True,
-                        "model": model,
-                        "status": "deleted",
-                        "error": None
-                    }
+            self.invalidate_model_cache()
+            return {
+                "success": True,
+                "model": model,
+                "status": "deleted",
+                "error": None
+            }
 
         except Exception as e:
             return {
@@ -654,25 +827,21 @@ class OllamaTool(BaseTool):
                 "error": str(e)
             }
 
-    async def list_models(self) -> Dict[str, Any]:
+    async def list_models(self, force_refresh: bool = False) -> Dict[str, Any]:
         """List all available models
 
+        Args:
+            force_refresh: Bypass the cached inventory
+
         Returns:
             Dictionary with list of models and metadata
         """
         try:
-            timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.TAGS_ENDPOINT}"
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    return {
-                        "success": True,
-                        "models": data.get("models", []),
-                        "error": None
-                    }
+            return {
+                "success": True,
+                "models": await self._get_models(force_refresh=force_refresh),
+                "error": None
+            }
 
         except Exception as e:
             return {
@@ -692,20 +861,19 @@ class OllamaTool(BaseTool):
         """
         try:
             timeout = aiohttp.ClientTimeout(total=10.0, connect=5.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.url}{self.SHOW_ENDPOINT}"
-                payload = {"name": model}
+            url = f"{self.url}{self.SHOW_ENDPOINT}"
+            payload = {"name": model}
 
-                async with session.post(url, json=payload) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            async with self._get_session().post(url, json=payload, timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
 
-                    return {
-                        "success": True,
-                        "model": model,
-                        "info": data,
-                        "error": None
-                    }
+            return {
+                "success": True,
+                "model": model,
+                "info": data,
+                "error": None
+            }
 
         except Exception as e:
             return {
@@ -768,6 +936,11 @@ class OllamaTool(BaseTool):
                 "retry_logic": True,
                 "auto_pull": self.auto_pull,
                 "max_retries": self.max_retries,
-                "cancellation": True
-            }
+                "cancellation": True,
+                "connection_reuse": True,
+                "model_residency": True,
+                "request_scheduling": True
+            },
+            "residency": self.residency.get_stats(),
+            "scheduler": self.scheduler.get_stats()
         }
@@ -0,0 +1,128 @@
+"""Model residency tracking for Ollama
+
+Ollama unloads a model once its ``keep_alive`` expires (5 minutes by
+default), and the next request pays the full load again (reported as
+``load_duration``). The manager here tracks recent use per model and picks
+the ``keep_alive`` sent with each request: models used often enough are
+pinned with a long keep-alive, the rest get the default so they do not hold
+GPU/RAM they are not earning.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Set, Union
+
+KeepAlive = Union[str, int, float]
+
+
+class ModelResidencyManager:
+    """Decide how long Ollama should keep each model loaded
+
+    Features:
+    - Sliding-window use counts per model
+    - Up to ``max_pinned`` hot models get ``hot_keep_alive``
+    - Models that drop out of the pinned set are reported once via
+      ``take_demoted()`` so the caller can shorten their keep-alive
+    """
+
+    def __init__(
+        self,
+        default_keep_alive: KeepAlive = "5m",
+        hot_keep_alive: KeepAlive = "30m",
+        hot_threshold: int = 2,
+        hot_window: float = 900.0,
+        max_pinned: int = 1
+    ):
+        """Initialize residency manager
+
+        Args:
+            default_keep_alive: keep_alive for models that are not hot
+            hot_keep_alive: keep_alive for pinned models
+            hot_threshold: Uses within ``hot_window`` before a model is hot
+            hot_window: Sliding window in seconds
+            max_pinned: Maximum number of models pinned at once
+        """
+        self.default_keep_alive = default_keep_alive
+        self.hot_keep_alive = hot_keep_alive
+        self.hot_threshold = hot_threshold
+        self.hot_window = hot_window
+        self.max_pinned = max_pinned
+
+        self._uses: Dict[str, Deque[float]] = {}
+        self._pinned: Set[str] = set()
+        self._demoted: Set[str] = set()
+
+    def _expire(self, now: float) -> None:
+        """Drop use timestamps that fell out of the window"""
+        cutoff = now - self.hot_window
+        for model in list(self._uses):
+            uses = self._uses[model]
+            while uses and uses[0] < cutoff:
+                uses.popleft()
+            if not uses:
+                del self._uses[model]
+
+    def _refresh_pinned(self) -> None:
+        """Recompute the pinned set, remembering models that lost their pin"""
+        ranked = sorted(
+            (m for m, uses in self._uses.items() if len(uses) >= self.hot_threshold),
+            key=lambda m: (len(self._uses[m]), self._uses[m][-1]),
+            reverse=True
+        )
+        pinned = set(ranked[:self.max_pinned])
+        self._demoted |= self._pinned - pinned
+        self._demoted -= pinned
+        self._pinned = pinned
+
+    def record_use(self, model: str, count: int = 1) -> None:
+        """Record that a request for ``model`` is being made
+
+        Args:
+            model: Model name
+            count: Number of uses to record (``hot_threshold`` marks the
+                model hot immediately; it still ages out of the window)
+        """
+        now = time.monotonic()
+        self._uses.setdefault(model, deque()).extend([now] * count)
+        self._expire(now)
+        self._refresh_pinned()
+
+    def keep_alive_for(self, model: str) -> KeepAlive:
+        """Get the keep_alive value to send with a request for ``model``
+
+        Args:
+            model: Model name
+
+        Returns:
+            ``hot_keep_alive`` for pinned models, otherwise ``default_keep_alive``
+        """
+        return self.hot_keep_alive if model in self._pinned else self.default_keep_alive
+
+    def is_pinned(self, model: str) -> bool:
+        """Whether ``model`` is currently pinned"""
+        return model in self._pinned
+
+    def take_demoted(self) -> List[str]:
+        """Get (and clear) models that lost their pin since the last call
+
+        Returns:
+            List of model names
+        """
+        demoted = sorted(self._demoted)
+        self._demoted.clear()
+        return demoted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get residency statistics
+
+        Returns:
+            Dictionary with pinned models and recent use counts
+        """
+        self._expire(time.monotonic())
+        self._refresh_pinned()
+        return {
+            "pinned": sorted(self._pinned),
+            "recent_uses": {model: len(uses) for model, uses in self._uses.items()},
+            "default_keep_alive": self.default_keep_alive,
+            "hot_keep_alive": self.hot_keep_alive
+        }
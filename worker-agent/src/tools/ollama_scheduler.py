@@ -0,0 +1,234 @@
+"""Concurrency-aware request scheduler for Ollama
+
+Ollama serves up to ``OLLAMA_NUM_PARALLEL`` requests at once for a loaded
+model; requests for a different model force a load (and, on memory-bound
+hosts, an unload of the current one). Sending requests in arrival order
+therefore wastes time switching models. The scheduler queues requests and
+dispatches them so that:
+
+- at most ``max_parallel`` requests are in flight
+- requests for the model that is already running are dispatched together;
+  another model is only started once in-flight requests have drained
+- higher priority (1-10, higher = more urgent) goes first, FIFO within a
+  priority; a strictly higher-priority request for another model ends the
+  current group
+- a group is capped at ``max_batch`` consecutive dispatches while other
+  models are waiting, so no model starves
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Ollama's default parallelism when memory allows
+DEFAULT_NUM_PARALLEL = 4
+
+DEFAULT_PRIORITY = 5
+
+
+def resolve_num_parallel(configured: Optional[int] = None) -> int:
+    """Get the concurrency cap: explicit config, then OLLAMA_NUM_PARALLEL
+
+    Args:
+        configured: Explicitly configured value (None to use the environment)
+
+    Returns:
+        Maximum number of concurrent requests (at least 1)
+    """
+    if configured:
+        return max(1, int(configured))
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", DEFAULT_NUM_PARALLEL)))
+    except ValueError:
+        return DEFAULT_NUM_PARALLEL
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    """A request waiting for dispatch (ordered by priority, then arrival)"""
+
+    sort_key: Tuple[int, int]
+    model: str = field(compare=False)
+    factory: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    task: Optional[asyncio.Task] = field(compare=False, default=None)
+
+
+class OllamaRequestScheduler:
+    """Queue Ollama calls, grouping by model under a concurrency cap"""
+
+    def __init__(self, max_parallel: Optional[int] = None, max_batch: int = 16):
+        """Initialize scheduler
+
+        Args:
+            max_parallel: Concurrent request cap (default: OLLAMA_NUM_PARALLEL or 4)
+            max_batch: Consecutive dispatches for one model while others wait
+        """
+        self.max_parallel = resolve_num_parallel(max_parallel)
+        self.max_batch = max(1, max_batch)
+
+        self._queues: Dict[str, List[_QueuedRequest]] = {}
+        self._seq = itertools.count()
+        self._active_model: Optional[str] = None
+        self._in_flight = 0
+        self._batch_count = 0
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "model_switches": 0,
+            "total_queue_wait": 0.0
+        }
+
+    async def submit(
+        self,
+        model: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = DEFAULT_PRIORITY
+    ) -> Any:
+        """Queue a call and wait for its result
+
+        Args:
+            model: Model the call targets (grouping key)
+            factory: Zero-argument function returning the awaitable to run
+            priority: 1-10, higher = more urgent
+
+        Returns:
+            Whatever the awaitable returns (exceptions propagate)
+        """
+        request = _QueuedRequest(
+            sort_key=(-int(priority), next(self._seq)),
+            model=model,
+            factory=factory,
+            future=asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._queues.setdefault(model, []), request)
+        self.stats["submitted"] += 1
+        self._dispatch()
+
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            # Caller gave up: drop it from the queue or stop the running call
+            if request.task is not None and not request.task.done():
+                request.task.cancel()
+            elif not request.future.done():
+                request.future.cancel()
+            self._dispatch()
+            raise
+
+    def _prune(self) -> None:
+        """Drop cancelled requests at queue heads and empty queues"""
+        for model in list(self._queues):
+            queue = self._queues[model]
+            while queue and queue[0].future.done():
+                heapq.heappop(queue)
+                self.stats["cancelled"] += 1
+            if not queue:
+                del self._queues[model]
+
+    def _next_request(self) -> Optional[_QueuedRequest]:
+        """Pick the next request to start, or None to wait"""
+        self._prune()
+        if not self._queues:
+            return None
+
+        best_model = min(self._queues, key=lambda m: self._queues[m][0].sort_key)
+        active = self._active_model
+        others_waiting = any(m != active for m in self._queues)
+
+        if active in self._queues:
+            active_priority = self._queues[active][0].sort_key[0]
+            best_priority = self._queues[best_model][0].sort_key[0]
+            batch_open = self._batch_count < self.max_batch or not others_waiting
+            if active_priority <= best_priority and batch_open:
+                if not others_waiting:
+                    self._batch_count = 0
+                self._batch_count += 1
+                return heapq.heappop(self._queues[active])
+
+        # Switching models: let the current group finish first
+        if self._in_flight > 0:
+            return None
+
+        if active in self._queues and others_waiting and self._batch_count >= self.max_batch:
+            # Batch cap reached; give the next model a turn
+            candidates = [m for m in self._queues if m != active]
+            best_model = min(candidates, key=lambda m: self._queues[m][0].sort_key)
+
+        if active is not None and best_model != active:
+            self.stats["model_switches"] += 1
+            logger.debug("Ollama scheduler switching model", from_model=active, to_model=best_model)
+        self._active_model = best_model
+        self._batch_count = 1
+        return heapq.heappop(self._queues[best_model])
+
+    def _dispatch(self) -> None:
+        """Start queued requests while there is capacity"""
+        while self._in_flight < self.max_parallel:
+            request = self._next_request()
+            if request is None:
+                return
+            self._in_flight += 1
+            self.stats["total_queue_wait"] += time.monotonic() - request.enqueued_at
+            request.task = asyncio.create_task(self._run(request))
+
+    async def _run(self, request: _QueuedRequest) -> None:
+        """Run one request and resolve its future"""
+        try:
+            result = await request.factory()
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            if not request.future.done():
+                request.future.cancel()
+        except Exception as e:
+            self.stats["failed"] += 1
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            self.stats["completed"] += 1
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for dispatch"""
+        return sum(len(q) for q in self._queues.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics
+
+        Returns:
+            Dictionary with counters, queue depth per model and in-flight count
+        """
+        dispatched = self.stats["submitted"] - self.queued
+        return {
+            **self.stats,
+            "avg_queue_wait": self.stats["total_queue_wait"] / dispatched if dispatched else 0.0,
+            "queued": {model: len(q) for model, q in self._queues.items()},
+            "in_flight": self._in_flight,
+            "active_model": self._active_model,
+            "max_parallel": self.max_parallel
+        }
+
+    def close(self) -> None:
+        """Cancel every queued request (in-flight calls are left to finish)"""
+        for queue in self._queues.values():
+            for request in queue:
+                if not request.future.done():
+                    request.future.cancel()
+        self._queues.clear()
@@ -0,0 +1,513 @@
+"""Warm CLI session pool
+
+Starting an AI CLI costs interpreter/Node startup and auth loading before
+the first token is produced. The pool keeps pre-spawned CLI processes per
+(working directory, command) so a task can hand its prompt to a process
+that is already running.
+
+Two session modes are supported:
+- ``oneshot``: the process is spawned ahead of time and blocks on stdin;
+  the prompt is written, stdin closed and output read to EOF.
+- ``stream-json``: a process speaking the Claude Code
+  ``--input-format stream-json`` protocol. The task is a user message and
+  the turn ends at the ``result`` event, so the answer arrives as a
+  structured event instead of output parsed at EOF.
+
+In both modes a pooled session serves exactly one task. A stream-json
+process keeps its conversation for as long as it lives, so handing it to
+a second task would leak the first task's prompt and answers into it;
+it is recycled instead, and its replacement is spawned while the task runs.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_MEMORY_BYTES,
+    JSONStreamScanner,
+    OutputCollector,
+    pump_stream,
+)
+
+logger = structlog.get_logger()
+
+SESSION_MODES = ("oneshot", "stream-json")
+
+
+class CLISessionError(Exception):
+    """Raised when a pooled CLI session cannot serve a request"""
+
+
+class CLISession:
+    """A single pre-spawned CLI process"""
+
+    def __init__(
+        self,
+        cmd: List[str],
+        cwd: Optional[str],
+        env: Dict[str, str],
+        mode: str = "oneshot",
+        max_output_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        spill_dir: Optional[str] = None
+    ):
+        """Initialize session (the process starts in ``start()``)
+
+        Args:
+            cmd: Command list
+            cwd: Working directory
+            env: Environment variables
+            mode: Session mode ("oneshot" or "stream-json")
+            max_output_bytes: Per-stream in-memory output cap
+            spill_dir: Directory for spilled output
+        """
+        if mode not in SESSION_MODES:
+            raise ValueError(f"Unknown session mode: {mode}")
+
+        self.cmd = cmd
+        self.cwd = cwd
+        self.env = env
+        self.mode = mode
+        self.max_output_bytes = max_output_bytes
+        self.spill_dir = spill_dir
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.broken = False
+
+        # stream-json sessions drain stderr in the background for their lifetime
+        self._stderr: Optional[OutputCollector] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Spawn the CLI process"""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=self.env
+        )
+        if self.mode == "stream-json":
+            self._stderr = OutputCollector(
+                "stderr",
+                max_memory_bytes=self.max_output_bytes,
+                spill_dir=self.spill_dir
+            )
+            self._stderr_task = asyncio.create_task(
+                pump_stream(self.process.stderr, self._stderr)
+            )
+        logger.debug("CLI session spawned", command=self.cmd[0], cwd=self.cwd, mode=self.mode)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is running and has not been marked broken"""
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and not self.broken
+        )
+
+    async def run(
+        self,
+        prompt: str,
+        timeout: float,
+        on_line: Optional[Callable[[str, str], Any]] = None,
+        parse_json: bool = False
+    ) -> Dict[str, Any]:
+        """Send a prompt and collect the response
+
+        Args:
+            prompt: Prompt text
+            timeout: Timeout in seconds
+            on_line: Optional callback for output lines (line, stream_name)
+            parse_json: Scan output for JSON values
+
+        Returns:
+            Dictionary shaped like a one-off subprocess run: stdout, stderr,
+            exit_code, stdout_truncated, stdout_bytes, stdout_path, json_value
+
+        Raises:
+            asyncio.TimeoutError: If the response does not complete in time
+            CLISessionError: If the session is no longer usable
+        """
+        if not self.alive:
+            raise CLISessionError("CLI session is not running")
+
+        self.uses += 1
+        self.last_used = time.monotonic()
+        try:
+            if self.mode == "oneshot":
+                return await asyncio.wait_for(
+                    self._run_oneshot(prompt, on_line, parse_json), timeout=timeout
+                )
+            return await asyncio.wait_for(
+                self._run_turn(prompt, on_line), timeout=timeout
+            )
+        except BaseException:
+            # Unknown protocol state; never hand this process out again
+            self.broken = True
+            raise
+
+    async def _run_oneshot(
+        self,
+        prompt: str,
+        on_line: Optional[Callable[[str, str], Any]],
+        parse_json: bool
+    ) -> Dict[str, Any]:
+        """Write the prompt, close stdin and read output to EOF"""
+        scanner = JSONStreamScanner(max_value_chars=self.max_output_bytes) if parse_json else None
+        stdout = OutputCollector(
+            "stdout",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            scanner=scanner,
+            spill_dir=self.spill_dir
+        )
+        stderr = OutputCollector(
+            "stderr",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            spill_dir=self.spill_dir
+        )
+
+        async def send_prompt():
+            self.process.stdin.write(prompt.encode("utf-8"))
+            await self.process.stdin.drain()
+            self.process.stdin.close()
+
+        await asyncio.gather(
+            send_prompt(),
+            pump_stream(self.process.stdout, stdout),
+            pump_stream(self.process.stderr, stderr),
+            self.process.wait()
+        )
+
+        return {
+            "stdout": stdout.get_text(),
+            "stderr": stderr.get_text(),
+            "exit_code": self.process.returncode,
+            "stdout_truncated": stdout.truncated,
+            "stdout_bytes": stdout.total_bytes,
+            "stdout_path": stdout.spill_path,
+            "json_value": scanner.last_value if scanner else None
+        }
+
+    async def _run_turn(
+        self,
+        prompt: str,
+        on_line: Optional[Callable[[str, str], Any]]
+    ) -> Dict[str, Any]:
+        """Send one stream-json user message and read events until ``result``"""
+        result_event: Dict[str, Any] = {}
+
+        def on_value(value: Any):
+            if isinstance(value, dict) and value.get("type") == "result":
+                result_event.update(value)
+
+        scanner = JSONStreamScanner(max_value_chars=self.max_output_bytes, on_value=on_value)
+        events = OutputCollector(
+            "stdout",
+            max_memory_bytes=self.max_output_bytes,
+            on_line=on_line,
+            scanner=scanner,
+            spill_dir=self.spill_dir
+        )
+
+        message = {
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": prompt}]}
+        }
+        self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+        while not result_event:
+            chunk = await self.process.stdout.read(DEFAULT_CHUNK_SIZE)
+            if not chunk:
+                break
+            await events.feed(chunk)
+        await events.finish()
+
+        if not result_event:
+            self.broken = True
+            exit_code = await self.process.wait()
+            return {
+                "stdout": events.get_text(),
+                "stderr": self._stderr.get_text() if self._stderr else "",
+                "exit_code": exit_code if exit_code else 1,
+                "stdout_truncated": events.truncated,
+                "stdout_bytes": events.total_bytes,
+                "stdout_path": events.spill_path,
+                "json_value": scanner.last_value
+            }
+
+        # The result event carries the answer; the raw event log is not needed
+        events.close()
+
+        output = result_event.get("result")
+        if not isinstance(output, str):
+            output = json.dumps(output) if output is not None else ""
+        is_error = bool(result_event.get("is_error")) or result_event.get("subtype", "success") != "success"
+
+        return {
+            "stdout": output,
+            "stderr": "",
+            "exit_code": 1 if is_error else 0,
+            "stdout_truncated": False,
+            "stdout_bytes": events.total_bytes,
+            "stdout_path": None,
+            "json_value": None,
+            "session_id": result_event.get("session_id")
+        }
+
+    async def close(self):
+        """Terminate the CLI process"""
+        process = self.process
+        if process is not None and process.returncode is None:
+            try:
+                if process.stdin and not process.stdin.is_closing():
+                    process.stdin.close()
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+            except ProcessLookupError:
+                pass
+            except Exception as e:
+                logger.debug("Error closing CLI session", error=str(e))
+
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+            try:
+                await self._stderr_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._stderr_task = None
+        if self._stderr is not None:
+            self._stderr.close()
+
+
+class CLISessionPool:
+    """Pool of warm CLI sessions keyed by working directory and command
+
+    Features:
+    - Keeps up to ``max_idle`` pre-spawned sessions per key; taking one
+      that will be spent after the task schedules a replacement in the
+      background
+    - Health check on checkout (process alive, not idle past ``idle_timeout``)
+    - Recycling after every task, so no conversation outlives its task
+    - Environment is copied once per pool rather than per task
+    """
+
+    def __init__(
+        self,
+        env: Dict[str, str],
+        mode: str = "oneshot",
+        max_idle: int = 1,
+        idle_timeout: float = 300.0,
+        max_output_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        spill_dir: Optional[str] = None
+    ):
+        """Initialize pool
+
+        Args:
+            env: Environment for spawned sessions
+            mode: Session mode ("oneshot" or "stream-json")
+            max_idle: Warm sessions kept per key
+            idle_timeout: Seconds an idle session may wait before being recycled
+            max_output_bytes: Per-stream in-memory output cap
+            spill_dir: Directory for spilled output
+        """
+        if mode not in SESSION_MODES:
+            raise ValueError(f"Unknown session mode: {mode}")
+
+        self.env = env
+        self.mode = mode
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_output_bytes = max_output_bytes
+        self.spill_dir = spill_dir
+
+        self._idle: Dict[Tuple, List[CLISession]] = {}
+        self._refills: Dict[Tuple, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+        self.stats = {"hits": 0, "misses": 0, "spawned": 0, "recycled": 0, "discarded": 0}
+
+    @staticmethod
+    def _key(cmd: List[str], cwd: Optional[str]) -> Tuple:
+        return (cwd, tuple(cmd))
+
+    async def _spawn(self, cmd: List[str], cwd: Optional[str]) -> CLISession:
+        session = CLISession(
+            cmd=cmd,
+            cwd=cwd,
+            env=self.env,
+            mode=self.mode,
+            max_output_bytes=self.max_output_bytes,
+            spill_dir=self.spill_dir
+        )
+        await session.start()
+        self.stats["spawned"] += 1
+        return session
+
+    @staticmethod
+    def _warmth(session: CLISession) -> float:
+        """Sort key; larger means more likely to be fully started"""
+        return -session.created_at
+
+    def _is_usable(self, session: CLISession) -> bool:
+        # A session that served a task holds that task's conversation
+        return (
+            session.alive
+            and session.uses == 0
+            and time.monotonic() - session.last_used < self.idle_timeout
+        )
+
+    async def acquire(self, cmd: List[str], cwd: Optional[str] = None) -> CLISession:
+        """Check out a warm session, spawning one if none is ready
+
+        Args:
+            cmd: Command list
+            cwd: Working directory
+
+        Returns:
+            A running CLISession (return it with ``release``)
+        """
+        if self._closed:
+            raise CLISessionError("CLI session pool is closed")
+
+        key = self._key(cmd, cwd)
+        stale: List[CLISession] = []
+        session: Optional[CLISession] = None
+
+        async with self._lock:
+            idle = self._idle.get(key, [])
+            # Prefer the oldest spawn
+            idle.sort(key=self._warmth)
+            while idle:
+                candidate = idle.pop()
+                if self._is_usable(candidate):
+                    session = candidate
+                    break
+                stale.append(candidate)
+
+        for candidate in stale:
+            self.stats["discarded"] += 1
+            await candidate.close()
+
+        if session is not None:
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            session = await self._spawn(cmd, cwd)
+
+        # The session is spent after this task; spawn its replacement while it runs
+        self._schedule_refill(cmd, cwd)
+        return session
+
+    async def release(self, session: CLISession):
+        """Return a session to the pool, recycling it if spent or unhealthy
+
+        Args:
+            session: Session obtained from ``acquire``
+        """
+        if self._closed or not self._is_usable(session):
+            self.stats["recycled"] += 1
+            await session.close()
+            return
+
+        key = self._key(session.cmd, session.cwd)
+        async with self._lock:
+            idle = self._idle.setdefault(key, [])
+            idle.append(session)
+            # Over capacity: drop the least warm session (possibly a fresh
+            # spare spawned while this one was busy)
+            idle.sort(key=self._warmth)
+            evicted = idle[:-self.max_idle] if self.max_idle > 0 else list(idle)
+            del idle[:len(evicted)]
+
+        for extra in evicted:
+            self.stats["discarded"] += 1
+            await extra.close()
+
+    async def prewarm(self, cmd: List[str], cwd: Optional[str] = None, count: Optional[int] = None):
+        """Spawn idle sessions ahead of the first task
+
+        Args:
+            cmd: Command list
+            cwd: Working directory
+            count: Sessions to keep warm (default: ``max_idle``)
+        """
+        target = self.max_idle if count is None else min(count, self.max_idle)
+        key = self._key(cmd, cwd)
+        while not self._closed:
+            async with self._lock:
+                if len(self._idle.get(key, [])) >= target:
+                    return
+            session = await self._spawn(cmd, cwd)
+            async with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < target and not self._closed:
+                    idle.append(session)
+                    continue
+            await session.close()
+            return
+
+    def _schedule_refill(self, cmd: List[str], cwd: Optional[str]):
+        """Top up idle sessions for a key in the background"""
+        key = self._key(cmd, cwd)
+        if self.max_idle <= 0 or self._closed:
+            return
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def refill():
+            try:
+                await self.prewarm(cmd, cwd)
+            except Exception as e:
+                logger.warning("Failed to pre-spawn CLI session", command=cmd[0], error=str(e))
+
+        self._refills[key] = asyncio.create_task(refill())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics
+
+        Returns:
+            Dictionary with hit/miss/spawn counters and idle session count
+        """
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "idle_sessions": sum(len(v) for v in self._idle.values()),
+            "keys": len(self._idle)
+        }
+
+    async def close(self):
+        """Terminate all idle sessions and stop background refills"""
+        self._closed = True
+        for task in self._refills.values():
+            task.cancel()
+        for task in self._refills.values():
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._refills.clear()
+
+        async with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for session in sessions:
+            await session.close()
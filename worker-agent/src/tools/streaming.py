@@ -0,0 +1,372 @@
+"""Bounded streaming capture for CLI subprocess output
+
+CLI tools can print far more than we want to hold in memory. The helpers
+here read subprocess pipes in chunks, forward complete lines to a callback
+as soon as they arrive, scan for JSON values incrementally and keep only a
+bounded tail of the output in memory. Anything beyond the cap is spilled to
+a temporary file whose path is reported alongside the truncated text.
+
+Spill files outlive their collector so the reported path stays readable;
+they are removed by ``OutputCollector.close()`` when the caller is done
+with them, and files older than ``DEFAULT_SPILL_TTL`` are swept whenever a
+new one is created.
+"""
+
+import asyncio
+import codecs
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Default in-memory cap per stream (bytes)
+DEFAULT_MAX_MEMORY_BYTES = 4 * 1024 * 1024
+
+# Read size for subprocess pipes
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# A partial line longer than this is forwarded without waiting for "\n"
+MAX_LINE_CHARS = 64 * 1024
+
+# Spill file naming and lifetime (seconds)
+SPILL_PREFIX = "garageswarm-"
+DEFAULT_SPILL_TTL = 3600.0
+
+# Characters that matter to the JSON scanner
+_JSON_TOKENS = re.compile(r'[{}\[\]"\\]')
+
+
+async def _invoke(callback: Optional[Callable[..., Any]], *args) -> None:
+    """Call a sync or async callback, logging (not raising) its errors"""
+    if callback is None:
+        return
+    try:
+        result = callback(*args)
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as e:
+        logger.debug("Output callback failed", error=str(e))
+
+
+def sweep_spill_files(spill_dir: Optional[str] = None, max_age: float = DEFAULT_SPILL_TTL) -> int:
+    """Delete spill files older than ``max_age`` seconds
+
+    Args:
+        spill_dir: Directory to sweep (default: system temp dir)
+        max_age: Age in seconds after which a spill file is removed
+
+    Returns:
+        Number of files removed
+    """
+    directory = spill_dir or tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not (entry.name.startswith(SPILL_PREFIX) and entry.name.endswith(".log")):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            pass  # Removed concurrently or not ours to remove
+    return removed
+
+
+class JSONStreamScanner:
+    """Incrementally detect complete top-level JSON values in streamed text
+
+    Only bracket, quote and escape characters are inspected, so plain prose
+    between values costs a regex scan rather than a Python-level loop. A
+    candidate value larger than ``max_value_chars`` is abandoned to keep
+    memory bounded.
+    """
+
+    def __init__(
+        self,
+        max_value_chars: int = DEFAULT_MAX_MEMORY_BYTES,
+        on_value: Optional[Callable[[Any], Any]] = None
+    ):
+        """Initialize scanner
+
+        Args:
+            max_value_chars: Largest JSON value that will be captured
+            on_value: Optional callback invoked with each parsed value
+        """
+        self.max_value_chars = max_value_chars
+        self.on_value = on_value
+        self.first_value: Any = None
+        self.last_value: Any = None
+        self.value_count = 0
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False  # Previous chunk ended on a backslash in a string
+        self._parts: list = []
+        self._size = 0
+
+    async def feed(self, text: str) -> None:
+        """Feed the next chunk of decoded text
+
+        Args:
+            text: Decoded output text
+        """
+        pos = 0
+        # Index of a character escaped by a backslash (may be this chunk's first)
+        skip = 0 if self._escape else -1
+        for match in _JSON_TOKENS.finditer(text):
+            char = match.group()
+            idx = match.start()
+
+            if self._depth == 0:
+                if char in "{[":
+                    self._depth = 1
+                    self._in_string = False
+                    self._parts = []
+                    self._size = 0
+                    pos = idx
+                continue
+
+            if idx == skip:
+                continue
+            if char == "\\":
+                if self._in_string:
+                    skip = idx + 1
+                continue
+            if char == '"':
+                self._in_string = not self._in_string
+                continue
+            if self._in_string:
+                continue
+
+            if char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._append(text[pos:idx + 1])
+                    await self._complete()
+
+        self._escape = self._depth > 0 and skip == len(text)
+        if self._depth > 0:
+            self._append(text[pos:])
+
+    def _append(self, fragment: str) -> None:
+        """Add a fragment to the current candidate, abandoning oversize ones"""
+        self._size += len(fragment)
+        if self._size > self.max_value_chars:
+            self._depth = 0
+            self._parts = []
+            self._size = 0
+            return
+        self._parts.append(fragment)
+
+    async def _complete(self) -> None:
+        """Try to parse the captured candidate"""
+        candidate = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        try:
+            value = json.loads(candidate)
+        except (json.JSONDecodeError, ValueError):
+            return
+
+        if self.value_count == 0:
+            self.first_value = value
+        self.last_value = value
+        self.value_count += 1
+        await _invoke(self.on_value, value)
+
+
+class OutputCollector:
+    """Collect one subprocess stream with bounded memory
+
+    Features:
+    - Complete lines are forwarded to ``on_line`` as they arrive
+    - At most ``max_memory_bytes`` of output are held in memory; once the
+      cap is exceeded the full output is written to a temporary file and
+      only the most recent bytes are kept in memory
+    - Optional incremental JSON scanning
+
+    The spill file is kept after ``finish()`` so the path in ``get_text()``
+    stays valid; call ``close()`` once the output is no longer needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        on_line: Optional[Callable[[str, str], Any]] = None,
+        scanner: Optional[JSONStreamScanner] = None,
+        spill_dir: Optional[str] = None,
+        spill_ttl: float = DEFAULT_SPILL_TTL
+    ):
+        """Initialize collector
+
+        Args:
+            name: Stream name ("stdout" / "stderr"), passed to ``on_line``
+            max_memory_bytes: In-memory cap before spilling to disk
+            on_line: Optional callback invoked with (line, name)
+            scanner: Optional JSON scanner fed with decoded text
+            spill_dir: Directory for spill files (default: system temp dir)
+            spill_ttl: Age after which leftover spill files in ``spill_dir``
+                are removed
+        """
+        self.name = name
+        self.max_memory_bytes = max_memory_bytes
+        self.on_line = on_line
+        self.scanner = scanner
+        self.spill_dir = spill_dir
+        self.spill_ttl = spill_ttl
+
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+        self.closed = False
+
+        self._buffer = bytearray()
+        self._spill_file = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial_line = ""
+
+    @property
+    def truncated(self) -> bool:
+        """Whether part of the output only exists in the spill file"""
+        return self.spill_path is not None
+
+    async def feed(self, data: bytes) -> None:
+        """Feed the next chunk of raw output
+
+        Args:
+            data: Raw bytes read from the stream
+        """
+        self.total_bytes += len(data)
+        self._store(data)
+
+        if self.on_line is None and self.scanner is None:
+            return
+
+        text = self._decoder.decode(data)
+        if self.scanner is not None:
+            await self.scanner.feed(text)
+        if self.on_line is not None:
+            await self._forward_lines(text)
+
+    async def finish(self) -> None:
+        """Flush decoder state, the trailing partial line and the spill file"""
+        if self.on_line is not None or self.scanner is not None:
+            text = self._decoder.decode(b"", final=True)
+            if self.scanner is not None and text:
+                await self.scanner.feed(text)
+            if self.on_line is not None:
+                await self._forward_lines(text)
+                if self._partial_line:
+                    await _invoke(self.on_line, self._partial_line.rstrip("\r"), self.name)
+                    self._partial_line = ""
+
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def close(self) -> None:
+        """Delete the spill file (the output text stays available in memory)"""
+        self.closed = True
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self.spill_path is not None:
+            try:
+                os.unlink(self.spill_path)
+            except OSError:
+                pass
+
+    def get_text(self) -> str:
+        """Get the collected output as text
+
+        Returns:
+            Full output if it fit in memory; otherwise a truncation notice
+            followed by the most recent output
+        """
+        text = self._buffer.decode("utf-8", errors="replace").rstrip("\n")
+        if not self.truncated:
+            return text
+        omitted = self.total_bytes - len(self._buffer)
+        where = "full output discarded" if self.closed else f"full output in {self.spill_path}"
+        return f"[... {omitted} bytes omitted; {where} ...]\n" + text
+
+    def _store(self, data: bytes) -> None:
+        """Keep output in memory, spilling to disk beyond the cap"""
+        if self._spill_file is None and len(self._buffer) + len(data) > self.max_memory_bytes:
+            sweep_spill_files(self.spill_dir, self.spill_ttl)
+            fd, self.spill_path = tempfile.mkstemp(
+                prefix=SPILL_PREFIX,
+                suffix=f".{self.name}.log",
+                dir=self.spill_dir
+            )
+            self._spill_file = os.fdopen(fd, "wb")
+            self._spill_file.write(self._buffer)
+            logger.debug(
+                "Output exceeded memory cap, spilling to file",
+                stream=self.name,
+                path=self.spill_path,
+                max_memory_bytes=self.max_memory_bytes
+            )
+
+        if self._spill_file is not None:
+            self._spill_file.write(data)
+
+        self._buffer += data
+        # Trim lazily so repeated small chunks do not copy the buffer each time
+        if len(self._buffer) > 2 * self.max_memory_bytes:
+            del self._buffer[:-self.max_memory_bytes]
+
+    async def _forward_lines(self, text: str) -> None:
+        """Forward complete lines from decoded text to the line callback"""
+        if not text:
+            return
+        pending = self._partial_line + text
+        lines = pending.split("\n")
+        self._partial_line = lines.pop()
+
+        for line in lines:
+            await _invoke(self.on_line, line.rstrip("\r"), self.name)
+
+        if len(self._partial_line) > MAX_LINE_CHARS:
+            await _invoke(self.on_line, self._partial_line, self.name)
+            self._partial_line = ""
+
+
+async def pump_stream(
+    reader: Optional[asyncio.StreamReader],
+    collector: OutputCollector,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    should_stop: Optional[Callable[[], bool]] = None
+) -> None:
+    """Read a subprocess stream to EOF into a collector
+
+    Args:
+        reader: Subprocess stdout/stderr reader (None is a no-op)
+        collector: Destination collector
+        chunk_size: Maximum bytes per read
+        should_stop: Optional predicate checked between reads
+    """
+    try:
+        if reader is not None:
+            while not (should_stop and should_stop()):
+                chunk = await reader.read(chunk_size)
+                if not chunk:
+                    break
+                await collector.feed(chunk)
+    except Exception as e:
+        logger.warning(f"Error reading {collector.name}", error=str(e))
+    finally:
+        await collector.finish()
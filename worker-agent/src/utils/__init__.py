@@ -6,10 +6,22 @@ from .retry import (
     RetryContext,
     retry_async_generator
 )
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    get_circuit_breakers
+)
 
 __all__ = [
     "retry_with_backoff",
     "with_retry",
     "RetryContext",
-    "retry_async_generator"
+    "retry_async_generator",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "CircuitState",
+    "get_circuit_breakers"
 ]
@@ -0,0 +1,228 @@
+"""
+Circuit Breaker
+
+Per-tool circuit breakers shared by the health monitor, the task executor and
+retry_with_backoff, so a tool that is known to be down is failed fast instead
+of costing a multi-second attempt (CLI spawn, HTTP timeout) per task.
+
+States:
+    closed    -> calls allowed; consecutive failures are counted
+    open      -> calls rejected until the reset timeout elapses
+    half_open -> one trial call allowed; success closes, failure re-opens
+                 with a doubled reset timeout (up to max_reset_timeout)
+"""
+
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from exceptions import WorkerException
+
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(WorkerException):
+    """
+    Raised when a call is rejected because the tool's circuit is open
+
+    Not recoverable by immediate retry; the breaker decides when the next
+    trial call is allowed.
+    """
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            f"Circuit open for '{name}'",
+            details={"circuit": name, "retry_after": round(retry_after, 2)},
+            recoverable=False
+        )
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one tool
+
+    Example:
+        breaker = CircuitBreaker("ollama")
+        if breaker.allow():
+            try:
+                result = await call()
+                breaker.record_success()
+            except Exception:
+                breaker.record_failure()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Tool name
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            max_reset_timeout: Upper bound for the backed-off reset timeout
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (open turns half-open once the reset timeout elapsed)"""
+        if self._state == CircuitState.OPEN and self.retry_after() <= 0:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected"""
+        return self.state == CircuitState.OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial call is allowed (0 when not open)"""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(self._opened_at + self._reset_timeout - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        In half-open state only one trial call is let through at a time.
+
+        Returns:
+            True if the call may proceed
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def check(self) -> None:
+        """
+        Raise if the call may not proceed
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self) -> None:
+        """Record a successful call or probe (closes the circuit)"""
+        if self._state != CircuitState.CLOSED:
+            logger.info("Circuit closed", circuit=self.name)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._reset_timeout = self.base_reset_timeout
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call or probe"""
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN:
+            # Trial failed: back off further
+            self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a half-open trial slot without recording an outcome (e.g. cancelled call)"""
+        self._trial_in_flight = False
+
+    def trip(self) -> None:
+        """Open the circuit immediately (e.g. a health probe found the tool down)"""
+        if self._state != CircuitState.OPEN:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._trial_in_flight = False
+        logger.warning(
+            "Circuit opened",
+            circuit=self.name,
+            failures=self._failures,
+            reset_timeout=self._reset_timeout
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get breaker status"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "retry_after": round(self.retry_after(), 2),
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers by tool name, created on first use"""
+
+    def __init__(self, **breaker_kwargs):
+        """
+        Initialize registry
+
+        Args:
+            **breaker_kwargs: Settings for new breakers (failure_threshold, reset_timeout, ...)
+        """
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def configure(self, **breaker_kwargs) -> None:
+        """Change settings for breakers created from now on"""
+        self._breaker_kwargs.update(breaker_kwargs)
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a tool"""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **self._breaker_kwargs)
+        return breaker
+
+    def open_circuits(self) -> List[str]:
+        """Names of tools whose circuit is open"""
+        return [name for name, breaker in self._breakers.items() if breaker.is_open]
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Status per tool"""
+        return {name: breaker.get_status() for name, breaker in self._breakers.items()}
+
+
+_registry: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get the process-wide circuit breaker registry"""
+    global _registry
+    if _registry is None:
+        _registry = CircuitBreakerRegistry()
+    return _registry
@@ -10,7 +10,8 @@ import functools
 from typing import Callable, Optional, Tuple, Type, Union
 import structlog
 
-from ..exceptions import WorkerException
+from exceptions import WorkerException
+from .circuit_breaker import CircuitBreaker
 
 
 logger = structlog.get_logger(__name__)
@@ -23,13 +24,16 @@ async def retry_with_backoff(
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
     jitter: bool = True,
-    exceptions: Optional[Tuple[Type[Exception], ...]] = None
+    exceptions: Optional[Tuple[Type[Exception], ...]] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None
 ):
     """
     Retry a coroutine function with exponential backoff
 
     Implements exponential backoff with optional jitter to avoid thundering herd.
     Only retries on specified exceptions or WorkerException with recoverable=True.
+    With a circuit breaker, every attempt is recorded on it and no attempt is
+    made while it is open (CircuitOpenError is raised instead of retrying).
 
     Args:
         func: Async function to retry
@@ -39,11 +43,13 @@ async def retry_with_backoff(
         exponential_base: Base for exponential backoff (default: 2.0)
         jitter: Add random jitter to delay (default: True)
         exceptions: Tuple of exception types to retry on (default: None, retries on all)
+        circuit_breaker: Breaker of the tool being called (default: None)
 
     Returns:
         Result of the function call
 
     Raises:
+        CircuitOpenError: If the circuit breaker is open
         The last exception if all retries fail
 
     Example:
@@ -60,11 +66,19 @@ async def retry_with_backoff(
     last_exception = None
 
     for attempt in range(max_retries + 1):  # +1 to include initial attempt
+        if circuit_breaker is not None:
+            circuit_breaker.check()
+
         try:
-            return await func()
+            result = await func()
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return result
 
         except Exception as e:
             last_exception = e
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
 
             # Check if we should retry this exception
             should_retry = False
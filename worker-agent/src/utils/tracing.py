@@ -0,0 +1,156 @@
+"""Distributed tracing for the worker agent
+
+Continues the backend's OpenTelemetry traces on the worker: the trace
+context of a task arrives as a W3C traceparent carrier, either in the
+"trace" field of a WebSocket message or in task metadata["trace"] (pull
+mode), and worker spans (task handling, tool execution, result upload)
+become its children.
+
+- Sampling follows the backend's decision (traceparent flags); tasks without
+  a trace context start a new trace sampled at sample_rate
+- Export over OTLP/HTTP or as JSON lines to a local file, in the same
+  format as the backend's file exporter, so both files can be concatenated
+  and rendered as one waterfall with the backend's `python -m src.tracing`
+- With exporter "none" (the default) spans are no-ops
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence
+
+import structlog
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+logger = structlog.get_logger()
+
+TRACER_NAME = "garageswarm.worker"
+
+_provider: Optional[TracerProvider] = None
+_tracer: Optional[trace.Tracer] = None
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(_span_to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _span_to_dict(span: ReadableSpan) -> Dict[str, Any]:
+    return {
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "name": span.name,
+        "service": span.resource.attributes.get("service.name"),
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+def configure_tracing(config: Dict[str, Any]) -> Optional[TracerProvider]:
+    """Install the span pipeline from the agent's tracing config section
+
+    Args:
+        config: tracing section with exporter ("otlp", "file" or "none"),
+            sample_rate, service_name, file_path and otlp_endpoint
+
+    Returns:
+        The configured provider, or None when tracing is disabled
+    """
+    global _provider, _tracer
+
+    shutdown_tracing()
+    exporter = config.get("exporter", "none")
+    if exporter == "none":
+        return None
+
+    if exporter == "file":
+        span_exporter: SpanExporter = FileSpanExporter(config.get("file_path", "traces.jsonl"))
+    elif exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter(endpoint=config.get("otlp_endpoint"))
+    else:
+        raise ValueError(f"Unknown trace exporter: {exporter}")
+
+    sample_rate = config.get("sample_rate", 0.05)
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": config.get("service_name", "garageswarm-worker")}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate))
+    )
+    _provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = _provider.get_tracer(TRACER_NAME)
+
+    logger.info("Tracing enabled", exporter=exporter, sample_rate=sample_rate)
+    return _provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and uninstall the provider"""
+    global _provider, _tracer
+
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def get_tracer() -> trace.Tracer:
+    """Tracer for worker spans (no-op until tracing is configured)"""
+    return _tracer or trace.get_tracer(TRACER_NAME)
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    carrier: Optional[Mapping[str, str]] = None
+) -> Iterator[trace.Span]:
+    """Start a span as the current span
+
+    Args:
+        name: Span name
+        attributes: Initial attributes
+        carrier: Trace context received from the backend; the current span
+            is the parent when omitted
+
+    Yields:
+        The span (escaping exceptions are recorded on it)
+    """
+    parent = propagate.extract(carrier) if carrier else None
+    if attributes:
+        attributes = {key: value for key, value in attributes.items() if value is not None}
+    with get_tracer().start_as_current_span(name, context=parent, attributes=attributes) as span:
+        yield span
+
+
+def task_trace_context(task_data: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Trace carrier of a task assignment (message field or task metadata)
+
+    Args:
+        task_data: Task assignment as passed to the task handler
+
+    Returns:
+        Carrier, or None when the task is not traced
+    """
+    return task_data.get("trace") or (task_data.get("context") or {}).get("trace")
@@ -0,0 +1,161 @@
+"""
+Unit Tests for Circuit Breakers and Tool Health Monitoring
+
+Tests breaker state transitions, fast-fail in retry_with_backoff and the
+executor, and adaptive probing in ToolHealthMonitor.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from agent.executor import TaskExecutor
+from tools.base import BaseTool
+from tools.health_checker import HealthStatus
+from tools.health_monitor import ToolHealthMonitor
+from utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState
+)
+from utils.retry import retry_with_backoff
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingTool(BaseTool):
+    """Tool whose executions raise"""
+
+    def __init__(self):
+        super().__init__({})
+        self.calls = 0
+
+    async def execute(self, instructions: str, context=None):
+        self.calls += 1
+        raise RuntimeError("tool down")
+
+    async def validate_config(self):
+        return True
+
+    async def health_check(self):
+        return False
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker state transitions"""
+
+    def test_opens_after_threshold_and_backs_off(self):
+        """Test open -> half-open trial -> re-open with doubled timeout -> closed"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("ollama", failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        clock.now += 10
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # Only one trial at a time
+
+        breaker.record_failure()
+        assert breaker.is_open
+        assert breaker.retry_after() == 20
+
+        clock.now += 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_stops_when_circuit_opens(self):
+        """Test retry_with_backoff records attempts and fails fast once open"""
+        breaker = CircuitBreaker("claude_code", failure_threshold=2, reset_timeout=60)
+        func = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(CircuitOpenError):
+            await retry_with_backoff(func, max_retries=5, base_delay=0.01, circuit_breaker=breaker)
+
+        assert func.call_count == 2
+        assert breaker.is_open
+
+
+class TestExecutorCircuit:
+    """Test TaskExecutor integration"""
+
+    @pytest.mark.asyncio
+    async def test_executor_fails_fast_when_open(self):
+        """Test failures open the circuit and later tasks skip the tool"""
+        registry = CircuitBreakerRegistry(failure_threshold=2, reset_timeout=60)
+        executor = TaskExecutor(circuit_breakers=registry)
+        tool = FailingTool()
+        executor.register_tool("ollama", tool)
+        subtask = {"subtask_id": "t1", "assigned_tool": "ollama", "description": "x"}
+
+        for _ in range(2):
+            result = await executor.execute_task(subtask)
+            assert result["success"] is False
+
+        result = await executor.execute_task(subtask)
+
+        assert result["metadata"]["circuit_open"] is True
+        assert tool.calls == 2
+        assert executor.get_healthy_tools() == []
+
+
+class TestToolHealthMonitor:
+    """Test adaptive background probing"""
+
+    @pytest.mark.asyncio
+    async def test_probe_intervals_and_breakers(self):
+        """Test unhealthy probes trip the breaker and are re-checked sooner"""
+        clock = FakeClock()
+        registry = CircuitBreakerRegistry(reset_timeout=30, clock=clock)
+        checker = AsyncMock()
+        checker.check_claude_code.return_value = {"status": HealthStatus.HEALTHY}
+        checker.check_ollama.return_value = {"status": HealthStatus.UNHEALTHY}
+
+        monitor = ToolHealthMonitor(
+            ["claude_code", "ollama", "custom"],
+            config={"ollama": {"url": "http://ollama:11434"}},
+            checker=checker,
+            circuit_breakers=registry,
+            healthy_interval=300,
+            degraded_interval=15,
+            clock=clock
+        )
+
+        await monitor.probe_due()
+
+        assert monitor.tools == ["claude_code", "ollama"]
+        checker.check_ollama.assert_awaited_once_with({"url": "http://ollama:11434"})
+        assert monitor.available_tools() == ["claude_code"]
+        assert monitor.get_status()["ollama"]["next_probe_in"] == 15
+
+        # Only the unhealthy tool is due again after the short interval
+        clock.now += 15
+        checker.check_ollama.return_value = {"status": HealthStatus.HEALTHY}
+        fresh = await monitor.probe_due()
+
+        assert list(fresh) == ["ollama"]
+        assert checker.check_claude_code.await_count == 1
+        assert monitor.available_tools() == ["claude_code", "ollama"]
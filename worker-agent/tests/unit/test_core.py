@@ -10,6 +10,7 @@ Tests agent lifecycle management:
 - WebSocket and polling modes
 """
 
+import httpx
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, call
@@ -56,6 +57,7 @@ def mock_connection_manager():
     manager.update_worker_status = AsyncMock()
     manager.stream_execution_log = AsyncMock()
     manager.upload_subtask_result = AsyncMock()
+    manager.report_task_started = AsyncMock(return_value=True)
     manager.ws_client = None
     return manager
 
@@ -291,8 +293,10 @@ class TestTaskAssignment:
         # Verify task execution
         mock_task_executor.execute_task.assert_called_once_with(task_data)
 
-        # Verify result upload
+        # Verify result upload, with the measured execution time
         mock_connection_manager.upload_subtask_result.assert_called_once()
+        uploaded = mock_connection_manager.upload_subtask_result.call_args.kwargs["result"]
+        assert uploaded["execution_time_ms"] >= 0
 
     async def test_handle_task_assignment_failure(
         self, worker_agent, mock_connection_manager, mock_task_executor
@@ -335,6 +339,60 @@ class TestTaskAssignment:
         # Should upload error result
         mock_connection_manager.upload_subtask_result.assert_called()
 
+    async def test_task_is_claimed_before_execution(
+        self, worker_agent, mock_connection_manager, mock_task_executor
+    ):
+        """Test the start report (assigned -> running) precedes execution"""
+        events = []
+        mock_connection_manager.report_task_started.side_effect = (
+            lambda **kwargs: events.append("claim") or True
+        )
+        mock_task_executor.execute_task.side_effect = (
+            lambda task: events.append("execute") or {"success": True, "output": "ok"}
+        )
+        subtask_id = str(uuid4())
+
+        await worker_agent._handle_task_assignment(
+            {"subtask_id": subtask_id, "description": "Test task", "assigned_tool": "test_tool"}
+        )
+
+        assert events == ["claim", "execute"]
+        mock_connection_manager.report_task_started.assert_called_once_with(
+            worker_id=worker_agent.worker_id, subtask_id=UUID(subtask_id)
+        )
+
+    async def test_stolen_task_is_executed_once(self, worker_agent, mock_task_executor):
+        """Test only the worker that wins the start claim runs a stolen task"""
+        victim, thief = uuid4(), uuid4()
+        task_id = uuid4()
+        backend = {"worker_id": thief, "status": "assigned"}  # Stolen before the victim started
+
+        def handler(request):
+            worker_id = UUID(request.url.path.split("/")[4])
+            if backend["worker_id"] != worker_id or backend["status"] != "assigned":
+                return httpx.Response(409, json={"detail": "Task was reassigned to another worker"})
+            backend["status"] = "running"
+            return httpx.Response(200, json={"status": "success"})
+
+        connection = ConnectionManager({"backend_url": "http://backend"})
+        connection.client = httpx.AsyncClient(
+            base_url="http://backend", transport=httpx.MockTransport(handler)
+        )
+        connection.update_worker_status = AsyncMock()
+        connection.stream_execution_log = AsyncMock()
+        connection.upload_subtask_result = AsyncMock()
+        worker_agent.connection_manager = connection
+        task_data = {"subtask_id": str(task_id), "description": "Test task", "assigned_tool": "test_tool"}
+
+        for worker_id in (victim, thief):
+            worker_agent.worker_id = worker_id
+            await worker_agent._handle_task_assignment(task_data)
+        await connection.client.aclose()
+
+        assert mock_task_executor.execute_task.await_count == 1
+        assert connection.upload_subtask_result.await_args.kwargs["worker_id"] == thief
+        assert backend["status"] == "running"
+
 
 class TestTaskCancellation:
     """Test task cancellation"""
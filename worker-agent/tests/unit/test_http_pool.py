@@ -0,0 +1,58 @@
+"""
+Unit Tests for the Shared Backend HTTP Pool
+"""
+
+import httpx
+import pytest
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from agent.http_pool import BackendHTTPPool, CircuitBreakerTransport
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+class TestBackendHTTPPool:
+    """Test pooled client configuration and the backend circuit"""
+
+    @pytest.mark.asyncio
+    async def test_shared_client_settings(self):
+        """Test one client is reused with configured base URL and headers"""
+        pool = BackendHTTPPool(
+            {"backend_url": "http://backend:8000/", "api_key": "key", "http_pool": {"max_connections": 4}},
+            circuit_breakers=CircuitBreakerRegistry()
+        )
+
+        client = pool.client
+
+        assert pool.client is client
+        assert str(client.base_url) == "http://backend:8000"
+        assert client.headers["X-Worker-API-Key"] == "key"
+        assert pool.get_status()["max_connections"] == 4
+
+        await pool.close()
+        assert not pool.is_open
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_on_unavailable_backend(self):
+        """Test gateway errors open the circuit and later requests fail fast"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        breaker = CircuitBreaker("backend", failure_threshold=2, reset_timeout=60)
+        transport = CircuitBreakerTransport(httpx.MockTransport(handler), breaker)
+
+        async with httpx.AsyncClient(base_url="http://backend", transport=transport) as client:
+            for _ in range(2):
+                assert (await client.get("/health")).status_code == 503
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/health")
+
+        assert len(calls) == 2
+        assert breaker.is_open
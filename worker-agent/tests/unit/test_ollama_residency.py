@@ -0,0 +1,128 @@
+"""Unit tests for Ollama connection reuse and model residency"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools.ollama import OllamaTool
+from tools.ollama_residency import ModelResidencyManager
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "benchmarks"))
+from fake_ollama import FakeOllama, parse_keep_alive  # noqa: E402
+
+
+class TestModelResidencyManager:
+    """Tests for keep_alive selection"""
+
+    @pytest.mark.unit
+    def test_model_pinned_after_threshold(self):
+        """Test that a model becomes hot after enough uses"""
+        manager = ModelResidencyManager(default_keep_alive="5m", hot_keep_alive="30m", hot_threshold=2)
+
+        manager.record_use("llama2")
+        assert manager.keep_alive_for("llama2") == "5m"
+
+        manager.record_use("llama2")
+        assert manager.keep_alive_for("llama2") == "30m"
+
+    @pytest.mark.unit
+    def test_max_pinned_and_demotion(self):
+        """Test that only the hottest models are pinned and demotions are reported once"""
+        manager = ModelResidencyManager(hot_threshold=1, max_pinned=1)
+
+        manager.record_use("a")
+        for _ in range(2):
+            manager.record_use("b")
+
+        assert manager.is_pinned("b") and not manager.is_pinned("a")
+        assert manager.take_demoted() == ["a"]
+        assert manager.take_demoted() == []
+
+    @pytest.mark.unit
+    def test_uses_expire_from_window(self, monkeypatch):
+        """Test that old uses no longer count toward hotness"""
+        now = [1000.0]
+        monkeypatch.setattr("tools.ollama_residency.time.monotonic", lambda: now[0])
+        manager = ModelResidencyManager(hot_threshold=2, hot_window=60)
+        manager.record_use("llama2", count=2)
+        assert manager.is_pinned("llama2")
+
+        now[0] += 120
+
+        assert manager.get_stats()["pinned"] == []
+
+
+class TestOllamaToolConnectionReuse:
+    """Tests against the local Ollama stand-in"""
+
+    @pytest.fixture
+    async def server(self):
+        """Start a fake Ollama server"""
+        server = FakeOllama(load_time=0.05, gen_time=0, tags_time=0, connect_cost=0)
+        server.url = await server.start()
+        yield server
+        await server.stop()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_session_reused_across_tasks(self, server):
+        """Test that consecutive tasks share one HTTP connection"""
+        tool = OllamaTool({"url": server.url})
+
+        for i in range(3):
+            result = await tool.execute(f"task {i}")
+            assert result["success"] is True
+        await tool.close()
+
+        assert server.stats["connections"] == 1
+        assert server.stats["generations"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_model_inventory_cached(self, server):
+        """Test that auto_pull checks reuse the cached /api/tags listing"""
+        tool = OllamaTool({"url": server.url, "auto_pull": True, "model_cache_ttl": 60})
+
+        for _ in range(3):
+            await tool.execute("hello")
+        await tool.list_models(force_refresh=True)
+        await tool.close()
+
+        assert server.stats["tags"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_hot_model_stays_resident(self, server):
+        """Test that a pinned model is not reloaded after the default keep_alive"""
+        tool = OllamaTool({"url": server.url, "keep_alive": 0, "hot_keep_alive": 60})
+
+        await tool.prewarm()
+        first = await tool.execute("one")
+        second = await tool.execute("two")
+        await tool.close()
+
+        assert server.stats["loads"] == 1
+        assert first["metadata"]["load_duration"] == 0
+        assert second["metadata"]["keep_alive"] == 60
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_schedule_prewarm_loads_in_background(self, server):
+        """Test that prewarm hints load the model before the task arrives"""
+        tool = OllamaTool({"url": server.url})
+
+        tool.schedule_prewarm(["codellama", "codellama"])
+        await tool._warming["codellama"]
+        result = await tool.execute("go", {"model": "codellama"})
+        await tool.close()
+
+        assert server.stats["loads"] == 1
+        assert result["metadata"]["load_duration"] == 0
+
+    @pytest.mark.unit
+    def test_parse_keep_alive(self):
+        """Test the stand-in's keep_alive parsing"""
+        assert parse_keep_alive("5m", 0) == 300
+        assert parse_keep_alive(30, 0) == 30
+        assert parse_keep_alive(None, 7) == 7
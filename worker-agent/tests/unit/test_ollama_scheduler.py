@@ -0,0 +1,146 @@
+"""Unit tests for the Ollama request scheduler"""
+
+import asyncio
+
+import pytest
+
+from tools.ollama_scheduler import OllamaRequestScheduler, resolve_num_parallel
+
+
+def recorder(log, gate=None):
+    """Build factories that log (model, tag) when they start running"""
+    def make(model, tag):
+        async def call():
+            log.append((model, tag))
+            if gate is not None:
+                await gate.wait()
+            else:
+                await asyncio.sleep(0)
+            return tag
+        return call
+    return make
+
+
+class TestOllamaRequestScheduler:
+    """Tests for model grouping, priority and the concurrency cap"""
+
+    @pytest.mark.unit
+    def test_resolve_num_parallel(self, monkeypatch):
+        """Test that explicit config wins over OLLAMA_NUM_PARALLEL"""
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "3")
+        assert resolve_num_parallel() == 3
+        assert resolve_num_parallel(6) == 6
+
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "bogus")
+        assert resolve_num_parallel() == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrency_capped(self):
+        """Test that no more than max_parallel calls run at once"""
+        scheduler = OllamaRequestScheduler(max_parallel=2)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(scheduler.submit("llama2", call) for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.get_stats()["completed"] == 6
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_requests_grouped_by_model(self):
+        """Test that interleaved arrivals are served one model at a time"""
+        scheduler = OllamaRequestScheduler(max_parallel=1)
+        log = []
+        make = recorder(log)
+        gate = asyncio.Event()
+
+        # Hold the scheduler busy while the mixed queue builds up
+        blocker = asyncio.create_task(scheduler.submit("a", recorder([], gate)("a", "hold")))
+        await asyncio.sleep(0)
+        calls = [scheduler.submit(m, make(m, i)) for i, m in enumerate("abababab")]
+        tasks = [asyncio.create_task(c) for c in calls]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert [m for m, _ in log] == list("aaaabbbb")
+        assert scheduler.get_stats()["model_switches"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_priority_preempts_group(self):
+        """Test that a higher-priority request for another model ends the group"""
+        scheduler = OllamaRequestScheduler(max_parallel=1)
+        log = []
+        make = recorder(log)
+        gate = asyncio.Event()
+
+        blocker = asyncio.create_task(scheduler.submit("a", recorder([], gate)("a", "hold")))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(scheduler.submit("a", make("a", "low"), priority=3)),
+            asyncio.create_task(scheduler.submit("b", make("b", "urgent"), priority=9)),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert log == [("b", "urgent"), ("a", "low")]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_max_batch_prevents_starvation(self):
+        """Test that a long run of one model yields to waiting models"""
+        scheduler = OllamaRequestScheduler(max_parallel=1, max_batch=2)
+        log = []
+        make = recorder(log)
+        gate = asyncio.Event()
+
+        blocker = asyncio.create_task(scheduler.submit("a", recorder([], gate)("a", "hold")))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(scheduler.submit("a", make("a", i))) for i in range(4)]
+        tasks.append(asyncio.create_task(scheduler.submit("b", make("b", "x"))))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        # "hold" counts toward the first batch of "a"
+        assert [m for m, _ in log] == ["a", "b", "a", "a", "a"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_and_cancellation(self):
+        """Test that failures propagate and cancelled waiters leave the queue"""
+        scheduler = OllamaRequestScheduler(max_parallel=1)
+        gate = asyncio.Event()
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        blocker = asyncio.create_task(scheduler.submit("a", recorder([], gate)("a", "hold")))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.submit("a", recorder([])("a", "never")))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        gate.set()
+        await blocker
+
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("a", boom)
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        stats = scheduler.get_stats()
+        assert stats["failed"] == 1
+        assert stats["cancelled"] == 1
+        assert stats["queued"] == {}
+        assert stats["in_flight"] == 0
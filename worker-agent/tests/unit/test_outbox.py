@@ -0,0 +1,159 @@
+"""Unit tests for the durable WebSocket outbox"""
+
+import json
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from agent.outbox import Outbox
+from agent.websocket_client import WebSocketClient
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a websockets connection"""
+
+    def __init__(self):
+        self.closed = False
+        self.sent = []
+
+    async def send(self, data: str):
+        self.sent.append(json.loads(data))
+
+
+class TestOutbox:
+    """Tests for Outbox persistence and acknowledgement"""
+
+    @pytest.mark.unit
+    def test_append_assigns_increasing_sequence(self):
+        """Test that appended messages get increasing sequence numbers"""
+        outbox = Outbox()
+
+        seq1, payload1 = outbox.append({"type": "task_progress", "data": {"progress": 10}})
+        seq2, _ = outbox.append({"type": "task_progress", "data": {"progress": 20}})
+
+        assert seq2 > seq1
+        assert json.loads(payload1)["seq"] == seq1
+        assert json.loads(payload1)["stream"] == outbox.stream_id
+        assert outbox.pending_count() == 2
+
+    @pytest.mark.unit
+    def test_ack_is_cumulative(self):
+        """Test that ack removes every message up to the given sequence"""
+        outbox = Outbox()
+        seqs = [outbox.append({"type": "task_progress"})[0] for _ in range(5)]
+
+        removed = outbox.ack(seqs[2])
+
+        assert removed == 3
+        assert [seq for seq, _ in outbox.pending()] == seqs[3:]
+
+    @pytest.mark.unit
+    def test_pending_pages_by_sequence(self):
+        """Test that pending() returns batches after a given sequence"""
+        outbox = Outbox()
+        for _ in range(5):
+            outbox.append({"type": "task_progress"})
+
+        first = outbox.pending(limit=2)
+        second = outbox.pending(after_seq=first[-1][0], limit=2)
+
+        assert len(first) == 2
+        assert len(second) == 2
+        assert second[0][0] > first[-1][0]
+
+    @pytest.mark.unit
+    def test_survives_reopen(self, tmp_path):
+        """Test that unacknowledged messages and stream id survive a restart"""
+        path = tmp_path / "outbox.db"
+        outbox = Outbox(path)
+        seq, _ = outbox.append({"type": "task_result", "data": {"task_id": "t1"}})
+        stream_id = outbox.stream_id
+        outbox.close()
+
+        reopened = Outbox(path)
+
+        assert reopened.stream_id == stream_id
+        assert reopened.pending()[0][0] == seq
+        next_seq, _ = reopened.append({"type": "task_result"})
+        assert next_seq > seq
+        reopened.close()
+
+
+class TestWebSocketClientOutbox:
+    """Tests for WebSocketClient outbox integration"""
+
+    @pytest.fixture
+    def client(self):
+        """Create a WebSocketClient with an in-memory outbox"""
+        return WebSocketClient(
+            ws_url="ws://localhost:8000",
+            worker_id=uuid4(),
+            message_handler=MagicMock(),
+            outbox=Outbox()
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_durable_message_stored_while_disconnected(self, client):
+        """Test that durable messages go to the outbox, not the memory queue"""
+        await client.send_message({"type": "task_result", "data": {"task_id": "t1"}})
+
+        assert client.outbox.pending_count() == 1
+        assert client.send_queue.qsize() == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_non_durable_message_uses_memory_queue(self, client):
+        """Test that other message types keep using the in-memory queue"""
+        await client.send_message({"type": "task_rejected"})
+
+        assert client.outbox.pending_count() == 0
+        assert client.send_queue.qsize() == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replay_sends_batches(self, client):
+        """Test that reconnect replays pending messages in batch frames"""
+        client.REPLAY_BATCH_SIZE = 2
+        for i in range(5):
+            await client.send_message({"type": "task_progress", "data": {"progress": i}})
+
+        ws = FakeWebSocket()
+        client.ws = ws
+        client.connected = True
+        await client._replay_outbox()
+
+        assert [frame["type"] for frame in ws.sent] == ["batch", "batch", "batch"]
+        replayed = [m["data"]["progress"] for frame in ws.sent for m in frame["messages"]]
+        assert replayed == [0, 1, 2, 3, 4]
+        assert client._outbox_replayed
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_live_send_after_replay(self, client):
+        """Test that durable messages are sent directly once replay caught up"""
+        ws = FakeWebSocket()
+        client.ws = ws
+        client.connected = True
+        await client._replay_outbox()
+
+        await client.send_message({"type": "task_result", "data": {"task_id": "t1"}})
+
+        assert ws.sent[0]["type"] == "task_result"
+        assert ws.sent[0]["seq"] == 1
+        # Remains pending until acknowledged
+        assert client.outbox.pending_count() == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ack_removes_messages(self, client):
+        """Test that a backend ack for this stream clears the outbox"""
+        for _ in range(3):
+            await client.send_message({"type": "task_progress"})
+
+        client._handle_ack({"type": "ack", "data": {"stream": "other", "seq": 3}})
+        assert client.outbox.pending_count() == 3
+
+        client._handle_ack({"type": "ack", "data": {"stream": client.outbox.stream_id, "seq": 2}})
+        assert client.outbox.pending_count() == 1
@@ -0,0 +1,156 @@
+"""Unit tests for the warm CLI session pool"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools.session_pool import CLISession, CLISessionError, CLISessionPool
+
+FAKE_CLI = str(Path(__file__).resolve().parents[2] / "benchmarks" / "fake_cli.py")
+
+
+def fake_cmd(input_format: str = "text"):
+    """Command line for the fake CLI stub with a negligible startup time"""
+    return [sys.executable, FAKE_CLI, "--startup", "0", "--input-format", input_format]
+
+
+class TestCLISession:
+    """Tests for individual sessions"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_oneshot_run(self):
+        """Test that a oneshot session sends the prompt via stdin"""
+        session = CLISession(fake_cmd(), cwd=None, env=dict(os.environ))
+        await session.start()
+
+        result = await session.run("hello", timeout=10)
+
+        assert result["exit_code"] == 0
+        assert result["stdout"] == "echo: hello"
+        assert not session.alive
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stream_json_multiple_turns(self):
+        """Test that a stream-json session serves several turns"""
+        session = CLISession(fake_cmd("stream-json"), cwd=None, env=dict(os.environ), mode="stream-json")
+        await session.start()
+        lines = []
+
+        first = await session.run("one", timeout=10, on_line=lambda line, name: lines.append(line))
+        second = await session.run("two", timeout=10)
+
+        assert first["stdout"] == "echo: one"
+        assert second["stdout"] == "echo: two"
+        assert second["exit_code"] == 0
+        assert session.alive and session.uses == 2
+        assert any('"type": "assistant"' in line for line in lines)
+        await session.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stream_json_error_result(self):
+        """Test that an error result maps to a non-zero exit code"""
+        session = CLISession(fake_cmd("stream-json"), cwd=None, env=dict(os.environ), mode="stream-json")
+        await session.start()
+
+        result = await session.run("FAIL please", timeout=10)
+
+        assert result["exit_code"] == 1
+        await session.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_timeout_marks_session_broken(self):
+        """Test that a timed-out session is never reused"""
+        cmd = [sys.executable, FAKE_CLI, "--startup", "0", "--work", "5"]
+        session = CLISession(cmd, cwd=None, env=dict(os.environ))
+        await session.start()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await session.run("slow", timeout=0.2)
+
+        assert not session.alive
+        with pytest.raises(CLISessionError):
+            await session.run("again", timeout=1)
+        await session.close()
+
+
+class TestCLISessionPool:
+    """Tests for pool checkout, refill and recycling"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prewarmed_session_is_a_hit(self):
+        """Test that acquire returns a prewarmed session"""
+        pool = CLISessionPool(env=dict(os.environ))
+        await pool.prewarm(fake_cmd())
+
+        session = await pool.acquire(fake_cmd())
+        result = await session.run("hi", timeout=10)
+        await pool.release(session)
+
+        assert result["stdout"] == "echo: hi"
+        stats = pool.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 0
+        assert stats["recycled"] == 1
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_oneshot_refills_in_background(self):
+        """Test that taking a oneshot session spawns its replacement"""
+        pool = CLISessionPool(env=dict(os.environ))
+
+        session = await pool.acquire(fake_cmd())
+        await session.run("x", timeout=10)
+        await pool.release(session)
+        await asyncio.sleep(0.1)
+
+        assert pool.get_stats()["idle_sessions"] == 1
+        assert pool.get_stats()["misses"] == 1
+        await pool.close()
+        assert pool.get_stats()["idle_sessions"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stream_json_conversation_not_shared_between_tasks(self):
+        """Test that a stream-json session is recycled after its task, not reused"""
+        pool = CLISessionPool(env=dict(os.environ), mode="stream-json")
+        cmd = fake_cmd("stream-json")
+
+        first = await pool.acquire(cmd)
+        await first.run("a", timeout=10)
+        await pool.release(first)
+
+        second = await pool.acquire(cmd)
+        second_result = await second.run("b", timeout=10)
+        await pool.release(second)
+
+        assert second is not first
+        assert not first.alive
+        assert second_result["stdout"] == "echo: b"
+        assert pool.get_stats()["recycled"] == 2
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dead_idle_session_discarded(self):
+        """Test that sessions whose process exited are not handed out"""
+        pool = CLISessionPool(env=dict(os.environ), mode="stream-json")
+        cmd = fake_cmd("stream-json")
+        session = await pool.acquire(cmd)
+        await pool.release(session)
+        session.process.kill()
+        await session.process.wait()
+
+        replacement = await pool.acquire(cmd)
+
+        assert replacement is not session
+        assert pool.get_stats()["discarded"] == 1
+        await pool.release(replacement)
+        await pool.close()
@@ -0,0 +1,263 @@
+"""Unit tests for bounded subprocess output streaming"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from tools.claude_code import ClaudeCodeTool
+from tools.streaming import (
+    JSONStreamScanner,
+    OutputCollector,
+    pump_stream,
+    sweep_spill_files,
+)
+
+
+class TestJSONStreamScanner:
+    """Tests for incremental JSON detection"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_finds_value_split_across_chunks(self):
+        """Test that a value split over several chunks is parsed once complete"""
+        scanner = JSONStreamScanner()
+
+        for chunk in ['Result: {"a": [1, ', '2], "b": "x}', '"} trailing']:
+            await scanner.feed(chunk)
+
+        assert scanner.first_value == {"a": [1, 2], "b": "x}"}
+        assert scanner.value_count == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_escaped_quotes_in_strings(self):
+        """Test that escaped quotes and backslashes do not end strings early"""
+        scanner = JSONStreamScanner()
+
+        await scanner.feed('{"s": "say \\"hi\\" \\\\", "t": "}"}')
+
+        assert scanner.first_value == {"s": 'say "hi" \\', "t": "}"}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_escape_at_chunk_boundary(self):
+        """Test a backslash at the end of one chunk escaping the next"""
+        scanner = JSONStreamScanner()
+
+        await scanner.feed('{"s": "a\\')
+        await scanner.feed('"b"}')
+
+        assert scanner.first_value == {"s": 'a"b'}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_json_lines_callback(self):
+        """Test that each JSON line is reported through on_value"""
+        values = []
+        scanner = JSONStreamScanner(on_value=values.append)
+
+        await scanner.feed('{"type": "progress"}\n{"type": "result", "text": "done"}\n')
+
+        assert [v["type"] for v in values] == ["progress", "result"]
+        assert scanner.last_value["text"] == "done"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_oversize_value_abandoned(self):
+        """Test that candidates above the size cap are dropped"""
+        scanner = JSONStreamScanner(max_value_chars=16)
+
+        await scanner.feed('{"long": "' + "x" * 100 + '"} {"ok": 1}')
+
+        assert scanner.first_value == {"ok": 1}
+
+
+class TestOutputCollector:
+    """Tests for OutputCollector"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lines_forwarded_incrementally(self):
+        """Test that complete lines are forwarded as soon as they arrive"""
+        lines = []
+        collector = OutputCollector("stdout", on_line=lambda line, name: lines.append(line))
+
+        await collector.feed(b"first\nsec")
+        assert lines == ["first"]
+
+        await collector.feed(b"ond\nthird")
+        await collector.finish()
+
+        assert lines == ["first", "second", "third"]
+        assert collector.get_text() == "first\nsecond\nthird"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_multibyte_split_across_chunks(self):
+        """Test that UTF-8 sequences split between chunks decode correctly"""
+        lines = []
+        collector = OutputCollector("stdout", on_line=lambda line, name: lines.append(line))
+        data = "héllo\n".encode("utf-8")
+
+        await collector.feed(data[:2])
+        await collector.feed(data[2:])
+        await collector.finish()
+
+        assert lines == ["héllo"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_spills_beyond_cap(self, tmp_path):
+        """Test that memory stays bounded and full output goes to a file"""
+        collector = OutputCollector("stdout", max_memory_bytes=1024, spill_dir=str(tmp_path))
+
+        for i in range(100):
+            await collector.feed(f"line {i:04d} ".encode() * 10 + b"\n")
+        await collector.finish()
+
+        assert collector.truncated
+        assert len(collector._buffer) <= 2 * 1024
+        with open(collector.spill_path, "rb") as f:
+            assert len(f.read()) == collector.total_bytes
+        text = collector.get_text()
+        assert "bytes omitted" in text
+        assert text.endswith("line 0099 " * 10)
+
+
+class TestSpillCleanup:
+    """Tests for removing spill files"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_close_deletes_spill_file(self, tmp_path):
+        """Test that close() removes the spill file but keeps the in-memory tail"""
+        collector = OutputCollector("stdout", max_memory_bytes=16, spill_dir=str(tmp_path))
+        await collector.feed(b"x" * 64)
+        await collector.finish()
+        assert os.path.exists(collector.spill_path)
+
+        collector.close()
+        collector.close()
+
+        assert not os.path.exists(collector.spill_path)
+        assert "full output discarded" in collector.get_text()
+        assert collector.get_text().endswith("x" * 16)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_new_spill_sweeps_expired_files(self, tmp_path):
+        """Test that spilling removes spill files older than the TTL, and only those"""
+        old = tmp_path / "garageswarm-old.stdout.log"
+        recent = tmp_path / "garageswarm-recent.stdout.log"
+        other = tmp_path / "notes.log"
+        for path in (old, recent, other):
+            path.write_text("x")
+        os.utime(old, (0, 0))
+        os.utime(other, (0, 0))
+
+        collector = OutputCollector(
+            "stdout", max_memory_bytes=16, spill_dir=str(tmp_path), spill_ttl=60
+        )
+        await collector.feed(b"x" * 64)
+        await collector.finish()
+
+        assert not old.exists()
+        assert recent.exists() and other.exists()
+        assert os.path.exists(collector.spill_path)
+
+    @pytest.mark.unit
+    def test_sweep_missing_directory(self, tmp_path):
+        """Test that sweeping a directory that does not exist is a no-op"""
+        assert sweep_spill_files(str(tmp_path / "missing")) == 0
+
+
+class TestPumpStream:
+    """Tests for reading real subprocess output"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pump_subprocess_output(self, tmp_path):
+        """Test streaming a subprocess that prints more than the cap"""
+        script = (
+            "import json\n"
+            "for i in range(2000): print('x' * 100)\n"
+            "print(json.dumps({'result': 'ok'}))\n"
+        )
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", script,
+            stdout=asyncio.subprocess.PIPE
+        )
+        line_count = 0
+
+        def on_line(line, name):
+            nonlocal line_count
+            line_count += 1
+
+        scanner = JSONStreamScanner()
+        collector = OutputCollector(
+            "stdout",
+            max_memory_bytes=8 * 1024,
+            on_line=on_line,
+            scanner=scanner,
+            spill_dir=str(tmp_path)
+        )
+
+        await asyncio.gather(pump_stream(process.stdout, collector), process.wait())
+
+        assert line_count == 2001
+        assert collector.truncated
+        assert scanner.last_value == {"result": "ok"}
+        assert os.path.getsize(collector.spill_path) == collector.total_bytes
+
+
+class TestSubprocessSpills:
+    """Tests for spill files left behind by tool subprocess runs"""
+
+    SCRIPT = (
+        "import sys\n"
+        "for i in range(100): print('x' * 100); print('e' * 100, file=sys.stderr)\n"
+        "sys.exit(int(sys.argv[1]))\n"
+    )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("exit_code", [0, 1])
+    async def test_only_reported_stdout_spill_is_kept(self, tmp_path, exit_code):
+        """Test that a run keeps only the stdout spill file it reports as its output"""
+        tool = ClaudeCodeTool({"max_output_bytes": 1024, "spill_directory": str(tmp_path)})
+
+        result = await tool._run_subprocess(
+            cmd=[sys.executable, "-c", self.SCRIPT, str(exit_code)],
+            working_dir=None,
+            timeout=30,
+            env=os.environ.copy(),
+            stream=False
+        )
+
+        assert result["stdout_truncated"]
+        assert "full output discarded" in result["stderr"]
+        if exit_code == 0:
+            assert os.listdir(tmp_path) == [os.path.basename(result["stdout_path"])]
+        else:
+            assert result["stdout_path"] is None
+            assert os.listdir(tmp_path) == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_timeout_removes_spill_files(self, tmp_path):
+        """Test that a run that times out leaves no spill files behind"""
+        tool = ClaudeCodeTool({"max_output_bytes": 16, "spill_directory": str(tmp_path)})
+        script = "import time\nprint('x' * 100, flush=True)\ntime.sleep(30)\n"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await tool._run_subprocess(
+                cmd=[sys.executable, "-c", script],
+                working_dir=None,
+                timeout=1,
+                env=os.environ.copy(),
+                stream=False
+            )
+
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,96 @@
+"""
+Unit Tests for Worker Tracing
+
+Tests that worker spans join the backend's trace and follow its sampling
+decision.
+"""
+
+import json
+
+import pytest
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from agent.executor import TaskExecutor
+from tools.base import BaseTool
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.tracing import configure_tracing, shutdown_tracing, start_span, task_trace_context
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class EchoTool(BaseTool):
+    """Tool that returns its instructions"""
+
+    def __init__(self):
+        super().__init__({})
+
+    async def execute(self, instructions: str, context=None):
+        return {"success": True, "output": instructions, "error": None, "metadata": {}}
+
+    async def validate_config(self):
+        return True
+
+    async def health_check(self):
+        return True
+
+
+@pytest.fixture
+def span_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing({"exporter": "file", "file_path": str(path), "sample_rate": 1.0})
+    yield path
+    shutdown_tracing()
+
+
+async def run_task(subtask: dict):
+    executor = TaskExecutor(circuit_breakers=CircuitBreakerRegistry())
+    executor.register_tool("echo", EchoTool())
+    with start_span("worker.task", carrier=task_trace_context(subtask)):
+        return await executor.execute_task(subtask)
+
+
+class TestWorkerTracing:
+    """Test trace continuation on the worker"""
+
+    @pytest.mark.asyncio
+    async def test_task_spans_join_backend_trace(self, span_file):
+        """Test polled task metadata carries the trace into worker and tool spans"""
+        subtask = {
+            "subtask_id": "t1",
+            "assigned_tool": "echo",
+            "description": "hello",
+            "context": {"trace": {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}},
+        }
+
+        result = await run_task(subtask)
+        shutdown_tracing()
+
+        assert result["success"] is True
+        spans = {s["name"]: s for s in map(json.loads, span_file.read_text().splitlines())}
+        assert spans["worker.task"]["trace_id"] == TRACE_ID
+        assert spans["worker.task"]["parent_id"] == PARENT_ID
+        assert spans["tool.execute"]["parent_id"] == spans["worker.task"]["span_id"]
+        assert spans["tool.execute"]["attributes"] == {"tool.name": "echo", "tool.success": True}
+        assert spans["tool.execute"]["service"] == "garageswarm-worker"
+
+    @pytest.mark.asyncio
+    async def test_unsampled_backend_trace_is_not_recorded(self, span_file):
+        """Test the backend's sampling decision wins over the worker's sample rate"""
+        subtask = {
+            "subtask_id": "t2",
+            "assigned_tool": "echo",
+            "description": "hello",
+            "trace": {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"},
+        }
+
+        result = await run_task(subtask)
+        shutdown_tracing()
+
+        assert result["success"] is True
+        assert not span_file.exists()